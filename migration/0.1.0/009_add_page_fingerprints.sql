@@ -0,0 +1,39 @@
+-- Migration: 009_add_page_fingerprints.sql
+-- Description: Store per-page validators and content hashes so knowledge refreshes can skip unchanged pages
+-- Version: 0.1.0
+-- Author: Archon Team
+-- Date: 2025
+
+CREATE TABLE IF NOT EXISTS archon_page_fingerprints (
+    source_id TEXT NOT NULL REFERENCES archon_sources(source_id) ON DELETE CASCADE,
+    url VARCHAR NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT NOT NULL,
+    chunk_hashes JSONB NOT NULL DEFAULT '[]'::jsonb,
+    internal_links JSONB NOT NULL DEFAULT '[]'::jsonb,
+    word_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT timezone('utc'::text, now()) NOT NULL,
+    PRIMARY KEY (source_id, url)
+);
+
+COMMENT ON TABLE archon_page_fingerprints IS 'Per-page validators and content hashes used by incremental knowledge refreshes';
+COMMENT ON COLUMN archon_page_fingerprints.etag IS 'ETag response header from the last crawl, sent as If-None-Match';
+COMMENT ON COLUMN archon_page_fingerprints.last_modified IS 'Last-Modified response header from the last crawl, sent as If-Modified-Since';
+COMMENT ON COLUMN archon_page_fingerprints.content_hash IS 'SHA-256 of the page markdown';
+COMMENT ON COLUMN archon_page_fingerprints.chunk_hashes IS 'SHA-256 of each stored chunk, indexed by chunk_number';
+COMMENT ON COLUMN archon_page_fingerprints.internal_links IS 'Internal links found on the page, followed when the page is not re-crawled';
+
+-- Fingerprints are only written by the backend
+ALTER TABLE archon_page_fingerprints ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Allow service role full access to archon_page_fingerprints" ON archon_page_fingerprints;
+CREATE POLICY "Allow service role full access to archon_page_fingerprints"
+  ON archon_page_fingerprints
+  FOR ALL
+  USING (auth.role() = 'service_role');
+
+-- Record this migration as applied
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '009_add_page_fingerprints')
+ON CONFLICT (version, migration_name) DO NOTHING;
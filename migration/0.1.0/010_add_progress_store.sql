@@ -0,0 +1,35 @@
+-- Migration: 010_add_progress_store.sql
+-- Description: Shared progress state table so several backend workers can serve the same operation's progress
+-- Version: 0.1.0
+-- Author: Archon Team
+-- Date: 2025
+
+CREATE SEQUENCE IF NOT EXISTS archon_progress_version_seq;
+
+CREATE TABLE IF NOT EXISTS archon_progress (
+    progress_id TEXT PRIMARY KEY,
+    state JSONB,
+    version BIGINT NOT NULL DEFAULT nextval('archon_progress_version_seq'),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_archon_progress_version ON archon_progress (version);
+CREATE INDEX IF NOT EXISTS idx_archon_progress_updated_at ON archon_progress (updated_at);
+
+COMMENT ON TABLE archon_progress IS 'Progress of running operations, shared by backend workers (PROGRESS_BACKEND=postgres)';
+COMMENT ON COLUMN archon_progress.state IS 'Latest progress state; NULL once the operation was cleaned up';
+COMMENT ON COLUMN archon_progress.version IS 'Increases on every write; workers sync the rows past the last version they saw';
+
+-- Progress is only written by the backend
+ALTER TABLE archon_progress ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Allow service role full access to archon_progress" ON archon_progress;
+CREATE POLICY "Allow service role full access to archon_progress"
+  ON archon_progress
+  FOR ALL
+  USING (auth.role() = 'service_role');
+
+-- Record this migration as applied
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '010_add_progress_store')
+ON CONFLICT (version, migration_name) DO NOTHING;
@@ -0,0 +1,57 @@
+-- Migration: 011_add_text_search_function.sql
+-- Description: Ranked full-text search over crawled pages, the keyword leg of HYBRID_SEARCH_MODE=rrf
+-- Version: 0.1.0
+-- Author: Archon Team
+-- Date: 2025
+
+CREATE OR REPLACE FUNCTION search_archon_crawled_pages_text(
+    query_text TEXT,
+    match_count INT DEFAULT 10,
+    filter JSONB DEFAULT '{}'::jsonb,
+    source_filter TEXT DEFAULT NULL
+)
+RETURNS TABLE (
+    id BIGINT,
+    url VARCHAR,
+    chunk_number INTEGER,
+    content TEXT,
+    metadata JSONB,
+    source_id TEXT,
+    text_score FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+BEGIN
+    RETURN QUERY
+    SELECT
+        cp.id,
+        cp.url,
+        cp.chunk_number,
+        cp.content,
+        cp.metadata,
+        cp.source_id,
+        ts_rank_cd(cp.content_search_vector, q.query)::float8 AS text_score
+    FROM archon_crawled_pages cp, plainto_tsquery('english', query_text) AS q(query)
+    WHERE cp.content_search_vector @@ q.query
+        AND cp.metadata @> filter
+        AND (source_filter IS NULL OR cp.source_id = source_filter)
+    ORDER BY text_score DESC
+    LIMIT match_count;
+END;
+$$;
+
+COMMENT ON FUNCTION search_archon_crawled_pages_text IS 'Full-text search on crawled pages ranked by ts_rank_cd; fused with vector search client-side (HYBRID_SEARCH_MODE=rrf)';
+
+-- Settings for client-side reciprocal rank fusion
+INSERT INTO archon_settings (key, value, is_encrypted, category, description) VALUES
+('HYBRID_SEARCH_MODE', 'union', false, 'rag_strategy', 'Hybrid search fusion: union (single SQL function, results ordered by raw score) or rrf (vector and full-text searches run concurrently and fused with weighted reciprocal rank fusion)'),
+('HYBRID_RRF_K', '60', false, 'rag_strategy', 'RRF rank constant k; larger values flatten the difference between top and lower ranks'),
+('HYBRID_VECTOR_WEIGHT', '1.0', false, 'rag_strategy', 'Weight of the vector search ranking in RRF fusion'),
+('HYBRID_TEXT_WEIGHT', '1.0', false, 'rag_strategy', 'Weight of the full-text search ranking in RRF fusion')
+ON CONFLICT (key) DO NOTHING;
+
+-- Record this migration as applied
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '011_add_text_search_function')
+ON CONFLICT (version, migration_name) DO NOTHING;
@@ -0,0 +1,144 @@
+-- Migration: 012_add_vector_search_params.sql
+-- Description: Per-query hnsw.ef_search / ivfflat.probes for the search functions (VECTOR_SEARCH_RECALL)
+-- Version: 0.1.0
+-- Author: Archon Team
+-- Date: 2025
+
+-- Per-query ANN search tuning: applies hnsw.ef_search / ivfflat.probes for the rest of
+-- the calling transaction (NULL keeps the server default)
+CREATE OR REPLACE FUNCTION set_vector_search_params(ef_search INT DEFAULT NULL, probes INT DEFAULT NULL)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  IF ef_search IS NOT NULL THEN
+    PERFORM set_config('hnsw.ef_search', ef_search::text, true);
+  END IF;
+  IF probes IS NOT NULL THEN
+    PERFORM set_config('ivfflat.probes', probes::text, true);
+  END IF;
+END;
+$$;
+
+-- Adding parameters changes the signatures, so the old functions are replaced
+DROP FUNCTION IF EXISTS match_archon_crawled_pages(vector, int, jsonb, text);
+DROP FUNCTION IF EXISTS match_archon_code_examples(vector, int, jsonb, text);
+DROP FUNCTION IF EXISTS hybrid_search_archon_crawled_pages(vector, text, int, jsonb, text);
+DROP FUNCTION IF EXISTS hybrid_search_archon_code_examples(vector, text, int, jsonb, text);
+
+-- Legacy compatibility function (defaults to 1536D)
+CREATE OR REPLACE FUNCTION match_archon_crawled_pages (
+  query_embedding VECTOR(1536),
+  match_count INT DEFAULT 10,
+  filter JSONB DEFAULT '{}'::jsonb,
+  source_filter TEXT DEFAULT NULL,
+  ef_search INT DEFAULT NULL,
+  probes INT DEFAULT NULL
+) RETURNS TABLE (
+  id BIGINT,
+  url VARCHAR,
+  chunk_number INTEGER,
+  content TEXT,
+  metadata JSONB,
+  source_id TEXT,
+  similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  PERFORM set_vector_search_params(ef_search, probes);
+  RETURN QUERY SELECT * FROM match_archon_crawled_pages_multi(query_embedding, 1536, match_count, filter, source_filter);
+END;
+$$;
+
+-- Legacy compatibility function (defaults to 1536D)
+CREATE OR REPLACE FUNCTION match_archon_code_examples (
+  query_embedding VECTOR(1536),
+  match_count INT DEFAULT 10,
+  filter JSONB DEFAULT '{}'::jsonb,
+  source_filter TEXT DEFAULT NULL,
+  ef_search INT DEFAULT NULL,
+  probes INT DEFAULT NULL
+) RETURNS TABLE (
+  id BIGINT,
+  url VARCHAR,
+  chunk_number INTEGER,
+  content TEXT,
+  summary TEXT,
+  metadata JSONB,
+  source_id TEXT,
+  similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  PERFORM set_vector_search_params(ef_search, probes);
+  RETURN QUERY SELECT * FROM match_archon_code_examples_multi(query_embedding, 1536, match_count, filter, source_filter);
+END;
+$$;
+
+-- Legacy compatibility function (defaults to 1536D)
+CREATE OR REPLACE FUNCTION hybrid_search_archon_crawled_pages(
+    query_embedding vector(1536),
+    query_text TEXT,
+    match_count INT DEFAULT 10,
+    filter JSONB DEFAULT '{}'::jsonb,
+    source_filter TEXT DEFAULT NULL,
+  ef_search INT DEFAULT NULL,
+  probes INT DEFAULT NULL
+)
+RETURNS TABLE (
+    id BIGINT,
+    url VARCHAR,
+    chunk_number INTEGER,
+    content TEXT,
+    metadata JSONB,
+    source_id TEXT,
+    similarity FLOAT,
+    match_type TEXT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM set_vector_search_params(ef_search, probes);
+    RETURN QUERY SELECT * FROM hybrid_search_archon_crawled_pages_multi(query_embedding, 1536, query_text, match_count, filter, source_filter);
+END;
+$$;
+
+-- Legacy compatibility function (defaults to 1536D)
+CREATE OR REPLACE FUNCTION hybrid_search_archon_code_examples(
+    query_embedding vector(1536),
+    query_text TEXT,
+    match_count INT DEFAULT 10,
+    filter JSONB DEFAULT '{}'::jsonb,
+    source_filter TEXT DEFAULT NULL,
+  ef_search INT DEFAULT NULL,
+  probes INT DEFAULT NULL
+)
+RETURNS TABLE (
+    id BIGINT,
+    url VARCHAR,
+    chunk_number INTEGER,
+    content TEXT,
+    summary TEXT,
+    metadata JSONB,
+    source_id TEXT,
+    similarity FLOAT,
+    match_type TEXT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM set_vector_search_params(ef_search, probes);
+    RETURN QUERY SELECT * FROM hybrid_search_archon_code_examples_multi(query_embedding, 1536, query_text, match_count, filter, source_filter);
+END;
+$$;
+
+INSERT INTO archon_settings (key, value, is_encrypted, category, description) VALUES
+('VECTOR_SEARCH_RECALL', 'balanced', false, 'rag_strategy', 'Vector index search effort per query: fast, balanced or accurate (sets hnsw.ef_search / ivfflat.probes); empty keeps the database defaults')
+ON CONFLICT (key) DO NOTHING;
+
+-- Record this migration as applied
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '012_add_vector_search_params')
+ON CONFLICT (version, migration_name) DO NOTHING;
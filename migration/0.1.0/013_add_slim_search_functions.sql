@@ -0,0 +1,143 @@
+-- Migration: 013_add_slim_search_functions.sql
+-- Description: Snippet-only variants of the document search functions and a bulk fetch of chunks by id
+-- Version: 0.1.0
+-- Author: Archon Team
+-- Date: 2025
+
+-- Keep only the given metadata keys (NULL keeps the whole object)
+CREATE OR REPLACE FUNCTION archon_select_metadata(metadata JSONB, keys TEXT[])
+RETURNS JSONB
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT CASE
+        WHEN keys IS NULL THEN metadata
+        ELSE COALESCE(
+            (SELECT jsonb_object_agg(e.key, e.value) FROM jsonb_each(metadata) AS e WHERE e.key = ANY(keys)),
+            '{}'::jsonb
+        )
+    END;
+$$;
+
+-- Slim variants of the document search functions: same ranking, but each row carries
+-- only the first snippet_length characters of its content (content_length is the full
+-- length) and the requested metadata keys. Full chunks are fetched by id afterwards.
+CREATE OR REPLACE FUNCTION match_archon_crawled_pages_slim(
+    query_embedding VECTOR(1536),
+    match_count INT DEFAULT 10,
+    filter JSONB DEFAULT '{}'::jsonb,
+    source_filter TEXT DEFAULT NULL,
+    ef_search INT DEFAULT NULL,
+    probes INT DEFAULT NULL,
+    snippet_length INT DEFAULT 300,
+    metadata_keys TEXT[] DEFAULT NULL
+)
+RETURNS TABLE (
+    id BIGINT,
+    url VARCHAR,
+    chunk_number INTEGER,
+    content TEXT,
+    content_length INTEGER,
+    metadata JSONB,
+    source_id TEXT,
+    similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT m.id, m.url, m.chunk_number, left(m.content, snippet_length), length(m.content),
+           archon_select_metadata(m.metadata, metadata_keys), m.source_id, m.similarity
+    FROM match_archon_crawled_pages(query_embedding, match_count, filter, source_filter, ef_search, probes) AS m;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION hybrid_search_archon_crawled_pages_slim(
+    query_embedding VECTOR(1536),
+    query_text TEXT,
+    match_count INT DEFAULT 10,
+    filter JSONB DEFAULT '{}'::jsonb,
+    source_filter TEXT DEFAULT NULL,
+    ef_search INT DEFAULT NULL,
+    probes INT DEFAULT NULL,
+    snippet_length INT DEFAULT 300,
+    metadata_keys TEXT[] DEFAULT NULL
+)
+RETURNS TABLE (
+    id BIGINT,
+    url VARCHAR,
+    chunk_number INTEGER,
+    content TEXT,
+    content_length INTEGER,
+    metadata JSONB,
+    source_id TEXT,
+    similarity FLOAT,
+    match_type TEXT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT h.id, h.url, h.chunk_number, left(h.content, snippet_length), length(h.content),
+           archon_select_metadata(h.metadata, metadata_keys), h.source_id, h.similarity, h.match_type
+    FROM hybrid_search_archon_crawled_pages(
+        query_embedding, query_text, match_count, filter, source_filter, ef_search, probes
+    ) AS h;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION search_archon_crawled_pages_text_slim(
+    query_text TEXT,
+    match_count INT DEFAULT 10,
+    filter JSONB DEFAULT '{}'::jsonb,
+    source_filter TEXT DEFAULT NULL,
+    snippet_length INT DEFAULT 300,
+    metadata_keys TEXT[] DEFAULT NULL
+)
+RETURNS TABLE (
+    id BIGINT,
+    url VARCHAR,
+    chunk_number INTEGER,
+    content TEXT,
+    content_length INTEGER,
+    metadata JSONB,
+    source_id TEXT,
+    text_score FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT t.id, t.url, t.chunk_number, left(t.content, snippet_length), length(t.content),
+           archon_select_metadata(t.metadata, metadata_keys), t.source_id, t.text_score
+    FROM search_archon_crawled_pages_text(query_text, match_count, filter, source_filter) AS t;
+END;
+$$;
+
+-- Full chunks for the search results a caller opens
+CREATE OR REPLACE FUNCTION get_archon_crawled_pages_by_ids(chunk_ids BIGINT[])
+RETURNS TABLE (
+    id BIGINT,
+    url VARCHAR,
+    chunk_number INTEGER,
+    content TEXT,
+    metadata JSONB,
+    source_id TEXT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT cp.id, cp.url, cp.chunk_number, cp.content, cp.metadata, cp.source_id
+    FROM archon_crawled_pages cp
+    WHERE cp.id = ANY(chunk_ids);
+$$;
+
+COMMENT ON FUNCTION match_archon_crawled_pages_slim IS 'Vector search on crawled pages returning content snippets and selected metadata keys';
+COMMENT ON FUNCTION hybrid_search_archon_crawled_pages_slim IS 'Hybrid search on crawled pages returning content snippets and selected metadata keys';
+COMMENT ON FUNCTION search_archon_crawled_pages_text_slim IS 'Full-text search on crawled pages returning content snippets and selected metadata keys';
+COMMENT ON FUNCTION get_archon_crawled_pages_by_ids IS 'Full crawled page chunks by id, the follow-up to a slim search';
+
+-- Record this migration as applied
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '013_add_slim_search_functions')
+ON CONFLICT (version, migration_name) DO NOTHING;
@@ -0,0 +1,33 @@
+-- Migration: 014_add_task_list_projections.sql
+-- Description: Count columns for task JSONB arrays and indexes for paginated task lists
+-- Version: 0.1.0
+-- Author: Archon Team
+-- Date: 2025
+
+-- Array lengths of the large JSONB task fields, selectable as computed columns
+-- (select=sources_count,code_examples_count) so task lists can show counts
+-- without transferring the arrays
+CREATE OR REPLACE FUNCTION sources_count(task archon_tasks)
+RETURNS INTEGER
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT COALESCE(jsonb_array_length(task.sources), 0);
+$$;
+
+CREATE OR REPLACE FUNCTION code_examples_count(task archon_tasks)
+RETURNS INTEGER
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT COALESCE(jsonb_array_length(task.code_examples), 0);
+$$;
+
+-- Task list order (task_order, created_at, id), for LIMIT and keyset cursor pages
+CREATE INDEX IF NOT EXISTS idx_archon_tasks_list_order ON archon_tasks(task_order, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_archon_tasks_project_list_order ON archon_tasks(project_id, task_order, created_at, id);
+
+-- Record this migration as applied
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '014_add_task_list_projections')
+ON CONFLICT (version, migration_name) DO NOTHING;
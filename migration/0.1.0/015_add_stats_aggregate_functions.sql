@@ -0,0 +1,80 @@
+-- Migration: 015_add_stats_aggregate_functions.sql
+-- Description: Aggregate functions for the dashboard statistics and per-project task counts
+-- Version: 0.1.0
+-- Author: Archon Team
+-- Date: 2025
+
+-- Index-only scans for the per-project task counts
+CREATE INDEX IF NOT EXISTS idx_archon_tasks_active_project_status ON archon_tasks(project_id, status) WHERE archived IS NOT TRUE;
+
+-- Active (non-archived) task counts per project and status, for the project sidebar
+CREATE OR REPLACE FUNCTION get_task_counts_by_project()
+RETURNS TABLE (
+    project_id UUID,
+    status TEXT,
+    task_count BIGINT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT t.project_id, t.status::text, count(*)
+    FROM archon_tasks t
+    WHERE t.archived IS NOT TRUE AND t.project_id IS NOT NULL
+    GROUP BY t.project_id, t.status;
+$$;
+
+-- Project total and task counts per status for the dashboard, optionally for one project's tasks
+CREATE OR REPLACE FUNCTION get_project_task_stats(project_filter UUID DEFAULT NULL)
+RETURNS TABLE (
+    bucket TEXT,
+    item_count BIGINT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT 'projects', count(*) FROM archon_projects
+    UNION ALL
+    SELECT CASE WHEN t.archived THEN 'archived' ELSE COALESCE(t.status::text, 'todo') END,
+           count(*)
+    FROM archon_tasks t
+    WHERE project_filter IS NULL OR t.project_id = project_filter
+    GROUP BY 1;
+$$;
+
+-- Sources, documents and code examples per knowledge type, for the dashboard
+CREATE OR REPLACE FUNCTION get_knowledge_stats()
+RETURNS TABLE (
+    knowledge_type TEXT,
+    sources BIGINT,
+    documents BIGINT,
+    code_examples BIGINT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    -- Pages and code examples are counted from their own tables, so rows whose
+    -- source row is gone still add to the totals (under the default type)
+    WITH pages AS (
+        SELECT source_id, count(*) AS n FROM archon_crawled_pages GROUP BY source_id
+    ), code AS (
+        SELECT source_id, count(*) AS n FROM archon_code_examples GROUP BY source_id
+    ), ids AS (
+        SELECT source_id FROM archon_sources
+        UNION SELECT source_id FROM pages
+        UNION SELECT source_id FROM code
+    )
+    SELECT COALESCE(s.metadata->>'knowledge_type', 'technical'),
+           count(s.source_id),
+           COALESCE(sum(pages.n), 0)::bigint,
+           COALESCE(sum(code.n), 0)::bigint
+    FROM ids
+    LEFT JOIN archon_sources s ON s.source_id = ids.source_id
+    LEFT JOIN pages ON pages.source_id = ids.source_id
+    LEFT JOIN code ON code.source_id = ids.source_id
+    GROUP BY 1;
+$$;
+
+-- Record this migration as applied
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '015_add_stats_aggregate_functions')
+ON CONFLICT (version, migration_name) DO NOTHING;
@@ -0,0 +1,76 @@
+-- Migration: 016_add_task_search.sql
+-- Description: Full-text and trigram indexes on archon_tasks with a ranked search function
+-- Version: 0.1.0
+-- Author: Archon Team
+-- Date: 2025
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Task search document: title ranks above feature, feature above description
+CREATE OR REPLACE FUNCTION archon_task_search_vector(title TEXT, feature TEXT, description TEXT)
+RETURNS tsvector
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english'::regconfig, coalesce(feature, '')), 'B')
+        || setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'C');
+$$;
+
+-- Lowercased task text for substring matches the search document misses (e.g. "auth" in "OAuth")
+CREATE OR REPLACE FUNCTION archon_task_search_text(title TEXT, feature TEXT, description TEXT)
+RETURNS TEXT
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT lower(coalesce(title, '') || ' ' || coalesce(feature, '') || ' ' || coalesce(description, ''));
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_archon_tasks_search_vector ON archon_tasks USING gin (archon_task_search_vector(title, feature, description));
+CREATE INDEX IF NOT EXISTS idx_archon_tasks_search_trgm ON archon_tasks USING gin (archon_task_search_text(title, feature, description) gin_trgm_ops);
+
+-- Ranked task search: every term must match, as a word prefix or, in order, as a substring
+CREATE OR REPLACE FUNCTION search_archon_tasks(
+    search_query TEXT,
+    filter_project_id UUID DEFAULT NULL,
+    filter_status TEXT DEFAULT NULL,
+    filter_assignee TEXT DEFAULT NULL,
+    include_closed BOOLEAN DEFAULT TRUE,
+    include_archived BOOLEAN DEFAULT FALSE
+)
+RETURNS SETOF archon_tasks
+LANGUAGE sql
+STABLE
+AS $$
+    WITH terms AS (
+        SELECT array_agg(term) AS words
+        FROM regexp_split_to_table(lower(search_query), '[^[:alnum:]]+') AS term
+        WHERE term <> ''
+    ), q AS (
+        SELECT
+            to_tsquery(
+                'english',
+                array_to_string(ARRAY(SELECT quote_literal(word) || ':*' FROM unnest(words) AS word), ' & ')
+            ) AS query,
+            '%' || array_to_string(words, '%') || '%' AS pattern
+        FROM terms
+        WHERE words IS NOT NULL
+    )
+    SELECT t.*
+    FROM archon_tasks t, q
+    WHERE (archon_task_search_vector(t.title, t.feature, t.description) @@ q.query
+           OR archon_task_search_text(t.title, t.feature, t.description) LIKE q.pattern)
+      AND (filter_project_id IS NULL OR t.project_id = filter_project_id)
+      AND (filter_status IS NULL OR t.status::text = filter_status)
+      AND (filter_status IS NOT NULL OR include_closed OR t.status <> 'done')
+      AND (filter_assignee IS NULL OR t.assignee = filter_assignee)
+      AND (include_archived OR t.archived IS NOT TRUE)
+    ORDER BY ts_rank_cd(archon_task_search_vector(t.title, t.feature, t.description), q.query) DESC,
+             similarity(t.title, search_query) DESC,
+             t.task_order, t.created_at, t.id;
+$$;
+
+-- Record this migration as applied
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '016_add_task_search')
+ON CONFLICT (version, migration_name) DO NOTHING;
@@ -0,0 +1,87 @@
+-- Migration: 017_add_bulk_task_writes.sql
+-- Description: Function creating and updating many tasks of a project in one transaction
+-- Version: 0.1.0
+-- Author: Archon Team
+-- Date: 2025
+
+-- Create and update many tasks of a project in one transaction. Created tasks without a
+-- task_order are appended to their status column order_gap apart, so siblings are never
+-- renumbered; updates to tasks of other projects or archived tasks are skipped.
+CREATE OR REPLACE FUNCTION bulk_write_archon_tasks(
+    target_project_id UUID,
+    creates JSONB DEFAULT '[]'::jsonb,
+    updates JSONB DEFAULT '[]'::jsonb,
+    order_gap INT DEFAULT 1000
+)
+RETURNS SETOF archon_tasks
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RETURN QUERY
+    WITH changed AS (
+        UPDATE archon_tasks t SET
+            title = COALESCE(u.title, t.title),
+            description = COALESCE(u.description, t.description),
+            status = COALESCE(u.status::task_status, t.status),
+            assignee = COALESCE(u.assignee, t.assignee),
+            priority = COALESCE(u.priority::task_priority, t.priority),
+            feature = COALESCE(u.feature, t.feature),
+            task_order = COALESCE(u.task_order, t.task_order),
+            updated_at = NOW()
+        FROM jsonb_to_recordset(updates) AS u(
+            id UUID, title TEXT, description TEXT, status TEXT, assignee TEXT,
+            priority TEXT, feature TEXT, task_order INT
+        )
+        WHERE t.id = u.id AND t.project_id = target_project_id AND t.archived IS NOT TRUE
+        RETURNING t.*
+    )
+    SELECT * FROM changed;
+
+    RETURN QUERY
+    WITH input AS (
+        SELECT c.*, COALESCE(c.status, 'todo') AS column_status, e.seq,
+               max(c.task_order) OVER (PARTITION BY COALESCE(c.status, 'todo')) AS explicit_top
+        FROM jsonb_array_elements(creates) WITH ORDINALITY AS e(doc, seq),
+             jsonb_to_record(e.doc) AS c(
+                 title TEXT, description TEXT, status TEXT, assignee TEXT, priority TEXT,
+                 feature TEXT, task_order INT, sources JSONB, code_examples JSONB
+             )
+    ), tops AS (
+        SELECT t.status::text AS column_status, max(t.task_order) AS top
+        FROM archon_tasks t
+        WHERE t.project_id = target_project_id AND t.archived IS NOT TRUE
+        GROUP BY t.status
+    ), created AS (
+        INSERT INTO archon_tasks (
+            project_id, title, description, status, assignee, priority, feature,
+            task_order, sources, code_examples
+        )
+        SELECT
+            target_project_id,
+            i.title,
+            COALESCE(i.description, ''),
+            i.column_status::task_status,
+            COALESCE(i.assignee, 'User'),
+            COALESCE(i.priority, 'medium')::task_priority,
+            i.feature,
+            COALESCE(
+                i.task_order,
+                -- Appended rows go above the explicit orders in this request too
+                GREATEST(tops.top, i.explicit_top, 0)
+                    + order_gap * row_number() OVER (PARTITION BY i.column_status, i.task_order IS NULL ORDER BY i.seq)
+            ),
+            COALESCE(i.sources, '[]'::jsonb),
+            COALESCE(i.code_examples, '[]'::jsonb)
+        FROM input i
+        LEFT JOIN tops ON tops.column_status = i.column_status
+        ORDER BY i.seq
+        RETURNING *
+    )
+    SELECT * FROM created;
+END;
+$$;
+
+-- Record this migration as applied
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '017_add_bulk_task_writes')
+ON CONFLICT (version, migration_name) DO NOTHING;
@@ -0,0 +1,38 @@
+-- Migration: 018_add_project_list_projections.sql
+-- Description: Count columns for project JSONB fields, for lightweight project lists
+-- Version: 0.1.0
+-- Author: Archon Team
+-- Date: 2025
+
+-- Sizes of the large JSONB project fields, selectable as computed columns
+-- (select=docs_count,features_count,has_data) so project lists can show them
+-- without transferring the documents
+CREATE OR REPLACE FUNCTION docs_count(project archon_projects)
+RETURNS INTEGER
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT CASE WHEN jsonb_typeof(project.docs) = 'array' THEN jsonb_array_length(project.docs) ELSE 0 END;
+$$;
+
+CREATE OR REPLACE FUNCTION features_count(project archon_projects)
+RETURNS INTEGER
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT CASE WHEN jsonb_typeof(project.features) = 'array' THEN jsonb_array_length(project.features) ELSE 0 END;
+$$;
+
+CREATE OR REPLACE FUNCTION has_data(project archon_projects)
+RETURNS BOOLEAN
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT project.data IS NOT NULL
+        AND project.data NOT IN ('[]'::jsonb, '{}'::jsonb, 'null'::jsonb, '""'::jsonb, 'false'::jsonb, '0'::jsonb);
+$$;
+
+-- Record this migration as applied
+INSERT INTO archon_migrations (version, migration_name)
+VALUES ('0.1.0', '018_add_project_list_projections')
+ON CONFLICT (version, migration_name) DO NOTHING;
@@ -134,12 +134,19 @@ BEGIN
     DROP FUNCTION IF EXISTS update_updated_at_column() CASCADE;
     
     -- Search functions (new with archon_ prefix)
-    DROP FUNCTION IF EXISTS match_archon_crawled_pages(vector, int, jsonb, text) CASCADE;
-    DROP FUNCTION IF EXISTS match_archon_code_examples(vector, int, jsonb, text) CASCADE;
+    DROP FUNCTION IF EXISTS match_archon_crawled_pages(vector, int, jsonb, text, int, int) CASCADE;
+    DROP FUNCTION IF EXISTS match_archon_code_examples(vector, int, jsonb, text, int, int) CASCADE;
     
     -- Hybrid search functions (with ts_vector support)
-    DROP FUNCTION IF EXISTS hybrid_search_archon_crawled_pages(vector, text, int, jsonb, text) CASCADE;
-    DROP FUNCTION IF EXISTS hybrid_search_archon_code_examples(vector, text, int, jsonb, text) CASCADE;
+    DROP FUNCTION IF EXISTS hybrid_search_archon_crawled_pages(vector, text, int, jsonb, text, int, int) CASCADE;
+    DROP FUNCTION IF EXISTS hybrid_search_archon_code_examples(vector, text, int, jsonb, text, int, int) CASCADE;
+    DROP FUNCTION IF EXISTS search_archon_crawled_pages_text(text, int, jsonb, text) CASCADE;
+    DROP FUNCTION IF EXISTS set_vector_search_params(int, int) CASCADE;
+    DROP FUNCTION IF EXISTS match_archon_crawled_pages_slim(vector, int, jsonb, text, int, int, int, text[]) CASCADE;
+    DROP FUNCTION IF EXISTS hybrid_search_archon_crawled_pages_slim(vector, text, int, jsonb, text, int, int, int, text[]) CASCADE;
+    DROP FUNCTION IF EXISTS search_archon_crawled_pages_text_slim(text, int, jsonb, text, int, text[]) CASCADE;
+    DROP FUNCTION IF EXISTS get_archon_crawled_pages_by_ids(bigint[]) CASCADE;
+    DROP FUNCTION IF EXISTS archon_select_metadata(jsonb, text[]) CASCADE;
     
     -- Search functions (old without prefix)
     DROP FUNCTION IF EXISTS match_crawled_pages(vector, int, jsonb, text) CASCADE;
@@ -147,6 +154,18 @@ BEGIN
     
     -- Task management functions
     DROP FUNCTION IF EXISTS archive_task(UUID, TEXT) CASCADE;
+    DROP FUNCTION IF EXISTS sources_count(archon_tasks) CASCADE;
+    DROP FUNCTION IF EXISTS code_examples_count(archon_tasks) CASCADE;
+    DROP FUNCTION IF EXISTS get_task_counts_by_project() CASCADE;
+    DROP FUNCTION IF EXISTS get_project_task_stats(UUID) CASCADE;
+    DROP FUNCTION IF EXISTS get_knowledge_stats() CASCADE;
+    DROP FUNCTION IF EXISTS search_archon_tasks(TEXT, UUID, TEXT, TEXT, BOOLEAN, BOOLEAN) CASCADE;
+    DROP FUNCTION IF EXISTS archon_task_search_vector(TEXT, TEXT, TEXT) CASCADE;
+    DROP FUNCTION IF EXISTS archon_task_search_text(TEXT, TEXT, TEXT) CASCADE;
+    DROP FUNCTION IF EXISTS bulk_write_archon_tasks(UUID, JSONB, JSONB, INT) CASCADE;
+    DROP FUNCTION IF EXISTS docs_count(archon_projects) CASCADE;
+    DROP FUNCTION IF EXISTS features_count(archon_projects) CASCADE;
+    DROP FUNCTION IF EXISTS has_data(archon_projects) CASCADE;
     
     RAISE NOTICE 'Functions dropped successfully.';
     
@@ -172,6 +191,7 @@ BEGIN
     DROP TABLE IF EXISTS archon_prompts CASCADE;
     
     -- Knowledge Base System - new archon_ prefixed tables
+    DROP TABLE IF EXISTS archon_page_fingerprints CASCADE;
     DROP TABLE IF EXISTS archon_code_examples CASCADE;
     DROP TABLE IF EXISTS archon_crawled_pages CASCADE;
     DROP TABLE IF EXISTS archon_sources CASCADE;
@@ -182,6 +202,10 @@ BEGIN
     -- Migration tracking table
     DROP TABLE IF EXISTS archon_migrations CASCADE;
 
+    -- Shared progress state
+    DROP TABLE IF EXISTS archon_progress CASCADE;
+    DROP SEQUENCE IF EXISTS archon_progress_version_seq;
+
     -- Legacy tables (without archon_ prefix) - for migration purposes
     DROP TABLE IF EXISTS document_versions CASCADE;
     DROP TABLE IF EXISTS project_sources CASCADE;
@@ -137,7 +137,11 @@ INSERT INTO archon_settings (key, value, is_encrypted, category, description) VA
 ('CRAWL_MAX_CONCURRENT', '10', false, 'rag_strategy', 'Maximum concurrent browser sessions for crawling (1-20)'),
 ('CRAWL_WAIT_STRATEGY', 'domcontentloaded', false, 'rag_strategy', 'When to consider page loaded: domcontentloaded, networkidle, or load'),
 ('CRAWL_PAGE_TIMEOUT', '30000', false, 'rag_strategy', 'Maximum time to wait for page load in milliseconds'),
-('CRAWL_DELAY_BEFORE_HTML', '0.5', false, 'rag_strategy', 'Time to wait for JavaScript rendering in seconds (0.1-5.0)')
+('CRAWL_DELAY_BEFORE_HTML', '0.5', false, 'rag_strategy', 'Time to wait for JavaScript rendering in seconds (0.1-5.0)'),
+('CRAWL_STREAMING_PIPELINE', 'true', false, 'rag_strategy', 'Chunk, embed and store pages while the crawl is running instead of after it finishes'),
+('CRAWL_PIPELINE_QUEUE_SIZE', '20', false, 'rag_strategy', 'Crawled pages buffered before the crawler waits for storage to catch up (5-100)'),
+('CRAWL_PIPELINE_FLUSH_CHUNKS', '100', false, 'rag_strategy', 'Chunks accumulated before they are embedded and stored (25-500)'),
+('CRAWL_PIPELINE_FLUSH_SECONDS', '2.0', false, 'rag_strategy', 'Maximum seconds a chunk waits before being stored (0.5-10.0)')
 ON CONFLICT (key) DO NOTHING;
 
 -- Document Storage Performance Settings (from add_performance_settings.sql and optimize_batch_sizes.sql)
@@ -156,7 +160,17 @@ INSERT INTO archon_settings (key, value, is_encrypted, category, description) VA
 ('DISPATCHER_CHECK_INTERVAL', '0.5', false, 'rag_strategy', 'How often to check memory usage in seconds (0.1-2.0)'),
 ('CODE_EXTRACTION_BATCH_SIZE', '40', false, 'rag_strategy', 'Number of code blocks to extract per batch (20-100) - increased for better performance'),
 ('CODE_SUMMARY_MAX_WORKERS', '3', false, 'rag_strategy', 'Maximum parallel workers for code summarization (1-10)'),
-('CONTEXTUAL_EMBEDDING_BATCH_SIZE', '50', false, 'rag_strategy', 'Number of chunks to process in contextual embedding batch API calls (20-100)')
+('CODE_SUMMARY_BLOCKS_PER_REQUEST', '1', false, 'rag_strategy', 'Number of code blocks packed into one summarization prompt (1-8)'),
+('CONTEXTUAL_EMBEDDING_BATCH_SIZE', '50', false, 'rag_strategy', 'Number of chunks to process in contextual embedding batch API calls (20-100)'),
+('EMBEDDING_CACHE_ENABLED', 'true', false, 'rag_strategy', 'Reuse cached embeddings for unchanged chunk text (keyed by model, dimensions and content hash)'),
+('CPU_PROCESS_POOL_SIZE', '4', false, 'rag_strategy', 'Worker processes for chunking and code extraction, capped by CPU cores in practice (0 = run in threads)'),
+('RERANKING_BACKEND', 'torch', false, 'rag_strategy', 'Reranker backend: torch (full-precision CrossEncoder) or onnx (int8-quantized ONNX Runtime model, faster on CPU-only hosts)'),
+('RERANKING_MAX_LENGTH', '512', false, 'rag_strategy', 'Maximum tokens per query-document pair for the reranker; documents are truncated, never the query'),
+('HYBRID_SEARCH_MODE', 'union', false, 'rag_strategy', 'Hybrid search fusion: union (single SQL function, results ordered by raw score) or rrf (vector and full-text searches run concurrently and fused with weighted reciprocal rank fusion)'),
+('HYBRID_RRF_K', '60', false, 'rag_strategy', 'RRF rank constant k; larger values flatten the difference between top and lower ranks'),
+('HYBRID_VECTOR_WEIGHT', '1.0', false, 'rag_strategy', 'Weight of the vector search ranking in RRF fusion'),
+('HYBRID_TEXT_WEIGHT', '1.0', false, 'rag_strategy', 'Weight of the full-text search ranking in RRF fusion'),
+('VECTOR_SEARCH_RECALL', 'balanced', false, 'rag_strategy', 'Vector index search effort per query: fast, balanced or accurate (sets hnsw.ef_search / ivfflat.probes); empty keeps the database defaults')
 ON CONFLICT (key) DO UPDATE SET
     value = EXCLUDED.value,
     description = EXCLUDED.description;
@@ -293,6 +307,27 @@ CREATE INDEX idx_archon_code_examples_embedding_model ON archon_code_examples (e
 CREATE INDEX idx_archon_code_examples_embedding_dimension ON archon_code_examples (embedding_dimension);
 CREATE INDEX idx_archon_code_examples_llm_chat_model ON archon_code_examples (llm_chat_model);
 
+-- Create the page fingerprints table for incremental refreshes
+CREATE TABLE IF NOT EXISTS archon_page_fingerprints (
+    source_id TEXT NOT NULL REFERENCES archon_sources(source_id) ON DELETE CASCADE,
+    url VARCHAR NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT NOT NULL,
+    chunk_hashes JSONB NOT NULL DEFAULT '[]'::jsonb,
+    internal_links JSONB NOT NULL DEFAULT '[]'::jsonb,
+    word_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT timezone('utc'::text, now()) NOT NULL,
+    PRIMARY KEY (source_id, url)
+);
+
+COMMENT ON TABLE archon_page_fingerprints IS 'Per-page validators and content hashes used by incremental knowledge refreshes';
+COMMENT ON COLUMN archon_page_fingerprints.etag IS 'ETag response header from the last crawl, sent as If-None-Match';
+COMMENT ON COLUMN archon_page_fingerprints.last_modified IS 'Last-Modified response header from the last crawl, sent as If-Modified-Since';
+COMMENT ON COLUMN archon_page_fingerprints.content_hash IS 'SHA-256 of the page markdown';
+COMMENT ON COLUMN archon_page_fingerprints.chunk_hashes IS 'SHA-256 of each stored chunk, indexed by chunk_number';
+COMMENT ON COLUMN archon_page_fingerprints.internal_links IS 'Internal links found on the page, followed when the page is not re-crawled';
+
 -- =====================================================
 -- SECTION 4.5: MULTI-DIMENSIONAL EMBEDDING HELPER FUNCTIONS
 -- =====================================================
@@ -324,6 +359,22 @@ $$ LANGUAGE plpgsql IMMUTABLE;
 -- SECTION 5: SEARCH FUNCTIONS
 -- =====================================================
 
+-- Per-query ANN search tuning: applies hnsw.ef_search / ivfflat.probes for the rest of
+-- the calling transaction (NULL keeps the server default)
+CREATE OR REPLACE FUNCTION set_vector_search_params(ef_search INT DEFAULT NULL, probes INT DEFAULT NULL)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  IF ef_search IS NOT NULL THEN
+    PERFORM set_config('hnsw.ef_search', ef_search::text, true);
+  END IF;
+  IF probes IS NOT NULL THEN
+    PERFORM set_config('ivfflat.probes', probes::text, true);
+  END IF;
+END;
+$$;
+
 -- Create multi-dimensional function to search for documentation chunks
 CREATE OR REPLACE FUNCTION match_archon_crawled_pages_multi (
   query_embedding VECTOR,
@@ -379,7 +430,9 @@ CREATE OR REPLACE FUNCTION match_archon_crawled_pages (
   query_embedding VECTOR(1536),
   match_count INT DEFAULT 10,
   filter JSONB DEFAULT '{}'::jsonb,
-  source_filter TEXT DEFAULT NULL
+  source_filter TEXT DEFAULT NULL,
+  ef_search INT DEFAULT NULL,
+  probes INT DEFAULT NULL
 ) RETURNS TABLE (
   id BIGINT,
   url VARCHAR,
@@ -392,6 +445,7 @@ CREATE OR REPLACE FUNCTION match_archon_crawled_pages (
 LANGUAGE plpgsql
 AS $$
 BEGIN
+  PERFORM set_vector_search_params(ef_search, probes);
   RETURN QUERY SELECT * FROM match_archon_crawled_pages_multi(query_embedding, 1536, match_count, filter, source_filter);
 END;
 $$;
@@ -452,7 +506,9 @@ CREATE OR REPLACE FUNCTION match_archon_code_examples (
   query_embedding VECTOR(1536),
   match_count INT DEFAULT 10,
   filter JSONB DEFAULT '{}'::jsonb,
-  source_filter TEXT DEFAULT NULL
+  source_filter TEXT DEFAULT NULL,
+  ef_search INT DEFAULT NULL,
+  probes INT DEFAULT NULL
 ) RETURNS TABLE (
   id BIGINT,
   url VARCHAR,
@@ -466,6 +522,7 @@ CREATE OR REPLACE FUNCTION match_archon_code_examples (
 LANGUAGE plpgsql
 AS $$
 BEGIN
+  PERFORM set_vector_search_params(ef_search, probes);
   RETURN QUERY SELECT * FROM match_archon_code_examples_multi(query_embedding, 1536, match_count, filter, source_filter);
 END;
 $$;
@@ -588,7 +645,9 @@ CREATE OR REPLACE FUNCTION hybrid_search_archon_crawled_pages(
     query_text TEXT,
     match_count INT DEFAULT 10,
     filter JSONB DEFAULT '{}'::jsonb,
-    source_filter TEXT DEFAULT NULL
+    source_filter TEXT DEFAULT NULL,
+  ef_search INT DEFAULT NULL,
+  probes INT DEFAULT NULL
 )
 RETURNS TABLE (
     id BIGINT,
@@ -603,10 +662,49 @@ RETURNS TABLE (
 LANGUAGE plpgsql
 AS $$
 BEGIN
+    PERFORM set_vector_search_params(ef_search, probes);
     RETURN QUERY SELECT * FROM hybrid_search_archon_crawled_pages_multi(query_embedding, 1536, query_text, match_count, filter, source_filter);
 END;
 $$;
 
+-- Ranked full-text search on archon_crawled_pages (keyword leg of HYBRID_SEARCH_MODE=rrf)
+CREATE OR REPLACE FUNCTION search_archon_crawled_pages_text(
+    query_text TEXT,
+    match_count INT DEFAULT 10,
+    filter JSONB DEFAULT '{}'::jsonb,
+    source_filter TEXT DEFAULT NULL
+)
+RETURNS TABLE (
+    id BIGINT,
+    url VARCHAR,
+    chunk_number INTEGER,
+    content TEXT,
+    metadata JSONB,
+    source_id TEXT,
+    text_score FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+BEGIN
+    RETURN QUERY
+    SELECT
+        cp.id,
+        cp.url,
+        cp.chunk_number,
+        cp.content,
+        cp.metadata,
+        cp.source_id,
+        ts_rank_cd(cp.content_search_vector, q.query)::float8 AS text_score
+    FROM archon_crawled_pages cp, plainto_tsquery('english', query_text) AS q(query)
+    WHERE cp.content_search_vector @@ q.query
+        AND cp.metadata @> filter
+        AND (source_filter IS NULL OR cp.source_id = source_filter)
+    ORDER BY text_score DESC
+    LIMIT match_count;
+END;
+$$;
+
 -- Multi-dimensional hybrid search function for archon_code_examples
 CREATE OR REPLACE FUNCTION hybrid_search_archon_code_examples_multi(
     query_embedding VECTOR,
@@ -725,7 +823,9 @@ CREATE OR REPLACE FUNCTION hybrid_search_archon_code_examples(
     query_text TEXT,
     match_count INT DEFAULT 10,
     filter JSONB DEFAULT '{}'::jsonb,
-    source_filter TEXT DEFAULT NULL
+    source_filter TEXT DEFAULT NULL,
+  ef_search INT DEFAULT NULL,
+  probes INT DEFAULT NULL
 )
 RETURNS TABLE (
     id BIGINT,
@@ -741,6 +841,7 @@ RETURNS TABLE (
 LANGUAGE plpgsql
 AS $$
 BEGIN
+    PERFORM set_vector_search_params(ef_search, probes);
     RETURN QUERY SELECT * FROM hybrid_search_archon_code_examples_multi(query_embedding, 1536, query_text, match_count, filter, source_filter);
 END;
 $$;
@@ -750,6 +851,140 @@ COMMENT ON FUNCTION hybrid_search_archon_crawled_pages_multi IS 'Multi-dimension
 COMMENT ON FUNCTION hybrid_search_archon_crawled_pages IS 'Legacy hybrid search function for backward compatibility (uses 1536D embeddings)';
 COMMENT ON FUNCTION hybrid_search_archon_code_examples_multi IS 'Multi-dimensional hybrid search on code examples with configurable embedding dimensions';
 COMMENT ON FUNCTION hybrid_search_archon_code_examples IS 'Legacy hybrid search function for code examples (uses 1536D embeddings)';
+COMMENT ON FUNCTION search_archon_crawled_pages_text IS 'Full-text search on crawled pages ranked by ts_rank_cd; fused with vector search client-side (HYBRID_SEARCH_MODE=rrf)';
+
+-- Keep only the given metadata keys (NULL keeps the whole object)
+CREATE OR REPLACE FUNCTION archon_select_metadata(metadata JSONB, keys TEXT[])
+RETURNS JSONB
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT CASE
+        WHEN keys IS NULL THEN metadata
+        ELSE COALESCE(
+            (SELECT jsonb_object_agg(e.key, e.value) FROM jsonb_each(metadata) AS e WHERE e.key = ANY(keys)),
+            '{}'::jsonb
+        )
+    END;
+$$;
+
+-- Slim variants of the document search functions: same ranking, but each row carries
+-- only the first snippet_length characters of its content (content_length is the full
+-- length) and the requested metadata keys. Full chunks are fetched by id afterwards.
+CREATE OR REPLACE FUNCTION match_archon_crawled_pages_slim(
+    query_embedding VECTOR(1536),
+    match_count INT DEFAULT 10,
+    filter JSONB DEFAULT '{}'::jsonb,
+    source_filter TEXT DEFAULT NULL,
+    ef_search INT DEFAULT NULL,
+    probes INT DEFAULT NULL,
+    snippet_length INT DEFAULT 300,
+    metadata_keys TEXT[] DEFAULT NULL
+)
+RETURNS TABLE (
+    id BIGINT,
+    url VARCHAR,
+    chunk_number INTEGER,
+    content TEXT,
+    content_length INTEGER,
+    metadata JSONB,
+    source_id TEXT,
+    similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT m.id, m.url, m.chunk_number, left(m.content, snippet_length), length(m.content),
+           archon_select_metadata(m.metadata, metadata_keys), m.source_id, m.similarity
+    FROM match_archon_crawled_pages(query_embedding, match_count, filter, source_filter, ef_search, probes) AS m;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION hybrid_search_archon_crawled_pages_slim(
+    query_embedding VECTOR(1536),
+    query_text TEXT,
+    match_count INT DEFAULT 10,
+    filter JSONB DEFAULT '{}'::jsonb,
+    source_filter TEXT DEFAULT NULL,
+    ef_search INT DEFAULT NULL,
+    probes INT DEFAULT NULL,
+    snippet_length INT DEFAULT 300,
+    metadata_keys TEXT[] DEFAULT NULL
+)
+RETURNS TABLE (
+    id BIGINT,
+    url VARCHAR,
+    chunk_number INTEGER,
+    content TEXT,
+    content_length INTEGER,
+    metadata JSONB,
+    source_id TEXT,
+    similarity FLOAT,
+    match_type TEXT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT h.id, h.url, h.chunk_number, left(h.content, snippet_length), length(h.content),
+           archon_select_metadata(h.metadata, metadata_keys), h.source_id, h.similarity, h.match_type
+    FROM hybrid_search_archon_crawled_pages(
+        query_embedding, query_text, match_count, filter, source_filter, ef_search, probes
+    ) AS h;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION search_archon_crawled_pages_text_slim(
+    query_text TEXT,
+    match_count INT DEFAULT 10,
+    filter JSONB DEFAULT '{}'::jsonb,
+    source_filter TEXT DEFAULT NULL,
+    snippet_length INT DEFAULT 300,
+    metadata_keys TEXT[] DEFAULT NULL
+)
+RETURNS TABLE (
+    id BIGINT,
+    url VARCHAR,
+    chunk_number INTEGER,
+    content TEXT,
+    content_length INTEGER,
+    metadata JSONB,
+    source_id TEXT,
+    text_score FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT t.id, t.url, t.chunk_number, left(t.content, snippet_length), length(t.content),
+           archon_select_metadata(t.metadata, metadata_keys), t.source_id, t.text_score
+    FROM search_archon_crawled_pages_text(query_text, match_count, filter, source_filter) AS t;
+END;
+$$;
+
+-- Full chunks for the search results a caller opens
+CREATE OR REPLACE FUNCTION get_archon_crawled_pages_by_ids(chunk_ids BIGINT[])
+RETURNS TABLE (
+    id BIGINT,
+    url VARCHAR,
+    chunk_number INTEGER,
+    content TEXT,
+    metadata JSONB,
+    source_id TEXT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT cp.id, cp.url, cp.chunk_number, cp.content, cp.metadata, cp.source_id
+    FROM archon_crawled_pages cp
+    WHERE cp.id = ANY(chunk_ids);
+$$;
+
+COMMENT ON FUNCTION match_archon_crawled_pages_slim IS 'Vector search on crawled pages returning content snippets and selected metadata keys';
+COMMENT ON FUNCTION hybrid_search_archon_crawled_pages_slim IS 'Hybrid search on crawled pages returning content snippets and selected metadata keys';
+COMMENT ON FUNCTION search_archon_crawled_pages_text_slim IS 'Full-text search on crawled pages returning content snippets and selected metadata keys';
+COMMENT ON FUNCTION get_archon_crawled_pages_by_ids IS 'Full crawled page chunks by id, the follow-up to a slim search';
 
 -- =====================================================
 -- SECTION 6: RLS POLICIES FOR KNOWLEDGE BASE
@@ -759,6 +994,7 @@ COMMENT ON FUNCTION hybrid_search_archon_code_examples IS 'Legacy hybrid search
 ALTER TABLE archon_crawled_pages ENABLE ROW LEVEL SECURITY;
 ALTER TABLE archon_sources ENABLE ROW LEVEL SECURITY;
 ALTER TABLE archon_code_examples ENABLE ROW LEVEL SECURITY;
+ALTER TABLE archon_page_fingerprints ENABLE ROW LEVEL SECURITY;
 
 -- Create policies that allow anyone to read
 CREATE POLICY "Allow public read access to archon_crawled_pages"
@@ -779,6 +1015,11 @@ CREATE POLICY "Allow public read access to archon_code_examples"
   TO public
   USING (true);
 
+CREATE POLICY "Allow service role full access to archon_page_fingerprints"
+  ON archon_page_fingerprints
+  FOR ALL
+  USING (auth.role() = 'service_role');
+
 -- =====================================================
 -- SECTION 7: PROJECTS AND TASKS MODULE
 -- =====================================================
@@ -878,6 +1119,32 @@ CREATE INDEX IF NOT EXISTS idx_archon_tasks_order ON archon_tasks(task_order);
 CREATE INDEX IF NOT EXISTS idx_archon_tasks_priority ON archon_tasks(priority);
 CREATE INDEX IF NOT EXISTS idx_archon_tasks_archived ON archon_tasks(archived);
 CREATE INDEX IF NOT EXISTS idx_archon_tasks_archived_at ON archon_tasks(archived_at);
+CREATE INDEX IF NOT EXISTS idx_archon_tasks_list_order ON archon_tasks(task_order, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_archon_tasks_project_list_order ON archon_tasks(project_id, task_order, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_archon_tasks_active_project_status ON archon_tasks(project_id, status) WHERE archived IS NOT TRUE;
+
+-- Task search document: title ranks above feature, feature above description
+CREATE OR REPLACE FUNCTION archon_task_search_vector(title TEXT, feature TEXT, description TEXT)
+RETURNS tsvector
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english'::regconfig, coalesce(feature, '')), 'B')
+        || setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'C');
+$$;
+
+-- Lowercased task text for substring matches the search document misses (e.g. "auth" in "OAuth")
+CREATE OR REPLACE FUNCTION archon_task_search_text(title TEXT, feature TEXT, description TEXT)
+RETURNS TEXT
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT lower(coalesce(title, '') || ' ' || coalesce(feature, '') || ' ' || coalesce(description, ''));
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_archon_tasks_search_vector ON archon_tasks USING gin (archon_task_search_vector(title, feature, description));
+CREATE INDEX IF NOT EXISTS idx_archon_tasks_search_trgm ON archon_tasks USING gin (archon_task_search_text(title, feature, description) gin_trgm_ops);
 CREATE INDEX IF NOT EXISTS idx_archon_project_sources_project_id ON archon_project_sources(project_id);
 CREATE INDEX IF NOT EXISTS idx_archon_project_sources_source_id ON archon_project_sources(source_id);
 CREATE INDEX IF NOT EXISTS idx_archon_document_versions_project_id ON archon_document_versions(project_id);
@@ -895,6 +1162,238 @@ CREATE OR REPLACE TRIGGER update_archon_tasks_updated_at
     BEFORE UPDATE ON archon_tasks
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+-- Sizes of the large JSONB project fields, selectable as computed columns
+-- (select=docs_count,features_count,has_data) so project lists can show them
+-- without transferring the documents
+CREATE OR REPLACE FUNCTION docs_count(project archon_projects)
+RETURNS INTEGER
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT CASE WHEN jsonb_typeof(project.docs) = 'array' THEN jsonb_array_length(project.docs) ELSE 0 END;
+$$;
+
+CREATE OR REPLACE FUNCTION features_count(project archon_projects)
+RETURNS INTEGER
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT CASE WHEN jsonb_typeof(project.features) = 'array' THEN jsonb_array_length(project.features) ELSE 0 END;
+$$;
+
+CREATE OR REPLACE FUNCTION has_data(project archon_projects)
+RETURNS BOOLEAN
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT project.data IS NOT NULL
+        AND project.data NOT IN ('[]'::jsonb, '{}'::jsonb, 'null'::jsonb, '""'::jsonb, 'false'::jsonb, '0'::jsonb);
+$$;
+
+-- Array lengths of the large JSONB task fields, selectable as computed columns
+-- (select=sources_count,code_examples_count) so task lists can show counts
+-- without transferring the arrays
+CREATE OR REPLACE FUNCTION sources_count(task archon_tasks)
+RETURNS INTEGER
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT COALESCE(jsonb_array_length(task.sources), 0);
+$$;
+
+CREATE OR REPLACE FUNCTION code_examples_count(task archon_tasks)
+RETURNS INTEGER
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT COALESCE(jsonb_array_length(task.code_examples), 0);
+$$;
+
+-- Active (non-archived) task counts per project and status, for the project sidebar
+CREATE OR REPLACE FUNCTION get_task_counts_by_project()
+RETURNS TABLE (
+    project_id UUID,
+    status TEXT,
+    task_count BIGINT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT t.project_id, t.status::text, count(*)
+    FROM archon_tasks t
+    WHERE t.archived IS NOT TRUE AND t.project_id IS NOT NULL
+    GROUP BY t.project_id, t.status;
+$$;
+
+-- Project total and task counts per status for the dashboard, optionally for one project's tasks
+CREATE OR REPLACE FUNCTION get_project_task_stats(project_filter UUID DEFAULT NULL)
+RETURNS TABLE (
+    bucket TEXT,
+    item_count BIGINT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT 'projects', count(*) FROM archon_projects
+    UNION ALL
+    SELECT CASE WHEN t.archived THEN 'archived' ELSE COALESCE(t.status::text, 'todo') END,
+           count(*)
+    FROM archon_tasks t
+    WHERE project_filter IS NULL OR t.project_id = project_filter
+    GROUP BY 1;
+$$;
+
+-- Sources, documents and code examples per knowledge type, for the dashboard
+CREATE OR REPLACE FUNCTION get_knowledge_stats()
+RETURNS TABLE (
+    knowledge_type TEXT,
+    sources BIGINT,
+    documents BIGINT,
+    code_examples BIGINT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    -- Pages and code examples are counted from their own tables, so rows whose
+    -- source row is gone still add to the totals (under the default type)
+    WITH pages AS (
+        SELECT source_id, count(*) AS n FROM archon_crawled_pages GROUP BY source_id
+    ), code AS (
+        SELECT source_id, count(*) AS n FROM archon_code_examples GROUP BY source_id
+    ), ids AS (
+        SELECT source_id FROM archon_sources
+        UNION SELECT source_id FROM pages
+        UNION SELECT source_id FROM code
+    )
+    SELECT COALESCE(s.metadata->>'knowledge_type', 'technical'),
+           count(s.source_id),
+           COALESCE(sum(pages.n), 0)::bigint,
+           COALESCE(sum(code.n), 0)::bigint
+    FROM ids
+    LEFT JOIN archon_sources s ON s.source_id = ids.source_id
+    LEFT JOIN pages ON pages.source_id = ids.source_id
+    LEFT JOIN code ON code.source_id = ids.source_id
+    GROUP BY 1;
+$$;
+
+-- Ranked task search: every term must match, as a word prefix or, in order, as a substring
+CREATE OR REPLACE FUNCTION search_archon_tasks(
+    search_query TEXT,
+    filter_project_id UUID DEFAULT NULL,
+    filter_status TEXT DEFAULT NULL,
+    filter_assignee TEXT DEFAULT NULL,
+    include_closed BOOLEAN DEFAULT TRUE,
+    include_archived BOOLEAN DEFAULT FALSE
+)
+RETURNS SETOF archon_tasks
+LANGUAGE sql
+STABLE
+AS $$
+    WITH terms AS (
+        SELECT array_agg(term) AS words
+        FROM regexp_split_to_table(lower(search_query), '[^[:alnum:]]+') AS term
+        WHERE term <> ''
+    ), q AS (
+        SELECT
+            to_tsquery(
+                'english',
+                array_to_string(ARRAY(SELECT quote_literal(word) || ':*' FROM unnest(words) AS word), ' & ')
+            ) AS query,
+            '%' || array_to_string(words, '%') || '%' AS pattern
+        FROM terms
+        WHERE words IS NOT NULL
+    )
+    SELECT t.*
+    FROM archon_tasks t, q
+    WHERE (archon_task_search_vector(t.title, t.feature, t.description) @@ q.query
+           OR archon_task_search_text(t.title, t.feature, t.description) LIKE q.pattern)
+      AND (filter_project_id IS NULL OR t.project_id = filter_project_id)
+      AND (filter_status IS NULL OR t.status::text = filter_status)
+      AND (filter_status IS NOT NULL OR include_closed OR t.status <> 'done')
+      AND (filter_assignee IS NULL OR t.assignee = filter_assignee)
+      AND (include_archived OR t.archived IS NOT TRUE)
+    ORDER BY ts_rank_cd(archon_task_search_vector(t.title, t.feature, t.description), q.query) DESC,
+             similarity(t.title, search_query) DESC,
+             t.task_order, t.created_at, t.id;
+$$;
+
+-- Create and update many tasks of a project in one transaction. Created tasks without a
+-- task_order are appended to their status column order_gap apart, so siblings are never
+-- renumbered; updates to tasks of other projects or archived tasks are skipped.
+CREATE OR REPLACE FUNCTION bulk_write_archon_tasks(
+    target_project_id UUID,
+    creates JSONB DEFAULT '[]'::jsonb,
+    updates JSONB DEFAULT '[]'::jsonb,
+    order_gap INT DEFAULT 1000
+)
+RETURNS SETOF archon_tasks
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RETURN QUERY
+    WITH changed AS (
+        UPDATE archon_tasks t SET
+            title = COALESCE(u.title, t.title),
+            description = COALESCE(u.description, t.description),
+            status = COALESCE(u.status::task_status, t.status),
+            assignee = COALESCE(u.assignee, t.assignee),
+            priority = COALESCE(u.priority::task_priority, t.priority),
+            feature = COALESCE(u.feature, t.feature),
+            task_order = COALESCE(u.task_order, t.task_order),
+            updated_at = NOW()
+        FROM jsonb_to_recordset(updates) AS u(
+            id UUID, title TEXT, description TEXT, status TEXT, assignee TEXT,
+            priority TEXT, feature TEXT, task_order INT
+        )
+        WHERE t.id = u.id AND t.project_id = target_project_id AND t.archived IS NOT TRUE
+        RETURNING t.*
+    )
+    SELECT * FROM changed;
+
+    RETURN QUERY
+    WITH input AS (
+        SELECT c.*, COALESCE(c.status, 'todo') AS column_status, e.seq,
+               max(c.task_order) OVER (PARTITION BY COALESCE(c.status, 'todo')) AS explicit_top
+        FROM jsonb_array_elements(creates) WITH ORDINALITY AS e(doc, seq),
+             jsonb_to_record(e.doc) AS c(
+                 title TEXT, description TEXT, status TEXT, assignee TEXT, priority TEXT,
+                 feature TEXT, task_order INT, sources JSONB, code_examples JSONB
+             )
+    ), tops AS (
+        SELECT t.status::text AS column_status, max(t.task_order) AS top
+        FROM archon_tasks t
+        WHERE t.project_id = target_project_id AND t.archived IS NOT TRUE
+        GROUP BY t.status
+    ), created AS (
+        INSERT INTO archon_tasks (
+            project_id, title, description, status, assignee, priority, feature,
+            task_order, sources, code_examples
+        )
+        SELECT
+            target_project_id,
+            i.title,
+            COALESCE(i.description, ''),
+            i.column_status::task_status,
+            COALESCE(i.assignee, 'User'),
+            COALESCE(i.priority, 'medium')::task_priority,
+            i.feature,
+            COALESCE(
+                i.task_order,
+                -- Appended rows go above the explicit orders in this request too
+                GREATEST(tops.top, i.explicit_top, 0)
+                    + order_gap * row_number() OVER (PARTITION BY i.column_status, i.task_order IS NULL ORDER BY i.seq)
+            ),
+            COALESCE(i.sources, '[]'::jsonb),
+            COALESCE(i.code_examples, '[]'::jsonb)
+        FROM input i
+        LEFT JOIN tops ON tops.column_status = i.column_status
+        ORDER BY i.seq
+        RETURNING *
+    )
+    SELECT * FROM created;
+END;
+$$;
+
 -- Soft delete function for tasks
 CREATE OR REPLACE FUNCTION archive_task(
     task_id_param UUID,
@@ -987,7 +1486,17 @@ VALUES
   ('0.1.0', '005_ollama_create_functions'),
   ('0.1.0', '006_ollama_create_indexes_optional'),
   ('0.1.0', '007_add_priority_column_to_tasks'),
-  ('0.1.0', '008_add_migration_tracking')
+  ('0.1.0', '008_add_migration_tracking'),
+  ('0.1.0', '009_add_page_fingerprints'),
+  ('0.1.0', '010_add_progress_store'),
+  ('0.1.0', '011_add_text_search_function'),
+  ('0.1.0', '012_add_vector_search_params'),
+  ('0.1.0', '013_add_slim_search_functions'),
+  ('0.1.0', '014_add_task_list_projections'),
+  ('0.1.0', '015_add_stats_aggregate_functions'),
+  ('0.1.0', '016_add_task_search'),
+  ('0.1.0', '017_add_bulk_task_writes'),
+  ('0.1.0', '018_add_project_list_projections')
 ON CONFLICT (version, migration_name) DO NOTHING;
 
 -- Enable Row Level Security on migrations table
@@ -1007,6 +1516,30 @@ CREATE POLICY "Allow authenticated users to read archon_migrations" ON archon_mi
     FOR SELECT TO authenticated
     USING (true);
 
+-- Shared progress state for multi-worker deployments (PROGRESS_BACKEND=postgres)
+CREATE SEQUENCE IF NOT EXISTS archon_progress_version_seq;
+
+CREATE TABLE IF NOT EXISTS archon_progress (
+    progress_id TEXT PRIMARY KEY,
+    state JSONB,
+    version BIGINT NOT NULL DEFAULT nextval('archon_progress_version_seq'),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_archon_progress_version ON archon_progress (version);
+CREATE INDEX IF NOT EXISTS idx_archon_progress_updated_at ON archon_progress (updated_at);
+
+COMMENT ON TABLE archon_progress IS 'Progress of running operations, shared by backend workers (PROGRESS_BACKEND=postgres)';
+COMMENT ON COLUMN archon_progress.state IS 'Latest progress state; NULL once the operation was cleaned up';
+COMMENT ON COLUMN archon_progress.version IS 'Increases on every write; workers sync the rows past the last version they saw';
+
+ALTER TABLE archon_progress ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Allow service role full access to archon_progress"
+  ON archon_progress
+  FOR ALL
+  USING (auth.role() = 'service_role');
+
 -- =====================================================
 -- SECTION 8: PROMPTS TABLE
 -- =====================================================
@@ -119,6 +119,29 @@ class MCPClient:
         )
         return json.dumps(result) if isinstance(result, dict) else str(result)
 
+    async def perform_rag_query_batch(
+        self, queries: list[str], source: str = None, match_count: int = 5
+    ) -> str:
+        """Perform several RAG queries in one batch through MCP."""
+        result = await self.call_tool(
+            "rag_search_knowledge_base_batch", queries=queries, source_id=source, match_count=match_count
+        )
+        return json.dumps(result) if isinstance(result, dict) else str(result)
+
+    async def search_documents_and_code(
+        self, query: str, source_id: str = None, match_count: int = 5
+    ) -> str:
+        """Search documents and code examples with one embedding through MCP."""
+        result = await self.call_tool(
+            "rag_search_knowledge_and_code", query=query, source_id=source_id, match_count=match_count
+        )
+        return json.dumps(result) if isinstance(result, dict) else str(result)
+
+    async def get_chunks(self, ids: list[int]) -> str:
+        """Get the full content of knowledge base chunks by id through MCP."""
+        result = await self.call_tool("rag_get_chunks", ids=ids)
+        return json.dumps(result) if isinstance(result, dict) else str(result)
+
     async def manage_project(self, action: str, **kwargs) -> str:
         """Manage projects through MCP."""
         result = await self.call_tool("manage_project", action=action, **kwargs)
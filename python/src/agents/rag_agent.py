@@ -47,6 +47,62 @@ class RagQueryResult(BaseModel):
     message: str = Field(description="Status message or error description")
 
 
+def _format_documents(results: list[dict[str, Any]]) -> str:
+    """Format document search results for the agent."""
+    if not results:
+        return "No results found for your query. Try using different search terms or removing filters."
+
+    formatted_results = []
+    for i, res in enumerate(results, 1):
+        similarity = res.get("similarity_score", res.get("similarity", 0))
+        metadata = res.get("metadata", {})
+        source = metadata.get("source", "Unknown")
+        url = metadata.get("url", res.get("url", ""))
+        content = res.get("content", "")
+
+        # Truncate content if too long
+        if len(content) > 500:
+            content = content[:500] + "..."
+
+        formatted_results.append(
+            f"**Result {i}** (Relevance: {similarity:.2%})\n"
+            f"Source: {source}\n"
+            f"URL: {url}\n"
+            f"Content: {content}\n"
+        )
+
+    return f"Found {len(results)} relevant results:\n\n" + "\n---\n".join(formatted_results)
+
+
+def _format_code_examples(examples: list[dict[str, Any]]) -> str:
+    """Format code example search results for the agent."""
+    if not examples:
+        return "No code examples found for your query."
+
+    formatted_examples = []
+    for i, example in enumerate(examples, 1):
+        similarity = example.get("similarity", 0)
+        summary = example.get("summary", "No summary")
+        code = example.get("code", example.get("code_block", ""))
+        url = example.get("url", "")
+
+        # Extract language from code block if available
+        lang = "code"
+        if code.startswith("```"):
+            first_line = code.split("\n")[0]
+            if len(first_line) > 3:
+                lang = first_line[3:].strip()
+
+        formatted_examples.append(
+            f"**Example {i}** (Relevance: {similarity:.2%})\n"
+            f"Summary: {summary}\n"
+            f"Source: {url}\n"
+            f"```{lang}\n{code}\n```"
+        )
+
+    return f"Found {len(examples)} code examples:\n\n" + "\n---\n".join(formatted_examples)
+
+
 class RagAgent(BaseAgent[RagDependencies, str]):
     """
     Conversational agent for RAG-based document search and retrieval.
@@ -95,13 +151,15 @@ class RagAgent(BaseAgent[RagDependencies, str]):
 - "What resources/sources are available?" → Use list_available_sources tool
 - "Search for X" → Use search_documents tool
 - "Find code examples for Y" → Use search_code_examples tool
+- Questions that need both explanations and code → Use search_documents_and_code tool
+- Several searches for one question → Use search_documents_batch tool with all the queries
 - "What documentation do you have?" → Use list_available_sources tool
 
 **Search Strategies:**
 - For conceptual questions: Use broader search terms
 - For specific features: Use exact terminology
 - For code examples: Search for function names, patterns
-- For comparisons: Search for each item separately
+- For comparisons: Search for each item, in one search_documents_batch call
 
 **Response Guidelines:**
 - Provide direct answers based on retrieved content
@@ -153,36 +211,47 @@ class RagAgent(BaseAgent[RagDependencies, str]):
                 if not result.get("success", False):
                     return f"Search failed: {result.get('error', 'Unknown error')}"
 
-                results = result.get("results", [])
-                if not results:
-                    return "No results found for your query. Try using different search terms or removing filters."
-
-                # Format results for display
-                formatted_results = []
-                for i, res in enumerate(results, 1):
-                    similarity = res.get("similarity_score", res.get("similarity", 0))
-                    metadata = res.get("metadata", {})
-                    source = metadata.get("source", "Unknown")
-                    url = metadata.get("url", res.get("url", ""))
-                    content = res.get("content", "")
-
-                    # Truncate content if too long
-                    if len(content) > 500:
-                        content = content[:500] + "..."
-
-                    formatted_results.append(
-                        f"**Result {i}** (Relevance: {similarity:.2%})\n"
-                        f"Source: {source}\n"
-                        f"URL: {url}\n"
-                        f"Content: {content}\n"
-                    )
+                return _format_documents(result.get("results", []))
+
+            except Exception as e:
+                logger.error(f"Error searching documents: {e}")
+                return f"Error performing search: {str(e)}"
+
+        @agent.tool
+        async def search_documents_batch(
+            ctx: RunContext[RagDependencies], queries: list[str], source_filter: str | None = None
+        ) -> str:
+            """Run several document searches at once (e.g. the sub-questions of one question)."""
+            try:
+                # Use source filter from context if not provided
+                if source_filter is None:
+                    source_filter = ctx.deps.source_filter
 
-                return f"Found {len(results)} relevant results:\n\n" + "\n---\n".join(
-                    formatted_results
+                # One MCP call for all queries: embedded and reranked together
+                mcp_client = await get_mcp_client()
+                result_json = await mcp_client.perform_rag_query_batch(
+                    queries=queries, source=source_filter, match_count=ctx.deps.match_count
                 )
 
+                # Parse the JSON response
+                import json
+
+                result = json.loads(result_json)
+
+                if not result.get("success", False):
+                    return f"Search failed: {result.get('error', 'Unknown error')}"
+
+                sections = []
+                for item in result.get("results", []):
+                    if item.get("success", False):
+                        body = _format_documents(item.get("results", []))
+                    else:
+                        body = f"Search failed: {item.get('error', 'Unknown error')}"
+                    sections.append(f"### Query: {item.get('query')}\n{body}")
+                return "\n\n===\n\n".join(sections)
+
             except Exception as e:
-                logger.error(f"Error searching documents: {e}")
+                logger.error(f"Error searching documents in batch: {e}")
                 return f"Error performing search: {str(e)}"
 
         @agent.tool
@@ -249,39 +318,49 @@ class RagAgent(BaseAgent[RagDependencies, str]):
                 if not result.get("success", False):
                     return f"Code search failed: {result.get('error', 'Unknown error')}"
 
-                examples = result.get("results", result.get("code_examples", []))
-                if not examples:
-                    return "No code examples found for your query."
-
-                formatted_examples = []
-                for i, example in enumerate(examples, 1):
-                    similarity = example.get("similarity", 0)
-                    summary = example.get("summary", "No summary")
-                    code = example.get("code", example.get("code_block", ""))
-                    url = example.get("url", "")
-
-                    # Extract language from code block if available
-                    lang = "code"
-                    if code.startswith("```"):
-                        first_line = code.split("\n")[0]
-                        if len(first_line) > 3:
-                            lang = first_line[3:].strip()
-
-                    formatted_examples.append(
-                        f"**Example {i}** (Relevance: {similarity:.2%})\n"
-                        f"Summary: {summary}\n"
-                        f"Source: {url}\n"
-                        f"```{lang}\n{code}\n```"
-                    )
-
-                return f"Found {len(examples)} code examples:\n\n" + "\n---\n".join(
-                    formatted_examples
-                )
+                return _format_code_examples(result.get("results", result.get("code_examples", [])))
 
             except Exception as e:
                 logger.error(f"Error searching code examples: {e}")
                 return f"Error searching code: {str(e)}"
 
+        @agent.tool
+        async def search_documents_and_code(
+            ctx: RunContext[RagDependencies], query: str, source_filter: str | None = None
+        ) -> str:
+            """Search documents and code examples for the same query in one call."""
+            try:
+                # Use source filter from context if not provided
+                if source_filter is None:
+                    source_filter = ctx.deps.source_filter
+
+                # One MCP call: the query is embedded once and both searches run in parallel
+                mcp_client = await get_mcp_client()
+                result_json = await mcp_client.search_documents_and_code(
+                    query=query, source_id=source_filter, match_count=ctx.deps.match_count
+                )
+
+                # Parse the JSON response
+                import json
+
+                result = json.loads(result_json)
+
+                if not result.get("success", False):
+                    return f"Search failed: {result.get('error', 'Unknown error')}"
+
+                sections = []
+                for name, formatter in (("documents", _format_documents), ("code_examples", _format_code_examples)):
+                    section = result.get(name, {})
+                    if section.get("success", True):
+                        sections.append(formatter(section.get("results", [])))
+                    else:
+                        sections.append(f"{name.replace('_', ' ').capitalize()} search failed: {section.get('error')}")
+                return "\n\n===\n\n".join(sections)
+
+            except Exception as e:
+                logger.error(f"Error searching documents and code examples: {e}")
+                return f"Error performing search: {str(e)}"
+
         @agent.tool
         async def refine_search_query(
             ctx: RunContext[RagDependencies], original_query: str, context: str
@@ -77,11 +77,19 @@ def register_rag_tools(mcp: FastMCP):
 
     @mcp.tool()
     async def rag_search_knowledge_base(
-        ctx: Context, query: str, source_id: str | None = None, tags: list[str] | None = None, match_count: int = 5
+        ctx: Context,
+        query: str,
+        source_id: str | None = None,
+        tags: list[str] | None = None,
+        match_count: int = 5,
+        full_content: bool = False,
     ) -> str:
         """
         Search knowledge base for relevant content using RAG.
 
+        Results carry a short snippet of each chunk; open the ones you need with
+        rag_get_chunks(ids) instead of asking for full content on every search.
+
         Args:
             query: Search query - Keep it SHORT and FOCUSED (2-5 keywords).
                    Good: "vector search", "authentication JWT", "React hooks"
@@ -92,11 +100,14 @@ def register_rag_tools(mcp: FastMCP):
             tags: Optional list of tags to filter by. Documents must have ALL specified tags.
                   Example: ["OCR Papers", "python"] to find Python documents in the OCR Papers collection
             match_count: Max results (default: 5)
+            full_content: Return up to 1000 characters of content and all metadata per result
+                          instead of snippets (default: False)
 
         Returns:
             JSON string with structure:
             - success: bool - Operation success status
-            - results: list[dict] - Array of matching documents with content and metadata
+            - results: list[dict] - Array of matching documents: id, content (a snippet unless
+              full_content), content_length, truncated, metadata, similarity_score
             - reranked: bool - Whether results were reranked
             - error: str|null - Error description if success=false
         """
@@ -105,7 +116,7 @@ def register_rag_tools(mcp: FastMCP):
             timeout = httpx.Timeout(30.0, connect=5.0)
 
             async with httpx.AsyncClient(timeout=timeout) as client:
-                request_data = {"query": query, "match_count": match_count}
+                request_data = {"query": query, "match_count": match_count, "slim": not full_content}
                 if source_id:
                     request_data["source"] = source_id
                 if tags:
@@ -139,6 +150,135 @@ def register_rag_tools(mcp: FastMCP):
             logger.error(f"Error performing RAG query: {e}")
             return json.dumps({"success": False, "results": [], "error": str(e)}, indent=2)
 
+    @mcp.tool()
+    async def rag_get_chunks(ctx: Context, ids: list[int]) -> str:
+        """
+        Get the full content of knowledge base chunks by id.
+
+        Use this on the rag_search_knowledge_base results you actually need to read.
+
+        Args:
+            ids: Chunk ids from search results (max 100)
+
+        Returns:
+            JSON string with structure:
+            - success: bool - Operation success status
+            - chunks: list[dict] - id, url, chunk_number, content, metadata, source_id per chunk
+            - missing: list[int] - Requested ids that no longer exist
+            - error: str|null - Error description if success=false
+        """
+        try:
+            api_url = get_api_url()
+            timeout = httpx.Timeout(30.0, connect=5.0)
+
+            async with httpx.AsyncClient(timeout=timeout) as client:
+                response = await client.post(urljoin(api_url, "/api/rag/chunks"), json={"ids": ids})
+
+                if response.status_code == 200:
+                    result = response.json()
+                    return json.dumps(
+                        {
+                            "success": True,
+                            "chunks": result.get("chunks", []),
+                            "missing": result.get("missing", []),
+                            "error": None,
+                        },
+                        indent=2,
+                    )
+                else:
+                    error_detail = response.text
+                    return json.dumps(
+                        {
+                            "success": False,
+                            "chunks": [],
+                            "error": f"HTTP {response.status_code}: {error_detail}",
+                        },
+                        indent=2,
+                    )
+
+        except Exception as e:
+            logger.error(f"Error getting chunks: {e}")
+            return json.dumps({"success": False, "chunks": [], "error": str(e)}, indent=2)
+
+    @mcp.tool()
+    async def rag_search_knowledge_base_batch(
+        ctx: Context,
+        queries: list[str],
+        source_id: str | None = None,
+        tags: list[str] | None = None,
+        match_count: int = 5,
+    ) -> str:
+        """
+        Run several knowledge base searches in one call.
+
+        Use this instead of calling rag_search_knowledge_base repeatedly when you have
+        multiple sub-queries: all queries are embedded together and reranked together,
+        so the batch takes about as long as a single search.
+
+        Args:
+            queries: Search queries (max 50), each SHORT and FOCUSED (2-5 keywords).
+                     Example: ["JWT refresh tokens", "FastAPI dependencies", "pgvector index"]
+            source_id: Optional source ID filter from rag_get_available_sources(), applied to every query.
+                      This is the 'id' field from available sources, NOT a URL or domain name.
+            tags: Optional list of tags documents must all have, applied to every query
+            match_count: Max results per query (default: 5)
+
+        Returns:
+            JSON string with structure:
+            - success: bool - Operation success status
+            - results: list[dict] - One entry per query, in order: query, success, results,
+              reranked, error
+            - timings_ms: dict - Time spent embedding, searching, reranking and in total
+            - error: str|null - Error description if success=false
+        """
+        try:
+            api_url = get_api_url()
+            timeout = httpx.Timeout(60.0, connect=5.0)
+
+            async with httpx.AsyncClient(timeout=timeout) as client:
+                request_data = {"queries": queries, "match_count": match_count}
+                if source_id:
+                    request_data["source"] = source_id
+                if tags:
+                    request_data["filter_metadata"] = {"tags": tags}
+
+                response = await client.post(urljoin(api_url, "/api/rag/query/batch"), json=request_data)
+
+                if response.status_code == 200:
+                    result = response.json()
+                    return json.dumps(
+                        {
+                            "success": True,
+                            "results": [
+                                {
+                                    "query": item.get("query"),
+                                    "success": item.get("success", False),
+                                    "results": item.get("results", []),
+                                    "reranked": item.get("reranking_applied", False),
+                                    "error": item.get("error"),
+                                }
+                                for item in result.get("results", [])
+                            ],
+                            "timings_ms": result.get("timings_ms", {}),
+                            "error": None,
+                        },
+                        indent=2,
+                    )
+                else:
+                    error_detail = response.text
+                    return json.dumps(
+                        {
+                            "success": False,
+                            "results": [],
+                            "error": f"HTTP {response.status_code}: {error_detail}",
+                        },
+                        indent=2,
+                    )
+
+        except Exception as e:
+            logger.error(f"Error performing batch RAG query: {e}")
+            return json.dumps({"success": False, "results": [], "error": str(e)}, indent=2)
+
     @mcp.tool()
     async def rag_search_code_examples(
         ctx: Context, query: str, source_id: str | None = None, tags: list[str] | None = None, match_count: int = 5
@@ -206,5 +346,94 @@ def register_rag_tools(mcp: FastMCP):
             logger.error(f"Error searching code examples: {e}")
             return json.dumps({"success": False, "results": [], "error": str(e)}, indent=2)
 
+    @mcp.tool()
+    async def rag_search_knowledge_and_code(
+        ctx: Context,
+        query: str,
+        source_id: str | None = None,
+        tags: list[str] | None = None,
+        match_count: int = 5,
+        code_match_count: int | None = None,
+    ) -> str:
+        """
+        Search documents AND code examples in one call.
+
+        Prefer this over calling rag_search_knowledge_base and rag_search_code_examples
+        with the same query: the query is embedded once and both searches run in parallel.
+
+        Args:
+            query: Search query - Keep it SHORT and FOCUSED (2-5 keywords).
+                   Good: "FastAPI middleware", "pgvector index"
+            source_id: Optional source ID filter from rag_get_available_sources().
+                      This is the 'id' field from available sources, NOT a URL or domain name.
+            tags: Optional list of tags documents must all have (documents only)
+            match_count: Max documents (default: 5)
+            code_match_count: Max code examples (default: match_count)
+
+        Returns:
+            JSON string with structure:
+            - success: bool - True if either search succeeded
+            - documents: dict - results, reranked, error for the document search
+            - code_examples: dict - results, reranked, error for the code example search
+            - timings_ms: dict - embedding, documents, code_examples and total time
+            - error: str|null - Error description if success=false
+        """
+        try:
+            api_url = get_api_url()
+            timeout = httpx.Timeout(30.0, connect=5.0)
+
+            async with httpx.AsyncClient(timeout=timeout) as client:
+                request_data = {"query": query, "match_count": match_count}
+                if code_match_count:
+                    request_data["code_match_count"] = code_match_count
+                if source_id:
+                    request_data["source"] = source_id
+                if tags:
+                    request_data["filter_metadata"] = {"tags": tags}
+
+                response = await client.post(
+                    urljoin(api_url, "/api/rag/query/combined"), json=request_data
+                )
+
+                if response.status_code == 200:
+                    result = response.json()
+
+                    def section(data: dict) -> dict:
+                        return {
+                            "success": data.get("success", False),
+                            "results": data.get("results", []),
+                            "reranked": data.get("reranking_applied", False),
+                            "error": data.get("error"),
+                        }
+
+                    return json.dumps(
+                        {
+                            "success": True,
+                            "documents": section(result.get("documents", {})),
+                            "code_examples": section(result.get("code_examples", {})),
+                            "timings_ms": result.get("timings_ms", {}),
+                            "error": None,
+                        },
+                        indent=2,
+                    )
+                else:
+                    error_detail = response.text
+                    return json.dumps(
+                        {
+                            "success": False,
+                            "documents": {"results": []},
+                            "code_examples": {"results": []},
+                            "error": f"HTTP {response.status_code}: {error_detail}",
+                        },
+                        indent=2,
+                    )
+
+        except Exception as e:
+            logger.error(f"Error searching documents and code examples: {e}")
+            return json.dumps(
+                {"success": False, "documents": {"results": []}, "code_examples": {"results": []}, "error": str(e)},
+                indent=2,
+            )
+
     # Log successful registration
     logger.info("✓ RAG tools registered (HTTP-based version)")
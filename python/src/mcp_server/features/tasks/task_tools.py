@@ -62,12 +62,14 @@ def register_task_tools(mcp: FastMCP):
         include_closed: bool = True,
         page: int = 1,
         per_page: int = DEFAULT_PAGE_SIZE,  # Use optimized default
+        cursor: str | None = None,
     ) -> str:
         """
         Find and search tasks (consolidated: list + search + get).
         
         Args:
-            query: Keyword search in title, description, feature (optional)
+            query: Keyword search in title, description, feature (optional);
+                   every term must match, best matches first
             task_id: Get specific task by ID (returns full details)
             filter_by: "status" | "project" | "assignee" (optional)
             filter_value: Filter value (e.g., "todo", "doing", "review", "done")
@@ -75,13 +77,17 @@ def register_task_tools(mcp: FastMCP):
             include_closed: Include done tasks in results
             page: Page number for pagination
             per_page: Items per page (default: 10)
+            cursor: next_cursor from the previous result, to get the following page
+                    (faster than page numbers on long task lists)
         
         Returns:
-            JSON array of tasks or single task (optimized payloads for lists)
+            JSON array of tasks or single task (optimized payloads for lists);
+            lists include next_cursor (null on the last page)
         
         Examples:
             find_tasks() # All tasks
             find_tasks(query="auth") # Search for "auth"
+            find_tasks(query="auth token") # Tasks mentioning both "auth" and "token"
             find_tasks(task_id="task-123") # Get specific task (full details)
             find_tasks(filter_by="status", filter_value="todo") # Only todo tasks
         """
@@ -114,15 +120,18 @@ def register_task_tools(mcp: FastMCP):
                 "per_page": per_page,
                 "exclude_large_fields": True,  # Always exclude large fields in MCP responses
             }
+            if cursor:
+                params["cursor"] = cursor
 
             # Add search query if provided
             if query:
                 params["q"] = query
 
             if filter_by == "project" and filter_value:
-                # Use project-specific endpoint for project filtering
-                url = urljoin(api_url, f"/api/projects/{filter_value}/tasks")
-                params["include_archived"] = False  # For backward compatibility
+                # Generic tasks endpoint pages in the database (the project endpoint returns all tasks)
+                url = urljoin(api_url, "/api/tasks")
+                params["project_id"] = filter_value
+                params["include_closed"] = include_closed
             elif filter_by == "status" and filter_value:
                 # Use generic tasks endpoint for status filtering
                 url = urljoin(api_url, "/api/tasks")
@@ -154,13 +163,15 @@ def register_task_tools(mcp: FastMCP):
                 result = response.json()
 
                 # Normalize response format
+                pagination: dict[str, Any] = {}
                 if isinstance(result, list):
                     tasks = result
                     total_count = len(result)
                 elif isinstance(result, dict):
                     if "tasks" in result:
                         tasks = result["tasks"]
-                        total_count = result.get("total_count", len(tasks))
+                        pagination = result.get("pagination") or {}
+                        total_count = pagination.get("total", result.get("total_count", len(tasks)))
                     elif "data" in result:
                         tasks = result["data"]
                         total_count = result.get("total", len(tasks))
@@ -185,6 +196,7 @@ def register_task_tools(mcp: FastMCP):
                     "tasks": optimized_tasks,
                     "total_count": total_count,
                     "count": len(optimized_tasks),
+                    "next_cursor": pagination.get("next_cursor"),
                     "query": query,  # Include search query in response
                 })
 
@@ -371,3 +383,72 @@ def register_task_tools(mcp: FastMCP):
         except Exception as e:
             logger.error(f"Error managing task ({action}): {e}", exc_info=True)
             return MCPErrorFormatter.from_exception(e, f"{action} task")
+
+    @mcp.tool()
+    async def manage_tasks_bulk(
+        ctx: Context,
+        project_id: str,
+        create: list[dict[str, Any]] | None = None,
+        update: list[dict[str, Any]] | None = None,
+        reorder: list[str] | None = None,
+    ) -> str:
+        """
+        Create, update and reorder many tasks of a project in one call (one transaction).
+
+        Use this instead of repeated manage_task calls when planning or restructuring:
+        a whole plan is written in a single request.
+
+        Args:
+            project_id: Project UUID
+            create: New tasks, each {"title": ..., optional "description", "status",
+                    "assignee", "priority", "feature", "task_order"}. Without task_order
+                    a task goes to the end of its status column, in list order.
+            update: Changes to existing tasks, each {"id": ..., fields to change}
+            reorder: Task ids in their new order; list every task of each status
+                     column you reorder (columns as they are after the updates)
+
+        Examples:
+          manage_tasks_bulk(project_id="p-1", create=[{"title": "Research patterns"}, {"title": "Write tests"}])
+          manage_tasks_bulk(project_id="p-1", update=[{"id": "t-1", "status": "done"}], reorder=["t-3", "t-2"])
+
+        Returns: {success: bool, created: [tasks], updated: [tasks], missing: [task ids], message: string}
+        """
+        try:
+            if not (create or update or reorder):
+                return MCPErrorFormatter.format_error(
+                    "validation_error",
+                    "Nothing to do",
+                    suggestion="Provide tasks to create or update, or task ids to reorder",
+                )
+
+            api_url = get_api_url()
+            timeout = get_default_timeout()
+
+            async with httpx.AsyncClient(timeout=timeout) as client:
+                response = await client.post(
+                    urljoin(api_url, "/api/tasks/bulk"),
+                    json={
+                        "project_id": project_id,
+                        "create": create or [],
+                        "update": update or [],
+                        "reorder": reorder or [],
+                    },
+                )
+
+                if response.status_code == 200:
+                    result = response.json()
+                    return json.dumps({
+                        "success": True,
+                        "created": [optimize_task_response(task) for task in result.get("created", [])],
+                        "updated": [optimize_task_response(task) for task in result.get("updated", [])],
+                        "missing": result.get("missing", []),
+                        "message": result.get("message", "Tasks written successfully"),
+                    })
+                else:
+                    return MCPErrorFormatter.from_http_error(response, "write tasks in bulk")
+
+        except httpx.RequestError as e:
+            return MCPErrorFormatter.from_exception(e, "write tasks in bulk", {"project_id": project_id})
+        except Exception as e:
+            logger.error(f"Error writing tasks in bulk: {e}", exc_info=True)
+            return MCPErrorFormatter.from_exception(e, "write tasks in bulk")
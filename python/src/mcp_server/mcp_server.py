@@ -246,6 +246,9 @@ IMPORTANT: Always use source_id (not URLs or domain names) for filtering!
     - `manage_task("create", project_id="p-1", title="Fix auth")`
     - `manage_task("update", task_id="t-1", status="doing")`
     - `manage_task("delete", task_id="t-1")`
+- `manage_tasks_bulk(project_id, create=None, update=None, reorder=None)`
+  - Create, update and reorder many tasks in one call (one transaction)
+  - Use it to write a whole plan instead of calling manage_task per task
 
 ## 🏗️ Project Management
 
@@ -1,19 +1,152 @@
 """Dashboard API routes for overview statistics."""
 
 import os
-from fastapi import APIRouter, Response
+from fastapi import APIRouter, Request, Response
 from logfire import instrument
+from ..services.async_db_client import execute_rpc
 from ..services.client_manager import get_supabase_client
+from ..services.stats_cache import KNOWLEDGE_SCOPE, TASKS_SCOPE, get_stats_cache
 from ..config.logfire_config import api_logger, safe_set_attribute, safe_span
+from ..utils.etag_utils import check_etag
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
+# Aggregate functions found missing (migration 015 not applied); their callers count rows instead
+_missing_stats_functions: set[str] = set()
+
+
+class _IncompleteStats(Exception):
+    """Raised with the partial statistics when a section could not be read, so they are not cached."""
+
+    def __init__(self, stats: dict):
+        super().__init__("incomplete dashboard statistics")
+        self.stats = stats
+
+
+async def _call_stats_function(client, name: str, params: dict) -> list[dict] | None:
+    """Call an aggregate function, or return None if it is not installed."""
+    if name in _missing_stats_functions:
+        return None
+    try:
+        return await execute_rpc(client, name, params)
+    except Exception as e:
+        if "does not exist" not in str(e) and "Could not find the function" not in str(e):
+            raise
+        api_logger.warning(f"{name} missing, counting rows instead (apply migration 015)")
+        _missing_stats_functions.add(name)
+        return None
+
+
+async def _get_project_task_stats(client, project_id: str | None) -> tuple[dict, dict]:
+    """Project total and task counts per status, grouped in the database."""
+    projects_stats = {"total": 0, "active": 0}
+    tasks_stats = {"todo": 0, "doing": 0, "review": 0, "done": 0, "archived": 0, "total": 0}
+
+    rows = await _call_stats_function(client, "get_project_task_stats", {"project_filter": project_id})
+    if rows is None:
+        rows = _scan_project_task_stats(client, project_id)
+
+    for row in rows:
+        bucket, count = row.get("bucket"), int(row.get("item_count") or 0)
+        if bucket == "projects":
+            # Projects have no status column, so every project is active
+            projects_stats["total"] = projects_stats["active"] = count
+            continue
+        tasks_stats["total"] += count
+        if bucket in tasks_stats:
+            tasks_stats[bucket] += count
+
+    return projects_stats, tasks_stats
+
+
+def _scan_project_task_stats(client, project_id: str | None) -> list[dict]:
+    """get_project_task_stats rows computed from the task rows."""
+    projects_result = client.table("archon_projects").select("id", count="exact", head=True).execute()
+    buckets = {"projects": projects_result.count or 0}
+
+    tasks_query = client.table("archon_tasks").select("status, archived")
+    if project_id:
+        tasks_query = tasks_query.eq("project_id", project_id)
+    for task in tasks_query.execute().data or []:
+        # Handle null status as "todo" (default)
+        bucket = "archived" if task.get("archived") else (task.get("status") or "todo")
+        buckets[bucket] = buckets.get(bucket, 0) + 1
+
+    return [{"bucket": bucket, "item_count": count} for bucket, count in buckets.items()]
+
+
+async def _get_knowledge_stats(client) -> dict:
+    """Source, document and code example counts, in total and per knowledge type."""
+    knowledge_stats = {"sources": 0, "documents": 0, "code_examples": 0, "by_knowledge_type": {}}
+
+    rows = await _call_stats_function(client, "get_knowledge_stats", {})
+    if rows is None:
+        # Head requests return only the counts
+        for key, table in (
+            ("sources", "archon_sources"),
+            ("documents", "archon_crawled_pages"),
+            ("code_examples", "archon_code_examples"),
+        ):
+            result = client.table(table).select("*", count="exact", head=True).execute()
+            knowledge_stats[key] = result.count or 0
+        return knowledge_stats
+
+    for row in rows:
+        counts = {key: int(row.get(key) or 0) for key in ("sources", "documents", "code_examples")}
+        knowledge_stats["by_knowledge_type"][row.get("knowledge_type") or "technical"] = counts
+        for key, count in counts.items():
+            knowledge_stats[key] += count
+
+    return knowledge_stats
+
+
+async def _compute_dashboard_stats(project_id: str | None, projects_enabled: bool) -> dict:
+    """Read the statistics; raises _IncompleteStats if a section failed."""
+    client = get_supabase_client()
+    failed = False
+
+    projects_stats = {"total": 0, "active": 0}
+    tasks_stats = {"todo": 0, "doing": 0, "review": 0, "done": 0, "archived": 0, "total": 0}
+    if projects_enabled:
+        try:
+            projects_stats, tasks_stats = await _get_project_task_stats(client, project_id)
+            api_logger.info(
+                f"Projects: {projects_stats['total']} total | Tasks: {tasks_stats['todo']} todo, "
+                f"{tasks_stats['doing']} doing, {tasks_stats['review']} review, {tasks_stats['done']} done, "
+                f"{tasks_stats['archived']} archived"
+            )
+        except Exception as e:
+            api_logger.error(f"Failed to get projects and tasks stats: {e}", exc_info=True)
+            failed = True
+
+    knowledge_stats = {"sources": 0, "documents": 0, "code_examples": 0, "by_knowledge_type": {}}
+    try:
+        knowledge_stats = await _get_knowledge_stats(client)
+        api_logger.info(f"Knowledge: {knowledge_stats['sources']} sources, {knowledge_stats['documents']} documents, {knowledge_stats['code_examples']} code examples")
+    except Exception as e:
+        api_logger.error(f"Failed to get knowledge stats: {e}", exc_info=True)
+        failed = True
+
+    stats = {
+        "projects": projects_stats,
+        "tasks": tasks_stats,
+        "knowledge": knowledge_stats,
+        "projects_enabled": projects_enabled
+    }
+    if failed:
+        raise _IncompleteStats(stats)
+    return stats
+
 
 @router.get("/stats")
 @instrument("api_get_dashboard_stats")
-async def get_dashboard_stats(response: Response, project_id: str = None):
+async def get_dashboard_stats(request: Request, response: Response, project_id: str = None):
     """Get dashboard statistics overview.
 
+    Counts are aggregated in the database and cached until the next project, task or
+    knowledge base write, so polling costs O(projects) at most and usually nothing.
+    Supports ETag/If-None-Match.
+
     Args:
         project_id: Optional project ID to filter tasks by project
     """
@@ -23,97 +156,32 @@ async def get_dashboard_stats(response: Response, project_id: str = None):
 
         try:
             api_logger.info("Getting dashboard statistics")
-            client = get_supabase_client()
-
-            # Get projects count and active projects
             projects_enabled = os.getenv("PROJECTS_ENABLED", "true").lower() == "true"
-            projects_stats = {"total": 0, "active": 0}
-
-            if projects_enabled:
-                try:
-                    projects_result = client.table("archon_projects").select("*").execute()
-                    projects_data = projects_result.data or []
-                    projects_stats["total"] = len(projects_data)
-                    projects_stats["active"] = len([p for p in projects_data if p.get("status") not in ["archived", "completed"]])
-                    api_logger.info(f"Projects found: {len(projects_data)} total, {projects_stats['active']} active")
-                except Exception as e:
-                    api_logger.error(f"Failed to get projects stats: {e}", exc_info=True)
-
-            # Get tasks count by status
-            tasks_stats = {"todo": 0, "doing": 0, "review": 0, "done": 0, "archived": 0, "total": 0}
-
-            if projects_enabled:
-                try:
-                    # Build tasks query with optional project filter
-                    tasks_query = client.table("archon_tasks").select("id, status, project_id, archived")
-                    if project_id:
-                        tasks_query = tasks_query.eq("project_id", project_id)
-                        api_logger.info(f"Filtering tasks by project_id: {project_id}")
-
-                    tasks_result = tasks_query.execute()
-                    tasks_data = tasks_result.data or []
-                    tasks_stats["total"] = len(tasks_data)
-
-                    # Count unique status values for debugging
-                    status_counts = {}
-                    archived_count = 0
-                    for task in tasks_data:
-                        # Check if task is archived first
-                        if task.get("archived"):
-                            tasks_stats["archived"] += 1
-                            archived_count += 1
-                            continue
-
-                        raw_status = task.get("status")
-                        status_counts[str(raw_status)] = status_counts.get(str(raw_status), 0) + 1
-
-                        # Handle null status as "todo" (default)
-                        status = raw_status or "todo"
-                        if status in tasks_stats:
-                            tasks_stats[status] += 1
-
-                    api_logger.info(f"Raw status distribution: {status_counts}, archived: {archived_count}")
-                    api_logger.info(f"Tasks: {tasks_stats['todo']} todo, {tasks_stats['doing']} doing, {tasks_stats['review']} review, {tasks_stats['done']} done, {tasks_stats['archived']} archived")
-                except Exception as e:
-                    api_logger.error(f"Failed to get tasks stats: {e}", exc_info=True)
-
-            # Get knowledge base statistics
-            knowledge_stats = {
-                "sources": 0,
-                "documents": 0,
-                "code_examples": 0
-            }
 
+            cache = get_stats_cache()
             try:
-                # Count sources (archon_sources uses source_id as primary key)
-                sources_result = client.table("archon_sources").select("source_id").execute()
-                knowledge_stats["sources"] = len(sources_result.data) if sources_result.data else 0
-
-                # Count documents (stored in archon_crawled_pages)
-                documents_result = client.table("archon_crawled_pages").select("id").execute()
-                knowledge_stats["documents"] = len(documents_result.data) if documents_result.data else 0
-
-                # Count code examples
-                code_result = client.table("archon_code_examples").select("id").execute()
-                knowledge_stats["code_examples"] = len(code_result.data) if code_result.data else 0
-
-                api_logger.info(f"Knowledge: {knowledge_stats['sources']} sources, {knowledge_stats['documents']} documents, {knowledge_stats['code_examples']} code examples")
-            except Exception as e:
-                api_logger.error(f"Failed to get knowledge stats: {e}", exc_info=True)
-
-            stats = {
-                "projects": projects_stats,
-                "tasks": tasks_stats,
-                "knowledge": knowledge_stats,
-                "projects_enabled": projects_enabled
-            }
+                stats, version = await cache.get_or_compute_async(
+                    ("dashboard", project_id, projects_enabled),
+                    (TASKS_SCOPE, KNOWLEDGE_SCOPE),
+                    lambda: _compute_dashboard_stats(project_id, projects_enabled),
+                )
+            except _IncompleteStats as e:
+                # Partial statistics are returned but neither cached nor tagged
+                return e.stats
+
+            current_etag = cache.etag(version)
+            response.headers["ETag"] = current_etag
+            response.headers["Cache-Control"] = "no-cache, must-revalidate"
+            if check_etag(request.headers.get("If-None-Match"), current_etag):
+                response.status_code = 304
+                return None
 
             api_logger.info(
                 "Dashboard statistics retrieved",
                 extra={
-                    "projects_total": projects_stats["total"],
-                    "tasks_total": tasks_stats["total"],
-                    "knowledge_sources": knowledge_stats["sources"]
+                    "projects_total": stats["projects"]["total"],
+                    "tasks_total": stats["tasks"]["total"],
+                    "knowledge_sources": stats["knowledge"]["sources"]
                 }
             )
 
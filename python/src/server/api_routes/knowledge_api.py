@@ -28,7 +28,13 @@ from ..services.crawling import CrawlingService
 from ..services.credential_service import credential_service
 from ..services.embeddings.provider_error_adapters import ProviderErrorFactory
 from ..services.knowledge import DatabaseMetricsService, KnowledgeItemService, KnowledgeSummaryService
-from ..services.search.rag_service import RAGService
+from ..services.search.rag_result_cache import get_rag_result_cache
+from ..services.search.rag_service import (
+    DEFAULT_SNIPPET_LENGTH,
+    MAX_CHUNK_IDS,
+    get_rag_service,
+    get_reranker_stats,
+)
 from ..services.storage import DocumentStorageService
 from ..utils import get_supabase_client
 from ..utils.document_processing import extract_text_from_document
@@ -174,11 +180,48 @@ class CrawlRequest(BaseModel):
     max_depth: int = 2  # Maximum crawl depth (1-5)
 
 
+# Longest snippet a slim query can ask for (chunks are about 5000 characters)
+MAX_SNIPPET_LENGTH = 5000
+
+
 class RagQueryRequest(BaseModel):
     query: str
     source: str | None = None
     match_count: int = 5
     filter_metadata: dict[str, Any] | None = None
+    slim: bool = False  # Snippets and selected metadata only; open results with POST /rag/chunks
+    snippet_length: int = DEFAULT_SNIPPET_LENGTH
+    metadata_keys: list[str] | None = None  # Metadata kept in slim results (server default if unset)
+
+
+class RagCombinedQueryRequest(RagQueryRequest):
+    code_match_count: int | None = None  # Defaults to match_count
+
+
+# Upper bound on queries per batch request
+MAX_BATCH_QUERIES = 50
+
+
+class RagBatchQueryRequest(BaseModel):
+    queries: list[str]
+    source: str | None = None
+    match_count: int = 5
+    filter_metadata: dict[str, Any] | None = None
+    max_concurrency: int | None = None  # Database searches at once (server default if unset)
+    slim: bool = False
+    snippet_length: int = DEFAULT_SNIPPET_LENGTH
+    metadata_keys: list[str] | None = None
+
+
+class RagChunksRequest(BaseModel):
+    ids: list[int]
+
+
+def _validate_snippet_length(snippet_length: int) -> None:
+    if not 1 <= snippet_length <= MAX_SNIPPET_LENGTH:
+        raise HTTPException(
+            status_code=422, detail=f"snippet_length must be between 1 and {MAX_SNIPPET_LENGTH}"
+        )
 
 
 @router.get("/crawl-progress/{progress_id}")
@@ -327,7 +370,7 @@ async def delete_knowledge_item(source_id: str):
         logger.debug("Successfully created SourceManagementService")
 
         logger.debug("Calling delete_source function...")
-        success, result_data = source_service.delete_source(source_id)
+        success, result_data = await asyncio.to_thread(source_service.delete_source, source_id)
         logger.debug(f"delete_source returned: success={success}, data={result_data}")
 
         # Convert to expected format
@@ -611,8 +654,14 @@ async def get_knowledge_item_code_examples(
 
 
 @router.post("/knowledge-items/{source_id}/refresh")
-async def refresh_knowledge_item(source_id: str):
-    """Refresh a knowledge item by re-crawling its URL with the same metadata."""
+async def refresh_knowledge_item(source_id: str, incremental: bool = True):
+    """
+    Refresh a knowledge item by re-crawling its URL with the same metadata.
+
+    Incremental refreshes (the default) skip pages that are unchanged since the last
+    crawl and only re-embed the chunks that changed. Pass incremental=false to re-embed
+    every page.
+    """
     
     # Validate API key before starting expensive refresh operation
     logger.info("🔍 About to validate API key for refresh...")
@@ -688,6 +737,7 @@ async def refresh_knowledge_item(source_id: str):
             "max_depth": max_depth,
             "extract_code_examples": True,
             "generate_summary": True,
+            "incremental": incremental,
         }
 
         # Create a wrapped task that acquires the semaphore
@@ -1116,15 +1166,19 @@ async def perform_rag_query(request: RagQueryRequest):
 
     if not request.query.strip():
         raise HTTPException(status_code=422, detail="Query cannot be empty")
+    _validate_snippet_length(request.snippet_length)
 
     try:
-        # Use RAGService for RAG query
-        search_service = RAGService(get_supabase_client())
+        # Use the shared RAGService for RAG query
+        search_service = await get_rag_service()
         success, result = await search_service.perform_rag_query(
             query=request.query,
             source=request.source,
             match_count=request.match_count,
             filter_metadata=request.filter_metadata,
+            slim=request.slim,
+            snippet_length=request.snippet_length,
+            metadata_keys=request.metadata_keys,
         )
 
         if success:
@@ -1144,12 +1198,38 @@ async def perform_rag_query(request: RagQueryRequest):
         raise HTTPException(status_code=500, detail={"error": f"RAG query failed: {str(e)}"})
 
 
+@router.post("/rag/chunks")
+async def get_rag_chunks(request: RagChunksRequest):
+    """Get whole document chunks by id, e.g. the slim query results a caller opens."""
+    if not request.ids:
+        raise HTTPException(status_code=422, detail="At least one chunk id is required")
+    if len(request.ids) > MAX_CHUNK_IDS:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_CHUNK_IDS} chunk ids per request")
+
+    try:
+        search_service = await get_rag_service()
+        success, result = await search_service.get_chunks_by_ids(request.ids)
+
+        if success:
+            result["success"] = True
+            return result
+        else:
+            raise HTTPException(
+                status_code=500, detail={"error": result.get("error", "Fetching chunks failed")}
+            )
+    except HTTPException:
+        raise
+    except Exception as e:
+        safe_logfire_error(f"Fetching chunks failed | error={str(e)} | ids={len(request.ids)}")
+        raise HTTPException(status_code=500, detail={"error": f"Fetching chunks failed: {str(e)}"})
+
+
 @router.post("/rag/code-examples")
 async def search_code_examples(request: RagQueryRequest):
     """Search for code examples relevant to the query using dedicated code examples service."""
     try:
-        # Use RAGService for code examples search
-        search_service = RAGService(get_supabase_client())
+        # Use the shared RAGService for code examples search
+        search_service = await get_rag_service()
         success, result = await search_service.search_code_examples_service(
             query=request.query,
             source_id=request.source,  # This is Optional[str] which matches the method signature
@@ -1180,6 +1260,89 @@ async def search_code_examples(request: RagQueryRequest):
         )
 
 
+@router.post("/rag/query/combined")
+async def perform_combined_rag_query(request: RagCombinedQueryRequest):
+    """Search documents and code examples for one query, embedding it once."""
+    if not request.query or not request.query.strip():
+        raise HTTPException(status_code=422, detail="Query cannot be empty")
+    _validate_snippet_length(request.snippet_length)
+
+    try:
+        search_service = await get_rag_service()
+        success, result = await search_service.search_documents_and_code(
+            query=request.query,
+            source=request.source,
+            match_count=request.match_count,
+            code_match_count=request.code_match_count,
+            filter_metadata=request.filter_metadata,
+            slim=request.slim,
+            snippet_length=request.snippet_length,
+            metadata_keys=request.metadata_keys,
+        )
+
+        if success:
+            result["success"] = True
+            return result
+        else:
+            raise HTTPException(
+                status_code=500, detail={"error": result.get("error", "Combined RAG query failed")}
+            )
+    except HTTPException:
+        raise
+    except Exception as e:
+        safe_logfire_error(
+            f"Combined RAG query failed | error={str(e)} | query={request.query[:50]} | source={request.source}"
+        )
+        raise HTTPException(status_code=500, detail={"error": f"Combined RAG query failed: {str(e)}"})
+
+
+@router.post("/rag/query/batch")
+async def perform_rag_query_batch(request: RagBatchQueryRequest):
+    """Run many RAG queries in one request: one embeddings call, one rerank pass."""
+    if not request.queries:
+        raise HTTPException(status_code=422, detail="At least one query is required")
+    if len(request.queries) > MAX_BATCH_QUERIES:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_BATCH_QUERIES} queries per batch")
+    if any(not query or not query.strip() for query in request.queries):
+        raise HTTPException(status_code=422, detail="Queries cannot be empty")
+    _validate_snippet_length(request.snippet_length)
+
+    try:
+        search_service = await get_rag_service()
+        options = {"max_concurrency": request.max_concurrency} if request.max_concurrency else {}
+        success, result = await search_service.perform_rag_query_batch(
+            queries=request.queries,
+            source=request.source,
+            match_count=request.match_count,
+            filter_metadata=request.filter_metadata,
+            slim=request.slim,
+            snippet_length=request.snippet_length,
+            metadata_keys=request.metadata_keys,
+            **options,
+        )
+
+        if success:
+            result["success"] = True
+            return result
+        else:
+            raise HTTPException(
+                status_code=500, detail={"error": result.get("error", "Batch RAG query failed")}
+            )
+    except HTTPException:
+        raise
+    except Exception as e:
+        safe_logfire_error(
+            f"Batch RAG query failed | error={str(e)} | queries={len(request.queries)} | source={request.source}"
+        )
+        raise HTTPException(status_code=500, detail={"error": f"Batch RAG query failed: {str(e)}"})
+
+
+@router.get("/rag/reranker/stats")
+async def reranker_stats():
+    """Get reranker metrics (queue depth, batch sizes, inference time)."""
+    return get_reranker_stats()
+
+
 @router.post("/code-examples")
 async def search_code_examples_simple(request: RagQueryRequest):
     """Search for code examples - simplified endpoint at /api/code-examples."""
@@ -1216,7 +1379,7 @@ async def delete_source(source_id: str):
 
         source_service = SourceManagementService(get_supabase_client())
 
-        success, result_data = source_service.delete_source(source_id)
+        success, result_data = await asyncio.to_thread(source_service.delete_source, source_id)
 
         if success:
             safe_logfire_info(f"Source deleted successfully | source_id={source_id}")
@@ -1276,6 +1439,7 @@ async def knowledge_health():
         "status": "healthy",
         "service": "knowledge-api",
         "timestamp": datetime.now().isoformat(),
+        "rag_result_cache": get_rag_result_cache().get_stats(),
     }
 
     return result
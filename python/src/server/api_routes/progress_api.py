@@ -1,10 +1,15 @@
-"""Progress API endpoints for polling operation status."""
+"""Progress API endpoints for polling and streaming operation status."""
 
+import asyncio
+import json
+from collections.abc import AsyncIterator
 from datetime import datetime
 from email.utils import formatdate
+from typing import Any
 
-from fastapi import APIRouter, Header, HTTPException, Response
+from fastapi import APIRouter, Header, HTTPException, Request, Response
 from fastapi import status as http_status
+from fastapi.responses import StreamingResponse
 
 from ..config.logfire_config import get_logger, logfire
 from ..models.progress_models import create_progress_response
@@ -18,6 +23,51 @@ router = APIRouter(prefix="/api/progress", tags=["progress"])
 # Terminal states that don't require further polling
 TERMINAL_STATES = {"completed", "failed", "error", "cancelled"}
 
+# Seconds between keep-alive comments on idle progress streams
+STREAM_HEARTBEAT_SECONDS = 15.0
+
+# Response body and ETag per operation, reused until the state's version changes
+_response_cache: dict[str, tuple[int, dict[str, Any], str]] = {}
+_RESPONSE_CACHE_MAX_ENTRIES = 256
+
+
+def _build_progress_response(operation_id: str, operation: dict[str, Any]) -> dict[str, Any]:
+    """Build the camelCase progress response for a raw progress state."""
+    # Ensure we have the progress_id in the response without mutating shared state
+    operation_with_id = {**operation, "progress_id": operation_id}
+
+    # Create standardized response using Pydantic model for the operation type
+    progress_response = create_progress_response(operation.get("type", "crawl"), operation_with_id)
+
+    # Convert to dict with camelCase fields for API response
+    return progress_response.model_dump(by_alias=True, exclude_none=True)
+
+
+def _cached_progress_response(operation_id: str, operation: dict[str, Any]) -> tuple[dict[str, Any], str]:
+    """
+    Return the response body and ETag for an operation.
+
+    Both are computed once per state version instead of on every poll.
+    """
+    version = ProgressTracker.get_version(operation_id)
+    cached = _response_cache.get(operation_id)
+    if version is not None and cached is not None and cached[0] == version:
+        return cached[1], cached[2]
+
+    response_data = _build_progress_response(operation_id, operation)
+    # Generate ETag from stable data (excluding timestamp)
+    etag_data = {k: v for k, v in response_data.items() if k != "timestamp"}
+    current_etag = generate_etag(etag_data)
+
+    if version is not None:
+        if len(_response_cache) >= _RESPONSE_CACHE_MAX_ENTRIES:
+            for stale_id in [op_id for op_id in _response_cache if ProgressTracker.get_version(op_id) is None]:
+                del _response_cache[stale_id]
+            if len(_response_cache) >= _RESPONSE_CACHE_MAX_ENTRIES:
+                _response_cache.clear()
+        _response_cache[operation_id] = (version, response_data, current_etag)
+    return response_data, current_etag
+
 
 @router.get("/{operation_id}")
 async def get_progress(
@@ -45,27 +95,16 @@ async def get_progress(
             )
 
 
-        # Ensure we have the progress_id in the response without mutating shared state
-        operation_with_id = {**operation, "progress_id": operation_id}
-
         # Get operation type for proper model selection
         operation_type = operation.get("type", "crawl")
 
-        # Create standardized response using Pydantic model
-        progress_response = create_progress_response(operation_type, operation_with_id)
-
-
-        # Convert to dict with camelCase fields for API response
-        response_data = progress_response.model_dump(by_alias=True, exclude_none=True)
+        # Standardized response and its ETag, rebuilt only when the state changed
+        response_data, current_etag = _cached_progress_response(operation_id, operation)
 
         # Debug logging for code extraction fields
         if operation_type == "crawl" and operation.get("status") == "code_extraction":
             logger.info(f"Code extraction response fields: completedSummaries={response_data.get('completedSummaries')}, totalSummaries={response_data.get('totalSummaries')}, codeBlocksFound={response_data.get('codeBlocksFound')}")
 
-        # Generate ETag from stable data (excluding timestamp)
-        etag_data = {k: v for k, v in response_data.items() if k != "timestamp"}
-        current_etag = generate_etag(etag_data)
-
         # Check if client's ETag matches
         if check_etag(if_none_match, current_etag):
             return Response(
@@ -97,6 +136,116 @@ async def get_progress(
         raise HTTPException(status_code=500, detail={"error": str(e)}) from e
 
 
+def _list_delta(old: list[Any], new: list[Any]) -> tuple[int, list[Any]]:
+    """
+    Describe ``new`` as ``old`` with items trimmed from the front and appended at the end.
+
+    Returns:
+        (trimmed, appended), keeping as much of ``old`` as possible
+    """
+    for trimmed in range(len(old)):
+        overlap = len(old) - trimmed
+        if overlap <= len(new) and new[:overlap] == old[trimmed:]:
+            return trimmed, new[overlap:]
+    return len(old), new
+
+
+def _progress_delta(previous: dict[str, Any], current: dict[str, Any]) -> dict[str, Any]:
+    """
+    Difference between two progress responses.
+
+    ``changed`` holds new values for changed fields and ``removed`` the fields that
+    disappeared. Lists that only grew at the end (e.g. logs) are sent as ``appended``
+    items, with ``trimmed`` counting items dropped from the front.
+    """
+    changed: dict[str, Any] = {}
+    appended: dict[str, list[Any]] = {}
+    trimmed: dict[str, int] = {}
+    for key, value in current.items():
+        old = previous.get(key)
+        if key in previous and old == value:
+            continue
+        if isinstance(old, list) and isinstance(value, list):
+            dropped, added = _list_delta(old, value)
+            if dropped < len(old):
+                if dropped:
+                    trimmed[key] = dropped
+                appended[key] = added
+                continue
+        changed[key] = value
+
+    delta: dict[str, Any] = {}
+    if changed:
+        delta["changed"] = changed
+    if appended:
+        delta["appended"] = appended
+    if trimmed:
+        delta["trimmed"] = trimmed
+    removed = [key for key in previous if key not in current]
+    if removed:
+        delta["removed"] = removed
+    return delta
+
+
+def _sse_event(event: str, data: dict[str, Any], event_id: int | None = None) -> str:
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def _progress_events(operation_id: str, request: Request) -> AsyncIterator[str]:
+    """Yield a snapshot, then a delta per state change, until the operation ends."""
+    previous: dict[str, Any] | None = None
+    with ProgressTracker.subscribe(operation_id) as changes:
+        while True:
+            operation = ProgressTracker.get_progress(operation_id)
+            if operation is None:
+                yield _sse_event("end", {"progressId": operation_id, "reason": "not_found"})
+                return
+
+            response_data, _ = _cached_progress_response(operation_id, operation)
+            event_id = ProgressTracker.get_version(operation_id)
+            if previous is None:
+                yield _sse_event("snapshot", response_data, event_id)
+            else:
+                delta = _progress_delta(previous, response_data)
+                if delta:
+                    yield _sse_event("delta", delta, event_id)
+            previous = response_data
+
+            if operation.get("status") in TERMINAL_STATES:
+                yield _sse_event("end", {"progressId": operation_id, "status": operation.get("status")})
+                return
+
+            try:
+                await asyncio.wait_for(changes.get(), timeout=STREAM_HEARTBEAT_SECONDS)
+            except TimeoutError:
+                yield ": keep-alive\n\n"
+            if await request.is_disconnected():
+                return
+
+
+@router.get("/{operation_id}/stream")
+async def stream_progress(operation_id: str, request: Request):
+    """
+    Stream progress for an operation as Server-Sent Events.
+
+    Sends a ``snapshot`` event with the same body as GET /api/progress/{operation_id},
+    then a ``delta`` event whenever the state changes, and an ``end`` event once the
+    operation reaches a terminal state. Replaces polling for clients that support SSE.
+    """
+    if ProgressTracker.get_progress(operation_id) is None:
+        raise HTTPException(status_code=404, detail={"error": f"Operation {operation_id} not found"})
+
+    return StreamingResponse(
+        _progress_events(operation_id, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/")
 async def list_active_operations():
     """
@@ -8,10 +8,11 @@ Handles:
 - HTTP polling for progress updates
 """
 
+import asyncio
 import json
 from datetime import datetime, timezone
 from email.utils import format_datetime
-from typing import Any
+from typing import Any, Literal
 
 from fastapi import APIRouter, Header, HTTPException, Request, Response
 from fastapi import status as http_status
@@ -20,8 +21,11 @@ from pydantic import BaseModel
 # Removed direct logging import - using unified config
 # Set up standard logger for background tasks
 from ..config.logfire_config import get_logger, logfire
+from ..services.projects.task_service import decode_task_cursor
+from ..services.stats_cache import TASKS_SCOPE, get_stats_cache
 from ..utils import get_supabase_client
 from ..utils.etag_utils import check_etag, generate_etag
+from ..utils.json_streaming import EncodedJSONList
 
 logger = get_logger(__name__)
 
@@ -75,6 +79,34 @@ class CreateTaskRequest(BaseModel):
     feature: str | None = None
 
 
+class BulkTaskCreate(BaseModel):
+    title: str
+    description: str | None = None
+    status: str | None = None
+    assignee: str | None = None
+    task_order: int | None = None  # Appended to its status column when omitted
+    priority: str | None = None
+    feature: str | None = None
+
+
+class BulkTaskUpdate(BaseModel):
+    id: str
+    title: str | None = None
+    description: str | None = None
+    status: str | None = None
+    assignee: str | None = None
+    task_order: int | None = None
+    priority: str | None = None
+    feature: str | None = None
+
+
+class BulkTasksRequest(BaseModel):
+    project_id: str
+    create: list[BulkTaskCreate] = []
+    update: list[BulkTaskUpdate] = []
+    reorder: list[str] = []  # Task ids in their new order, whole status columns
+
+
 @router.get("/projects")
 async def list_projects(
     response: Response,
@@ -86,58 +118,51 @@ async def list_projects(
     
     Args:
         include_content: If True (default), returns full project content.
-                        If False, returns lightweight metadata with statistics.
+                        If False, returns lightweight metadata with statistics
+                        (computed in the database; the JSONB content is never loaded).
+
+    Full content is serialized once, for both the ETag and the streamed response body.
     """
     try:
         logfire.debug(f"Listing all projects | include_content={include_content}")
 
         # Use ProjectService to get projects with include_content parameter
         project_service = ProjectService()
-        success, result = project_service.list_projects(include_content=include_content)
+        success, result = await asyncio.to_thread(project_service.list_projects, include_content=include_content)
 
         if not success:
             raise HTTPException(status_code=500, detail=result)
 
         # Only format with sources if we have full content
+        encoded_projects = None
         if include_content:
             # Use SourceLinkingService to format projects with sources
             source_service = SourceLinkingService()
             formatted_projects = source_service.format_projects_with_sources(result["projects"])
+            encoded_projects = EncodedJSONList(formatted_projects)
+            current_etag = encoded_projects.etag
+
+            # Log large responses at debug level (>100KB is worth noting, but normal for project data)
+            if encoded_projects.size_bytes > 100000:
+                logfire.debug(
+                    f"Large response size | size_bytes={encoded_projects.size_bytes} | "
+                    f"include_content={include_content} | project_count={len(formatted_projects)}"
+                )
         else:
             # Lightweight response doesn't need source formatting
             formatted_projects = result["projects"]
 
-        # Monitor response size for optimization validation
-        response_json = json.dumps(formatted_projects)
-        response_size = len(response_json)
+            # Generate ETag from stable data (excluding timestamp)
+            etag_data = {
+                "projects": formatted_projects,
+                "count": len(formatted_projects)
+            }
+            current_etag = generate_etag(etag_data)
 
-        # Log response metrics
         logfire.debug(
-            f"Projects listed successfully | count={len(formatted_projects)} | "
-            f"size_bytes={response_size} | include_content={include_content}"
+            f"Projects listed successfully | count={len(formatted_projects)} | include_content={include_content}"
         )
 
-        # Log large responses at debug level (>100KB is worth noting, but normal for project data)
-        if response_size > 100000:
-            logfire.debug(
-                f"Large response size | size_bytes={response_size} | "
-                f"include_content={include_content} | project_count={len(formatted_projects)}"
-            )
-
-        # Generate ETag from stable data (excluding timestamp)
-        etag_data = {
-            "projects": formatted_projects,
-            "count": len(formatted_projects)
-        }
-        current_etag = generate_etag(etag_data)
-
-        # Generate response with timestamp for polling
-        response_data = {
-            "projects": formatted_projects,
-            "timestamp": datetime.utcnow().isoformat(),
-            "count": len(formatted_projects)
-        }
-
         # Check if client's ETag matches
         if check_etag(if_none_match, current_etag):
             response.status_code = http_status.HTTP_304_NOT_MODIFIED
@@ -146,11 +171,18 @@ async def list_projects(
             return None
 
         # Set headers
-        response.headers["ETag"] = current_etag
-        response.headers["Last-Modified"] = datetime.utcnow().isoformat()
-        response.headers["Cache-Control"] = "no-cache, must-revalidate"
+        headers = {
+            "ETag": current_etag,
+            "Last-Modified": datetime.utcnow().isoformat(),
+            "Cache-Control": "no-cache, must-revalidate",
+        }
+        response.headers.update(headers)
 
-        return response_data
+        # Timestamp for polling
+        metadata = {"timestamp": datetime.utcnow().isoformat(), "count": len(formatted_projects)}
+        if encoded_projects is not None:
+            return encoded_projects.response("projects", metadata, headers)
+        return {"projects": formatted_projects, **metadata}
 
     except HTTPException:
         raise
@@ -222,7 +254,7 @@ async def projects_health():
         try:
             project_service = ProjectService(supabase_client)
             # Try to list projects with limit 1 to test table access
-            success, _ = project_service.list_projects()
+            success, _ = await asyncio.to_thread(project_service.list_projects)
             projects_table_exists = success
             if success:
                 logfire.info("Projects table detected successfully")
@@ -236,7 +268,7 @@ async def projects_health():
         try:
             task_service = TaskService(supabase_client)
             # Try to list tasks with limit 1 to test table access
-            success, _ = task_service.list_tasks(include_closed=True)
+            success, _ = await asyncio.to_thread(task_service.list_tasks, include_closed=True, limit=1)
             tasks_table_exists = success
             if success:
                 logfire.info("Tasks table detected successfully")
@@ -285,6 +317,9 @@ async def get_all_task_counts(
     
     Returns counts grouped by project_id with todo, doing, and done counts.
     Review status is included in doing count to match frontend logic.
+
+    Counts are aggregated in the database and cached until the next project or task
+    write; the ETag is the cached version, so unchanged polls cost no query.
     """
     try:
         # Get If-None-Match header for ETag comparison
@@ -292,22 +327,18 @@ async def get_all_task_counts(
 
         logfire.debug(f"Getting task counts for all projects | etag={if_none_match}")
 
-        # Use TaskService to get batch task counts
-        # Get client explicitly to ensure mocking works in tests
-        supabase_client = get_supabase_client()
-        task_service = TaskService(supabase_client)
-        success, result = task_service.get_all_project_task_counts()
+        async def compute_counts() -> dict[str, dict[str, int]]:
+            # Get client explicitly to ensure mocking works in tests
+            task_service = TaskService(get_supabase_client())
+            success, counts = await asyncio.to_thread(task_service.get_all_project_task_counts)
+            if not success:
+                logfire.error(f"Failed to get task counts | error={counts.get('error')}")
+                raise HTTPException(status_code=500, detail=counts)
+            return counts
 
-        if not success:
-            logfire.error(f"Failed to get task counts | error={result.get('error')}")
-            raise HTTPException(status_code=500, detail=result)
-
-        # Generate ETag from counts data
-        etag_data = {
-            "counts": result,
-            "count": len(result)
-        }
-        current_etag = generate_etag(etag_data)
+        cache = get_stats_cache()
+        result, version = await cache.get_or_compute_async("task_counts", (TASKS_SCOPE,), compute_counts)
+        current_etag = cache.etag(version)
 
         # Check if client's ETag matches (304 Not Modified)
         if check_etag(if_none_match, current_etag):
@@ -343,7 +374,7 @@ async def get_project(project_id: str):
 
         # Use ProjectService to get the project
         project_service = ProjectService()
-        success, result = project_service.get_project(project_id)
+        success, result = await asyncio.to_thread(project_service.get_project, project_id)
 
         if not success:
             if "not found" in result.get("error", "").lower():
@@ -407,7 +438,7 @@ async def update_project(project_id: str, request: UpdateProjectRequest):
 
                 # Get current project for comparison
                 project_service = ProjectService(supabase_client)
-                success, current_result = project_service.get_project(project_id)
+                success, current_result = await asyncio.to_thread(project_service.get_project, project_id)
 
                 if success and current_result.get("project"):
                     current_project = current_result["project"]
@@ -441,7 +472,7 @@ async def update_project(project_id: str, request: UpdateProjectRequest):
 
         # Use ProjectService to update the project
         project_service = ProjectService(supabase_client)
-        success, result = project_service.update_project(project_id, update_fields)
+        success, result = await asyncio.to_thread(project_service.update_project, project_id, update_fields)
 
         if not success:
             if "not found" in result.get("error", "").lower():
@@ -494,7 +525,7 @@ async def delete_project(project_id: str):
 
         # Use ProjectService to delete the project
         project_service = ProjectService()
-        success, result = project_service.delete_project(project_id)
+        success, result = await asyncio.to_thread(project_service.delete_project, project_id)
 
         if not success:
             if "not found" in result.get("error", "").lower():
@@ -526,7 +557,7 @@ async def get_project_features(project_id: str):
 
         # Use ProjectService to get features
         project_service = ProjectService()
-        success, result = project_service.get_project_features(project_id)
+        success, result = await asyncio.to_thread(project_service.get_project_features, project_id)
 
         if not success:
             if "not found" in result.get("error", "").lower():
@@ -567,7 +598,8 @@ async def list_project_tasks(
 
         # Use TaskService to list tasks
         task_service = TaskService()
-        success, result = task_service.list_tasks(
+        success, result = await asyncio.to_thread(
+            task_service.list_tasks,
             project_id=project_id,
             include_closed=True,  # Get all tasks, including done
             exclude_large_fields=exclude_large_fields,
@@ -688,6 +720,41 @@ async def create_task(request: CreateTaskRequest):
         raise HTTPException(status_code=500, detail={"error": str(e)})
 
 
+@router.post("/tasks/bulk")
+async def bulk_write_tasks(request: BulkTasksRequest):
+    """
+    Create, update and reorder many tasks of a project in one transaction.
+
+    The whole request is a constant number of database statements. New tasks without a
+    task_order go to the end of their status column. Reorders list whole status columns,
+    which are spaced apart so later inserts between their tasks renumber no siblings.
+    """
+    try:
+        task_service = TaskService()
+        success, result = await task_service.bulk_write_tasks(
+            request.project_id,
+            creates=[task.model_dump(exclude_none=True) for task in request.create],
+            updates=[task.model_dump(exclude_none=True) for task in request.update],
+            reorder=request.reorder,
+        )
+
+        if not success:
+            raise HTTPException(status_code=400, detail=result)
+
+        logfire.info(
+            f"Tasks written in bulk | project_id={request.project_id} | created={len(result['created'])} | "
+            f"updated={len(result['updated'])} | missing={len(result['missing'])}"
+        )
+
+        return {"message": "Tasks written successfully", **result}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logfire.error(f"Failed to write tasks in bulk | error={str(e)} | project_id={request.project_id}")
+        raise HTTPException(status_code=500, detail={"error": str(e)})
+
+
 @router.get("/tasks")
 async def list_tasks(
     status: str | None = None,
@@ -697,21 +764,46 @@ async def list_tasks(
     per_page: int = 10,
     exclude_large_fields: bool = False,
     q: str | None = None,  # Search query parameter
+    assignee: str | None = None,
+    cursor: str | None = None,  # pagination.next_cursor of the previous page (replaces page)
+    count: Literal["exact", "estimated", "none"] = "exact",
 ):
-    """List tasks with optional filters including status, project, and keyword search."""
+    """
+    List tasks with optional filters including status, project, assignee and keyword search.
+
+    Pages are cut in the database. Follow pagination.next_cursor for constant-cost paging
+    through long lists; count=estimated uses planner statistics for the total and
+    count=none skips it.
+
+    q returns the tasks matching every term, ranked by relevance (paged by page only).
+    """
+    if page < 1 or per_page < 1:
+        raise HTTPException(status_code=422, detail={"error": "page and per_page must be positive"})
+    if cursor:
+        try:
+            decode_task_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail={"error": str(e)}) from e
+
     try:
         logfire.info(
-            f"Listing tasks | status={status} | project_id={project_id} | include_closed={include_closed} | page={page} | per_page={per_page} | q={q}"
+            f"Listing tasks | status={status} | project_id={project_id} | include_closed={include_closed} | page={page} | per_page={per_page} | q={q} | cursor={bool(cursor)}"
         )
 
         # Use TaskService to list tasks
         task_service = TaskService()
-        success, result = task_service.list_tasks(
+        success, result = await asyncio.to_thread(
+            task_service.list_tasks,
             project_id=project_id,
             status=status,
             include_closed=include_closed,
             exclude_large_fields=exclude_large_fields,
             search_query=q,  # Pass search query to service
+            assignee=assignee,
+            limit=per_page,
+            offset=(page - 1) * per_page,
+            cursor=cursor,
+            count=None if count == "none" else count,
         )
 
         if not success:
@@ -727,19 +819,21 @@ async def list_tasks(
                 task.pop("code_examples", None)
                 task.pop("messages", None)
 
-        # Apply pagination
-        start_idx = (page - 1) * per_page
-        end_idx = start_idx + per_page
-        paginated_tasks = tasks[start_idx:end_idx]
+        # The service already returned just this page
+        paginated_tasks = tasks
+        total = result.get("total_count") if count != "none" else None
 
         # Prepare response
         response = {
             "tasks": paginated_tasks,
             "pagination": {
-                "total": len(tasks),
+                "total": total,
                 "page": page,
                 "per_page": per_page,
-                "pages": (len(tasks) + per_page - 1) // per_page,
+                "pages": (total + per_page - 1) // per_page if total is not None else None,
+                "total_is_estimate": count == "estimated",
+                "has_more": result.get("has_more", False),
+                "next_cursor": result.get("next_cursor"),
             },
         }
 
@@ -775,7 +869,7 @@ async def get_task(task_id: str):
     try:
         # Use TaskService to get the task
         task_service = TaskService()
-        success, result = task_service.get_task(task_id)
+        success, result = await asyncio.to_thread(task_service.get_task, task_id)
 
         if not success:
             if "not found" in result.get("error", "").lower():
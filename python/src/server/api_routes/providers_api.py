@@ -96,6 +96,14 @@ PROVIDER_TESTERS = {
 }
 
 
+@router.get("/clients/stats")
+async def get_client_stats():
+    """Get pooled LLM/embedding client metrics (reuse hits, connections per pool)"""
+    from ..services.llm_provider_service import get_client_pool_stats
+
+    return get_client_pool_stats()
+
+
 @router.get("/{provider}/status")
 async def get_provider_status(
     provider: str = Path(
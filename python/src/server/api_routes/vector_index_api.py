@@ -0,0 +1,104 @@
+"""
+API routes for inspecting and rebuilding the pgvector indexes.
+"""
+
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from ..config.logfire_config import get_logger, safe_logfire_error, safe_logfire_info
+from ..services.search.vector_index_service import (
+    VECTOR_TABLES,
+    DirectDatabaseRequiredError,
+    get_vector_index_service,
+)
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/api/vector-indexes", tags=["vector-indexes"])
+
+
+class VectorIndexRebuildRequest(BaseModel):
+    """Which indexes to (re)build and how."""
+
+    table: str | None = None
+    column: str | None = None
+    index_type: Literal["auto", "hnsw", "ivfflat"] = "auto"
+    force: bool = False  # Also rebuild indexes that already match the recommendation
+    dry_run: bool = False  # Only return the statements
+    maintenance_work_mem: str | None = None  # e.g. "2GB"; HNSW builds are much faster when the graph fits
+
+
+@router.get("")
+async def get_vector_indexes(
+    exact: bool = Query(False, description="Count rows instead of using planner estimates (full table scans)"),
+    index_type: Literal["auto", "hnsw", "ivfflat"] = "auto",
+):
+    """
+    Get every embedding column with its row count, current index and recommended index.
+
+    Also returns the per-query search effort in use and the state of any running build.
+    """
+    service = get_vector_index_service()
+    try:
+        statuses = await service.inspect(exact=exact, index_type=index_type)
+        progress = await service.build_progress()
+    except DirectDatabaseRequiredError as e:
+        raise HTTPException(status_code=503, detail={"error": str(e)}) from e
+    except Exception as e:
+        safe_logfire_error(f"Failed to inspect vector indexes | error={str(e)}")
+        raise HTTPException(status_code=500, detail={"error": str(e)}) from e
+
+    return {
+        "indexes": [status.to_dict() for status in statuses],
+        "search": {
+            "recall": service.search_recall() or None,
+            "params": {table: service.search_params(table, match_count=10) for table in VECTOR_TABLES},
+        },
+        "build": {**service.build, "progress": progress},
+    }
+
+
+@router.post("/rebuild")
+async def rebuild_vector_indexes(request: VectorIndexRebuildRequest):
+    """
+    Create or rebuild the indexes that do not match their recommendation.
+
+    Indexes are built one at a time in the background with CREATE INDEX CONCURRENTLY;
+    the old index keeps serving searches until the new one replaces it. Poll
+    GET /api/vector-indexes for progress.
+    """
+    if request.table and request.table not in VECTOR_TABLES:
+        raise HTTPException(status_code=422, detail={"error": f"Unknown table: {request.table}"})
+
+    service = get_vector_index_service()
+    if service.is_building:
+        raise HTTPException(status_code=409, detail={"error": "A vector index build is already running"})
+
+    try:
+        statuses = await service.inspect(index_type=request.index_type)
+        plan = service.plan(statuses, request.table, request.column, request.force)
+        planned = [
+            {
+                "table": status.table,
+                "column": status.column,
+                "action": status.action if status.action != "keep" else "rebuild",
+                "index": status.recommended.method,
+                "reason": status.reason,
+                "statements": statements,
+            }
+            for status, statements in plan
+        ]
+        if request.dry_run or not plan:
+            return {"started": False, "plan": planned}
+
+        build = service.start_build(plan, request.maintenance_work_mem)
+        safe_logfire_info(f"Vector index build started | indexes={build['indexes']}")
+        return JSONResponse(status_code=202, content={"started": True, "plan": planned})
+    except DirectDatabaseRequiredError as e:
+        raise HTTPException(status_code=503, detail={"error": str(e)}) from e
+    except Exception as e:
+        safe_logfire_error(f"Failed to start vector index build | error={str(e)}")
+        raise HTTPException(status_code=500, detail={"error": str(e)}) from e
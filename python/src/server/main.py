@@ -29,6 +29,7 @@ from .api_routes.ollama_api import router as ollama_router
 from .api_routes.progress_api import router as progress_router
 from .api_routes.projects_api import router as projects_router
 from .api_routes.providers_api import router as providers_router
+from .api_routes.vector_index_api import router as vector_index_router
 from .api_routes.version_api import router as version_router
 
 # Import modular API routers
@@ -36,6 +37,13 @@ from .api_routes.settings_api import router as settings_router
 
 # Import Logfire configuration
 from .config.logfire_config import api_logger, setup_logfire
+from .services.async_db_client import close_async_db_client, get_async_db_client
+from .services.embeddings.embedding_cache import close_embedding_cache
+from .services.llm_client_registry import close_client_registry, get_client_registry
+from .services.search.rag_service import close_rag_service, warm_up_rag_service
+from .services.search.vector_index_service import get_vector_index_service
+from .services.threading_service import configure_process_pool_from_settings, get_threading_service
+from .utils.progress import ProgressTracker
 from .services.crawler_manager import cleanup_crawler, initialize_crawler
 
 # Import utilities and core classes
@@ -90,6 +98,36 @@ async def lifespan(app: FastAPI):
         logger.info("✅ Credentials initialized")
         api_logger.info("🔥 Logfire initialized for backend")
 
+        # Pool LLM/embedding clients on the main event loop
+        get_client_registry().bind_to_running_loop()
+
+        # Size the process pool used for chunking and code extraction (started lazily)
+        process_workers = await configure_process_pool_from_settings()
+        api_logger.info(f"✅ CPU process pool configured with {process_workers} workers")
+
+        # Share progress with other workers when a shared progress backend is configured
+        try:
+            await ProgressTracker.start_sync()
+        except Exception as e:
+            api_logger.warning(f"Could not start progress store, progress stays in this worker: {e}")
+
+        # Build the shared search stack and warm up the reranker before the first query
+        try:
+            rag_service = await warm_up_rag_service()
+            reranker = rag_service.reranking_strategy
+            api_logger.info(
+                f"✅ RAG service ready (reranker: {reranker.model_name if reranker else 'disabled'})"
+            )
+        except Exception as e:
+            api_logger.warning(f"Could not warm up RAG service, it will be built on first query: {e}")
+
+        # Read the vector index layout so per-query probes match the ivfflat list counts
+        if get_async_db_client() is not None:
+            try:
+                await get_vector_index_service().inspect()
+            except Exception as e:
+                api_logger.warning(f"Could not inspect vector indexes, assuming the defaults: {e}")
+
         # Initialize crawling context
         try:
             await initialize_crawler()
@@ -137,6 +175,42 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             api_logger.warning("Could not cleanup crawling context: %s", e, exc_info=True)
 
+        # Close pooled LLM/embedding clients
+        try:
+            await close_client_registry()
+        except Exception as e:
+            api_logger.warning("Could not close pooled LLM clients: %s", e, exc_info=True)
+
+        # Release the shared RAG service and its reranker model
+        try:
+            await close_rag_service()
+        except Exception as e:
+            api_logger.warning("Could not close RAG service: %s", e, exc_info=True)
+
+        # Close the async database pool
+        try:
+            await close_async_db_client()
+        except Exception as e:
+            api_logger.warning("Could not close async database pool: %s", e, exc_info=True)
+
+        # Close the embedding cache
+        try:
+            close_embedding_cache()
+        except Exception as e:
+            api_logger.warning("Could not close embedding cache: %s", e, exc_info=True)
+
+        # Stop syncing progress with other workers
+        try:
+            await ProgressTracker.stop_sync()
+        except Exception as e:
+            api_logger.warning("Could not stop progress sync: %s", e, exc_info=True)
+
+        # Stop chunking / code extraction worker processes
+        try:
+            get_threading_service().shutdown_process_pool()
+        except Exception as e:
+            api_logger.warning("Could not shut down process pool: %s", e, exc_info=True)
+
 
         api_logger.info("✅ Cleanup completed")
 
@@ -194,6 +268,7 @@ app.include_router(providers_router)
 app.include_router(version_router)
 app.include_router(migration_router)
 app.include_router(dashboard_router)
+app.include_router(vector_index_router)
 
 
 # Root endpoint
@@ -0,0 +1,267 @@
+"""
+Async Database Client
+
+Pooled, natively async PostgreSQL access built on asyncpg.
+
+The Supabase Python client is synchronous: every ``.execute()`` blocks the event loop
+for the full database round-trip. Table queries in the services run that call in a
+worker thread (``asyncio.to_thread``); this module covers the hot paths that benefit
+from a real pool: database function calls (search, dashboard stats), the shared
+progress store and vector index maintenance.
+
+The pool is only created when a direct Postgres DSN is configured (``SUPABASE_DB_URL``
+or ``DATABASE_URL``). When it is not, ``execute_rpc`` falls back to the Supabase client
+and runs the blocking call in a worker thread instead of on the event loop.
+"""
+
+import asyncio
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..config.logfire_config import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import asyncpg
+
+    ASYNCPG_AVAILABLE = True
+except ImportError:  # pragma: no cover - asyncpg is a declared dependency
+    asyncpg = None
+    ASYNCPG_AVAILABLE = False
+
+# Only plain (optionally schema-qualified) identifiers are ever interpolated into SQL
+_IDENTIFIER_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)?$")
+
+DSN_ENV_VARS = ("SUPABASE_DB_URL", "DATABASE_URL")
+
+
+def get_database_dsn() -> str | None:
+    """Return the direct Postgres DSN from the environment, if configured."""
+    for env_var in DSN_ENV_VARS:
+        value = os.getenv(env_var)
+        if value:
+            return value
+    return None
+
+
+def quote_identifier(name: str) -> str:
+    """
+    Validate and quote a table, column or function identifier.
+
+    Raises:
+        ValueError: If the name is not a plain identifier
+    """
+    if name == "*":
+        return name
+    if not _IDENTIFIER_PATTERN.match(name):
+        raise ValueError(f"Invalid SQL identifier: {name!r}")
+    return ".".join(f'"{part}"' for part in name.split("."))
+
+
+def _encode_vector(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    return "[" + ",".join(str(float(v)) for v in value) + "]"
+
+
+def _decode_vector(value: str) -> list[float]:
+    stripped = value.strip("[]")
+    if not stripped:
+        return []
+    return [float(v) for v in stripped.split(",")]
+
+
+@dataclass
+class QueryResult:
+    """Result of an RPC call, shaped like a Supabase API response."""
+
+    data: list[dict[str, Any]] = field(default_factory=list)
+    count: int | None = None
+
+
+class AsyncDatabaseClient:
+    """Pooled asyncpg client for raw queries and database function calls."""
+
+    def __init__(
+        self,
+        dsn: str,
+        min_size: int = 2,
+        max_size: int = 10,
+        command_timeout: float = 60.0,
+    ):
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.command_timeout = command_timeout
+        self._pool = None
+        self._pool_lock = asyncio.Lock()
+
+    @property
+    def is_connected(self) -> bool:
+        return self._pool is not None
+
+    async def _init_connection(self, conn) -> None:
+        """Register JSON and pgvector codecs so values round-trip as Python objects."""
+        for type_name in ("json", "jsonb"):
+            await conn.set_type_codec(
+                type_name, encoder=json.dumps, decoder=json.loads, schema="pg_catalog"
+            )
+        try:
+            await conn.set_type_codec(
+                "vector", encoder=_encode_vector, decoder=_decode_vector, schema="public", format="text"
+            )
+        except ValueError:
+            # pgvector is not installed in this database (e.g. tests or plain Postgres)
+            pass
+
+    async def connect(self):
+        """Create the connection pool if it does not exist yet."""
+        if self._pool is not None:
+            return self._pool
+        if not ASYNCPG_AVAILABLE:
+            raise RuntimeError("asyncpg is not installed")
+
+        async with self._pool_lock:
+            if self._pool is None:
+                # statement_cache_size=0 keeps the pool compatible with PgBouncer/Supavisor
+                self._pool = await asyncpg.create_pool(
+                    dsn=self.dsn,
+                    min_size=self.min_size,
+                    max_size=self.max_size,
+                    command_timeout=self.command_timeout,
+                    statement_cache_size=0,
+                    init=self._init_connection,
+                )
+                logger.info(
+                    f"Async database pool created | min_size={self.min_size} | max_size={self.max_size}"
+                )
+        return self._pool
+
+    async def close(self) -> None:
+        """Close the connection pool."""
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await pool.close()
+            logger.info("Async database pool closed")
+
+    def get_pool_stats(self) -> dict[str, Any]:
+        """Return pool sizing information for health/metrics endpoints."""
+        if self._pool is None:
+            return {"connected": False, "min_size": self.min_size, "max_size": self.max_size}
+        return {
+            "connected": True,
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "size": self._pool.get_size(),
+            "idle": self._pool.get_idle_size(),
+        }
+
+    # ------------------------------------------------------------------
+    # Raw query helpers
+    # ------------------------------------------------------------------
+
+    async def fetch(self, query: str, *args: Any) -> list[dict[str, Any]]:
+        pool = await self.connect()
+        rows = await pool.fetch(query, *args)
+        return [dict(row) for row in rows]
+
+    async def fetchrow(self, query: str, *args: Any) -> dict[str, Any] | None:
+        pool = await self.connect()
+        row = await pool.fetchrow(query, *args)
+        return dict(row) if row is not None else None
+
+    async def fetchval(self, query: str, *args: Any) -> Any:
+        pool = await self.connect()
+        return await pool.fetchval(query, *args)
+
+    async def execute(self, query: str, *args: Any) -> str:
+        pool = await self.connect()
+        return await pool.execute(query, *args)
+
+    # ------------------------------------------------------------------
+    # Database functions
+    # ------------------------------------------------------------------
+
+    async def rpc(self, function_name: str, params: dict[str, Any] | None = None) -> QueryResult:
+        """
+        Call a database function with named arguments.
+
+        Equivalent to ``supabase_client.rpc(function_name, params).execute()``.
+        """
+        params = params or {}
+        args: list[Any] = []
+        named_args: list[str] = []
+        for name, value in params.items():
+            args.append(_to_db_value(value))
+            named_args.append(f"{quote_identifier(name)} => ${len(args)}")
+
+        query = f"SELECT * FROM {quote_identifier(function_name)}({', '.join(named_args)})"
+        return QueryResult(data=await self.fetch(query, *args))
+
+def _to_db_value(value: Any) -> Any:
+    """
+    Convert Python values for asyncpg parameters.
+
+    Lists of floats are sent as pgvector text literals; dicts are JSON encoded by the
+    registered jsonb codec.
+    """
+    if isinstance(value, list) and value and all(isinstance(v, float) for v in value):
+        return _encode_vector(value)
+    return value
+
+
+# Global client instance
+_async_db_client: AsyncDatabaseClient | None = None
+
+
+def get_async_db_client() -> AsyncDatabaseClient | None:
+    """
+    Get the global async database client.
+
+    Returns:
+        The shared client, or None when no direct Postgres DSN is configured
+    """
+    global _async_db_client
+
+    if _async_db_client is None:
+        dsn = get_database_dsn()
+        if not dsn or not ASYNCPG_AVAILABLE:
+            return None
+        _async_db_client = AsyncDatabaseClient(
+            dsn=dsn,
+            min_size=int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            max_size=int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+        )
+    return _async_db_client
+
+
+async def close_async_db_client() -> None:
+    """Close the global async database client, if it was created."""
+    global _async_db_client
+
+    if _async_db_client is not None:
+        await _async_db_client.close()
+        _async_db_client = None
+
+
+async def execute_rpc(supabase_client, function_name: str, params: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Call a database function without blocking the event loop.
+
+    Uses the pooled asyncpg client when configured; otherwise runs the synchronous
+    Supabase RPC in a worker thread.
+
+    Returns:
+        Result rows (empty list when there are none)
+    """
+    db_client = get_async_db_client()
+    if db_client is not None:
+        result = await db_client.rpc(function_name, params)
+        return result.data
+
+    response = await asyncio.to_thread(supabase_client.rpc(function_name, params).execute)
+    return response.data or []
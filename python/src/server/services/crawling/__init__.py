@@ -17,6 +17,7 @@ from .helpers.site_config import SiteConfig
 
 # Export helpers
 from .helpers.url_handler import URLHandler
+from .page_fingerprints import PageFingerprintTracker
 from .progress_mapper import ProgressMapper
 
 # Export strategies
@@ -24,12 +25,15 @@ from .strategies.batch import BatchCrawlStrategy
 from .strategies.recursive import RecursiveCrawlStrategy
 from .strategies.single_page import SinglePageCrawlStrategy
 from .strategies.sitemap import SitemapCrawlStrategy
+from .streaming_pipeline import StreamingIngestionPipeline
 
 __all__ = [
     "CrawlingService",
     "CodeExtractionService",
     "DocumentStorageOperations",
+    "PageFingerprintTracker",
     "ProgressMapper",
+    "StreamingIngestionPipeline",
     "BatchCrawlStrategy",
     "RecursiveCrawlStrategy",
     "SinglePageCrawlStrategy",
@@ -15,6 +15,27 @@ from ..storage.code_storage_service import (
     add_code_examples_to_supabase,
     generate_code_summaries_batch,
 )
+from ..threading_service import get_threading_service
+
+# Settings read during extraction, with their defaults; snapshotted for worker processes
+EXTRACTION_SETTING_DEFAULTS: dict[str, Any] = {
+    "MIN_CODE_BLOCK_LENGTH": 250,
+    "MAX_CODE_BLOCK_LENGTH": 5000,
+    "ENABLE_COMPLETE_BLOCK_DETECTION": True,
+    "ENABLE_LANGUAGE_SPECIFIC_PATTERNS": True,
+    "ENABLE_PROSE_FILTERING": True,
+    "MAX_PROSE_RATIO": 0.15,
+    "MIN_CODE_INDICATORS": 3,
+    "ENABLE_DIAGRAM_FILTERING": True,
+    "ENABLE_CONTEXTUAL_LENGTH": True,
+    "CONTEXT_WINDOW_SIZE": 1000,
+}
+
+# Crawls with less HTML + markdown than this are extracted on the event loop
+PROCESS_POOL_EXTRACTION_THRESHOLD = 100_000
+# Characters of HTML + markdown handed to one worker process task
+PROCESS_POOL_GROUP_CHARS = 1_000_000
+PROCESS_POOL_GROUP_MAX_DOCUMENTS = 50
 
 
 class CodeExtractionService:
@@ -244,138 +265,66 @@ class CodeExtractionService:
         Returns:
             List of code blocks with metadata
         """
-        # Progress will be reported during the loop below
-
         all_code_blocks = []
         total_docs = len(crawl_results)
         completed_docs = 0
 
-        for doc in crawl_results:
-            # Check for cancellation before processing each document
-            if cancellation_check:
-                try:
-                    cancellation_check()
-                except asyncio.CancelledError:
-                    if progress_callback:
-                        await progress_callback({
-                            "status": "cancelled",
-                            "progress": 99,
-                            "message": f"Code extraction cancelled at document {completed_docs + 1}/{total_docs}"
-                        })
-                    raise
-
-            try:
-                source_url = doc["url"]
-                html_content = doc.get("html", "")
-                md = doc.get("markdown", "")
-
-                # Debug logging
-                safe_logfire_info(
-                    f"Document content check | url={source_url} | has_html={bool(html_content)} | has_markdown={bool(md)} | html_len={len(html_content) if html_content else 0} | md_len={len(md) if md else 0}"
-                )
-
-                # Get dynamic minimum length based on document context
-
-                # Check markdown first to see if it has code blocks
-                if md:
-                    has_backticks = "```" in md
-                    backtick_count = md.count("```")
-                    safe_logfire_info(
-                        f"Markdown check | url={source_url} | has_backticks={has_backticks} | backtick_count={backtick_count}"
+        # Large crawls are extracted in worker processes, one task per document group;
+        # workers get a snapshot of the extraction settings since they can't reach the DB
+        settings = await self._load_extraction_settings()
+        groups = _group_documents(crawl_results)
+        use_process_pool = sum(_document_size(doc) for doc in crawl_results) > PROCESS_POOL_EXTRACTION_THRESHOLD
+        group_tasks = []
+        if use_process_pool:
+            threading_service = get_threading_service()
+            group_tasks = [
+                asyncio.ensure_future(
+                    threading_service.run_in_process_pool(
+                        extract_code_blocks_for_documents,
+                        [_picklable_document(doc) for doc in group],
+                        settings,
                     )
+                )
+                for group in groups
+            ]
 
-                    if "getting-started" in source_url and md:
-                        # Log a sample of the markdown
-                        sample = md[:500]
-                        safe_logfire_info(f"Markdown sample for getting-started: {sample}...")
-
-                # Improved extraction logic - check for text files first, then HTML, then markdown
-                code_blocks = []
-
-                # Check if this is a text file (e.g., .txt, .md, .html after cleaning) or PDF
-                is_text_file = source_url.endswith((
-                    ".txt",
-                    ".text",
-                    ".md",
-                    ".html",
-                    ".htm",
-                )) or "text/plain" in doc.get("content_type", "") or "text/markdown" in doc.get("content_type", "")
-                
-                is_pdf_file = source_url.endswith(".pdf") or "application/pdf" in doc.get("content_type", "")
-
-                if is_text_file:
-                    # For text files, use specialized text extraction
-                    safe_logfire_info(f"🎯 TEXT FILE DETECTED | url={source_url}")
-                    safe_logfire_info(
-                        f"📊 Content types - has_html={bool(html_content)}, has_md={bool(md)}"
-                    )
-                    # For text files, the HTML content should be the raw text (not wrapped in <pre>)
-                    text_content = html_content if html_content else md
-                    if text_content:
-                        safe_logfire_info(
-                            f"📝 Using {'HTML' if html_content else 'MARKDOWN'} content for text extraction"
-                        )
-                        safe_logfire_info(
-                            f"🔍 Content preview (first 500 chars): {repr(text_content[:500])}..."
-                        )
-                        code_blocks = await self._extract_text_file_code_blocks(
-                            text_content, source_url
-                        )
-                        safe_logfire_info(
-                            f"📦 Text extraction complete | found={len(code_blocks)} blocks | url={source_url}"
-                        )
-                    else:
-                        safe_logfire_info(f"⚠️ NO CONTENT for text file | url={source_url}")
-
-                # If this is a PDF file, use specialized PDF extraction
-                elif is_pdf_file:
-                    safe_logfire_info(f"📄 PDF FILE DETECTED | url={source_url}")
-                    # For PDFs, use the content that should be PDF-extracted text
-                    pdf_content = html_content if html_content else md
-                    if pdf_content:
-                        safe_logfire_info(f"📝 Using {'HTML' if html_content else 'MARKDOWN'} content for PDF extraction")
-                        code_blocks = await self._extract_pdf_code_blocks(pdf_content, source_url)
-                        safe_logfire_info(f"📦 PDF extraction complete | found={len(code_blocks)} blocks | url={source_url}")
-                    else:
-                        safe_logfire_info(f"⚠️ NO CONTENT for PDF file | url={source_url}")
+        try:
+            for group_index, group in enumerate(groups):
+                # Check for cancellation before processing each document group
+                if cancellation_check:
+                    try:
+                        cancellation_check()
+                    except asyncio.CancelledError:
+                        if progress_callback:
+                            await progress_callback({
+                                "status": "cancelled",
+                                "progress": 99,
+                                "message": f"Code extraction cancelled at document {completed_docs + 1}/{total_docs}"
+                            })
+                        raise
 
-                # If not a text file or PDF, or no code blocks found, try HTML extraction as fallback
-                if len(code_blocks) == 0 and html_content and not is_text_file:
-                    safe_logfire_info(
-                        f"Trying HTML extraction first | url={source_url} | html_length={len(html_content)}"
-                    )
-                    html_code_blocks = await self._extract_html_code_blocks(html_content)
-                    if html_code_blocks:
-                        code_blocks = html_code_blocks
-                        safe_logfire_info(
-                            f"Found {len(code_blocks)} code blocks from HTML | url={source_url}"
+                if use_process_pool:
+                    try:
+                        group_results = await group_tasks[group_index]
+                    except Exception as e:
+                        safe_logfire_error(
+                            f"Code extraction worker failed, process pool unavailable, extracting on the event loop | documents={len(group)} | error={str(e)}"
                         )
+                        group_results = [await self._extract_code_blocks_from_document(doc) for doc in group]
+                else:
+                    group_results = [await self._extract_code_blocks_from_document(doc) for doc in group]
 
-                # If still no code blocks, try markdown extraction as fallback
-                if len(code_blocks) == 0 and md and "```" in md:
-                    safe_logfire_info(
-                        f"No code blocks from HTML, trying markdown extraction | url={source_url}"
-                    )
-                    from ..storage.code_storage_service import extract_code_blocks
-
-                    # Use dynamic minimum for markdown extraction
-                    base_min_length = 250  # Default for markdown
-                    code_blocks = extract_code_blocks(md, min_length=base_min_length)
-                    safe_logfire_info(
-                        f"Found {len(code_blocks)} code blocks from markdown | url={source_url}"
-                    )
-
-                if code_blocks:
+                for doc, code_blocks in zip(group, group_results, strict=True):
                     # Use the provided source_id for all code blocks
                     for block in code_blocks:
                         all_code_blocks.append({
                             "block": block,
-                            "source_url": source_url,
+                            "source_url": doc["url"],
                             "source_id": source_id,
                         })
 
-                # Update progress only after completing document extraction
-                completed_docs += 1
+                # Update progress only after completing the group's extraction
+                completed_docs += len(group)
                 if progress_callback and total_docs > 0:
                     # Report raw progress (0-100) for this extraction phase
                     raw_progress = int((completed_docs / total_docs) * 100)
@@ -387,13 +336,135 @@ class CodeExtractionService:
                         "total_documents": total_docs,
                         "code_blocks_found": len(all_code_blocks),
                     })
+        finally:
+            for task in group_tasks:
+                task.cancel()
+
+        return all_code_blocks
+
+    async def _load_extraction_settings(self) -> dict[str, Any]:
+        """Resolve every setting used during extraction into a plain dict."""
+        for key, default in EXTRACTION_SETTING_DEFAULTS.items():
+            await self._get_setting(key, default)
+        return {key: self._settings_cache[key] for key in EXTRACTION_SETTING_DEFAULTS}
+
+    async def _extract_code_blocks_from_document(self, doc: dict[str, Any]) -> list[dict[str, Any]]:
+        """
+        Extract code blocks from a single document.
+
+        Returns an empty list (and logs) when extraction fails so one bad page
+        doesn't abort the rest of its group.
+        """
+        try:
+            source_url = doc["url"]
+            html_content = doc.get("html", "")
+            md = doc.get("markdown", "")
+
+            # Debug logging
+            safe_logfire_info(
+                f"Document content check | url={source_url} | has_html={bool(html_content)} | has_markdown={bool(md)} | html_len={len(html_content) if html_content else 0} | md_len={len(md) if md else 0}"
+            )
+
+            # Get dynamic minimum length based on document context
 
-            except Exception as e:
-                safe_logfire_error(
-                    f"Error processing code from document | url={doc.get('url')} | error={str(e)}"
+            # Check markdown first to see if it has code blocks
+            if md:
+                has_backticks = "```" in md
+                backtick_count = md.count("```")
+                safe_logfire_info(
+                    f"Markdown check | url={source_url} | has_backticks={has_backticks} | backtick_count={backtick_count}"
                 )
 
-        return all_code_blocks
+                if "getting-started" in source_url and md:
+                    # Log a sample of the markdown
+                    sample = md[:500]
+                    safe_logfire_info(f"Markdown sample for getting-started: {sample}...")
+
+            # Improved extraction logic - check for text files first, then HTML, then markdown
+            code_blocks = []
+
+            # Check if this is a text file (e.g., .txt, .md, .html after cleaning) or PDF
+            is_text_file = source_url.endswith((
+                ".txt",
+                ".text",
+                ".md",
+                ".html",
+                ".htm",
+            )) or "text/plain" in doc.get("content_type", "") or "text/markdown" in doc.get("content_type", "")
+            
+            is_pdf_file = source_url.endswith(".pdf") or "application/pdf" in doc.get("content_type", "")
+
+            if is_text_file:
+                # For text files, use specialized text extraction
+                safe_logfire_info(f"🎯 TEXT FILE DETECTED | url={source_url}")
+                safe_logfire_info(
+                    f"📊 Content types - has_html={bool(html_content)}, has_md={bool(md)}"
+                )
+                # For text files, the HTML content should be the raw text (not wrapped in <pre>)
+                text_content = html_content if html_content else md
+                if text_content:
+                    safe_logfire_info(
+                        f"📝 Using {'HTML' if html_content else 'MARKDOWN'} content for text extraction"
+                    )
+                    safe_logfire_info(
+                        f"🔍 Content preview (first 500 chars): {repr(text_content[:500])}..."
+                    )
+                    code_blocks = await self._extract_text_file_code_blocks(
+                        text_content, source_url
+                    )
+                    safe_logfire_info(
+                        f"📦 Text extraction complete | found={len(code_blocks)} blocks | url={source_url}"
+                    )
+                else:
+                    safe_logfire_info(f"⚠️ NO CONTENT for text file | url={source_url}")
+
+            # If this is a PDF file, use specialized PDF extraction
+            elif is_pdf_file:
+                safe_logfire_info(f"📄 PDF FILE DETECTED | url={source_url}")
+                # For PDFs, use the content that should be PDF-extracted text
+                pdf_content = html_content if html_content else md
+                if pdf_content:
+                    safe_logfire_info(f"📝 Using {'HTML' if html_content else 'MARKDOWN'} content for PDF extraction")
+                    code_blocks = await self._extract_pdf_code_blocks(pdf_content, source_url)
+                    safe_logfire_info(f"📦 PDF extraction complete | found={len(code_blocks)} blocks | url={source_url}")
+                else:
+                    safe_logfire_info(f"⚠️ NO CONTENT for PDF file | url={source_url}")
+
+            # If not a text file or PDF, or no code blocks found, try HTML extraction as fallback
+            if len(code_blocks) == 0 and html_content and not is_text_file:
+                safe_logfire_info(
+                    f"Trying HTML extraction first | url={source_url} | html_length={len(html_content)}"
+                )
+                html_code_blocks = await self._extract_html_code_blocks(html_content)
+                if html_code_blocks:
+                    code_blocks = html_code_blocks
+                    safe_logfire_info(
+                        f"Found {len(code_blocks)} code blocks from HTML | url={source_url}"
+                    )
+
+            # If still no code blocks, try markdown extraction as fallback
+            if len(code_blocks) == 0 and md and "```" in md:
+                safe_logfire_info(
+                    f"No code blocks from HTML, trying markdown extraction | url={source_url}"
+                )
+                from ..storage.code_storage_service import extract_code_blocks
+
+                # Use dynamic minimum for markdown extraction
+                base_min_length = 250  # Default for markdown
+                code_blocks = extract_code_blocks(
+                    md, min_length=base_min_length, settings=self._settings_cache
+                )
+                safe_logfire_info(
+                    f"Found {len(code_blocks)} code blocks from markdown | url={source_url}"
+                )
+
+            return code_blocks
+
+        except Exception as e:
+            safe_logfire_error(
+                f"Error processing code from document | url={doc.get('url')} | error={str(e)}"
+            )
+            return []
 
     async def _extract_html_code_blocks(self, content: str) -> list[dict[str, Any]]:
         """
@@ -1731,3 +1802,55 @@ class CodeExtractionService:
         except Exception as e:
             safe_logfire_error(f"Error storing code examples | error={e}")
             raise RuntimeError("Failed to store code examples") from e
+
+
+def _document_size(doc: dict[str, Any]) -> int:
+    return len(doc.get("html") or "") + len(doc.get("markdown") or "")
+
+
+def _group_documents(crawl_results: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+    """Split documents into ordered groups bounded by size and document count."""
+    groups: list[list[dict[str, Any]]] = []
+    group_chars = 0
+    for doc in crawl_results:
+        size = _document_size(doc)
+        if (
+            not groups
+            or len(groups[-1]) >= PROCESS_POOL_GROUP_MAX_DOCUMENTS
+            or (groups[-1] and group_chars + size > PROCESS_POOL_GROUP_CHARS)
+        ):
+            groups.append([])
+            group_chars = 0
+        groups[-1].append(doc)
+        group_chars += size
+    return groups
+
+
+def _picklable_document(doc: dict[str, Any]) -> dict[str, Any]:
+    """The fields extraction reads, so worker tasks don't pickle whole crawl results."""
+    return {
+        "url": doc["url"],
+        "html": doc.get("html", ""),
+        "markdown": doc.get("markdown", ""),
+        "content_type": doc.get("content_type", ""),
+    }
+
+
+def extract_code_blocks_for_documents(
+    docs: list[dict[str, Any]], settings: dict[str, Any]
+) -> list[list[dict[str, Any]]]:
+    """
+    Process pool entry point: extract code blocks from a group of documents.
+
+    Runs with a settings snapshot so the worker never calls the credential service.
+
+    Returns:
+        One list of code blocks per document, in input order
+    """
+    service = CodeExtractionService(None)
+    service._settings_cache = dict(settings)
+
+    async def extract_all() -> list[list[dict[str, Any]]]:
+        return [await service._extract_code_blocks_from_document(doc) for doc in docs]
+
+    return asyncio.run(extract_all())
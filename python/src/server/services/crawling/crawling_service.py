@@ -22,11 +22,13 @@ from .helpers.site_config import SiteConfig
 
 # Import helpers
 from .helpers.url_handler import URLHandler
+from .page_fingerprints import PageFingerprintTracker
 from .progress_mapper import ProgressMapper
 from .strategies.batch import BatchCrawlStrategy
 from .strategies.recursive import RecursiveCrawlStrategy
 from .strategies.single_page import SinglePageCrawlStrategy
 from .strategies.sitemap import SitemapCrawlStrategy
+from .streaming_pipeline import StreamingIngestionPipeline, load_pipeline_settings
 
 logger = get_logger(__name__)
 
@@ -198,6 +200,8 @@ class CrawlingService:
         urls: list[str],
         max_concurrent: int | None = None,
         progress_callback: Callable[[str, int, str], Awaitable[None]] | None = None,
+        on_page: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+        filter_unchanged: Callable[[list[str]], Awaitable[dict[str, list[str]]]] | None = None,
     ) -> list[dict[str, Any]]:
         """Batch crawl multiple URLs in parallel."""
         return await self.batch_strategy.crawl_batch_with_progress(
@@ -207,6 +211,8 @@ class CrawlingService:
             max_concurrent,
             progress_callback,
             self._check_cancellation,  # Pass cancellation check
+            on_page=on_page,
+            filter_unchanged=filter_unchanged,
         )
 
     async def crawl_recursive_with_progress(
@@ -215,6 +221,8 @@ class CrawlingService:
         max_depth: int = 3,
         max_concurrent: int | None = None,
         progress_callback: Callable[[str, int, str], Awaitable[None]] | None = None,
+        on_page: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+        filter_unchanged: Callable[[list[str]], Awaitable[dict[str, list[str]]]] | None = None,
     ) -> list[dict[str, Any]]:
         """Recursively crawl internal links from start URLs."""
         return await self.recursive_strategy.crawl_recursive_with_progress(
@@ -225,6 +233,8 @@ class CrawlingService:
             max_concurrent,
             progress_callback,
             self._check_cancellation,  # Pass cancellation check
+            on_page=on_page,
+            filter_unchanged=filter_unchanged,
         )
 
     # Orchestration methods
@@ -289,6 +299,7 @@ class CrawlingService:
                 )
                 last_heartbeat = current_time
 
+        pipeline: StreamingIngestionPipeline | None = None
         try:
             url = str(request.get("url", ""))
             safe_logfire_info(f"Starting async crawl orchestration | url={url} | task_id={task_id}")
@@ -340,8 +351,18 @@ class CrawlingService:
                 processed_pages=0
             )
 
+            # Stream pages into chunking/embedding/storage while the crawl runs
+            pipeline_settings = await load_pipeline_settings()
+            if pipeline_settings["enabled"]:
+                pipeline = await self._create_streaming_pipeline(
+                    request, original_source_id, url, source_display_name, pipeline_settings
+                )
+                pipeline.start()
+            elif request.get("incremental"):
+                logger.info("Incremental refresh requires the streaming pipeline; refreshing all pages")
+
             # Detect URL type and perform crawl
-            crawl_results, crawl_type = await self._crawl_by_url_type(url, request)
+            crawl_results, crawl_type = await self._crawl_by_url_type(url, request, pipeline)
 
             # Update progress tracker with crawl type
             if self.progress_tracker and crawl_type:
@@ -360,7 +381,18 @@ class CrawlingService:
             # Send heartbeat after potentially long crawl operation
             await send_heartbeat_if_needed()
 
-            if not crawl_results:
+            if pipeline:
+                # Documents that were not streamed (single files) go through the same pipeline
+                for page in crawl_results:
+                    await pipeline.submit(page)
+                total_pages = pipeline.stats["pages_submitted"]
+                if pipeline.fingerprints:
+                    # Pages that answered 304 Not Modified were skipped, not lost
+                    total_pages += pipeline.fingerprints.stats["pages_not_modified"]
+            else:
+                total_pages = len(crawl_results)
+
+            if not total_pages:
                 raise ValueError("No content was crawled from the provided URL")
 
             # Processing stage
@@ -369,9 +401,6 @@ class CrawlingService:
             # Check for cancellation before document processing
             self._check_cancellation()
 
-            # Calculate total work units for accurate progress tracking
-            total_pages = len(crawl_results)
-
             # Process and store documents using document storage operations
             last_logged_progress = 0
 
@@ -408,16 +437,41 @@ class CrawlingService:
                         **kwargs
                     )
 
-            storage_results = await self.doc_storage_ops.process_and_store_documents(
-                crawl_results,
-                request,
-                crawl_type,
-                original_source_id,
-                doc_storage_callback,
-                self._check_cancellation,
-                source_url=url,
-                source_display_name=source_display_name,
-            )
+            if pipeline:
+                await update_mapped_progress(
+                    "document_storage",
+                    50,
+                    f"Storing remaining pages ({pipeline.stats['chunks_stored']} chunks already stored)",
+                    total_pages=total_pages,
+                )
+                storage_results = await pipeline.finish()
+                refresh_stats = self._incremental_refresh_stats(storage_results) if request.get("incremental") else {}
+                storage_message = f"Document storage completed: {storage_results['chunks_stored']} chunks stored"
+                if refresh_stats:
+                    storage_message += (
+                        f", {refresh_stats['pages_skipped']} unchanged pages and "
+                        f"{refresh_stats['chunks_skipped']} unchanged chunks skipped"
+                    )
+                await doc_storage_callback(
+                    "document_storage",
+                    100,
+                    storage_message,
+                    chunks_stored=storage_results["chunks_stored"],
+                    time_to_first_chunk_seconds=storage_results["time_to_first_chunk_seconds"],
+                    **refresh_stats,
+                )
+            else:
+                refresh_stats = {}
+                storage_results = await self.doc_storage_ops.process_and_store_documents(
+                    crawl_results,
+                    request,
+                    crawl_type,
+                    original_source_id,
+                    doc_storage_callback,
+                    self._check_cancellation,
+                    source_url=url,
+                    source_display_name=source_display_name,
+                )
 
             # Update progress tracker with source_id now that it's created
             if self.progress_tracker and storage_results.get("source_id"):
@@ -450,9 +504,9 @@ class CrawlingService:
                 safe_logfire_error(error_msg)
                 raise ValueError(error_msg)
 
-            # Extract code examples if requested
-            code_examples_count = 0
-            if request.get("extract_code_examples", True) and actual_chunks_stored > 0:
+            # Extract code examples if requested (the streaming pipeline already did it per batch)
+            code_examples_count = storage_results.get("code_examples_stored", 0)
+            if not pipeline and request.get("extract_code_examples", True) and actual_chunks_stored > 0:
                 # Check for cancellation before starting code extraction
                 self._check_cancellation()
 
@@ -475,16 +529,7 @@ class CrawlingService:
                         )
 
                 try:
-                    # Extract provider from request or use credential service default
-                    provider = request.get("provider")
-                    if not provider:
-                        try:
-                            from ..credential_service import credential_service
-                            provider_config = await credential_service.get_active_provider("llm")
-                            provider = provider_config.get("provider", "openai")
-                        except Exception as e:
-                            logger.warning(f"Failed to get provider from credential service: {e}, defaulting to openai")
-                            provider = "openai"
+                    provider = await self._get_code_summary_provider(request)
 
                     code_examples_count = await self.doc_storage_ops.extract_and_store_code_examples(
                         crawl_results,
@@ -531,8 +576,8 @@ class CrawlingService:
                 f"Crawl completed: {actual_chunks_stored} chunks, {code_examples_count} code examples",
                 chunks_stored=actual_chunks_stored,
                 code_examples_found=code_examples_count,
-                processed_pages=len(crawl_results),
-                total_pages=len(crawl_results),
+                processed_pages=total_pages,
+                total_pages=total_pages,
             )
 
             # Mark crawl as completed
@@ -540,10 +585,11 @@ class CrawlingService:
                 await self.progress_tracker.complete({
                     "chunks_stored": actual_chunks_stored,
                     "code_examples_found": code_examples_count,
-                    "processed_pages": len(crawl_results),
-                    "total_pages": len(crawl_results),
+                    "processed_pages": total_pages,
+                    "total_pages": total_pages,
                     "sourceId": storage_results.get("source_id", ""),
                     "log": "Crawl completed successfully!",
+                    **refresh_stats,
                 })
 
             # Unregister after successful completion
@@ -595,6 +641,82 @@ class CrawlingService:
                 safe_logfire_info(
                     f"Unregistered orchestration service on error | progress_id={self.progress_id}"
                 )
+        finally:
+            if pipeline:
+                await pipeline.aclose()
+
+    async def _get_code_summary_provider(self, request: dict[str, Any]) -> str:
+        """Get the LLM provider for code summaries from the request or the credential service default."""
+        provider = request.get("provider")
+        if not provider:
+            try:
+                from ..credential_service import credential_service
+                provider_config = await credential_service.get_active_provider("llm")
+                provider = provider_config.get("provider", "openai")
+            except Exception as e:
+                logger.warning(f"Failed to get provider from credential service: {e}, defaulting to openai")
+                provider = "openai"
+        return provider
+
+    @staticmethod
+    def _incremental_refresh_stats(storage_results: dict[str, Any]) -> dict[str, int]:
+        """Skipped/re-embedded counters reported by an incremental refresh."""
+        if "pages_not_modified" not in storage_results:
+            return {}
+        return {
+            "pages_skipped": storage_results["pages_not_modified"] + storage_results["pages_unchanged"],
+            "pages_not_modified": storage_results["pages_not_modified"],
+            "pages_unchanged": storage_results["pages_unchanged"],
+            "pages_changed": storage_results["pages_changed"],
+            "pages_new": storage_results["pages_new"],
+            "chunks_skipped": storage_results["chunks_skipped"],
+            "chunks_embedded": storage_results["chunks_embedded"],
+            "chunks_deleted": storage_results["chunks_deleted"],
+        }
+
+    async def _create_streaming_pipeline(
+        self,
+        request: dict[str, Any],
+        source_id: str,
+        source_url: str,
+        source_display_name: str,
+        settings: dict[str, Any],
+    ) -> StreamingIngestionPipeline:
+        """Create the pipeline that stores pages while they are being crawled."""
+        extract_code_examples = request.get("extract_code_examples", True)
+        provider = await self._get_code_summary_provider(request) if extract_code_examples else None
+
+        # Fingerprints are always recorded so a later refresh can be incremental
+        fingerprints = PageFingerprintTracker(
+            self.supabase_client, source_id, incremental=bool(request.get("incremental"))
+        )
+        await fingerprints.load()
+
+        async def pipeline_progress_callback(message: str, **counters):
+            # Counters only: the crawl stage keeps driving status and overall progress
+            if self.progress_tracker:
+                await self.progress_tracker.update(
+                    status=self.progress_tracker.state.get("status", "crawling"),
+                    progress=self.progress_tracker.state.get("progress", 0),
+                    log=message,
+                    **counters,
+                )
+
+        return StreamingIngestionPipeline(
+            self.doc_storage_ops,
+            request,
+            source_id,
+            source_url=source_url,
+            source_display_name=source_display_name,
+            extract_code_examples=extract_code_examples,
+            provider=provider,
+            queue_size=settings["queue_size"],
+            flush_chunks=settings["flush_chunks"],
+            flush_seconds=settings["flush_seconds"],
+            progress_callback=pipeline_progress_callback,
+            cancellation_check=self._check_cancellation,
+            fingerprints=fingerprints,
+        )
 
     def _is_self_link(self, link: str, base_url: str) -> bool:
         """
@@ -630,13 +752,29 @@ class CrawlingService:
             # Fallback to simple string comparison
             return link.rstrip('/') == base_url.rstrip('/')
 
-    async def _crawl_by_url_type(self, url: str, request: dict[str, Any]) -> tuple:
+    async def _crawl_by_url_type(
+        self,
+        url: str,
+        request: dict[str, Any],
+        pipeline: StreamingIngestionPipeline | None = None,
+    ) -> tuple:
         """
         Detect URL type and perform appropriate crawling.
 
+        Args:
+            url: URL to crawl
+            request: The crawl request
+            pipeline: Optional streaming pipeline; batch and recursive crawls hand
+                pages to it as they arrive instead of returning them
+
         Returns:
             Tuple of (crawl_results, crawl_type)
         """
+        on_page = pipeline.submit if pipeline else None
+        filter_unchanged = None
+        if pipeline and pipeline.fingerprints and pipeline.fingerprints.incremental:
+            async def filter_unchanged(urls: list[str]) -> dict[str, list[str]]:
+                return await pipeline.fingerprints.filter_not_modified(urls, self.url_handler.transform_github_url)
         crawl_results = []
         crawl_type = None
 
@@ -655,6 +793,8 @@ class CrawlingService:
         if self.url_handler.is_txt(url) or self.url_handler.is_markdown(url):
             # Handle text files
             crawl_type = "llms-txt" if "llms" in url.lower() else "text_file"
+            if pipeline:
+                pipeline.crawl_type = crawl_type
             await update_crawl_progress(
                 50,  # 50% of crawling stage
                 "Detected text file, fetching content...",
@@ -693,10 +833,14 @@ class CrawlingService:
                     if extracted_links:
                         # Crawl the extracted links using batch crawling
                         logger.info(f"Crawling {len(extracted_links)} extracted links from {url}")
+                        if pipeline:
+                            pipeline.crawl_type = "link_collection_with_crawled_links"
                         batch_results = await self.crawl_batch_with_progress(
                             extracted_links,
                             max_concurrent=request.get('max_concurrent'),  # None -> use DB settings
                             progress_callback=await self._create_crawl_progress_callback("crawling"),
+                            on_page=on_page,
+                            filter_unchanged=filter_unchanged,
                         )
 
                         # Combine original text file results with batch results
@@ -711,6 +855,8 @@ class CrawlingService:
         elif self.url_handler.is_sitemap(url):
             # Handle sitemaps
             crawl_type = "sitemap"
+            if pipeline:
+                pipeline.crawl_type = crawl_type
             await update_crawl_progress(
                 50,  # 50% of crawling stage
                 "Detected sitemap, parsing URLs...",
@@ -729,11 +875,15 @@ class CrawlingService:
                 crawl_results = await self.crawl_batch_with_progress(
                     sitemap_urls,
                     progress_callback=await self._create_crawl_progress_callback("crawling"),
+                    on_page=on_page,
+                    filter_unchanged=filter_unchanged,
                 )
 
         else:
             # Handle regular webpages with recursive crawling
             crawl_type = "normal"
+            if pipeline:
+                pipeline.crawl_type = crawl_type
             await update_crawl_progress(
                 50,  # 50% of crawling stage
                 f"Starting recursive crawl with max depth {request.get('max_depth', 1)}...",
@@ -749,6 +899,8 @@ class CrawlingService:
                 max_depth=max_depth,
                 max_concurrent=None,  # Let strategy use settings
                 progress_callback=await self._create_crawl_progress_callback("crawling"),
+                on_page=on_page,
+                filter_unchanged=filter_unchanged,
             )
 
         return crawl_results, crawl_type
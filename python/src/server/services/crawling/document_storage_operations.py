@@ -73,7 +73,17 @@ class DocumentStorageOperations:
         url_to_full_document = {}
         processed_docs = 0
 
-        # Process and chunk each document
+        # Chunk all documents up front; large crawls are chunked per document group in
+        # worker processes instead of one document at a time on the event loop
+        chunkable = [
+            (doc_index, (doc.get('markdown') or '').strip())
+            for doc_index, doc in enumerate(crawl_results)
+            if (doc.get('url') or '').strip() and (doc.get('markdown') or '').strip()
+        ]
+        chunked = await storage_service.smart_chunk_texts_async([text for _, text in chunkable], chunk_size=5000)
+        chunks_by_doc = {doc_index: chunks for (doc_index, _), chunks in zip(chunkable, chunked, strict=True)}
+
+        # Process each chunked document
         for doc_index, doc in enumerate(crawl_results):
             # Check for cancellation during document processing
             if cancellation_check:
@@ -102,8 +112,7 @@ class DocumentStorageOperations:
             # Store full document for code extraction context
             url_to_full_document[doc_url] = markdown_content
 
-            # CHUNK THE CONTENT
-            chunks = await storage_service.smart_chunk_text_async(markdown_content, chunk_size=5000)
+            chunks = chunks_by_doc[doc_index]
 
             # Use the original source_id for all documents
             source_id = original_source_id
@@ -129,19 +138,8 @@ class DocumentStorageOperations:
                 all_contents.append(chunk)
 
                 # Create metadata for each chunk
-                word_count = len(chunk.split())
-                metadata = {
-                    "url": doc_url,
-                    "title": doc.get("title", ""),
-                    "description": doc.get("description", ""),
-                    "source_id": source_id,
-                    "knowledge_type": request.get("knowledge_type", "documentation"),
-                    "crawl_type": crawl_type,
-                    "word_count": word_count,
-                    "char_count": len(chunk),
-                    "chunk_index": i,
-                    "tags": request.get("tags", []),
-                }
+                metadata = self._build_chunk_metadata(doc, doc_url, chunk, i, request, crawl_type, source_id)
+                word_count = metadata["word_count"]
                 all_metadatas.append(metadata)
 
                 # Accumulate word count
@@ -197,6 +195,64 @@ class DocumentStorageOperations:
             'source_id': original_source_id
         }
 
+    async def chunk_document(
+        self,
+        doc: dict,
+        request: dict[str, Any],
+        crawl_type: str,
+        source_id: str,
+    ) -> tuple[str, list[str], list[dict]] | None:
+        """
+        Chunk a single crawled document and build per-chunk metadata.
+
+        Used by the streaming pipeline, which chunks pages one at a time as they are crawled.
+
+        Args:
+            doc: Crawled document with url and markdown
+            request: The original crawl request
+            crawl_type: Type of crawl performed
+            source_id: The source ID for the document
+
+        Returns:
+            Tuple of (url, chunks, metadatas), or None if the document has no URL or content
+        """
+        doc_url = (doc.get('url') or '').strip()
+        markdown_content = (doc.get('markdown') or '').strip()
+        if not markdown_content or not doc_url:
+            logger.debug(f"Skipping document: empty {'URL' if not doc_url else 'content'}")
+            return None
+
+        chunks = await self.doc_storage_service.smart_chunk_text_async(markdown_content, chunk_size=5000)
+        metadatas = [
+            self._build_chunk_metadata(doc, doc_url, chunk, i, request, crawl_type, source_id)
+            for i, chunk in enumerate(chunks)
+        ]
+        return doc_url, chunks, metadatas
+
+    @staticmethod
+    def _build_chunk_metadata(
+        doc: dict,
+        doc_url: str,
+        chunk: str,
+        chunk_index: int,
+        request: dict[str, Any],
+        crawl_type: str,
+        source_id: str,
+    ) -> dict[str, Any]:
+        """Build the metadata stored alongside a chunk."""
+        return {
+            "url": doc_url,
+            "title": doc.get("title", ""),
+            "description": doc.get("description", ""),
+            "source_id": source_id,
+            "knowledge_type": request.get("knowledge_type", "documentation"),
+            "crawl_type": crawl_type,
+            "word_count": len(chunk.split()),
+            "char_count": len(chunk),
+            "chunk_index": chunk_index,
+            "tags": request.get("tags", []),
+        }
+
     async def _create_source_records(
         self,
         all_metadatas: list[dict],
@@ -0,0 +1,262 @@
+"""
+Page Fingerprints
+
+Per-URL fingerprints that make knowledge refreshes incremental.
+
+Every stored page records its ETag/Last-Modified validators, a hash of its markdown,
+the hashes of its chunks and (for recursive crawls) its internal links. On an
+incremental refresh:
+
+- pages with validators get a conditional GET first; a 304 skips the page entirely,
+  and its stored links keep recursive discovery going
+- crawled pages whose content hash is unchanged are skipped before embedding and storage
+- changed pages are diffed chunk by chunk so only new or changed chunks are
+  re-embedded and upserted, and chunks past the new end of the page are deleted
+"""
+
+import asyncio
+import hashlib
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from ...config.logfire_config import get_logger, safe_logfire_info
+
+logger = get_logger(__name__)
+
+FINGERPRINT_TABLE = "archon_page_fingerprints"
+
+CONDITIONAL_REQUEST_CONCURRENCY = 10
+CONDITIONAL_REQUEST_TIMEOUT = 10.0
+
+# Rows fetched per request when loading a source's fingerprints
+_LOAD_PAGE_SIZE = 1000
+
+
+def hash_text(text: str) -> str:
+    """Content hash used for pages and chunks."""
+    return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+
+
+def get_header(headers: dict[str, Any] | None, name: str) -> str | None:
+    """Case-insensitive response header lookup."""
+    if not headers:
+        return None
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return str(value) if value else None
+    return None
+
+
+@dataclass
+class PageFingerprint:
+    """What a page looked like when it was last stored."""
+
+    url: str
+    content_hash: str
+    chunk_hashes: list[str] = field(default_factory=list)
+    etag: str | None = None
+    last_modified: str | None = None
+    internal_links: list[str] = field(default_factory=list)
+    word_count: int = 0
+
+    @classmethod
+    def from_row(cls, row: dict[str, Any]) -> "PageFingerprint":
+        return cls(
+            url=row["url"],
+            content_hash=row["content_hash"],
+            chunk_hashes=row.get("chunk_hashes") or [],
+            etag=row.get("etag"),
+            last_modified=row.get("last_modified"),
+            internal_links=row.get("internal_links") or [],
+            word_count=row.get("word_count") or 0,
+        )
+
+    def to_row(self, source_id: str) -> dict[str, Any]:
+        return {
+            "source_id": source_id,
+            "url": self.url,
+            "content_hash": self.content_hash,
+            "chunk_hashes": self.chunk_hashes,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "internal_links": self.internal_links,
+            "word_count": self.word_count,
+        }
+
+
+@dataclass
+class ChunkDiff:
+    """Chunk-level difference between a crawled page and its stored fingerprint."""
+
+    unchanged: bool
+    changed_indices: list[int]
+    removed_indices: list[int]
+    # None when there is no usable fingerprint and every existing row must be replaced
+    previous_chunk_count: int | None = None
+
+
+class PageFingerprintTracker:
+    """
+    Loads, compares and records page fingerprints for one source during a crawl.
+
+    Fingerprints are always recorded so the next refresh has a baseline; comparisons
+    only happen when ``incremental`` is set.
+    """
+
+    def __init__(self, supabase_client, source_id: str, incremental: bool = False):
+        self.supabase_client = supabase_client
+        self.source_id = source_id
+        self.incremental = incremental
+        self.previous: dict[str, PageFingerprint] = {}
+        self._pending: dict[str, PageFingerprint] = {}
+        self._available = True
+        # Words on pages that answered 304, which keep counting towards the source total
+        self.not_modified_word_count = 0
+        self.stats: dict[str, int] = {
+            "pages_not_modified": 0,
+            "pages_unchanged": 0,
+            "pages_changed": 0,
+            "pages_new": 0,
+            "chunks_skipped": 0,
+            "chunks_embedded": 0,
+            "chunks_deleted": 0,
+        }
+
+    async def load(self) -> None:
+        """Load the fingerprints stored by the previous crawl of this source."""
+        if not self.incremental:
+            return
+        rows: list[dict[str, Any]] = []
+        try:
+            offset = 0
+            while True:
+                response = await asyncio.to_thread(
+                    self.supabase_client.table(FINGERPRINT_TABLE)
+                    .select("*")
+                    .eq("source_id", self.source_id)
+                    .range(offset, offset + _LOAD_PAGE_SIZE - 1)
+                    .execute
+                )
+                batch = response.data or []
+                rows.extend(batch)
+                if len(batch) < _LOAD_PAGE_SIZE:
+                    break
+                offset += _LOAD_PAGE_SIZE
+        except Exception as e:
+            self._disable(e)
+            return
+
+        self.previous = {row["url"]: PageFingerprint.from_row(row) for row in rows}
+        safe_logfire_info(
+            f"Loaded {len(self.previous)} page fingerprints for incremental refresh | source_id={self.source_id}"
+        )
+
+    def _disable(self, error: Exception) -> None:
+        if self._available:
+            logger.warning(
+                f"Page fingerprints unavailable ({error}); refreshing without them. "
+                f"Run migration 009_add_page_fingerprints.sql to enable incremental refresh."
+            )
+        self._available = False
+        self.incremental = False
+        self.previous = {}
+
+    async def filter_not_modified(
+        self, urls: list[str], transform_url: Callable[[str], str] | None = None
+    ) -> dict[str, list[str]]:
+        """
+        Send conditional GETs for previously stored pages that have validators.
+
+        Args:
+            urls: Candidate URLs about to be crawled
+            transform_url: URL transform applied by the crawl strategy (e.g. GitHub raw URLs)
+
+        Returns:
+            Mapping of URLs that answered 304 Not Modified to their stored internal links
+        """
+        if not self.incremental:
+            return {}
+        candidates = [
+            url for url in urls
+            if url in self.previous and (self.previous[url].etag or self.previous[url].last_modified)
+        ]
+        if not candidates:
+            return {}
+
+        semaphore = asyncio.Semaphore(CONDITIONAL_REQUEST_CONCURRENCY)
+        not_modified: dict[str, list[str]] = {}
+
+        async def check(client: httpx.AsyncClient, url: str) -> None:
+            fingerprint = self.previous[url]
+            headers = {}
+            if fingerprint.etag:
+                headers["If-None-Match"] = fingerprint.etag
+            if fingerprint.last_modified:
+                headers["If-Modified-Since"] = fingerprint.last_modified
+            async with semaphore:
+                try:
+                    target = transform_url(url) if transform_url else url
+                    async with client.stream("GET", target, headers=headers) as response:
+                        if response.status_code == 304:
+                            not_modified[url] = fingerprint.internal_links
+                except httpx.HTTPError as e:
+                    logger.debug(f"Conditional request failed for {url}: {e}")
+
+        async with httpx.AsyncClient(follow_redirects=True, timeout=CONDITIONAL_REQUEST_TIMEOUT) as client:
+            await asyncio.gather(*(check(client, url) for url in candidates))
+
+        self.stats["pages_not_modified"] += len(not_modified)
+        for url in not_modified:
+            self.stats["chunks_skipped"] += len(self.previous[url].chunk_hashes)
+            self.not_modified_word_count += self.previous[url].word_count
+        return not_modified
+
+    def diff(self, url: str, content_hash: str, chunk_hashes: list[str]) -> ChunkDiff:
+        """
+        Compare a crawled page with its stored fingerprint.
+
+        Without a previous fingerprint (or outside incremental mode) every chunk is
+        treated as changed and all existing rows for the URL are replaced.
+        """
+        previous = self.previous.get(url) if self.incremental else None
+        if previous is None:
+            if self.incremental:
+                self.stats["pages_new"] += 1
+            self.stats["chunks_embedded"] += len(chunk_hashes)
+            return ChunkDiff(False, list(range(len(chunk_hashes))), [], None)
+
+        if previous.content_hash == content_hash:
+            self.stats["pages_unchanged"] += 1
+            self.stats["chunks_skipped"] += len(chunk_hashes)
+            return ChunkDiff(True, [], [], len(previous.chunk_hashes))
+
+        old = previous.chunk_hashes
+        changed = [i for i, h in enumerate(chunk_hashes) if i >= len(old) or old[i] != h]
+        removed = list(range(len(chunk_hashes), len(old)))
+        self.stats["pages_changed"] += 1
+        self.stats["chunks_skipped"] += len(chunk_hashes) - len(changed)
+        self.stats["chunks_embedded"] += len(changed)
+        self.stats["chunks_deleted"] += len(removed)
+        return ChunkDiff(False, changed, removed, len(old))
+
+    def record(self, fingerprint: PageFingerprint) -> None:
+        """Queue a fingerprint to be saved with the next ``save()``."""
+        self._pending[fingerprint.url] = fingerprint
+
+    async def save(self) -> None:
+        """Upsert queued fingerprints."""
+        if not self._pending or not self._available:
+            self._pending.clear()
+            return
+        rows = [fingerprint.to_row(self.source_id) for fingerprint in self._pending.values()]
+        self._pending.clear()
+        try:
+            await asyncio.to_thread(
+                self.supabase_client.table(FINGERPRINT_TABLE).upsert(rows, on_conflict="source_id,url").execute
+            )
+        except Exception as e:
+            self._disable(e)
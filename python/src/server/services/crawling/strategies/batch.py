@@ -12,6 +12,7 @@ from crawl4ai import CacheMode, CrawlerRunConfig, MemoryAdaptiveDispatcher
 
 from ....config.logfire_config import get_logger
 from ...credential_service import credential_service
+from ..page_fingerprints import get_header
 
 logger = get_logger(__name__)
 
@@ -38,6 +39,8 @@ class BatchCrawlStrategy:
         max_concurrent: int | None = None,
         progress_callback: Callable[..., Awaitable[None]] | None = None,
         cancellation_check: Callable[[], None] | None = None,
+        on_page: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+        filter_unchanged: Callable[[list[str]], Awaitable[dict[str, list[str]]]] | None = None,
     ) -> list[dict[str, Any]]:
         """
         Batch crawl multiple URLs in parallel with progress reporting.
@@ -49,9 +52,13 @@ class BatchCrawlStrategy:
             max_concurrent: Maximum concurrent crawls
             progress_callback: Optional callback for progress updates
             cancellation_check: Optional function to check for cancellation
+            on_page: Optional async sink for each successful page. When given, pages are
+                streamed to it as they arrive instead of being collected in the result list.
+            filter_unchanged: Optional async check returning the URLs that were not modified
+                since the last crawl; those URLs are not crawled again.
 
         Returns:
-            List of crawl results
+            List of crawl results (empty when pages are streamed to on_page)
         """
         if not self.crawler:
             logger.error("No crawler instance available for batch crawling")
@@ -99,6 +106,12 @@ class BatchCrawlStrategy:
             check_interval = 0.5
             settings = {}  # Empty dict for defaults
 
+        if filter_unchanged:
+            not_modified = await filter_unchanged(urls)
+            if not_modified:
+                logger.info(f"Skipping {len(not_modified)} URLs that were not modified since the last crawl")
+                urls = [url for url in urls if url not in not_modified]
+
         # Check if any URLs are documentation sites
         has_doc_sites = any(is_documentation_site_func(url) for url in urls)
 
@@ -159,6 +172,7 @@ class BatchCrawlStrategy:
 
         # Use configured batch size
         successful_results = []
+        successful_count = 0
         processed = 0
         cancelled = False
 
@@ -183,7 +197,7 @@ class BatchCrawlStrategy:
                         status="cancelled",
                         total_pages=total_urls,
                         processed_pages=processed,
-                        successful_count=len(successful_results),
+                        successful_count=successful_count,
                     )
                     break
 
@@ -223,7 +237,7 @@ class BatchCrawlStrategy:
                             status="cancelled",
                             total_pages=total_urls,
                             processed_pages=processed,
-                            successful_count=len(successful_results),
+                            successful_count=successful_count,
                         )
                         break
                     except Exception:
@@ -234,11 +248,20 @@ class BatchCrawlStrategy:
                 if result.success and result.markdown and result.markdown.fit_markdown:
                     # Map back to original URL
                     original_url = url_mapping.get(result.url, result.url)
-                    successful_results.append({
+                    headers = getattr(result, "response_headers", None)
+                    page = {
                         "url": original_url,
                         "markdown": result.markdown.fit_markdown,
                         "html": result.html,  # Use raw HTML
-                    })
+                        "etag": get_header(headers, "etag"),
+                        "last_modified": get_header(headers, "last-modified"),
+                    }
+                    successful_count += 1
+                    if on_page:
+                        # Blocks while the downstream pipeline is full (backpressure)
+                        await on_page(page)
+                    else:
+                        successful_results.append(page)
                 else:
                     logger.warning(
                         f"Failed to crawl {result.url}: {getattr(result, 'error_message', 'Unknown error')}"
@@ -256,7 +279,7 @@ class BatchCrawlStrategy:
                         f"Crawled {processed}/{total_urls} pages",
                         total_pages=total_urls,
                         processed_pages=processed,
-                        successful_count=len(successful_results)
+                        successful_count=successful_count
                     )
             if cancelled:
                 break
@@ -265,9 +288,9 @@ class BatchCrawlStrategy:
             return successful_results
         await report_progress(
             100,
-            f"Batch crawling completed: {len(successful_results)}/{total_urls} pages successful",
+            f"Batch crawling completed: {successful_count}/{total_urls} pages successful",
             total_pages=total_urls,
             processed_pages=processed,
-            successful_count=len(successful_results)
+            successful_count=successful_count
         )
         return successful_results
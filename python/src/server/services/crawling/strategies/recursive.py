@@ -14,6 +14,7 @@ from crawl4ai import CacheMode, CrawlerRunConfig, MemoryAdaptiveDispatcher
 from ....config.logfire_config import get_logger
 from ...credential_service import credential_service
 from ..helpers.url_handler import URLHandler
+from ..page_fingerprints import get_header
 
 logger = get_logger(__name__)
 
@@ -42,6 +43,8 @@ class RecursiveCrawlStrategy:
         max_concurrent: int | None = None,
         progress_callback: Callable[..., Awaitable[None]] | None = None,
         cancellation_check: Callable[[], None] | None = None,
+        on_page: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+        filter_unchanged: Callable[[list[str]], Awaitable[dict[str, list[str]]]] | None = None,
     ) -> list[dict[str, Any]]:
         """
         Recursively crawl internal links from start URLs up to a maximum depth with progress reporting.
@@ -54,9 +57,14 @@ class RecursiveCrawlStrategy:
             max_concurrent: Maximum concurrent crawls
             progress_callback: Optional callback for progress updates
             cancellation_check: Optional function to check for cancellation
+            on_page: Optional async sink for each successful page. When given, pages are
+                streamed to it as they arrive instead of being collected in the result list.
+            filter_unchanged: Optional async check returning the URLs that were not modified
+                since the last crawl, mapped to their stored internal links. Those pages are
+                not crawled again, but their links are still followed.
 
         Returns:
-            List of crawl results
+            List of crawl results (empty when pages are streamed to on_page)
         """
         if not self.crawler:
             logger.error("No crawler instance available for recursive crawling")
@@ -162,9 +170,24 @@ class RecursiveCrawlStrategy:
 
         current_urls = {normalize_url(u) for u in start_urls}
         results_all = []
+        total_successful = 0
         total_processed = 0
         total_discovered = len(current_urls)  # Track total URLs discovered (normalized & de-duped)
         cancelled = False
+        next_level_urls: set[str] = set()
+
+        def queue_link(link_url: str) -> list[str]:
+            """Add a discovered link to the next depth; returns it when it is crawlable."""
+            nonlocal total_discovered
+            next_url = normalize_url(link_url)
+            # Skip binary files and already visited URLs
+            if self.url_handler.is_binary_file(next_url):
+                logger.debug(f"Skipping binary file from crawl queue: {next_url}")
+                return []
+            if next_url not in visited and next_url not in next_level_urls:
+                next_level_urls.add(next_url)
+                total_discovered += 1  # Increment when we discover a new URL
+            return [next_url]
 
         for depth in range(max_depth):
             # Check for cancellation at the start of each depth level
@@ -188,7 +211,24 @@ class RecursiveCrawlStrategy:
             urls_to_crawl = [
                 normalize_url(url) for url in current_urls if normalize_url(url) not in visited
             ]
+            next_level_urls = set()
+
+            if filter_unchanged and urls_to_crawl:
+                not_modified = await filter_unchanged(urls_to_crawl)
+                if not_modified:
+                    logger.info(
+                        f"Skipping {len(not_modified)} URLs at depth {depth + 1} that were not modified since the last crawl"
+                    )
+                    visited.update(not_modified)
+                    urls_to_crawl = [url for url in urls_to_crawl if url not in not_modified]
+                    for links in not_modified.values():
+                        for link in links:
+                            queue_link(link)
+
             if not urls_to_crawl:
+                if next_level_urls:
+                    current_urls = next_level_urls
+                    continue
                 break
 
             # Calculate progress for this depth level
@@ -203,7 +243,6 @@ class RecursiveCrawlStrategy:
             )
 
             # Use configured batch size for recursive crawling
-            next_level_urls = set()
             depth_successful = 0
 
             for batch_idx in range(0, len(urls_to_crawl), batch_size):
@@ -277,25 +316,28 @@ class RecursiveCrawlStrategy:
                     total_processed += 1
 
                     if result.success and result.markdown and result.markdown.fit_markdown:
-                        results_all.append({
+                        # Find internal links for next depth
+                        internal_links = []
+                        links = getattr(result, "links", {}) or {}
+                        for link in links.get("internal", []):
+                            internal_links.extend(queue_link(link["href"]))
+
+                        headers = getattr(result, "response_headers", None)
+                        page = {
                             "url": original_url,
                             "markdown": result.markdown.fit_markdown,
                             "html": result.html,  # Always use raw HTML for code extraction
-                        })
+                            "etag": get_header(headers, "etag"),
+                            "last_modified": get_header(headers, "last-modified"),
+                            "internal_links": internal_links,
+                        }
+                        if on_page:
+                            # Blocks while the downstream pipeline is full (backpressure)
+                            await on_page(page)
+                        else:
+                            results_all.append(page)
                         depth_successful += 1
-
-                        # Find internal links for next depth
-                        links = getattr(result, "links", {}) or {}
-                        for link in links.get("internal", []):
-                            next_url = normalize_url(link["href"])
-                            # Skip binary files and already visited URLs
-                            is_binary = self.url_handler.is_binary_file(next_url)
-                            if next_url not in visited and not is_binary:
-                                if next_url not in next_level_urls:
-                                    next_level_urls.add(next_url)
-                                    total_discovered += 1  # Increment when we discover a new URL
-                            elif is_binary:
-                                logger.debug(f"Skipping binary file from crawl queue: {next_url}")
+                        total_successful += 1
                     else:
                         logger.warning(
                             f"Failed to crawl {original_url}: {getattr(result, 'error_message', 'Unknown error')}"
@@ -324,7 +366,7 @@ class RecursiveCrawlStrategy:
             return results_all
         await report_progress(
             100,
-            f"Recursive crawling completed: {len(results_all)} total pages crawled across {max_depth} depth levels",
+            f"Recursive crawling completed: {total_successful} total pages crawled across {max_depth} depth levels",
             total_pages=total_discovered,
             processed_pages=total_processed,
         )
@@ -0,0 +1,482 @@
+"""
+Streaming Ingestion Pipeline
+
+Chunks, embeds and stores crawled pages while the crawl is still running.
+
+Pages flow through bounded queues:
+
+    crawler --(page queue)--> chunk/embed/store worker --(code queue)--> code extraction worker
+
+The crawl strategies hand each page to ``submit()``, which blocks when the page queue
+is full, so a slow embedding provider applies backpressure to the crawler instead of
+the crawl buffering every page's markdown and HTML. Chunks are flushed to storage
+once enough have accumulated (or after a short wait), so the first chunks become
+searchable seconds into a crawl rather than after it finishes. Peak memory is bounded
+by the queue depths, not by the size of the site.
+
+With a PageFingerprintTracker the pipeline also refreshes incrementally: pages whose
+content hash matches the previous crawl are skipped, and changed pages only re-embed
+and replace the chunks that differ.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from ...config.logfire_config import get_logger, safe_logfire_error, safe_logfire_info, safe_span
+from ..search.rag_result_cache import bump_index_generation
+from ..storage.document_storage_service import add_documents_to_supabase
+from .page_fingerprints import PageFingerprint, PageFingerprintTracker, hash_text
+
+logger = get_logger(__name__)
+
+DEFAULT_QUEUE_SIZE = 20
+DEFAULT_FLUSH_CHUNKS = 100
+DEFAULT_FLUSH_SECONDS = 2.0
+
+# Flushed page batches waiting for code extraction
+CODE_QUEUE_SIZE = 2
+
+_END = object()
+
+
+async def load_pipeline_settings() -> dict[str, Any]:
+    """
+    Load streaming pipeline settings from the rag_strategy category.
+
+    Returns:
+        Dict with enabled, queue_size, flush_chunks and flush_seconds
+    """
+    try:
+        from ..credential_service import credential_service
+
+        settings = await credential_service.get_credentials_by_category("rag_strategy")
+    except Exception as e:
+        logger.warning(f"Failed to load streaming pipeline settings: {e}, using defaults")
+        settings = {}
+
+    def _number(key: str, default, cast):
+        try:
+            return cast(settings.get(key, default))
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid {key}={settings.get(key)!r}, using {default}")
+            return default
+
+    return {
+        "enabled": str(settings.get("CRAWL_STREAMING_PIPELINE", "true")).lower() == "true",
+        "queue_size": max(1, _number("CRAWL_PIPELINE_QUEUE_SIZE", DEFAULT_QUEUE_SIZE, int)),
+        "flush_chunks": max(1, _number("CRAWL_PIPELINE_FLUSH_CHUNKS", DEFAULT_FLUSH_CHUNKS, int)),
+        "flush_seconds": max(0.0, _number("CRAWL_PIPELINE_FLUSH_SECONDS", DEFAULT_FLUSH_SECONDS, float)),
+    }
+
+
+class StreamingIngestionPipeline:
+    """
+    Bounded-queue pipeline from crawled pages to stored chunks and code examples.
+
+    Usage:
+        pipeline = StreamingIngestionPipeline(doc_storage_ops, request, source_id, ...)
+        pipeline.start()
+        await strategy.crawl(..., on_page=pipeline.submit)
+        results = await pipeline.finish()
+    """
+
+    def __init__(
+        self,
+        doc_storage_ops,
+        request: dict[str, Any],
+        source_id: str,
+        crawl_type: str | None = None,
+        source_url: str | None = None,
+        source_display_name: str | None = None,
+        extract_code_examples: bool = True,
+        provider: str | None = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        flush_chunks: int = DEFAULT_FLUSH_CHUNKS,
+        flush_seconds: float = DEFAULT_FLUSH_SECONDS,
+        progress_callback: Callable[..., Awaitable[None]] | None = None,
+        cancellation_check: Callable[[], None] | None = None,
+        fingerprints: PageFingerprintTracker | None = None,
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            doc_storage_ops: DocumentStorageOperations used for chunking, source records and code extraction
+            request: The original crawl request
+            source_id: The source ID for all documents
+            crawl_type: Type of crawl; may be set later, before the first page is submitted
+            source_url: Original URL that was crawled
+            source_display_name: Human-readable name for the source
+            extract_code_examples: Whether to extract code examples from stored pages
+            provider: LLM provider for code summaries
+            queue_size: Maximum pages waiting to be chunked before the crawler blocks
+            flush_chunks: Number of buffered chunks that triggers a storage flush
+            flush_seconds: Maximum time a buffered chunk waits for a flush
+            progress_callback: Optional async callback receiving (message, **counters)
+            cancellation_check: Optional function to check for cancellation
+            fingerprints: Optional tracker that records page fingerprints and, in incremental
+                mode, skips unchanged pages and chunks
+        """
+        self.doc_storage_ops = doc_storage_ops
+        self.request = request
+        self.source_id = source_id
+        self.crawl_type = crawl_type
+        self.source_url = source_url
+        self.source_display_name = source_display_name
+        self.extract_code_examples = extract_code_examples
+        self.provider = provider
+        self.flush_chunks = max(1, flush_chunks)
+        self.flush_seconds = max(0.0, flush_seconds)
+        self.progress_callback = progress_callback
+        self.cancellation_check = cancellation_check
+        self.fingerprints = fingerprints
+
+        self._pages: asyncio.Queue = asyncio.Queue(maxsize=max(1, queue_size))
+        self._code_batches: asyncio.Queue = asyncio.Queue(maxsize=CODE_QUEUE_SIZE)
+        self._storage_task: asyncio.Task | None = None
+        self._code_task: asyncio.Task | None = None
+        self._error: BaseException | None = None
+
+        # Chunks buffered for the next flush
+        self._urls: list[str] = []
+        self._chunk_numbers: list[int] = []
+        self._contents: list[str] = []
+        self._metadatas: list[dict[str, Any]] = []
+        self._buffered_pages: list[dict[str, Any]] = []
+        self._buffered_fingerprints: list[PageFingerprint] = []
+        # Rows to delete before the next insert: chunk numbers per URL, None for every row
+        self._deletions: dict[str, list[int] | None] = {}
+        self._flush_deadline: float | None = None
+
+        self._source_created = False
+        self._started_at: float | None = None
+        self.stats: dict[str, Any] = {
+            "pages_submitted": 0,
+            "pages_processed": 0,
+            "pages_skipped": 0,
+            "chunk_count": 0,
+            "chunks_stored": 0,
+            "total_word_count": 0,
+            "flushes": 0,
+            "code_examples_stored": 0,
+            "code_extraction_errors": 0,
+            "peak_queue_depth": 0,
+            "embedding_cache_hits": 0,
+            "embedding_cache_misses": 0,
+            "time_to_first_chunk_seconds": None,
+        }
+
+    def start(self) -> None:
+        """Start the storage and code extraction workers."""
+        if self._storage_task is not None:
+            return
+        self._started_at = time.monotonic()
+        self._storage_task = asyncio.create_task(self._storage_worker())
+        self._code_task = asyncio.create_task(self._code_worker())
+
+    async def submit(self, page: dict[str, Any]) -> None:
+        """
+        Hand a crawled page to the pipeline.
+
+        Blocks while the page queue is full, which slows the crawler down to the pace
+        of chunking and embedding. Raises the worker's error if the pipeline failed.
+        """
+        self._raise_if_failed()
+        await self._pages.put(page)
+        self.stats["pages_submitted"] += 1
+        self.stats["peak_queue_depth"] = max(self.stats["peak_queue_depth"], self._pages.qsize())
+
+    async def finish(self) -> dict[str, Any]:
+        """
+        Drain the queues, wait for both workers and return storage statistics.
+
+        Returns:
+            Dict with the same keys as DocumentStorageOperations.process_and_store_documents
+            plus pipeline counters
+        """
+        if self._storage_task is None:
+            self.start()
+        await self._pages.put(_END)
+        await asyncio.gather(self._storage_task, self._code_task)
+        self._raise_if_failed()
+
+        if self.fingerprints:
+            await self.fingerprints.save()
+            self.stats["total_word_count"] += self.fingerprints.not_modified_word_count
+
+        if self.stats["flushes"] > 1 or self._is_incremental_refresh():
+            await self._update_source_word_count()
+
+        safe_logfire_info(
+            f"Streaming pipeline finished | source_id={self.source_id} | "
+            f"pages={self.stats['pages_processed']}/{self.stats['pages_submitted']} | "
+            f"chunks_stored={self.stats['chunks_stored']} | flushes={self.stats['flushes']} | "
+            f"code_examples={self.stats['code_examples_stored']} | "
+            f"time_to_first_chunk={self.stats['time_to_first_chunk_seconds']}s | "
+            f"peak_queue_depth={self.stats['peak_queue_depth']}"
+        )
+        return {
+            **self.stats,
+            **(self.fingerprints.stats if self.fingerprints else {}),
+            "url_to_full_document": {},
+            "source_id": self.source_id,
+        }
+
+    async def aclose(self) -> None:
+        """Cancel the workers if they are still running (error or cancellation paths)."""
+        tasks = [task for task in (self._storage_task, self._code_task) if task and not task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _is_incremental_refresh(self) -> bool:
+        """True when refreshing an existing source against its stored fingerprints."""
+        return bool(self.fingerprints and self.fingerprints.incremental and self.fingerprints.previous)
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def _record_error(self, error: BaseException) -> None:
+        if self._error is None:
+            self._error = error
+
+    async def _report(self, message: str) -> None:
+        if not self.progress_callback:
+            return
+        try:
+            await self.progress_callback(
+                message,
+                pages_stored=self.stats["pages_processed"],
+                chunks_stored=self.stats["chunks_stored"],
+                code_examples_found=self.stats["code_examples_stored"],
+                embedding_cache_hits=self.stats["embedding_cache_hits"],
+                embedding_cache_misses=self.stats["embedding_cache_misses"],
+            )
+        except Exception as e:
+            logger.warning(f"Streaming pipeline progress callback failed: {e}")
+
+    async def _storage_worker(self) -> None:
+        """Chunk pages as they arrive and flush chunks to storage in batches."""
+        loop = asyncio.get_running_loop()
+        while True:
+            timeout = None
+            if self._flush_deadline is not None:
+                timeout = max(0.0, self._flush_deadline - loop.time())
+            try:
+                page = await asyncio.wait_for(self._pages.get(), timeout)
+            except TimeoutError:
+                page = None
+
+            if self._error is not None:
+                # Keep draining so a blocked crawler can observe the failure
+                if page is _END:
+                    break
+                continue
+
+            try:
+                if page is None or page is _END:
+                    await self._flush()
+                else:
+                    await self._chunk_page(page)
+                    if len(self._contents) >= self.flush_chunks:
+                        await self._flush()
+                    elif self._has_buffered() and self._flush_deadline is None:
+                        self._flush_deadline = loop.time() + self.flush_seconds
+            except (asyncio.CancelledError, Exception) as e:
+                if isinstance(e, asyncio.CancelledError) and asyncio.current_task().cancelling():
+                    raise
+                logger.error("Streaming pipeline storage worker failed", exc_info=True)
+                safe_logfire_error(f"Streaming pipeline storage failed | error={e}")
+                self._record_error(e)
+                self._clear_buffer()
+
+            if page is _END:
+                break
+
+        await self._code_batches.put(_END)
+
+    async def _chunk_page(self, page: dict[str, Any]) -> None:
+        if self.cancellation_check:
+            self.cancellation_check()
+
+        chunked = await self.doc_storage_ops.chunk_document(
+            page, self.request, self.crawl_type, self.source_id
+        )
+        if chunked is None:
+            self.stats["pages_skipped"] += 1
+            return
+
+        doc_url, chunks, metadatas = chunked
+        page_word_count = sum(metadata["word_count"] for metadata in metadatas)
+        self.stats["total_word_count"] += page_word_count
+        self.stats["pages_processed"] += 1
+        indices = list(range(len(chunks)))
+
+        if self.fingerprints:
+            chunk_hashes = [hash_text(chunk) for chunk in chunks]
+            fingerprint = PageFingerprint(
+                url=doc_url,
+                content_hash=hash_text(page["markdown"]),
+                chunk_hashes=chunk_hashes,
+                etag=page.get("etag"),
+                last_modified=page.get("last_modified"),
+                internal_links=page.get("internal_links", []),
+                word_count=page_word_count,
+            )
+            diff = self.fingerprints.diff(doc_url, fingerprint.content_hash, chunk_hashes)
+            if diff.unchanged:
+                # Stored rows already match; only the validators may have changed
+                self.fingerprints.record(fingerprint)
+                return
+            if self.fingerprints.incremental:
+                indices = diff.changed_indices
+                if diff.previous_chunk_count is None:
+                    self._deletions[doc_url] = None
+                elif indices or diff.removed_indices:
+                    self._deletions[doc_url] = indices + diff.removed_indices
+            self._buffered_fingerprints.append(fingerprint)
+
+        for i in indices:
+            self._urls.append(doc_url)
+            self._chunk_numbers.append(i)
+            self._contents.append(chunks[i])
+            self._metadatas.append(metadatas[i])
+        self._buffered_pages.append(page)
+        self.stats["chunk_count"] += len(indices)
+
+    def _has_buffered(self) -> bool:
+        return bool(self._contents or self._deletions or self._buffered_fingerprints)
+
+    def _clear_buffer(self) -> None:
+        self._urls, self._chunk_numbers, self._contents, self._metadatas = [], [], [], []
+        self._buffered_pages = []
+        self._buffered_fingerprints = []
+        self._deletions = {}
+        self._flush_deadline = None
+
+    async def _flush(self) -> None:
+        """Store the buffered chunks and queue their pages for code extraction."""
+        self._flush_deadline = None
+        if not self._has_buffered():
+            return
+
+        urls, chunk_numbers, contents, metadatas = self._urls, self._chunk_numbers, self._contents, self._metadatas
+        pages, fingerprints, deletions = self._buffered_pages, self._buffered_fingerprints, self._deletions
+        self._clear_buffer()
+        url_to_full_document = {page["url"].strip(): page["markdown"].strip() for page in pages}
+
+        with safe_span("streaming_pipeline_flush", chunks=len(contents), pages=len(pages)) as span:
+            if not self._source_created and contents and not self._is_incremental_refresh():
+                word_counts: dict[str, int] = {}
+                for metadata in metadatas:
+                    word_counts[self.source_id] = word_counts.get(self.source_id, 0) + metadata["word_count"]
+                # The source row must exist before any chunk references it
+                await self.doc_storage_ops._create_source_records(
+                    metadatas, contents, word_counts, self.request,
+                    self.source_url, self.source_display_name,
+                )
+                self._source_created = True
+
+            incremental = bool(self.fingerprints and self.fingerprints.incremental)
+            if deletions:
+                await self._delete_replaced_chunks(deletions)
+
+            storage_stats: dict[str, Any] = {}
+            if contents:
+                storage_stats = await add_documents_to_supabase(
+                    client=self.doc_storage_ops.supabase_client,
+                    urls=urls,
+                    chunk_numbers=chunk_numbers,
+                    contents=contents,
+                    metadatas=metadatas,
+                    url_to_full_document=url_to_full_document,
+                    batch_size=25,
+                    progress_callback=None,
+                    enable_parallel_batches=True,
+                    provider=None,
+                    cancellation_check=self.cancellation_check,
+                    replace_existing=not incremental,
+                )
+            stored = storage_stats.get("chunks_stored", 0)
+            span.set_attribute("chunks_stored", stored)
+            span.set_attribute("urls_with_deletions", len(deletions))
+
+            if self.fingerprints:
+                # Fingerprints describe stored rows, so they are only saved once the rows are
+                for fingerprint in fingerprints:
+                    self.fingerprints.record(fingerprint)
+                await self.fingerprints.save()
+
+        self.stats["chunks_stored"] += stored
+        self.stats["embedding_cache_hits"] += storage_stats.get("embedding_cache_hits", 0)
+        self.stats["embedding_cache_misses"] += storage_stats.get("embedding_cache_misses", 0)
+        self.stats["flushes"] += 1
+        if stored and self.stats["time_to_first_chunk_seconds"] is None:
+            self.stats["time_to_first_chunk_seconds"] = round(time.monotonic() - self._started_at, 2)
+            safe_logfire_info(
+                f"First chunks searchable | source_id={self.source_id} | "
+                f"after={self.stats['time_to_first_chunk_seconds']}s"
+            )
+
+        await self._report(
+            f"Stored {self.stats['chunks_stored']} chunks from {self.stats['pages_processed']} pages"
+        )
+
+        if self.extract_code_examples and stored > 0:
+            await self._code_batches.put((pages, url_to_full_document))
+
+    async def _delete_replaced_chunks(self, deletions: dict[str, list[int] | None]) -> None:
+        """Delete the rows an incremental refresh replaces or that no longer exist on the page."""
+        table = self.doc_storage_ops.supabase_client.table("archon_crawled_pages")
+        for url, chunk_numbers in deletions.items():
+            if self.cancellation_check:
+                self.cancellation_check()
+            query = table.delete().eq("url", url)
+            if chunk_numbers is not None:
+                query = query.in_("chunk_number", chunk_numbers)
+            await asyncio.to_thread(query.execute)
+            bump_index_generation([self.source_id])
+
+    async def _code_worker(self) -> None:
+        """Extract and store code examples from pages whose chunks have been stored."""
+        while True:
+            batch = await self._code_batches.get()
+            if batch is _END:
+                break
+            if self._error is not None:
+                continue
+
+            pages, url_to_full_document = batch
+            try:
+                stored = await self.doc_storage_ops.extract_and_store_code_examples(
+                    pages, url_to_full_document, self.source_id, None,
+                    self.cancellation_check, self.provider,
+                )
+                self.stats["code_examples_stored"] += stored or 0
+                await self._report(f"Stored {self.stats['code_examples_stored']} code examples")
+            except RuntimeError as e:
+                # Code extraction failures don't fail the crawl (same as the staged path)
+                self.stats["code_extraction_errors"] += 1
+                logger.error("Code extraction failed for a page batch, continuing", exc_info=True)
+                safe_logfire_error(f"Streaming code extraction failed | error={e}")
+            except (asyncio.CancelledError, Exception) as e:
+                if isinstance(e, asyncio.CancelledError) and asyncio.current_task().cancelling():
+                    raise
+                logger.error("Streaming pipeline code worker failed", exc_info=True)
+                self._record_error(e)
+
+    async def _update_source_word_count(self) -> None:
+        """The source row was created from the first flush; record the final word count."""
+        try:
+            await asyncio.to_thread(
+                self.doc_storage_ops.supabase_client.table("archon_sources")
+                .update({"total_word_count": self.stats["total_word_count"]})
+                .eq("source_id", self.source_id)
+                .execute
+            )
+        except Exception as e:
+            logger.warning(f"Failed to update word count for source '{self.source_id}': {e}")
@@ -5,7 +5,9 @@ Handles loading, storing, and accessing credentials with encryption for sensitiv
 Credentials include API keys, service credentials, and application configuration.
 """
 
+import asyncio
 import base64
+import functools
 import os
 import re
 import time
@@ -74,6 +76,35 @@ def _detect_embedding_provider_from_model(embedding_model: str) -> str:
     return "openai"
 
 
+# Credential holding the API key for each provider
+PROVIDER_API_KEYS: dict[str, str | None] = {
+    "openai": "OPENAI_API_KEY",
+    "google": "GOOGLE_API_KEY",
+    "openrouter": "OPENROUTER_API_KEY",
+    "anthropic": "ANTHROPIC_API_KEY",
+    "grok": "GROK_API_KEY",
+    "ollama": None,  # No API key needed
+}
+PROVIDER_API_KEY_NAMES = {key: provider for provider, key in PROVIDER_API_KEYS.items() if key}
+
+# Settings that decide which reranker the shared RAGService loads
+RERANKING_SETTING_KEYS = {"USE_RERANKING", "RERANKING_MODEL", "RERANKING_BACKEND", "RERANKING_MAX_LENGTH"}
+# Settings that change which vectors queries embed to
+EMBEDDING_SETTING_KEYS = {"EMBEDDING_MODEL", "EMBEDDING_DIMENSIONS", "EMBEDDING_PROVIDER", "LLM_PROVIDER", "LLM_BASE_URL"}
+
+
+@functools.lru_cache(maxsize=4)
+def _derive_encryption_key(service_key: str) -> bytes:
+    """Derive the Fernet key for a service key (memoized - PBKDF2 costs tens of ms)."""
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=b"static_salt_for_credentials",  # In production, consider using a configurable salt
+        iterations=100000,
+    )
+    return base64.urlsafe_b64encode(kdf.derive(service_key.encode()))
+
+
 class CredentialService:
     """Service for managing application credentials and configuration."""
 
@@ -84,6 +115,11 @@ class CredentialService:
         self._rag_settings_cache: dict[str, Any] | None = None
         self._rag_cache_timestamp: float | None = None
         self._rag_cache_ttl = 300  # 5 minutes TTL for RAG settings cache
+        # Fernet instance derived once per service key (PBKDF2 is deliberately slow)
+        self._fernet: Fernet | None = None
+        self._fernet_service_key: str | None = None
+        # Decrypted plaintexts keyed by ciphertext, invalidated on set/delete/reload
+        self._decrypted_cache: dict[str, str] = {}
 
     def _get_supabase_client(self) -> Client:
         """
@@ -117,20 +153,19 @@ class CredentialService:
 
         return self._supabase
 
-    def _get_encryption_key(self) -> bytes:
-        """Generate encryption key from environment variables."""
-        # Use Supabase service key as the basis for encryption key
-        service_key = os.getenv("SUPABASE_SERVICE_KEY", "default-key-for-development")
+    def _get_fernet(self) -> Fernet:
+        """
+        Get the Fernet instance for the current service key.
 
-        # Generate a proper encryption key using PBKDF2
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=b"static_salt_for_credentials",  # In production, consider using a configurable salt
-            iterations=100000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(service_key.encode()))
-        return key
+        The PBKDF2 derivation runs once per process (and again only if the
+        service key changes), not on every encrypt/decrypt call.
+        """
+        service_key = os.getenv("SUPABASE_SERVICE_KEY", "default-key-for-development")
+        if self._fernet is None or self._fernet_service_key != service_key:
+            self._fernet = Fernet(_derive_encryption_key(service_key))
+            self._fernet_service_key = service_key
+            self._decrypted_cache.clear()
+        return self._fernet
 
     def _encrypt_value(self, value: str) -> str:
         """Encrypt a sensitive value using Fernet encryption."""
@@ -138,7 +173,7 @@ class CredentialService:
             return ""
 
         try:
-            fernet = Fernet(self._get_encryption_key())
+            fernet = self._get_fernet()
             encrypted_bytes = fernet.encrypt(value.encode("utf-8"))
             return base64.urlsafe_b64encode(encrypted_bytes).decode("utf-8")
         except Exception as e:
@@ -151,21 +186,33 @@ class CredentialService:
             return ""
 
         try:
-            fernet = Fernet(self._get_encryption_key())
+            fernet = self._get_fernet()
+            cached = self._decrypted_cache.get(encrypted_value)
+            if cached is not None:
+                return cached
+
             encrypted_bytes = base64.urlsafe_b64decode(encrypted_value.encode("utf-8"))
             decrypted_bytes = fernet.decrypt(encrypted_bytes)
-            return decrypted_bytes.decode("utf-8")
+            plaintext = decrypted_bytes.decode("utf-8")
+            self._decrypted_cache[encrypted_value] = plaintext
+            return plaintext
         except Exception as e:
             logger.error(f"Error decrypting value: {e}")
             raise
 
+    def _invalidate_decrypted(self, key: str) -> None:
+        """Drop the cached plaintext for a credential before it is replaced or removed."""
+        value = self._cache.get(key)
+        if isinstance(value, dict) and value.get("encrypted_value"):
+            self._decrypted_cache.pop(value["encrypted_value"], None)
+
     async def load_all_credentials(self) -> dict[str, Any]:
         """Load all credentials from database and cache them."""
         try:
             supabase = self._get_supabase_client()
 
             # Fetch all credentials
-            result = supabase.table("archon_settings").select("*").execute()
+            result = await asyncio.to_thread(supabase.table("archon_settings").select("*").execute)
 
             credentials = {}
             for item in result.data:
@@ -185,6 +232,7 @@ class CredentialService:
 
             self._cache = credentials
             self._cache_initialized = True
+            self._decrypted_cache.clear()
             logger.info(f"Loaded {len(credentials)} credentials from database")
 
             return credentials
@@ -234,6 +282,7 @@ class CredentialService:
         """Set a credential value."""
         try:
             supabase = self._get_supabase_client()
+            self._invalidate_decrypted(key)
 
             if is_encrypted:
                 encrypted_value = self._encrypt_value(value)
@@ -266,10 +315,12 @@ class CredentialService:
 
             # Upsert to database with proper conflict handling
             # Since we validate service key at startup, permission errors here indicate actual database issues
-            supabase.table("archon_settings").upsert(
-                data,
-                on_conflict="key",  # Specify the unique column for conflict resolution
-            ).execute()
+            await asyncio.to_thread(
+                supabase.table("archon_settings").upsert(
+                    data,
+                    on_conflict="key",  # Specify the unique column for conflict resolution
+                ).execute
+            )
 
             # Invalidate RAG settings cache if this is a rag_strategy setting
             if category == "rag_strategy":
@@ -299,6 +350,13 @@ class CredentialService:
                 except Exception as e:
                     logger.error(f"Error invalidating LLM provider service cache: {e}")
 
+            if key in PROVIDER_API_KEY_NAMES:
+                self._invalidate_provider_clients(key)
+            if key in RERANKING_SETTING_KEYS:
+                self._refresh_rag_service(key)
+            if key in EMBEDDING_SETTING_KEYS:
+                self._invalidate_query_embeddings(key)
+
             logger.info(
                 f"Successfully {'encrypted and ' if is_encrypted else ''}stored credential: {key}"
             )
@@ -314,9 +372,10 @@ class CredentialService:
             supabase = self._get_supabase_client()
 
             # Since we validate service key at startup, we can directly execute
-            supabase.table("archon_settings").delete().eq("key", key).execute()
+            await asyncio.to_thread(supabase.table("archon_settings").delete().eq("key", key).execute)
 
             # Remove from cache
+            self._invalidate_decrypted(key)
             if key in self._cache:
                 del self._cache[key]
 
@@ -349,6 +408,13 @@ class CredentialService:
                 except Exception as e:
                     logger.error(f"Error invalidating LLM provider service cache: {e}")
 
+            if key in PROVIDER_API_KEY_NAMES:
+                self._invalidate_provider_clients(key)
+            if key in RERANKING_SETTING_KEYS:
+                self._refresh_rag_service(key)
+            if key in EMBEDDING_SETTING_KEYS:
+                self._invalidate_query_embeddings(key)
+
             logger.info(f"Successfully deleted credential: {key}")
             return True
 
@@ -356,6 +422,33 @@ class CredentialService:
             logger.error(f"Error deleting credential {key}: {e}")
             return False
 
+    def _invalidate_provider_clients(self, key: str) -> None:
+        """Retire pooled LLM clients built with a provider API key that just changed."""
+        try:
+            from .llm_provider_service import invalidate_provider_cache
+
+            invalidate_provider_cache(PROVIDER_API_KEY_NAMES[key])
+        except Exception as e:
+            logger.warning(f"Failed to invalidate LLM clients after {key} change: {e}")
+
+    def _invalidate_query_embeddings(self, key: str) -> None:
+        """Drop cached query embeddings after the embedding model or provider changed."""
+        try:
+            from .embeddings.query_embedding_cache import invalidate_query_embedding_cache
+
+            invalidate_query_embedding_cache()
+        except Exception as e:
+            logger.warning(f"Failed to invalidate query embeddings after {key} change: {e}")
+
+    def _refresh_rag_service(self, key: str) -> None:
+        """Swap the shared RAGService's reranker after a reranking setting changed."""
+        try:
+            from .search.rag_service import refresh_rag_service
+
+            refresh_rag_service()
+        except Exception as e:
+            logger.warning(f"Failed to refresh RAG service after {key} change: {e}")
+
     async def get_credentials_by_category(self, category: str) -> dict[str, Any]:
         """Get all credentials for a specific category."""
         if not self._cache_initialized:
@@ -376,8 +469,8 @@ class CredentialService:
 
         try:
             supabase = self._get_supabase_client()
-            result = (
-                supabase.table("archon_settings").select("*").eq("category", category).execute()
+            result = await asyncio.to_thread(
+                supabase.table("archon_settings").select("*").eq("category", category).execute
             )
 
             credentials = {}
@@ -408,7 +501,7 @@ class CredentialService:
         """Get all credentials as a list of CredentialItem objects (for Settings UI)."""
         try:
             supabase = self._get_supabase_client()
-            result = supabase.table("archon_settings").select("*").execute()
+            result = await asyncio.to_thread(supabase.table("archon_settings").select("*").execute)
 
             credentials = []
             for item in result.data:
@@ -540,16 +633,7 @@ class CredentialService:
 
     async def _get_provider_api_key(self, provider: str) -> str | None:
         """Get API key for a specific provider."""
-        key_mapping = {
-            "openai": "OPENAI_API_KEY",
-            "google": "GOOGLE_API_KEY",
-            "openrouter": "OPENROUTER_API_KEY",
-            "anthropic": "ANTHROPIC_API_KEY",
-            "grok": "GROK_API_KEY",
-            "ollama": None,  # No API key needed
-        }
-
-        key_name = key_mapping.get(provider)
+        key_name = PROVIDER_API_KEYS.get(provider)
         if key_name:
             return await self.get_credential(key_name)
         return "ollama" if provider == "ollama" else None
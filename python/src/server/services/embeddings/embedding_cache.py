@@ -0,0 +1,238 @@
+"""
+Embedding Cache
+
+Persistent content-hash cache for embeddings, keyed by (model, dimensions, text hash).
+
+Re-crawls and knowledge refreshes mostly re-embed documentation that has not changed.
+Caching embeddings by a hash of the normalized chunk text lets create_embeddings_batch
+split each batch into hits and misses and only send the misses to the provider.
+
+Entries live in a local SQLite file (stdlib, no extra service) as packed float32
+vectors, which is also the precision pgvector stores them at. The least recently
+used entries are pruned once the cache grows past its entry limit.
+"""
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from pathlib import Path
+from typing import Any
+
+from ...config.logfire_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "archon" / "embedding_cache.sqlite3"
+DEFAULT_MAX_ENTRIES = 200_000
+
+# SQLite limits the number of bound parameters per statement
+_LOOKUP_CHUNK_SIZE = 500
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text before hashing so whitespace-only changes still hit the cache."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def content_hash(text: str) -> str:
+    """Hash of the normalized text."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def _pack(embedding: list[float]) -> bytes:
+    return array("f", embedding).tobytes()
+
+
+def _unpack(blob: bytes) -> list[float]:
+    values = array("f")
+    values.frombytes(blob)
+    return values.tolist()
+
+
+class EmbeddingCache:
+    """SQLite-backed embedding cache shared by all embedding calls in the process."""
+
+    def __init__(self, path: str | Path = DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite database file (``:memory:`` for a process-local cache)
+            max_entries: Entries kept before the least recently used are pruned
+        """
+        self.path = str(path)
+        self.max_entries = max(1, max_entries)
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embedding_cache (
+                    model TEXT NOT NULL,
+                    dimensions INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    embedding BLOB NOT NULL,
+                    last_used_at REAL NOT NULL,
+                    PRIMARY KEY (model, dimensions, content_hash)
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_embedding_cache_last_used ON embedding_cache (last_used_at)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _get_many_sync(self, model: str, dimensions: int, hashes: list[str]) -> dict[str, list[float]]:
+        found: dict[str, list[float]] = {}
+        unique = list(dict.fromkeys(hashes))
+        with self._lock:
+            conn = self._connection()
+            for start in range(0, len(unique), _LOOKUP_CHUNK_SIZE):
+                chunk = unique[start : start + _LOOKUP_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT content_hash, embedding FROM embedding_cache "
+                    f"WHERE model = ? AND dimensions = ? AND content_hash IN ({placeholders})",
+                    [model, dimensions, *chunk],
+                ).fetchall()
+                found.update((row[0], _unpack(row[1])) for row in rows)
+
+            if found:
+                now = time.time()
+                conn.executemany(
+                    "UPDATE embedding_cache SET last_used_at = ? "
+                    "WHERE model = ? AND dimensions = ? AND content_hash = ?",
+                    [(now, model, dimensions, h) for h in found],
+                )
+                conn.commit()
+        return found
+
+    def _put_many_sync(self, model: str, dimensions: int, rows: list[tuple[str, bytes]]) -> None:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO embedding_cache "
+                "(model, dimensions, content_hash, embedding, last_used_at) VALUES (?, ?, ?, ?, ?)",
+                [(model, dimensions, h, blob, now) for h, blob in rows],
+            )
+            count = conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+            if count > self.max_entries:
+                conn.execute(
+                    "DELETE FROM embedding_cache WHERE rowid IN "
+                    "(SELECT rowid FROM embedding_cache ORDER BY last_used_at LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+            conn.commit()
+
+    async def get_many(self, model: str, dimensions: int, texts: list[str]) -> dict[int, list[float]]:
+        """
+        Look up cached embeddings.
+
+        Args:
+            model: Embedding model name
+            dimensions: Embedding dimensions
+            texts: Texts to look up
+
+        Returns:
+            Mapping of index into ``texts`` to its cached embedding (hits only)
+        """
+        if not texts:
+            return {}
+        hashes = [content_hash(text) for text in texts]
+        try:
+            found = await asyncio.to_thread(self._get_many_sync, model, dimensions, hashes)
+        except Exception as e:
+            logger.warning(f"Embedding cache lookup failed, embedding all texts: {e}")
+            found = {}
+
+        hits = {i: found[h] for i, h in enumerate(hashes) if h in found}
+        self._hits += len(hits)
+        self._misses += len(texts) - len(hits)
+        return hits
+
+    async def put_many(
+        self, model: str, dimensions: int, texts: list[str], embeddings: list[list[float]]
+    ) -> None:
+        """Store embeddings for texts (pairs are matched by position)."""
+        rows = [
+            (content_hash(text), _pack(embedding))
+            for text, embedding in zip(texts, embeddings, strict=False)
+            if embedding
+        ]
+        if not rows:
+            return
+        try:
+            await asyncio.to_thread(self._put_many_sync, model, dimensions, rows)
+            self._writes += len(rows)
+        except Exception as e:
+            logger.warning(f"Failed to write {len(rows)} embeddings to cache: {e}")
+
+    def clear(self) -> None:
+        """Remove every cached embedding."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM embedding_cache")
+            conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_stats(self) -> dict[str, Any]:
+        """Hit/miss counters since startup."""
+        lookups = self._hits + self._misses
+        return {
+            "path": self.path,
+            "hits": self._hits,
+            "misses": self._misses,
+            "writes": self._writes,
+            "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Global cache instance
+_embedding_cache: EmbeddingCache | None = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get the global embedding cache (path and size from EMBEDDING_CACHE_PATH / EMBEDDING_CACHE_MAX_ENTRIES)."""
+    global _embedding_cache
+
+    if _embedding_cache is None:
+        path = os.getenv("EMBEDDING_CACHE_PATH") or DEFAULT_CACHE_PATH
+        try:
+            max_entries = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", str(DEFAULT_MAX_ENTRIES)))
+        except ValueError:
+            max_entries = DEFAULT_MAX_ENTRIES
+        _embedding_cache = EmbeddingCache(path, max_entries)
+    return _embedding_cache
+
+
+def close_embedding_cache() -> None:
+    """Close the global embedding cache."""
+    global _embedding_cache
+
+    if _embedding_cache is not None:
+        _embedding_cache.close()
+        _embedding_cache = None
@@ -15,6 +15,8 @@ from ...config.logfire_config import safe_span, search_logger
 from ..credential_service import credential_service
 from ..llm_provider_service import get_embedding_model, get_llm_client, is_google_embedding_model, is_openai_embedding_model
 from ..threading_service import get_threading_service
+from .embedding_cache import get_embedding_cache
+from .query_embedding_cache import get_query_embedding_cache, query_embedding_key
 from .embedding_exceptions import (
     EmbeddingAPIError,
     EmbeddingError,
@@ -32,6 +34,8 @@ class EmbeddingBatchResult:
     success_count: int = 0
     failure_count: int = 0
     texts_processed: list[str] = field(default_factory=list)  # Successfully processed texts
+    cache_hits: int = 0  # Embeddings served from the embedding cache
+    cache_misses: int = 0  # Embeddings requested from the provider
 
     def add_success(self, embedding: list[float], text: str):
         """Add a successful embedding."""
@@ -63,6 +67,37 @@ class EmbeddingBatchResult:
     def total_requested(self) -> int:
         return self.success_count + self.failure_count
 
+    @property
+    def cache_hit_rate(self) -> float:
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else 0.0
+
+
+def _merge_cached_embeddings(
+    texts: list[str], cached: dict[int, list[float]], provider_result: EmbeddingBatchResult
+) -> EmbeddingBatchResult:
+    """
+    Combine cache hits with the provider result for the misses, in input order.
+
+    ``provider_result`` covers the cache misses in order; failed misses are absent
+    from its successes and carried over as failures.
+    """
+    merged = EmbeddingBatchResult(
+        failed_items=provider_result.failed_items,
+        failure_count=provider_result.failure_count,
+        cache_hits=len(cached),
+        cache_misses=len(texts) - len(cached),
+    )
+    fresh = iter(zip(provider_result.embeddings, provider_result.texts_processed, strict=False))
+    pending = next(fresh, None)
+    for i, text in enumerate(texts):
+        if i in cached:
+            merged.add_success(cached[i], text)
+        elif pending is not None and pending[1] == text:
+            merged.add_success(pending[0], text)
+            pending = next(fresh, None)
+    return merged
+
 
 # Provider-aware client factory
 get_openai_client = get_llm_client
@@ -128,6 +163,81 @@ async def create_embedding(text: str, provider: str | None = None) -> list[float
             )
 
 
+async def create_query_embedding(query: str, provider: str | None = None) -> list[float]:
+    """
+    Create an embedding for a search query, reusing recent results.
+
+    Queries are cached in memory by (provider, model, dimensions, normalized query), and
+    concurrent calls for the same query share one provider request. Use create_embedding
+    for anything that must reach the provider (e.g. connection tests).
+
+    Args:
+        query: Search query to embed
+        provider: Optional provider override
+
+    Returns:
+        List of floats representing the embedding
+
+    Raises:
+        EmbeddingError: As raised by create_embedding
+    """
+    cache = get_query_embedding_cache()
+    if not cache.max_entries:
+        return await create_embedding(query, provider=provider)
+
+    try:
+        embedding_model = await get_embedding_model(provider=provider)
+        rag_settings = await credential_service.get_credentials_by_category("rag_strategy")
+        embedding_dimensions = int(rag_settings.get("EMBEDDING_DIMENSIONS", "1536"))
+    except Exception as e:
+        search_logger.warning(f"Failed to load embedding settings for query cache, not caching: {e}")
+        return await create_embedding(query, provider=provider)
+
+    key = query_embedding_key(provider, embedding_model, embedding_dimensions, query)
+    return await cache.get_or_create(key, lambda: create_embedding(query, provider=provider))
+
+
+async def create_query_embeddings(queries: list[str], provider: str | None = None) -> list[list[float] | None]:
+    """
+    Create embeddings for several search queries with one provider request.
+
+    Cached queries are served from the query embedding cache and all misses are embedded
+    together with create_embeddings_batch, instead of one request per query.
+
+    Args:
+        queries: Search queries to embed
+        provider: Optional provider override
+
+    Returns:
+        Embeddings in query order, None for queries that could not be embedded
+    """
+
+    async def embed(texts: list[str]) -> list[list[float] | None]:
+        result = await create_embeddings_batch(texts, provider=provider)
+        if result.has_failures:
+            search_logger.warning(f"Failed to embed {result.failure_count}/{len(texts)} queries")
+        embeddings = dict(zip(result.texts_processed, result.embeddings, strict=False))
+        return [embeddings.get(text) for text in texts]
+
+    if not queries:
+        return []
+
+    cache = get_query_embedding_cache()
+    if not cache.max_entries:
+        return await embed(list(queries))
+
+    try:
+        embedding_model = await get_embedding_model(provider=provider)
+        rag_settings = await credential_service.get_credentials_by_category("rag_strategy")
+        embedding_dimensions = int(rag_settings.get("EMBEDDING_DIMENSIONS", "1536"))
+    except Exception as e:
+        search_logger.warning(f"Failed to load embedding settings for query cache, not caching: {e}")
+        return await embed(list(queries))
+
+    keys = [query_embedding_key(provider, embedding_model, embedding_dimensions, query) for query in queries]
+    return await cache.get_or_create_many(keys, lambda indices: embed([queries[i] for i in indices]))
+
+
 async def create_embeddings_batch(
     texts: list[str],
     progress_callback: Any | None = None,
@@ -179,6 +289,8 @@ async def create_embeddings_batch(
             )
 
     texts = validated_texts
+    all_texts = texts
+    cached: dict[int, list[float]] = {}
     threading_service = get_threading_service()
 
     with safe_span(
@@ -209,10 +321,36 @@ async def create_embeddings_batch(
                     )
                     batch_size = int(rag_settings.get("EMBEDDING_BATCH_SIZE", "100"))
                     embedding_dimensions = int(rag_settings.get("EMBEDDING_DIMENSIONS", "1536"))
+                    cache_enabled = rag_settings.get("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
                 except Exception as e:
                     search_logger.warning(f"Failed to load embedding settings: {e}, using defaults")
                     batch_size = 100
                     embedding_dimensions = 1536
+                    cache_enabled = True
+
+                # Split the batch into cache hits and misses; only misses go to the provider
+                embedding_cache = get_embedding_cache() if cache_enabled else None
+                if embedding_cache:
+                    cache_model = await get_embedding_model(provider=embedding_provider)
+                    cached = await embedding_cache.get_many(cache_model, embedding_dimensions, all_texts)
+                    texts = [text for i, text in enumerate(all_texts) if i not in cached]
+                span.set_attribute("cache_enabled", embedding_cache is not None)
+                span.set_attribute("cache_hits", len(cached))
+                span.set_attribute("cache_misses", len(all_texts) - len(cached))
+                span.set_attribute(
+                    "cache_hit_rate", round(len(cached) / len(all_texts), 4) if all_texts else 0.0
+                )
+
+                async def finalize(provider_result: EmbeddingBatchResult) -> EmbeddingBatchResult:
+                    if not embedding_cache:
+                        return provider_result
+                    await embedding_cache.put_many(
+                        cache_model,
+                        embedding_dimensions,
+                        provider_result.texts_processed,
+                        provider_result.embeddings,
+                    )
+                    return _merge_cached_embeddings(all_texts, cached, provider_result)
 
                 total_tokens_used = 0
 
@@ -283,7 +421,7 @@ async def create_embeddings_batch(
                                         # Return what we have so far
                                         span.set_attribute("quota_exhausted", True)
                                         span.set_attribute("partial_success", True)
-                                        return result
+                                        return await finalize(result)
 
                                     else:
                                         # Regular rate limit - retry
@@ -333,7 +471,7 @@ async def create_embeddings_batch(
                 span.set_attribute("success", not result.has_failures)
                 span.set_attribute("total_tokens_used", total_tokens_used)
 
-                return result
+                return await finalize(result)
 
         except Exception as e:
             # Catastrophic failure - return what we have
@@ -347,6 +485,8 @@ async def create_embeddings_batch(
                     text, EmbeddingAPIError(f"Catastrophic failure: {str(e)}", original_error=e)
                 )
 
+            if cached:
+                result = _merge_cached_embeddings(all_texts, cached, result)
             return result
 
 
@@ -0,0 +1,241 @@
+"""
+Query Embedding Cache
+
+In-process LRU + TTL cache for search query embeddings.
+
+Every search embeds its query before touching the database, and agents repeat the same
+or near-identical queries constantly. Each embedding is a provider round trip of
+100-400 ms, so query vectors are kept in memory keyed by (provider, model, dimensions,
+normalized query). Concurrent requests for the same key share one in-flight call
+(single-flight), so a burst of identical queries costs a single provider request.
+
+Entries expire after a TTL and the least recently used are evicted past the size
+limit. The whole cache is dropped when the embedding model or provider settings change
+(see credential_service); results of calls started before the change are discarded.
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from ...config.logfire_config import get_logger
+from .embedding_cache import normalize_text
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_ENTRIES = 2048
+DEFAULT_TTL_SECONDS = 3600.0
+
+# (provider, model, dimensions, normalized query)
+QueryEmbeddingKey = tuple[str, str, int, str]
+
+
+def query_embedding_key(provider: str | None, model: str, dimensions: int, query: str) -> QueryEmbeddingKey:
+    """Build the cache key for a query."""
+    return (provider or "", model, dimensions, normalize_text(query))
+
+
+class QueryEmbeddingCache:
+    """LRU + TTL cache of query embeddings with single-flight misses."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Embeddings kept before the least recently used are evicted (0 disables caching)
+            ttl_seconds: Seconds an embedding stays valid
+        """
+        self.max_entries = max(0, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[QueryEmbeddingKey, tuple[list[float], float]] = OrderedDict()
+        self._inflight: dict[QueryEmbeddingKey, asyncio.Task] = {}
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._shared = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, key: QueryEmbeddingKey) -> list[float] | None:
+        """Return a cached, unexpired embedding."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        embedding, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return embedding
+
+    def put(self, key: QueryEmbeddingKey, embedding: list[float]) -> None:
+        """Store an embedding, evicting the least recently used past the size limit."""
+        if not self.max_entries or not embedding:
+            return
+        self._entries[key] = (embedding, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    async def get_or_create(
+        self, key: QueryEmbeddingKey, create: Callable[[], Awaitable[list[float]]]
+    ) -> list[float]:
+        """
+        Return the cached embedding for ``key`` or create it.
+
+        Concurrent calls for the same key await one ``create()`` call. Failures are
+        raised to every waiter and not cached.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            self._hits += 1
+            return cached
+
+        task = self._inflight.get(key)
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            self._shared += 1
+        else:
+            self._misses += 1
+            task = asyncio.ensure_future(self._create(key, create, self._generation))
+            self._inflight[key] = task
+        # A caller giving up must not cancel the call other waiters share
+        return await asyncio.shield(task)
+
+    async def get_or_create_many(
+        self,
+        keys: list[QueryEmbeddingKey],
+        create_many: Callable[[list[int]], Awaitable[list[list[float] | None]]],
+    ) -> list[list[float] | None]:
+        """
+        Return embeddings for several keys, creating all misses with one ``create_many`` call.
+
+        ``create_many`` receives the indices (into ``keys``) of the missing keys and returns
+        their embeddings in the same order, None for any it could not create. Keys already
+        in flight are shared as in get_or_create; failures come back as None.
+        """
+        loop = asyncio.get_running_loop()
+        results: list[list[float] | None] = [None] * len(keys)
+        tasks: dict[int, asyncio.Task] = {}
+        new_keys: dict[QueryEmbeddingKey, int] = {}
+
+        for i, key in enumerate(keys):
+            cached = self.get(key)
+            if cached is not None:
+                self._hits += 1
+                results[i] = cached
+                continue
+            task = self._inflight.get(key)
+            if task is not None and not task.done() and task.get_loop() is loop:
+                self._shared += 1
+                tasks[i] = task
+            elif key in new_keys:
+                self._shared += 1
+            else:
+                self._misses += 1
+                new_keys[key] = i
+
+        if new_keys:
+            miss_indices = list(new_keys.values())
+            batch = asyncio.ensure_future(create_many(miss_indices))
+
+            def from_batch(position: int) -> Callable[[], Awaitable[list[float]]]:
+                async def create() -> list[float]:
+                    embedding = (await asyncio.shield(batch))[position]
+                    if not embedding:
+                        raise ValueError("No embedding returned for query")
+                    return embedding
+
+                return create
+
+            for position, (key, i) in enumerate(new_keys.items()):
+                task = asyncio.ensure_future(self._create(key, from_batch(position), self._generation))
+                self._inflight[key] = task
+                tasks[i] = task
+
+        for i, key in enumerate(keys):
+            if results[i] is None and i not in tasks:
+                # Repeated key within this call
+                tasks[i] = tasks[new_keys[key]]
+
+        if tasks:
+            outcomes = await asyncio.gather(*(asyncio.shield(task) for task in tasks.values()), return_exceptions=True)
+            for i, outcome in zip(tasks, outcomes, strict=True):
+                results[i] = None if isinstance(outcome, BaseException) else outcome
+        return results
+
+    async def _create(
+        self, key: QueryEmbeddingKey, create: Callable[[], Awaitable[list[float]]], generation: int
+    ) -> list[float]:
+        try:
+            embedding = await create()
+            if generation == self._generation:
+                self.put(key, embedding)
+            return embedding
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+
+    def invalidate(self) -> None:
+        """Drop every entry; calls already in flight are not cached."""
+        self._entries.clear()
+        self._inflight.clear()
+        self._generation += 1
+        self._invalidations += 1
+
+    def get_stats(self) -> dict[str, Any]:
+        """Hit/miss counters since startup."""
+        lookups = self._hits + self._misses + self._shared
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self._hits,
+            "misses": self._misses,
+            "shared_inflight": self._shared,
+            "evictions": self._evictions,
+            "invalidations": self._invalidations,
+            "hit_rate": round((self._hits + self._shared) / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Global cache instance
+_query_embedding_cache: QueryEmbeddingCache | None = None
+
+
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    """
+    Get the global query embedding cache (size and TTL from QUERY_EMBEDDING_CACHE_MAX_ENTRIES /
+    QUERY_EMBEDDING_CACHE_TTL_SECONDS).
+    """
+    global _query_embedding_cache
+
+    if _query_embedding_cache is None:
+        try:
+            max_entries = int(os.getenv("QUERY_EMBEDDING_CACHE_MAX_ENTRIES", str(DEFAULT_MAX_ENTRIES)))
+        except ValueError:
+            max_entries = DEFAULT_MAX_ENTRIES
+        try:
+            ttl_seconds = float(os.getenv("QUERY_EMBEDDING_CACHE_TTL_SECONDS", str(DEFAULT_TTL_SECONDS)))
+        except ValueError:
+            ttl_seconds = DEFAULT_TTL_SECONDS
+        _query_embedding_cache = QueryEmbeddingCache(max_entries, ttl_seconds)
+    return _query_embedding_cache
+
+
+def invalidate_query_embedding_cache() -> None:
+    """Drop cached query embeddings (after an embedding model or provider change)."""
+    if _query_embedding_cache is not None:
+        _query_embedding_cache.invalidate()
+        logger.info("Query embedding cache invalidated")
+
+
+def reset_query_embedding_cache() -> None:
+    """Discard the global cache so the next use starts empty."""
+    global _query_embedding_cache
+
+    _query_embedding_cache = None
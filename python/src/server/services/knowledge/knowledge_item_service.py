@@ -4,9 +4,11 @@ Knowledge Item Service
 Handles all knowledge item CRUD operations and data transformations.
 """
 
+import asyncio
 from typing import Any
 
 from ...config.logfire_config import safe_logfire_error, safe_logfire_info
+from ..stats_cache import KNOWLEDGE_SCOPE, bump_stats_epoch
 
 
 class KnowledgeItemService:
@@ -73,7 +75,7 @@ class KnowledgeItemService:
                     f"title.ilike.{search_pattern},summary.ilike.{search_pattern},source_id.ilike.{search_pattern}"
                 )
 
-            count_result = count_query.execute()
+            count_result = await asyncio.to_thread(count_query.execute)
             total = count_result.count if hasattr(count_result, "count") else 0
 
             # Apply pagination at database level
@@ -81,7 +83,7 @@ class KnowledgeItemService:
             query = query.range(start_idx, start_idx + per_page - 1)
 
             # Execute query
-            result = query.execute()
+            result = await asyncio.to_thread(query.execute)
             sources = result.data if result.data else []
 
             # Get source IDs for batch queries
@@ -97,11 +99,11 @@ class KnowledgeItemService:
 
             if source_ids:
                 # Batch fetch first URLs
-                urls_result = (
+                urls_result = await asyncio.to_thread(
                     self.supabase.from_("archon_crawled_pages")
                     .select("source_id, url")
                     .in_("source_id", source_ids)
-                    .execute()
+                    .execute
                 )
 
                 # Group URLs by source_id (take first one for each)
@@ -110,14 +112,17 @@ class KnowledgeItemService:
                         first_urls[item["source_id"]] = item["url"]
 
                 # Get code example counts per source - NO CONTENT, just counts!
-                # Fetch counts individually for each source
-                for source_id in source_ids:
-                    count_result = (
+                # Fetch counts individually for each source, concurrently
+                count_results = await asyncio.gather(*(
+                    asyncio.to_thread(
                         self.supabase.from_("archon_code_examples")
                         .select("id", count="exact", head=True)
                         .eq("source_id", source_id)
-                        .execute()
+                        .execute
                     )
+                    for source_id in source_ids
+                ))
+                for source_id, count_result in zip(source_ids, count_results, strict=True):
                     code_example_counts[source_id] = (
                         count_result.count if hasattr(count_result, "count") else 0
                     )
@@ -213,12 +218,12 @@ class KnowledgeItemService:
             safe_logfire_info(f"Getting knowledge item | source_id={source_id}")
 
             # Get the source record
-            result = (
+            result = await asyncio.to_thread(
                 self.supabase.from_("archon_sources")
                 .select("*")
                 .eq("source_id", source_id)
                 .single()
-                .execute()
+                .execute
             )
 
             if not result.data:
@@ -272,11 +277,11 @@ class KnowledgeItemService:
 
             if metadata_updates:
                 # Get current metadata
-                current_response = (
+                current_response = await asyncio.to_thread(
                     self.supabase.table("archon_sources")
                     .select("metadata")
                     .eq("source_id", source_id)
-                    .execute()
+                    .execute
                 )
                 if current_response.data:
                     current_metadata = current_response.data[0].get("metadata", {})
@@ -286,14 +291,16 @@ class KnowledgeItemService:
                     update_data["metadata"] = metadata_updates
 
             # Perform the update
-            result = (
+            result = await asyncio.to_thread(
                 self.supabase.table("archon_sources")
                 .update(update_data)
                 .eq("source_id", source_id)
-                .execute()
+                .execute
             )
 
             if result.data:
+                # Knowledge types feed the dashboard's per-type counts
+                bump_stats_epoch(KNOWLEDGE_SCOPE)
                 safe_logfire_info(f"Knowledge item updated successfully | source_id={source_id}")
                 return True, {
                     "success": True,
@@ -319,7 +326,9 @@ class KnowledgeItemService:
         """
         try:
             # Query the sources table
-            result = self.supabase.from_("archon_sources").select("*").order("source_id").execute()
+            result = await asyncio.to_thread(
+                self.supabase.from_("archon_sources").select("*").order("source_id").execute
+            )
 
             # Format the sources
             sources = []
@@ -402,12 +411,12 @@ class KnowledgeItemService:
     async def _get_first_page_url(self, source_id: str) -> str:
         """Get the first page URL for a source."""
         try:
-            pages_response = (
+            pages_response = await asyncio.to_thread(
                 self.supabase.from_("archon_crawled_pages")
                 .select("url")
                 .eq("source_id", source_id)
                 .limit(1)
-                .execute()
+                .execute
             )
 
             if pages_response.data:
@@ -421,11 +430,11 @@ class KnowledgeItemService:
     async def _get_code_examples(self, source_id: str) -> list[dict[str, Any]]:
         """Get code examples for a source."""
         try:
-            code_examples_response = (
+            code_examples_response = await asyncio.to_thread(
                 self.supabase.from_("archon_code_examples")
                 .select("id, content, summary, metadata")
                 .eq("source_id", source_id)
-                .execute()
+                .execute
             )
 
             return code_examples_response.data if code_examples_response.data else []
@@ -463,11 +472,11 @@ class KnowledgeItemService:
         """Get the actual number of chunks for a source."""
         try:
             # Count the actual rows in crawled_pages for this source
-            result = (
+            result = await asyncio.to_thread(
                 self.supabase.table("archon_crawled_pages")
                 .select("*", count="exact")
                 .eq("source_id", source_id)
-                .execute()
+                .execute
             )
 
             # Return the count of pages (chunks)
@@ -0,0 +1,246 @@
+"""
+LLM Client Registry
+
+Keeps long-lived OpenAI-compatible clients with warm keep-alive connection pools,
+keyed by (provider, base_url, api_key hash).
+
+Building a new ``openai.AsyncOpenAI`` per call means a new httpx connection pool and
+a fresh TLS handshake for every embedding batch, contextual embedding and code summary.
+The registry hands out a shared client per key instead; clients are retired when the
+provider configuration or credentials change and closed in the FastAPI lifespan.
+
+httpx connection pools are bound to the event loop that created them, so clients are
+only pooled on the loop the registry is bound to. Calls from other loops (e.g. worker
+threads running ``asyncio.run``) get an unpooled client that the caller closes.
+"""
+
+import asyncio
+import hashlib
+import inspect
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..config.logfire_config import get_logger
+
+logger = get_logger(__name__)
+
+# Grace period before closing a retired client, so in-flight requests can finish
+RETIRED_CLIENT_GRACE_SECONDS = 30.0
+
+
+def _hash_api_key(api_key: str | None) -> str:
+    """Hash the API key so raw secrets never appear in registry keys or metrics."""
+    if not api_key:
+        return "none"
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+async def close_client(client: Any) -> None:
+    """Close an OpenAI-compatible client, supporting both async and sync close methods."""
+    close_method = getattr(client, "aclose", None) or getattr(client, "close", None)
+    if not callable(close_method):
+        return
+    result = close_method()
+    if inspect.isawaitable(result):
+        await result
+
+
+@dataclass
+class PooledClient:
+    """A registry entry and its usage statistics."""
+
+    client: Any
+    provider: str
+    base_url: str | None
+    api_key_hash: str
+    created_at: float = field(default_factory=time.time)
+    last_used_at: float = field(default_factory=time.time)
+    acquisitions: int = 0
+
+    def to_stats(self) -> dict[str, Any]:
+        now = time.time()
+        stats = {
+            "provider": self.provider,
+            "base_url": self.base_url,
+            "api_key_hash": self.api_key_hash,
+            "age_seconds": round(now - self.created_at, 1),
+            "idle_seconds": round(now - self.last_used_at, 1),
+            "acquisitions": self.acquisitions,
+        }
+        stats.update(_connection_pool_stats(self.client))
+        return stats
+
+
+def _connection_pool_stats(client: Any) -> dict[str, Any]:
+    """Best-effort connection counts from the underlying httpx pool."""
+    try:
+        pool = client._client._transport._pool
+        connections = list(pool.connections)
+        idle = sum(1 for conn in connections if conn.is_idle())
+        return {"connections": len(connections), "idle_connections": idle}
+    except Exception:
+        return {}
+
+
+class LLMClientRegistry:
+    """Registry of shared, long-lived LLM clients."""
+
+    def __init__(self):
+        self._clients: dict[tuple[str, str, str], PooledClient] = {}
+        self._retired: list[Any] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._created = 0
+        self._hits = 0
+        self._unpooled = 0
+        self._invalidations = 0
+
+    def bind_to_running_loop(self) -> None:
+        """Bind the registry to the current event loop (called at application startup)."""
+        self._loop = asyncio.get_running_loop()
+
+    def can_pool(self) -> bool:
+        """Whether clients can be shared on the current event loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        if self._loop is None or self._loop.is_closed():
+            if self._clients:
+                # Connections owned by a closed loop are unusable; drop them
+                logger.debug(f"Discarding {len(self._clients)} LLM client(s) bound to a closed event loop")
+                self._clients.clear()
+                self._retired.clear()
+            self._loop = loop
+        return loop is self._loop
+
+    def acquire(
+        self,
+        provider: str,
+        base_url: str | None,
+        api_key: str | None,
+        factory: Callable[[], Any],
+    ) -> tuple[Any, bool]:
+        """
+        Return the shared client for this configuration, creating it if needed.
+
+        Args:
+            provider: Provider name
+            base_url: Base URL the client talks to (None for the provider default)
+            api_key: API key the client authenticates with
+            factory: Zero-argument callable building a new client
+
+        Returns:
+            Tuple of (client, pooled). Unpooled clients (created off the registry's loop)
+            must be closed by the caller.
+        """
+        if not self.can_pool():
+            self._unpooled += 1
+            return factory(), False
+
+        key = (provider, base_url or "", _hash_api_key(api_key))
+        entry = self._clients.get(key)
+        if entry is None:
+            entry = PooledClient(
+                client=factory(), provider=provider, base_url=base_url, api_key_hash=key[2]
+            )
+            self._clients[key] = entry
+            self._created += 1
+            logger.debug(f"Created pooled LLM client for provider={provider} base_url={base_url}")
+        else:
+            self._hits += 1
+
+        entry.acquisitions += 1
+        entry.last_used_at = time.time()
+        return entry.client, True
+
+    def invalidate(self, provider: str | None = None) -> int:
+        """
+        Retire pooled clients so the next acquisition builds a fresh one.
+
+        Retired clients are closed after a grace period rather than immediately,
+        since other coroutines may still be using them.
+
+        Args:
+            provider: Only retire clients for this provider; all clients when None
+
+        Returns:
+            Number of clients retired
+        """
+        keys = [key for key in self._clients if provider is None or key[0] == provider]
+        batch = [self._clients.pop(key).client for key in keys]
+        self._retired.extend(batch)
+
+        if batch:
+            self._invalidations += len(batch)
+            logger.debug(f"Retired {len(batch)} pooled LLM client(s) (provider={provider or 'all'})")
+            self._schedule_retired_close(batch)
+        return len(batch)
+
+    def _schedule_retired_close(self, batch: list[Any]) -> None:
+        if self._loop is None or self._loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is not self._loop:
+            # Retired clients are closed at shutdown instead
+            return
+        self._loop.call_later(
+            RETIRED_CLIENT_GRACE_SECONDS, lambda: asyncio.ensure_future(self.close_retired(batch))
+        )
+
+    async def close_retired(self, clients: list[Any] | None = None) -> None:
+        """Close retired clients (the given batch, or all of them)."""
+        if clients is None:
+            retired, self._retired = self._retired, []
+        else:
+            retired = [client for client in clients if client in self._retired]
+            self._retired = [client for client in self._retired if client not in retired]
+        for client in retired:
+            try:
+                await close_client(client)
+            except Exception as e:
+                logger.warning(f"Error closing retired LLM client: {e}")
+
+    async def close_all(self) -> None:
+        """Close every pooled and retired client (application shutdown)."""
+        self.invalidate()
+        await self.close_retired()
+        logger.info("Closed all pooled LLM clients")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Registry and per-client connection pool metrics."""
+        return {
+            "pooled_clients": len(self._clients),
+            "retired_pending_close": len(self._retired),
+            "clients_created": self._created,
+            "reuse_hits": self._hits,
+            "unpooled_clients": self._unpooled,
+            "invalidations": self._invalidations,
+            "clients": [entry.to_stats() for entry in self._clients.values()],
+        }
+
+
+# Global registry instance
+_client_registry: LLMClientRegistry | None = None
+
+
+def get_client_registry() -> LLMClientRegistry:
+    """Get the global LLM client registry."""
+    global _client_registry
+
+    if _client_registry is None:
+        _client_registry = LLMClientRegistry()
+    return _client_registry
+
+
+async def close_client_registry() -> None:
+    """Close all pooled clients and reset the global registry."""
+    global _client_registry
+
+    if _client_registry is not None:
+        await _client_registry.close_all()
+        _client_registry = None
@@ -5,7 +5,6 @@ Provides a unified interface for creating OpenAI-compatible clients for differen
 Supports OpenAI, Ollama, and Google Gemini.
 """
 
-import inspect
 import time
 from contextlib import asynccontextmanager
 from typing import Any
@@ -14,6 +13,7 @@ import openai
 
 from ..config.logfire_config import get_logger
 from .credential_service import credential_service
+from .llm_client_registry import close_client, get_client_registry
 
 logger = get_logger(__name__)
 
@@ -156,6 +156,9 @@ def clear_provider_cache() -> None:
     _log_cache_access("*", "clear")
     logger.debug(f"Provider configuration cache cleared ({cache_size_before} entries removed)")
 
+    # Pooled clients may point at a provider/base URL that is no longer configured
+    get_client_registry().invalidate()
+
 
 def invalidate_provider_cache(provider: str = None) -> None:
     """
@@ -172,6 +175,7 @@ def invalidate_provider_cache(provider: str = None) -> None:
         _settings_cache.clear()
         _log_cache_access("*", "invalidate")
         logger.debug(f"All provider cache entries invalidated ({cache_size_before} entries)")
+        get_client_registry().invalidate()
     else:
         # Validate provider name before processing
         if not _is_valid_provider(provider):
@@ -189,6 +193,8 @@ def invalidate_provider_cache(provider: str = None) -> None:
             del _settings_cache[key]
             _log_cache_access(key, "invalidate")
 
+        get_client_registry().invalidate(provider)
+
         safe_provider = _sanitize_for_log(provider)
         logger.debug(f"Cache entries for provider '{safe_provider}' invalidated: {len(keys_to_remove)} entries removed")
 
@@ -333,6 +339,7 @@ async def get_llm_client(
         openai.AsyncOpenAI: An OpenAI-compatible client configured for the selected provider
     """
     client = None
+    pooled = False
     provider_name: str | None = None
     api_key = None
 
@@ -398,8 +405,8 @@ async def get_llm_client(
 
         if provider_name == "openai":
             if api_key:
-                client = openai.AsyncOpenAI(api_key=api_key)
-                logger.info("OpenAI client created successfully")
+                client, pooled = _acquire_client("openai", api_key=api_key)
+                logger.info("OpenAI client ready")
             else:
                 logger.warning("OpenAI API key not found, attempting Ollama fallback")
                 try:
@@ -412,7 +419,8 @@ async def get_llm_client(
                     if not ollama_base_url:
                         raise RuntimeError("No Ollama base URL resolved")
 
-                    client = openai.AsyncOpenAI(
+                    client, pooled = _acquire_client(
+                        "ollama",
                         api_key="ollama",
                         base_url=ollama_base_url,
                     )
@@ -436,7 +444,8 @@ async def get_llm_client(
             )
 
             # Ollama requires an API key in the client but doesn't actually use it
-            client = openai.AsyncOpenAI(
+            client, pooled = _acquire_client(
+                "ollama",
                 api_key="ollama",  # Required but unused by Ollama
                 base_url=ollama_base_url,
             )
@@ -446,7 +455,8 @@ async def get_llm_client(
             if not api_key:
                 raise ValueError("Google API key not found")
 
-            client = openai.AsyncOpenAI(
+            client, pooled = _acquire_client(
+                "google",
                 api_key=api_key,
                 base_url=base_url or "https://generativelanguage.googleapis.com/v1beta/openai/",
             )
@@ -456,7 +466,8 @@ async def get_llm_client(
             if not api_key:
                 raise ValueError("OpenRouter API key not found")
 
-            client = openai.AsyncOpenAI(
+            client, pooled = _acquire_client(
+                "openrouter",
                 api_key=api_key,
                 base_url=base_url or "https://openrouter.ai/api/v1",
             )
@@ -466,7 +477,8 @@ async def get_llm_client(
             if not api_key:
                 raise ValueError("Anthropic API key not found")
 
-            client = openai.AsyncOpenAI(
+            client, pooled = _acquire_client(
+                "anthropic",
                 api_key=api_key,
                 base_url=base_url or "https://api.anthropic.com/v1",
             )
@@ -490,7 +502,8 @@ async def get_llm_client(
                 f"Grok API key validation: format_valid={key_format_valid}, length_valid={key_length_valid}"
             )
 
-            client = openai.AsyncOpenAI(
+            client, pooled = _acquire_client(
+                "grok",
                 api_key=api_key,
                 base_url=base_url or "https://api.x.ai/v1",
             )
@@ -508,27 +521,12 @@ async def get_llm_client(
     try:
         yield client
     finally:
-        if client is not None:
+        # Pooled clients stay open for reuse; only ephemeral clients are closed here
+        if client is not None and not pooled:
             safe_provider = _sanitize_for_log(provider_name) if provider_name else "unknown"
 
             try:
-                close_method = getattr(client, "aclose", None)
-                if callable(close_method):
-                    if inspect.iscoroutinefunction(close_method):
-                        await close_method()
-                    else:
-                        maybe_coro = close_method()
-                        if inspect.isawaitable(maybe_coro):
-                            await maybe_coro
-                else:
-                    close_method = getattr(client, "close", None)
-                    if callable(close_method):
-                        if inspect.iscoroutinefunction(close_method):
-                            await close_method()
-                        else:
-                            close_result = close_method()
-                            if inspect.isawaitable(close_result):
-                                await close_result
+                await close_client(client)
                 logger.debug(f"Closed LLM client for provider: {safe_provider}")
             except RuntimeError as close_error:
                 if "Event loop is closed" in str(close_error):
@@ -548,6 +546,25 @@ async def get_llm_client(
                 )
 
 
+def _acquire_client(provider_name: str, **client_kwargs: Any) -> tuple[Any, bool]:
+    """
+    Get an OpenAI-compatible client from the shared registry.
+
+    Returns:
+        Tuple of (client, pooled); unpooled clients must be closed by the caller
+    """
+    return get_client_registry().acquire(
+        provider_name,
+        client_kwargs.get("base_url"),
+        client_kwargs.get("api_key"),
+        lambda: openai.AsyncOpenAI(**client_kwargs),
+    )
+
+
+def get_client_pool_stats() -> dict[str, Any]:
+    """Get pooled LLM client metrics (clients, reuse hits, connections per pool)."""
+    return get_client_registry().get_stats()
+
 
 async def _get_optimal_ollama_instance(instance_type: str | None = None,
                                        use_embedding_provider: bool = False,
@@ -68,6 +68,9 @@ class EmbeddingRouter:
         3072: "hnsw"      # Better for high dimensions
     }
 
+    # Above this many rows HNSW's query speed/recall outweighs its slower build
+    HNSW_MIN_ROWS = 1_000_000
+
     def __init__(self):
         self.routing_cache: dict[str, RoutingDecision] = {}
         self.cache_ttl = 300  # 5 minutes cache TTL
@@ -258,16 +261,21 @@ class EmbeddingRouter:
             logger.warning(f"Dimensions {dimensions} > 1536, using embedding_3072 (may truncate)")
             return "embedding_3072"
 
-    def get_optimal_index_type(self, dimensions: int) -> str:
+    def get_optimal_index_type(self, dimensions: int, row_count: int | None = None) -> str:
         """
         Get the optimal index type for the given dimensions.
 
         Args:
             dimensions: Embedding dimensions
+            row_count: Rows with embeddings in the column, if known. Large columns get
+                HNSW whatever their dimensions: ivfflat needs ever more lists and probes
+                to keep recall as they grow.
 
         Returns:
             Recommended index type (ivfflat or hnsw)
         """
+        if row_count is not None and row_count >= self.HNSW_MIN_ROWS:
+            return "hnsw"
         return self.INDEX_PREFERENCES.get(dimensions, "hnsw")
 
     async def get_available_embedding_routes(self, instance_urls: list[str]) -> list[EmbeddingRoute]:
@@ -6,12 +6,14 @@ AI-assisted documentation generation and progress tracking.
 """
 
 # Removed direct logging import - using unified config
+import asyncio
 from datetime import UTC, datetime
 from typing import Any
 
 from src.server.utils import get_supabase_client
 
 from ...config.logfire_config import get_logger
+from ..stats_cache import TASKS_SCOPE, bump_stats_epoch
 
 logger = get_logger(__name__)
 
@@ -68,7 +70,9 @@ class ProjectCreationService:
                     project_data[key] = kwargs[key]
 
             # Create the project in database
-            response = self.supabase_client.table("archon_projects").insert(project_data).execute()
+            response = await asyncio.to_thread(
+                self.supabase_client.table("archon_projects").insert(project_data).execute
+            )
             if hasattr(response, "error") and response.error:
                 raise RuntimeError(f"Supabase insert failed for project '{title}': {response.error}")
             if not response.data:
@@ -76,6 +80,7 @@ class ProjectCreationService:
 
             project_id = response.data[0]["id"]
             logger.info(f"Created project {project_id} in database")
+            bump_stats_epoch(TASKS_SCOPE)
 
             # AI processing step
 
@@ -85,11 +90,11 @@ class ProjectCreationService:
             )
 
             # Final success - fetch complete project data
-            final_project_response = (
+            final_project_response = await asyncio.to_thread(
                 self.supabase_client.table("archon_projects")
                 .select("*")
                 .eq("id", project_id)
-                .execute()
+                .execute
             )
             if final_project_response.data:
                 final_project = final_project_response.data[0]
@@ -13,13 +13,24 @@ from typing import Any
 from src.server.utils import get_supabase_client
 
 from ...config.logfire_config import get_logger
+from ..stats_cache import TASKS_SCOPE, bump_stats_epoch
 
 logger = get_logger(__name__)
 
 
+# Project columns for lightweight lists (everything but the large JSONB fields)
+PROJECT_LIST_COLUMNS = "id, title, description, github_repo, pinned, created_at, updated_at, "
+
+# Computed columns with the sizes of docs, features and data (migration 018)
+PROJECT_COUNT_COLUMNS = "docs_count, features_count, has_data"
+
+
 class ProjectService:
     """Service class for project operations"""
 
+    # Set when the database lacks the project count columns (migration 018 not applied)
+    _count_columns_missing = False
+
     def __init__(self, supabase_client=None):
         """Initialize with optional supabase client"""
         self.supabase_client = supabase_client or get_supabase_client()
@@ -59,6 +70,7 @@ class ProjectService:
             project = response.data[0]
             project_id = project["id"]
             logger.info(f"Project created successfully with ID: {project_id}")
+            bump_stats_epoch(TASKS_SCOPE)
 
             return True, {
                 "project": {
@@ -109,22 +121,28 @@ class ProjectService:
                         "data": project.get("data", []),
                     })
             else:
-                # Lightweight response for MCP - fetch all data but only return metadata + stats
-                # FIXED: N+1 query problem - now using single query
-                response = (
-                    self.supabase_client.table("archon_projects")
-                    .select("*")  # Fetch all fields in single query
-                    .order("created_at", desc=True)
-                    .execute()
+                # Lightweight response for MCP - the sizes of the JSONB fields are computed
+                # in the database, so the documents themselves are never transferred
+                columns = PROJECT_LIST_COLUMNS + (
+                    "docs, features, data" if ProjectService._count_columns_missing else PROJECT_COUNT_COLUMNS
                 )
+                try:
+                    response = (
+                        self.supabase_client.table("archon_projects")
+                        .select(columns)
+                        .order("created_at", desc=True)
+                        .execute()
+                    )
+                except Exception as e:
+                    if ProjectService._count_columns_missing or not ("_count" in str(e) or "has_data" in str(e)):
+                        raise
+                    # Count columns not installed (migration 018), fetch the fields to measure them
+                    logger.warning("Project count columns missing, fetching docs, features and data to count")
+                    ProjectService._count_columns_missing = True
+                    return self.list_projects(include_content=False)
 
                 projects = []
                 for project in response.data:
-                    # Calculate counts from fetched data (no additional queries)
-                    docs_count = len(project.get("docs", []))
-                    features_count = len(project.get("features", []))
-                    has_data = bool(project.get("data", []))
-
                     # Return only metadata + stats, excluding large JSONB fields
                     projects.append({
                         "id": project["id"],
@@ -135,9 +153,9 @@ class ProjectService:
                         "pinned": project.get("pinned", False),
                         "description": project.get("description", ""),
                         "stats": {
-                            "docs_count": docs_count,
-                            "features_count": features_count,
-                            "has_data": has_data
+                            "docs_count": project.get("docs_count", len(project.get("docs") or [])),
+                            "features_count": project.get("features_count", len(project.get("features") or [])),
+                            "has_data": project.get("has_data", bool(project.get("data"))),
                         }
                     })
 
@@ -261,6 +279,7 @@ class ProjectService:
 
             # For DELETE operations, success is indicated by no error, not by response.data content
             # response.data will be empty list [] even on successful deletion
+            bump_stats_epoch(TASKS_SCOPE)
             return True, {
                 "project_id": project_id,
                 "deleted_tasks": tasks_count,
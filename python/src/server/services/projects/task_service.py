@@ -6,23 +6,104 @@ shared between MCP tools and FastAPI endpoints.
 """
 
 # Removed direct logging import - using unified config
+import asyncio
+import base64
+import json
 from datetime import datetime
 from typing import Any
 
 from src.server.utils import get_supabase_client
 
 from ...config.logfire_config import get_logger
+from ..stats_cache import TASKS_SCOPE, bump_stats_epoch
 
 logger = get_logger(__name__)
 
 # Task updates are handled via polling - no broadcasting needed
 
+# Task fields listed when the large JSONB fields are excluded
+TASK_LIST_COLUMNS = (
+    "id, project_id, parent_task_id, title, description, "
+    "status, assignee, task_order, priority, feature, archived, "
+    "archived_at, archived_by, created_at, updated_at, "
+)
+# Computed columns with the JSONB array lengths (migration 014)
+TASK_COUNT_COLUMNS = "sources_count, code_examples_count"
+
+# PostgREST count methods list_tasks accepts
+TASK_COUNT_METHODS = ("exact", "planned", "estimated")
+
+# Spacing of task_order values written by bulk operations (the task board uses the same),
+# leaving room to insert between tasks without renumbering their siblings
+TASK_ORDER_GAP = 1000
+
+# Most tasks one bulk request may create, update and reorder
+MAX_BULK_TASKS = 100
+
+# Task fields bulk creates and updates may set
+BULK_TASK_FIELDS = (
+    "title", "description", "status", "assignee", "priority", "feature",
+    "task_order", "sources", "code_examples",
+)
+
+
+def encode_task_cursor(task: dict[str, Any]) -> str:
+    """Opaque cursor pointing at a task's position in the (task_order, created_at, id) order."""
+    key = [task.get("task_order"), task.get("created_at"), task.get("id")]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip("=")
+
+
+def decode_task_cursor(cursor: str) -> tuple[int | None, str, str]:
+    """Decode a cursor from encode_task_cursor; raises ValueError if it is malformed."""
+    try:
+        task_order, created_at, task_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+    if not (task_order is None or isinstance(task_order, int)) or not (
+        isinstance(created_at, str) and isinstance(task_id, str)
+    ):
+        raise ValueError("Invalid cursor")
+    return task_order, created_at, task_id
+
+
+def _after_cursor_filter(task_order: int | None, created_at: str, task_id: str) -> str:
+    """PostgREST or-filter for the tasks after a cursor (task_order sorts nulls last)."""
+    created, tid = json.dumps(created_at), json.dumps(task_id)
+    if task_order is None:
+        return (
+            f"and(task_order.is.null,created_at.gt.{created}),"
+            f"and(task_order.is.null,created_at.eq.{created},id.gt.{tid})"
+        )
+    return (
+        f"task_order.gt.{task_order},task_order.is.null,"
+        f"and(task_order.eq.{task_order},created_at.gt.{created}),"
+        f"and(task_order.eq.{task_order},created_at.eq.{created},id.gt.{tid})"
+    )
+
+
+def _term_filter(term: str) -> str:
+    """PostgREST or-filter matching a search term in the title, description or feature."""
+    # Quoted so commas and parentheses in the term are not read as filter syntax
+    pattern = json.dumps(f"%{term}%")
+    return f"title.ilike.{pattern},description.ilike.{pattern},feature.ilike.{pattern}"
+
 
 class TaskService:
     """Service class for task operations"""
 
     VALID_STATUSES = ["todo", "doing", "review", "done"]
 
+    # Set when the database lacks the task count columns (migration 014 not applied)
+    _count_columns_missing = False
+    # Set when the database lacks get_task_counts_by_project (migration 015 not applied)
+    _count_function_missing = False
+
+    # Set when the database lacks search_archon_tasks (migration 016 not applied)
+    _search_function_missing = False
+
+    # Set when the database lacks bulk_write_archon_tasks (migration 017 not applied)
+    _bulk_function_missing = False
+
     def __init__(self, supabase_client=None):
         """Initialize with optional supabase client"""
         self.supabase_client = supabase_client or get_supabase_client()
@@ -93,13 +174,13 @@ class TaskService:
             # REORDERING LOGIC: If inserting at a specific position, increment existing tasks
             if task_order > 0:
                 # Get all tasks in the same project and status with task_order >= new task's order
-                existing_tasks_response = (
+                existing_tasks_response = await asyncio.to_thread(
                     self.supabase_client.table("archon_tasks")
                     .select("id, task_order")
                     .eq("project_id", project_id)
                     .eq("status", task_status)
                     .gte("task_order", task_order)
-                    .execute()
+                    .execute
                 )
 
                 if existing_tasks_response.data:
@@ -108,10 +189,12 @@ class TaskService:
                     # Increment task_order for all affected tasks
                     for existing_task in existing_tasks_response.data:
                         new_order = existing_task["task_order"] + 1
-                        self.supabase_client.table("archon_tasks").update({
-                            "task_order": new_order,
-                            "updated_at": datetime.now().isoformat(),
-                        }).eq("id", existing_task["id"]).execute()
+                        await asyncio.to_thread(
+                            self.supabase_client.table("archon_tasks").update({
+                                "task_order": new_order,
+                                "updated_at": datetime.now().isoformat(),
+                            }).eq("id", existing_task["id"]).execute
+                        )
 
             task_data = {
                 "project_id": project_id,
@@ -130,11 +213,13 @@ class TaskService:
             if feature:
                 task_data["feature"] = feature
 
-            response = self.supabase_client.table("archon_tasks").insert(task_data).execute()
+            response = await asyncio.to_thread(
+                self.supabase_client.table("archon_tasks").insert(task_data).execute
+            )
 
             if response.data:
                 task = response.data[0]
-
+                bump_stats_epoch(TASKS_SCOPE)
 
                 return True, {
                     "task": {
@@ -156,6 +241,236 @@ class TaskService:
             logger.error(f"Error creating task: {e}")
             return False, {"error": f"Error creating task: {str(e)}"}
 
+    async def bulk_write_tasks(
+        self,
+        project_id: str,
+        creates: list[dict[str, Any]] | None = None,
+        updates: list[dict[str, Any]] | None = None,
+        reorder: list[str] | None = None,
+    ) -> tuple[bool, dict[str, Any]]:
+        """
+        Create, update and reorder many tasks of a project in one transaction.
+
+        Everything is written by one call to bulk_write_archon_tasks, whatever the number
+        of tasks. Created tasks without a task_order are appended to their status column
+        TASK_ORDER_GAP apart; explicit orders are stored as given. Either way no other task
+        is renumbered. Reordered columns are renumbered TASK_ORDER_GAP apart.
+
+        Args:
+            project_id: Project the tasks belong to
+            creates: New tasks (title required, other BULK_TASK_FIELDS optional)
+            updates: Changes to existing tasks ("id" plus the fields to change)
+            reorder: Task ids in their new order; every task of each status column they
+                are in (after the status updates) must be listed
+
+        Returns:
+            Tuple of (success, result_dict) with "created" and "updated" tasks and the
+            "missing" update ids (not found in the project, or archived)
+        """
+        try:
+            if not project_id or not isinstance(project_id, str):
+                return False, {"error": "Project ID is required and must be a string"}
+
+            creates = [dict(task) for task in creates or []]
+            updates_by_id: dict[str, dict[str, Any]] = {}
+            for index, update in enumerate(updates or []):
+                task_id = update.get("id")
+                if not task_id or not isinstance(task_id, str):
+                    return False, {"error": f"updates[{index}]: id is required"}
+                if task_id in updates_by_id:
+                    return False, {"error": f"updates[{index}]: task {task_id} is updated twice"}
+                updates_by_id[task_id] = dict(update)
+            reorder = list(reorder or [])
+            if len(set(reorder)) != len(reorder):
+                return False, {"error": "reorder lists a task more than once"}
+
+            if not creates and not updates_by_id and not reorder:
+                return False, {"error": "Nothing to create, update or reorder"}
+            if len(creates) + len(updates_by_id.keys() | set(reorder)) > MAX_BULK_TASKS:
+                return False, {"error": f"At most {MAX_BULK_TASKS} tasks per bulk request"}
+
+            for label, tasks in (("creates", creates), ("updates", list(updates_by_id.values()))):
+                for index, task in enumerate(tasks):
+                    unknown = set(task) - set(BULK_TASK_FIELDS) - ({"id"} if label == "updates" else set())
+                    if unknown:
+                        return False, {"error": f"{label}[{index}]: unknown fields {', '.join(sorted(unknown))}"}
+                    error_msg = self._validate_bulk_fields(task, require_title=label == "creates")
+                    if error_msg:
+                        return False, {"error": f"{label}[{index}]: {error_msg}"}
+                    if label == "updates" and len(task) == 1:
+                        return False, {"error": f"{label}[{index}]: no fields to update"}
+
+            if reorder:
+                orders, error_msg = await self._reorder_columns(project_id, reorder, updates_by_id)
+                if error_msg:
+                    return False, {"error": error_msg}
+                for task_id, task_order in orders.items():
+                    updates_by_id.setdefault(task_id, {"id": task_id})["task_order"] = task_order
+            updates = list(updates_by_id.values())
+
+            if TaskService._bulk_function_missing:
+                rows = await asyncio.to_thread(self._bulk_write_statements, project_id, creates, updates)
+            else:
+                try:
+                    query = self.supabase_client.rpc(
+                        "bulk_write_archon_tasks",
+                        {
+                            "target_project_id": project_id,
+                            "creates": creates,
+                            "updates": updates,
+                            "order_gap": TASK_ORDER_GAP,
+                        },
+                    )
+                    response = await asyncio.to_thread(query.execute)
+                    rows = response.data or []
+                except Exception as e:
+                    if "does not exist" not in str(e) and "Could not find the function" not in str(e):
+                        raise
+                    # Bulk function not installed (migration 017), write statement by statement
+                    logger.warning("bulk_write_archon_tasks missing, writing bulk tasks one statement at a time")
+                    TaskService._bulk_function_missing = True
+                    rows = await asyncio.to_thread(self._bulk_write_statements, project_id, creates, updates)
+
+            update_ids = {update["id"] for update in updates}
+            updated = [row for row in rows if row["id"] in update_ids]
+            created = [row for row in rows if row["id"] not in update_ids]
+            missing = sorted(update_ids - {row["id"] for row in updated})
+            if rows:
+                bump_stats_epoch(TASKS_SCOPE)
+
+            logger.info(
+                f"Bulk task write | project_id={project_id} | created={len(created)} | "
+                f"updated={len(updated)} | missing={len(missing)}"
+            )
+            return True, {"created": created, "updated": updated, "missing": missing}
+
+        except Exception as e:
+            logger.error(f"Error writing tasks in bulk: {e}")
+            return False, {"error": f"Error writing tasks in bulk: {str(e)}"}
+
+    async def _reorder_columns(
+        self, project_id: str, reorder: list[str], updates_by_id: dict[str, dict[str, Any]]
+    ) -> tuple[dict[str, int], str | None]:
+        """
+        New task_order of every reordered task, or an error message.
+
+        Reordered tasks are grouped by their status column (after the request's status
+        updates), and each column must be listed in full: its tasks are renumbered
+        TASK_ORDER_GAP apart in the listed order, so none can tie with an unlisted sibling.
+        """
+        response = await asyncio.to_thread(
+            self.supabase_client.table("archon_tasks")
+            .select("id, status")
+            .eq("project_id", project_id)
+            .or_("archived.is.null,archived.is.false")
+            .execute
+        )
+        statuses = {task["id"]: task["status"] for task in response.data or []}
+        for task_id, update in updates_by_id.items():
+            if task_id in statuses and "status" in update:
+                statuses[task_id] = update["status"]
+
+        unknown = [task_id for task_id in reorder if task_id not in statuses]
+        if unknown:
+            return {}, f"reorder: tasks not found in the project (or archived): {', '.join(unknown)}"
+
+        columns: dict[str, list[str]] = {}
+        for task_id in reorder:
+            columns.setdefault(statuses[task_id], []).append(task_id)
+
+        orders: dict[str, int] = {}
+        for status, listed in columns.items():
+            unlisted = sorted(task_id for task_id, s in statuses.items() if s == status and task_id not in listed)
+            if unlisted:
+                return {}, (
+                    f"reorder must list every task of the '{status}' column; missing: {', '.join(unlisted)}"
+                )
+            for position, task_id in enumerate(listed, start=1):
+                orders[task_id] = position * TASK_ORDER_GAP
+        return orders, None
+
+    def _validate_bulk_fields(self, task: dict[str, Any], require_title: bool) -> str | None:
+        """Error message for an invalid bulk create or update, else None."""
+        if require_title or "title" in task:
+            title = task.get("title")
+            if not title or not isinstance(title, str) or not title.strip():
+                return "Task title is required and must be a non-empty string"
+        for field, validate in (
+            ("status", self.validate_status),
+            ("assignee", self.validate_assignee),
+            ("priority", self.validate_priority),
+        ):
+            if field in task:
+                is_valid, error_msg = validate(task[field])
+                if not is_valid:
+                    return error_msg
+        task_order = task.get("task_order")
+        if task_order is not None and (
+            isinstance(task_order, bool) or not isinstance(task_order, int) or task_order < 0
+        ):
+            return "task_order must be a non-negative integer"
+        return None
+
+    def _bulk_write_statements(
+        self, project_id: str, creates: list[dict[str, Any]], updates: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """bulk_write_archon_tasks without the function: one UPDATE per task, one INSERT for all (not atomic)."""
+        now = datetime.now().isoformat()
+        rows = []
+        for update in updates:
+            fields = {key: value for key, value in update.items() if key != "id"}
+            response = (
+                self.supabase_client.table("archon_tasks")
+                .update({**fields, "updated_at": now})
+                .eq("id", update["id"])
+                .eq("project_id", project_id)
+                .or_("archived.is.null,archived.is.false")
+                .execute()
+            )
+            rows.extend(response.data or [])
+
+        if creates:
+            # Append after the highest order of each status column, like the function does
+            existing = (
+                self.supabase_client.table("archon_tasks")
+                .select("status, task_order")
+                .eq("project_id", project_id)
+                .or_("archived.is.null,archived.is.false")
+                .execute()
+            )
+            tops: dict[str, int] = {}
+            for task in existing.data or []:
+                tops[task["status"]] = max(tops.get(task["status"], 0), task.get("task_order") or 0)
+            # Appended creates go above the explicit orders in this request too, never onto one
+            for create in creates:
+                if create.get("task_order") is not None:
+                    status = create.get("status", "todo")
+                    tops[status] = max(tops.get(status, 0), create["task_order"])
+
+            task_data = []
+            for create in creates:
+                status = create.get("status", "todo")
+                task_order = create.get("task_order")
+                if task_order is None:
+                    task_order = tops[status] = tops.get(status, 0) + TASK_ORDER_GAP
+                task_data.append({
+                    "project_id": project_id,
+                    "description": "",
+                    "assignee": "User",
+                    "priority": "medium",
+                    "sources": [],
+                    "code_examples": [],
+                    **create,
+                    "status": status,
+                    "task_order": task_order,
+                    "created_at": now,
+                    "updated_at": now,
+                })
+            response = self.supabase_client.table("archon_tasks").insert(task_data).execute()
+            rows.extend(response.data or [])
+
+        return rows
+
     def list_tasks(
         self,
         project_id: str = None,
@@ -163,104 +478,171 @@ class TaskService:
         include_closed: bool = False,
         exclude_large_fields: bool = False,
         include_archived: bool = False,
-        search_query: str = None
+        search_query: str = None,
+        assignee: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        cursor: str | None = None,
+        count: str | None = None,
     ) -> tuple[bool, dict[str, Any]]:
         """
         List tasks with various filters.
 
+        Tasks are ordered by (task_order, created_at, id). Pages are cut in the database:
+        pass ``limit`` with either ``offset`` or the ``next_cursor`` of the previous page,
+        which keeps every page as cheap as the first however deep it is.
+
+        A ``search_query`` matches tasks containing every term (as a word prefix, or in
+        order as a substring) through the indexed search_archon_tasks function; results
+        are ranked by relevance and paged by ``offset`` only (no next_cursor).
+
         Args:
             project_id: Filter by project
             status: Filter by status
             include_closed: Include done tasks
             exclude_large_fields: If True, excludes sources and code_examples fields
             include_archived: If True, includes archived tasks
-            search_query: Keyword search in title, description, and feature fields
+            search_query: Keyword search in title, description, and feature fields (all terms must match)
+            assignee: Filter by assignee
+            limit: Maximum number of tasks to return (all if None)
+            offset: Tasks to skip (ignored with a cursor)
+            cursor: Continue after the task a previous page's next_cursor points to
+            count: Also count all matching tasks: "exact", "planned" or "estimated"
+                (planner statistics, cheap on large tables)
 
         Returns:
-            Tuple of (success, result_dict)
+            Tuple of (success, result_dict); paginated results also carry
+            "next_cursor" (None on the last page) and "has_more"
         """
         try:
+            if count and count not in TASK_COUNT_METHODS:
+                return False, {"error": f"Invalid count '{count}'. Must be one of: {', '.join(TASK_COUNT_METHODS)}"}
+            after = decode_task_cursor(cursor) if cursor else None
+            if status:
+                # Validate status
+                is_valid, error_msg = self.validate_status(status)
+                if not is_valid:
+                    return False, {"error": error_msg}
+            search_terms = search_query.lower().split() if search_query else []
+            searching = bool(search_terms) and not TaskService._search_function_missing
+
             # Start with base query
             if exclude_large_fields:
-                # Select all fields except large JSONB ones
-                query = self.supabase_client.table("archon_tasks").select(
-                    "id, project_id, parent_task_id, title, description, "
-                    "status, assignee, task_order, priority, feature, archived, "
-                    "archived_at, archived_by, created_at, updated_at, "
-                    "sources, code_examples"  # Still fetch for counting, but will process differently
+                # Select all fields except large JSONB ones, with their lengths instead
+                columns = TASK_LIST_COLUMNS + (
+                    "sources, code_examples" if TaskService._count_columns_missing else TASK_COUNT_COLUMNS
                 )
             else:
-                query = self.supabase_client.table("archon_tasks").select("*")
+                columns = "*"
+            select_options = {"count": count} if count else {}
 
             # Track filters for debugging
             filters_applied = []
 
-            # Apply filters
-            if project_id:
-                query = query.eq("project_id", project_id)
-                filters_applied.append(f"project_id={project_id}")
-
-            if status:
-                # Validate status
-                is_valid, error_msg = self.validate_status(status)
-                if not is_valid:
-                    return False, {"error": error_msg}
-                query = query.eq("status", status)
-                filters_applied.append(f"status={status}")
-                # When filtering by specific status, don't apply include_closed filter
-                # as it would be redundant or potentially conflicting
-            elif not include_closed:
-                # Only exclude done tasks if no specific status filter is applied
-                query = query.neq("status", "done")
-                filters_applied.append("exclude done tasks")
-
-            # Apply keyword search if provided
-            if search_query:
-                # Split search query into terms
-                search_terms = search_query.lower().split()
-                
-                # Build the filter expression for AND-of-ORs
-                # Each term must match in at least one field (OR), and all terms must match (AND)
-                if len(search_terms) == 1:
-                    # Single term: simple OR across fields
-                    term = search_terms[0]
-                    query = query.or_(
-                        f"title.ilike.%{term}%,"
-                        f"description.ilike.%{term}%,"
-                        f"feature.ilike.%{term}%"
-                    )
+            if searching:
+                # Filters are applied inside the function, before ranking
+                query = self.supabase_client.rpc(
+                    "search_archon_tasks",
+                    {
+                        "search_query": search_query,
+                        "filter_project_id": project_id,
+                        "filter_status": status,
+                        "filter_assignee": assignee,
+                        "include_closed": include_closed,
+                        "include_archived": include_archived,
+                    },
+                    **select_options,
+                ).select(columns)
+                filters_applied.append(f"ranked search={search_query}")
+                # Ranked results have no position to continue after
+                after = None
+            else:
+                query = self.supabase_client.table("archon_tasks").select(columns, **select_options)
+
+                # Apply filters
+                if project_id:
+                    query = query.eq("project_id", project_id)
+                    filters_applied.append(f"project_id={project_id}")
+
+                if status:
+                    query = query.eq("status", status)
+                    filters_applied.append(f"status={status}")
+                    # When filtering by specific status, don't apply include_closed filter
+                    # as it would be redundant or potentially conflicting
+                elif not include_closed:
+                    # Only exclude done tasks if no specific status filter is applied
+                    query = query.neq("status", "done")
+                    filters_applied.append("exclude done tasks")
+
+                if assignee:
+                    query = query.eq("assignee", assignee)
+                    filters_applied.append(f"assignee={assignee}")
+
+                # Keyword search without the search function: each term must match in at
+                # least one field (OR), and all terms must match (AND)
+                for term in search_terms:
+                    query = query.or_(_term_filter(term))
+                if search_terms:
+                    filters_applied.append(f"search={search_query}")
+
+                # Filter out archived tasks only if not including them
+                if not include_archived:
+                    query = query.or_("archived.is.null,archived.is.false")
+                    filters_applied.append("exclude archived tasks (null or false)")
                 else:
-                    # Multiple terms: use text search for proper AND logic
-                    # Note: This requires full-text search columns to be set up in the database
-                    # For now, we'll search for the full phrase in any field
-                    full_query = search_query.lower()
-                    query = query.or_(
-                        f"title.ilike.%{full_query}%,"
-                        f"description.ilike.%{full_query}%,"
-                        f"feature.ilike.%{full_query}%"
-                    )
-                filters_applied.append(f"search={search_query}")
+                    filters_applied.append("include all tasks (including archived)")
 
-            # Filter out archived tasks only if not including them
-            if not include_archived:
-                query = query.or_("archived.is.null,archived.is.false")
-                filters_applied.append("exclude archived tasks (null or false)")
-            else:
-                filters_applied.append("include all tasks (including archived)")
+                if after:
+                    query = query.or_(_after_cursor_filter(*after))
+                    filters_applied.append("after cursor")
 
             logger.debug(f"Listing tasks with filters: {', '.join(filters_applied)}")
 
-            # Execute query and get raw response
-            response = (
-                query.order("task_order", desc=False).order("created_at", desc=False).execute()
-            )
+            # Execute query and get raw response (search results keep their relevance order)
+            if not searching:
+                query = query.order("task_order", desc=False).order("created_at", desc=False)
+            paginated = limit is not None
+            if paginated:
+                # id breaks ties so pages never overlap; one extra row tells whether more follow
+                limit = max(1, limit)
+                start = 0 if after else max(0, offset)
+                if not searching:
+                    query = query.order("id", desc=False)
+                query = query.range(start, start + limit)
+            try:
+                response = query.execute()
+            except Exception as e:
+                if exclude_large_fields and not TaskService._count_columns_missing and "_count" in str(e):
+                    # Count columns not installed (migration 014), count the arrays here instead
+                    logger.warning("Task count columns missing, fetching sources and code_examples to count")
+                    TaskService._count_columns_missing = True
+                    return self.list_tasks(
+                        project_id, status, include_closed, exclude_large_fields, include_archived,
+                        search_query, assignee, limit, offset, cursor, count,
+                    )
+                if searching and "search_archon_tasks" in str(e) and (
+                    "does not exist" in str(e) or "Could not find the function" in str(e)
+                ):
+                    # Search function not installed (migration 016), filter with ILIKE instead
+                    logger.warning("search_archon_tasks missing, searching tasks with ILIKE filters")
+                    TaskService._search_function_missing = True
+                    return self.list_tasks(
+                        project_id, status, include_closed, exclude_large_fields, include_archived,
+                        search_query, assignee, limit, offset, cursor, count,
+                    )
+                raise
+
+            rows = response.data or []
+            has_more = paginated and len(rows) > limit
+            if has_more:
+                rows = rows[:limit]
 
             # Debug: Log task status distribution and filter effectiveness
-            if response.data:
+            if rows:
                 status_counts = {}
                 archived_counts = {"null": 0, "true": 0, "false": 0}
 
-                for task in response.data:
+                for task in rows:
                     task_status = task.get("status", "unknown")
                     status_counts[task_status] = status_counts.get(task_status, 0) + 1
 
@@ -274,13 +656,13 @@ class TaskService:
                         archived_counts["false"] += 1
 
                 logger.debug(
-                    f"Retrieved {len(response.data)} tasks. Status distribution: {status_counts}"
+                    f"Retrieved {len(rows)} tasks. Status distribution: {status_counts}"
                 )
                 logger.debug(f"Archived field distribution: {archived_counts}")
 
                 # If we're filtering by status and getting wrong results, log sample
-                if status and len(response.data) > 0:
-                    first_task = response.data[0]
+                if status and len(rows) > 0:
+                    first_task = rows[0]
                     logger.warning(
                         f"Status filter: {status}, First task status: {first_task.get('status')}, archived: {first_task.get('archived')}"
                     )
@@ -288,7 +670,7 @@ class TaskService:
                 logger.debug("No tasks found with current filters")
 
             tasks = []
-            for task in response.data:
+            for task in rows:
                 task_data = {
                     "id": task["id"],
                     "project_id": task["project_id"],
@@ -311,8 +693,10 @@ class TaskService:
                 else:
                     # Add counts instead of full content
                     task_data["stats"] = {
-                        "sources_count": len(task.get("sources", [])),
-                        "code_examples_count": len(task.get("code_examples", []))
+                        "sources_count": task.get("sources_count", len(task.get("sources") or [])),
+                        "code_examples_count": task.get(
+                            "code_examples_count", len(task.get("code_examples") or [])
+                        ),
                     }
 
                 tasks.append(task_data)
@@ -322,16 +706,24 @@ class TaskService:
                 filter_info.append(f"project_id={project_id}")
             if status:
                 filter_info.append(f"status={status}")
+            if assignee:
+                filter_info.append(f"assignee={assignee}")
             if not include_closed:
                 filter_info.append("excluding closed tasks")
 
-            return True, {
+            result = {
                 "tasks": tasks,
-                "total_count": len(tasks),
+                "total_count": response.count if count else len(tasks),
                 "filters_applied": ", ".join(filter_info) if filter_info else "none",
                 "include_closed": include_closed,
             }
+            if paginated:
+                result["has_more"] = has_more
+                result["next_cursor"] = encode_task_cursor(rows[-1]) if has_more and not searching else None
+            return True, result
 
+        except ValueError as e:
+            return False, {"error": str(e)}
         except Exception as e:
             logger.error(f"Error listing tasks: {e}")
             return False, {"error": f"Error listing tasks: {str(e)}"}
@@ -403,16 +795,16 @@ class TaskService:
                 update_data["feature"] = update_fields["feature"]
 
             # Update task
-            response = (
+            response = await asyncio.to_thread(
                 self.supabase_client.table("archon_tasks")
                 .update(update_data)
                 .eq("id", task_id)
-                .execute()
+                .execute
             )
 
             if response.data:
                 task = response.data[0]
-
+                bump_stats_epoch(TASKS_SCOPE)
 
                 return True, {"task": task, "message": "Task updated successfully"}
             else:
@@ -433,8 +825,8 @@ class TaskService:
         """
         try:
             # First, check if task exists and is not already archived
-            task_response = (
-                self.supabase_client.table("archon_tasks").select("*").eq("id", task_id).execute()
+            task_response = await asyncio.to_thread(
+                self.supabase_client.table("archon_tasks").select("*").eq("id", task_id).execute
             )
             if not task_response.data:
                 return False, {"error": f"Task with ID {task_id} not found"}
@@ -452,15 +844,15 @@ class TaskService:
             }
 
             # Archive the main task
-            response = (
+            response = await asyncio.to_thread(
                 self.supabase_client.table("archon_tasks")
                 .update(archive_data)
                 .eq("id", task_id)
-                .execute()
+                .execute
             )
 
             if response.data:
-
+                bump_stats_epoch(TASKS_SCOPE)
                 return True, {"task_id": task_id, "message": "Task archived successfully"}
             else:
                 return False, {"error": f"Failed to archive task {task_id}"}
@@ -473,7 +865,8 @@ class TaskService:
         """
         Get task counts for all projects in a single optimized query.
         
-        Returns task counts grouped by project_id and status.
+        Counts are aggregated in the database (GROUP BY project_id, status), so the
+        response grows with the number of projects, not tasks.
         
         Returns:
             Tuple of (success, counts_dict) where counts_dict is:
@@ -482,40 +875,27 @@ class TaskService:
         try:
             logger.debug("Fetching task counts for all projects in batch")
 
-            # Query all non-archived tasks grouped by project_id and status
-            response = (
-                self.supabase_client.table("archon_tasks")
-                .select("project_id, status")
-                .or_("archived.is.null,archived.is.false")
-                .execute()
-            )
-
-            if not response.data:
-                logger.debug("No tasks found")
-                return True, {}
-
-            # Process results into counts by project and status
-            counts_by_project = {}
-
-            for task in response.data:
-                project_id = task.get("project_id")
-                status = task.get("status")
-
-                if not project_id or not status:
+            if TaskService._count_function_missing:
+                return True, self._count_project_tasks_by_scan()
+
+            try:
+                response = self.supabase_client.rpc("get_task_counts_by_project", {}).execute()
+            except Exception as e:
+                if "does not exist" not in str(e) and "Could not find the function" not in str(e):
+                    raise
+                # Aggregate function not installed (migration 015), count the rows here instead
+                logger.warning("get_task_counts_by_project missing, counting task rows instead")
+                TaskService._count_function_missing = True
+                return True, self._count_project_tasks_by_scan()
+
+            counts_by_project: dict[str, dict[str, int]] = {}
+            for row in response.data or []:
+                project_id = row.get("project_id")
+                status = row.get("status")
+                if not project_id or status not in self.VALID_STATUSES:
                     continue
-
-                # Initialize project counts if not exists
-                if project_id not in counts_by_project:
-                    counts_by_project[project_id] = {
-                        "todo": 0,
-                        "doing": 0,
-                        "review": 0,
-                        "done": 0
-                    }
-
-                # Count all statuses separately
-                if status in ["todo", "doing", "review", "done"]:
-                    counts_by_project[project_id][status] += 1
+                counts = counts_by_project.setdefault(project_id, dict.fromkeys(self.VALID_STATUSES, 0))
+                counts[status] += int(row.get("task_count") or 0)
 
             logger.debug(f"Task counts fetched for {len(counts_by_project)} projects")
 
@@ -524,3 +904,23 @@ class TaskService:
         except Exception as e:
             logger.error(f"Error fetching task counts: {e}")
             return False, {"error": f"Error fetching task counts: {str(e)}"}
+
+    def _count_project_tasks_by_scan(self) -> dict[str, dict[str, int]]:
+        """Count non-archived tasks per project and status from the task rows."""
+        response = (
+            self.supabase_client.table("archon_tasks")
+            .select("project_id, status")
+            .or_("archived.is.null,archived.is.false")
+            .execute()
+        )
+
+        counts_by_project: dict[str, dict[str, int]] = {}
+        for task in response.data or []:
+            project_id = task.get("project_id")
+            status = task.get("status")
+            if not project_id or status not in self.VALID_STATUSES:
+                continue
+            counts = counts_by_project.setdefault(project_id, dict.fromkeys(self.VALID_STATUSES, 0))
+            counts[status] += 1
+
+        return counts_by_project
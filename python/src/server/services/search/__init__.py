@@ -10,12 +10,14 @@ from .agentic_rag_strategy import AgenticRAGStrategy
 # Strategy implementations
 from .base_search_strategy import BaseSearchStrategy
 from .hybrid_search_strategy import HybridSearchStrategy
-from .rag_service import RAGService
+from .rag_service import RAGService, close_rag_service, get_rag_service
 from .reranking_strategy import RerankingStrategy
 
 __all__ = [
     # Main service classes
     "RAGService",
+    "get_rag_service",
+    "close_rag_service",
     # Strategy classes
     "BaseSearchStrategy",
     "HybridSearchStrategy",
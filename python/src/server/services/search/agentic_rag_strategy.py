@@ -17,7 +17,7 @@ from typing import Any
 from supabase import Client
 
 from ...config.logfire_config import get_logger, safe_span
-from ..embeddings.embedding_service import create_embedding
+from ..embeddings.embedding_service import create_query_embedding
 
 logger = get_logger(__name__)
 
@@ -71,6 +71,7 @@ class AgenticRAGStrategy:
         match_count: int = 10,
         filter_metadata: dict[str, Any] | None = None,
         source_id: str | None = None,
+        query_embedding: list[float] | None = None,
     ) -> list[dict[str, Any]]:
         """
         Search for code examples using vector similarity.
@@ -80,6 +81,7 @@ class AgenticRAGStrategy:
             match_count: Maximum number of results to return
             filter_metadata: Optional metadata filter
             source_id: Optional source ID to filter results
+            query_embedding: Pre-computed query embedding (created from the query if not given)
 
         Returns:
             List of matching code examples
@@ -88,8 +90,9 @@ class AgenticRAGStrategy:
             "agentic_code_search", query_length=len(query), match_count=match_count
         ) as span:
             try:
-                # Create embedding for the query (no enhancement)
-                query_embedding = await create_embedding(query)
+                # Create embedding for the query (no enhancement) unless the caller already has it
+                if not query_embedding:
+                    query_embedding = await create_query_embedding(query)
 
                 if not query_embedding:
                     logger.error("Failed to create embedding for code example query")
@@ -5,17 +5,74 @@ Implements the foundational vector similarity search that all other strategies b
 This is the core semantic search functionality.
 """
 
-from typing import Any
+from typing import Any, NamedTuple
 
 from supabase import Client
 
 from ...config.logfire_config import get_logger, safe_span
+from ..async_db_client import execute_rpc
+from .vector_index_service import get_vector_index_service
 
 logger = get_logger(__name__)
 
 # Fixed similarity threshold for vector results
 SIMILARITY_THRESHOLD = 0.05
 
+# Search RPCs whose slim variant the database does not have (migration not applied)
+_missing_slim_rpcs: set[str] = set()
+
+
+class SearchProjection(NamedTuple):
+    """Which part of each chunk a search returns (see the *_slim search functions)."""
+
+    content_length: int  # Characters of content to return
+    metadata_keys: tuple[str, ...] | None = None  # Metadata keys to keep (None keeps all)
+
+    def rpc_params(self) -> dict[str, Any]:
+        return {
+            "snippet_length": self.content_length,
+            "metadata_keys": list(self.metadata_keys) if self.metadata_keys is not None else None,
+        }
+
+    def apply(self, row: dict[str, Any]) -> dict[str, Any]:
+        """Project a full row the way the slim search functions do."""
+        content = row.get("content") or ""
+        metadata = row.get("metadata") or {}
+        if self.metadata_keys is not None:
+            metadata = {key: value for key, value in metadata.items() if key in self.metadata_keys}
+        return {
+            **row,
+            "content": content[: self.content_length],
+            "content_length": len(content),
+            "metadata": metadata,
+        }
+
+
+async def execute_search_rpc(
+    client: Client, rpc: str, params: dict[str, Any], projection: SearchProjection | None = None
+) -> list[dict[str, Any]]:
+    """
+    Run a search RPC, through its slim variant when a projection is given.
+
+    The slim variant ({rpc}_slim) cuts the content and metadata in the database, so only
+    snippets leave it. On databases without it the full rows are projected client-side.
+    """
+    if projection is None:
+        return await execute_rpc(client, rpc, params)
+
+    if rpc not in _missing_slim_rpcs:
+        try:
+            return await execute_rpc(client, f"{rpc}_slim", {**params, **projection.rpc_params()})
+        except Exception as e:
+            message = str(e)
+            if "does not exist" not in message and "Could not find the function" not in message:
+                raise
+            logger.warning(f"{rpc}_slim is missing (run migration 013), projecting results client-side")
+            _missing_slim_rpcs.add(rpc)
+
+    rows = await execute_rpc(client, rpc, params)
+    return [projection.apply(row) for row in rows or []]
+
 
 class BaseSearchStrategy:
     """Base strategy implementing fundamental vector similarity search"""
@@ -30,6 +87,7 @@ class BaseSearchStrategy:
         match_count: int,
         filter_metadata: dict | None = None,
         table_rpc: str = "match_archon_crawled_pages",
+        projection: SearchProjection | None = None,
     ) -> list[dict[str, Any]]:
         """
         Perform basic vector similarity search.
@@ -41,6 +99,7 @@ class BaseSearchStrategy:
             match_count: Number of results to return
             filter_metadata: Optional metadata filters
             table_rpc: The RPC function to call (match_archon_crawled_pages or match_archon_code_examples)
+            projection: Return only content snippets and selected metadata keys (crawled pages only)
 
         Returns:
             List of matching documents with similarity scores
@@ -60,13 +119,17 @@ class BaseSearchStrategy:
                 else:
                     rpc_params["filter"] = {}
 
-                # Execute search
-                response = self.supabase_client.rpc(table_rpc, rpc_params).execute()
+                # Index search effort (hnsw.ef_search / ivfflat.probes) per VECTOR_SEARCH_RECALL
+                table = "archon_code_examples" if "code_examples" in table_rpc else "archon_crawled_pages"
+                rpc_params.update(get_vector_index_service().search_params(table, match_count))
+
+                # Execute search without blocking the event loop
+                rows = await execute_search_rpc(self.supabase_client, table_rpc, rpc_params, projection)
 
                 # Filter by similarity threshold
                 filtered_results = []
-                if response.data:
-                    for result in response.data:
+                if rows:
+                    for result in rows:
                         similarity = float(result.get("similarity", 0.0))
                         if similarity >= SIMILARITY_THRESHOLD:
                             filtered_results.append(result)
@@ -74,7 +137,7 @@ class BaseSearchStrategy:
                 span.set_attribute("results_found", len(filtered_results))
                 span.set_attribute(
                     "results_filtered",
-                    len(response.data) - len(filtered_results) if response.data else 0,
+                    len(rows) - len(filtered_results) if rows else 0,
                 )
 
                 return filtered_results
@@ -9,17 +9,74 @@ Strategy combines:
 1. Vector/semantic search for conceptual matches
 2. Full-text search using ts_vector for efficient keyword matching
 3. Returns union of both result sets for maximum coverage
+
+Documents can alternatively be searched in "rrf" mode, where the vector and full-text
+searches run as separate concurrent queries and their rankings are fused client-side
+with weighted reciprocal rank fusion, so each leg can be weighted and timed on its own.
 """
 
+import asyncio
+import time
+from collections.abc import Awaitable
 from typing import Any
 
 from supabase import Client
 
 from ...config.logfire_config import get_logger, safe_span
-from ..embeddings.embedding_service import create_embedding
+from ..async_db_client import execute_rpc
+from ..embeddings.embedding_service import create_query_embedding
+from .base_search_strategy import SearchProjection, execute_search_rpc
+from .vector_index_service import get_vector_index_service
 
 logger = get_logger(__name__)
 
+# Rank constant from the original RRF paper; dampens the lead of the very top ranks
+DEFAULT_RRF_K = 60
+
+
+def reciprocal_rank_fusion(
+    rankings: list[tuple[list[dict[str, Any]], float]],
+    k: int = DEFAULT_RRF_K,
+    id_key: str = "id",
+) -> list[dict[str, Any]]:
+    """
+    Fuse ranked result lists with weighted reciprocal rank fusion.
+
+    Each result scores ``weight / (k + rank)`` (rank starting at 1) in every list it
+    appears in; results are deduplicated by ``id_key`` and ordered by their summed
+    score. The first list a result appears in provides its fields.
+
+    Args:
+        rankings: (results in rank order, weight) per ranked list
+        k: Rank constant
+        id_key: Field identifying the same result across lists
+
+    Returns:
+        Fused results, each with "rrf_score" and "ranks" (its rank in each list, None if absent)
+    """
+    fused: dict[Any, dict[str, Any]] = {}
+    for position, (results, weight) in enumerate(rankings):
+        for rank, result in enumerate(results, start=1):
+            entry = fused.get(result[id_key])
+            if entry is None:
+                entry = fused[result[id_key]] = {
+                    **result,
+                    "rrf_score": 0.0,
+                    "ranks": [None] * len(rankings),
+                }
+            elif entry["ranks"][position] is not None:
+                continue  # Duplicate within one list, keep its best rank
+            entry["ranks"][position] = rank
+            entry["rrf_score"] += weight / (k + rank)
+    return sorted(fused.values(), key=lambda entry: entry["rrf_score"], reverse=True)
+
+
+async def _timed(awaitable: Awaitable[Any]) -> tuple[Any, float]:
+    """Await and return (result, elapsed milliseconds)."""
+    start = time.perf_counter()
+    result = await awaitable
+    return result, round(1000 * (time.perf_counter() - start), 1)
+
 
 class HybridSearchStrategy:
     """Strategy class implementing hybrid search combining vector and full-text search"""
@@ -34,6 +91,7 @@ class HybridSearchStrategy:
         query_embedding: list[float],
         match_count: int,
         filter_metadata: dict | None = None,
+        projection: SearchProjection | None = None,
     ) -> list[dict[str, Any]]:
         """
         Perform hybrid search on archon_crawled_pages table using the PostgreSQL 
@@ -44,6 +102,7 @@ class HybridSearchStrategy:
             query_embedding: Pre-computed query embedding
             match_count: Number of results to return
             filter_metadata: Optional metadata filter dict
+            projection: Return only content snippets and selected metadata keys
 
         Returns:
             List of matching documents from both vector and text search
@@ -55,7 +114,8 @@ class HybridSearchStrategy:
                 source_filter = filter_json.pop("source", None) if "source" in filter_json else None
 
                 # Call the hybrid search PostgreSQL function
-                response = self.supabase_client.rpc(
+                rows = await execute_search_rpc(
+                    self.supabase_client,
                     "hybrid_search_archon_crawled_pages",
                     {
                         "query_embedding": query_embedding,
@@ -63,16 +123,18 @@ class HybridSearchStrategy:
                         "match_count": match_count,
                         "filter": filter_json,
                         "source_filter": source_filter,
+                        **get_vector_index_service().search_params("archon_crawled_pages", match_count),
                     },
-                ).execute()
+                    projection,
+                )
 
-                if not response.data:
+                if not rows:
                     logger.debug("No results from hybrid search")
                     return []
 
                 # Format results to match expected structure
                 results = []
-                for row in response.data:
+                for row in rows:
                     result = {
                         "id": row["id"],
                         "url": row["url"],
@@ -83,6 +145,8 @@ class HybridSearchStrategy:
                         "similarity": row["similarity"],
                         "match_type": row["match_type"],
                     }
+                    if "content_length" in row:
+                        result["content_length"] = row["content_length"]
                     results.append(result)
 
                 span.set_attribute("results_count", len(results))
@@ -105,12 +169,135 @@ class HybridSearchStrategy:
                 span.set_attribute("error", str(e))
                 return []
 
+    async def search_documents_rrf(
+        self,
+        query: str,
+        query_embedding: list[float],
+        match_count: int,
+        filter_metadata: dict | None = None,
+        k: int = DEFAULT_RRF_K,
+        vector_weight: float = 1.0,
+        text_weight: float = 1.0,
+        timings: dict[str, float] | None = None,
+        projection: SearchProjection | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Hybrid search on archon_crawled_pages fused with reciprocal rank fusion.
+
+        The vector search (match_archon_crawled_pages) and the full-text search
+        (search_archon_crawled_pages_text) run concurrently, each returning up to
+        match_count results; their rankings are fused with weighted RRF and
+        deduplicated by chunk id. If one leg fails, the other's results are used.
+
+        Args:
+            query: Original search query text
+            query_embedding: Pre-computed query embedding
+            match_count: Number of results to return (and to fetch from each leg)
+            filter_metadata: Optional metadata filter dict
+            k: RRF rank constant
+            vector_weight: Weight of the vector ranking
+            text_weight: Weight of the full-text ranking
+            timings: Optional dict that receives the per-leg and fusion latency in ms
+            projection: Return only content snippets and selected metadata keys
+
+        Returns:
+            Up to match_count documents ordered by fused score, each with
+            "rrf_score", "vector_rank", "text_rank" and "match_type"
+        """
+        with safe_span("hybrid_search_documents_rrf", match_count=match_count) as span:
+            filter_json = dict(filter_metadata or {})
+            source_filter = filter_json.pop("source", None)
+
+            vector_leg = self.base_strategy.vector_search(
+                query_embedding=query_embedding,
+                match_count=match_count,
+                filter_metadata=filter_metadata,
+                projection=projection,
+            )
+            text_leg = execute_search_rpc(
+                self.supabase_client,
+                "search_archon_crawled_pages_text",
+                {
+                    "query_text": query,
+                    "match_count": match_count,
+                    "filter": filter_json,
+                    "source_filter": source_filter,
+                },
+                projection,
+            )
+            start = time.perf_counter()
+            vector_outcome, text_outcome = await asyncio.gather(
+                _timed(vector_leg), _timed(text_leg), return_exceptions=True
+            )
+
+            leg_timings = {"vector": None, "text": None}
+            legs = {}
+            for name, outcome in (("vector", vector_outcome), ("text", text_outcome)):
+                if isinstance(outcome, Exception):
+                    logger.warning(f"RRF {name} search failed: {outcome}")
+                    span.set_attribute(f"{name}_error", str(outcome))
+                    legs[name] = []
+                else:
+                    legs[name], leg_timings[name] = outcome[0] or [], outcome[1]
+
+            fusion_start = time.perf_counter()
+            fused = reciprocal_rank_fusion(
+                [(legs["vector"], vector_weight), (legs["text"], text_weight)], k=k
+            )[:match_count]
+
+            results = []
+            for entry in fused:
+                vector_rank, text_rank = entry["ranks"]
+                if vector_rank and text_rank:
+                    match_type = "hybrid"
+                elif vector_rank:
+                    match_type = "vector"
+                else:
+                    match_type = "keyword"
+                result = {
+                    "id": entry["id"],
+                    "url": entry.get("url"),
+                    "chunk_number": entry.get("chunk_number"),
+                    "content": entry.get("content", ""),
+                    "metadata": entry.get("metadata", {}),
+                    "source_id": entry.get("source_id"),
+                    # Fields come from the vector row when the vector leg found it
+                    "similarity": float(entry.get("similarity") or entry.get("text_score") or 0.0),
+                    "rrf_score": round(entry["rrf_score"], 6),
+                    "vector_rank": vector_rank,
+                    "text_rank": text_rank,
+                    "match_type": match_type,
+                }
+                if "content_length" in entry:
+                    result["content_length"] = entry["content_length"]
+                results.append(result)
+
+            leg_timings["fusion"] = round(1000 * (time.perf_counter() - fusion_start), 2)
+            leg_timings["total"] = round(1000 * (time.perf_counter() - start), 1)
+            if timings is not None:
+                timings.update(leg_timings)
+
+            span.set_attribute("vector_results", len(legs["vector"]))
+            span.set_attribute("text_results", len(legs["text"]))
+            span.set_attribute("results_count", len(results))
+            for name, value in leg_timings.items():
+                if value is not None:
+                    span.set_attribute(f"{name}_ms", value)
+
+            logger.debug(
+                f"RRF hybrid search returned {len(results)} results "
+                f"(vector {len(legs['vector'])} in {leg_timings['vector']}ms, "
+                f"text {len(legs['text'])} in {leg_timings['text']}ms)"
+            )
+            return results
+
     async def search_code_examples_hybrid(
         self,
         query: str,
         match_count: int,
         filter_metadata: dict | None = None,
         source_id: str | None = None,
+        query_embedding: list[float] | None = None,
     ) -> list[dict[str, Any]]:
         """
         Perform hybrid search on archon_code_examples table using the PostgreSQL 
@@ -121,14 +308,16 @@ class HybridSearchStrategy:
             match_count: Number of results to return
             filter_metadata: Optional metadata filter dict
             source_id: Optional source ID to filter results
+            query_embedding: Pre-computed query embedding (created from the query if not given)
 
         Returns:
             List of matching code examples from both vector and text search
         """
         with safe_span("hybrid_search_code_examples") as span:
             try:
-                # Create query embedding
-                query_embedding = await create_embedding(query)
+                # Create query embedding unless the caller already has it
+                if not query_embedding:
+                    query_embedding = await create_query_embedding(query)
 
                 if not query_embedding:
                     logger.error("Failed to create embedding for code example query")
@@ -142,7 +331,8 @@ class HybridSearchStrategy:
                     final_source_filter = filter_json.pop("source")
 
                 # Call the hybrid search PostgreSQL function
-                response = self.supabase_client.rpc(
+                rows = await execute_rpc(
+                    self.supabase_client,
                     "hybrid_search_archon_code_examples",
                     {
                         "query_embedding": query_embedding,
@@ -150,16 +340,17 @@ class HybridSearchStrategy:
                         "match_count": match_count,
                         "filter": filter_json,
                         "source_filter": final_source_filter,
+                        **get_vector_index_service().search_params("archon_code_examples", match_count),
                     },
-                ).execute()
+                )
 
-                if not response.data:
+                if not rows:
                     logger.debug("No results from hybrid code search")
                     return []
 
                 # Format results to match expected structure
                 results = []
-                for row in response.data:
+                for row in rows:
                     result = {
                         "id": row["id"],
                         "url": row["url"],
@@ -0,0 +1,156 @@
+"""
+ONNX Runtime Reranker
+
+CPU backend for the reranker: runs an ONNX export of a cross-encoder, int8-quantized by
+default, with ``onnxruntime`` and a ``tokenizers`` fast tokenizer. Neither pulls in
+torch, and the quantized model scores candidates several times faster on CPU than the
+full-precision PyTorch CrossEncoder.
+
+Cross-encoder repositories on the Hugging Face Hub publish ready-made exports under
+``onnx/`` (e.g. ``onnx/model_quint8_avx2.onnx``). When the requested file is missing
+but a full-precision ``onnx/model.onnx`` exists, it is quantized to int8 once with
+``onnxruntime.quantization`` and the result cached next to it.
+
+Inputs are truncated to ``max_length`` tokens, cutting the document and never the
+query (``only_second``), so long chunks can't push the question out of the window.
+"""
+
+import os
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ...config.logfire_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_ONNX_FILE = "onnx/model_quint8_avx2.onnx"
+FULL_PRECISION_ONNX_FILE = "onnx/model.onnx"
+DEFAULT_MAX_LENGTH = 512
+
+
+def onnx_runtime_available() -> bool:
+    """Whether the ONNX backend's dependencies are installed."""
+    try:
+        import onnxruntime  # noqa: F401
+        import tokenizers  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class OnnxCrossEncoder:
+    """
+    Cross-encoder scored with ONNX Runtime.
+
+    Exposes the same ``predict(pairs)`` as ``sentence_transformers.CrossEncoder``, returning
+    the model's raw relevance logits, so RerankingStrategy can use either interchangeably.
+    """
+
+    def __init__(self, session: Any, tokenizer: Any, max_length: int = DEFAULT_MAX_LENGTH, model_name: str = ""):
+        """
+        Args:
+            session: onnxruntime.InferenceSession for the exported model
+            tokenizer: tokenizers.Tokenizer matching the model
+            max_length: Maximum tokens per query-document pair
+            model_name: Name used in logs
+        """
+        self.session = session
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+        self.model_name = model_name
+        self.input_names = {model_input.name for model_input in session.get_inputs()}
+
+        tokenizer.enable_truncation(max_length=max_length, strategy="only_second")
+        if tokenizer.padding is None:
+            tokenizer.enable_padding()
+
+    @classmethod
+    def load(
+        cls,
+        model_name: str,
+        onnx_file: str = DEFAULT_ONNX_FILE,
+        max_length: int = DEFAULT_MAX_LENGTH,
+        threads: int | None = None,
+    ) -> "OnnxCrossEncoder":
+        """
+        Load a model from a local directory or a Hugging Face Hub repository.
+
+        Args:
+            model_name: Directory or Hub repository id (e.g. cross-encoder/ms-marco-MiniLM-L-6-v2)
+            onnx_file: Path of the ONNX file inside the model directory/repository
+            max_length: Maximum tokens per query-document pair
+            threads: Intra-op threads for ONNX Runtime (defaults to its own choice)
+        """
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        model_path = _resolve_model_file(model_name, onnx_file)
+        tokenizer_path = _resolve_file(model_name, "tokenizer.json")
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        session = onnxruntime.InferenceSession(
+            str(model_path), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        logger.info(f"Loaded ONNX reranker {model_name} ({model_path.name}, max_length={max_length})")
+        return cls(session, Tokenizer.from_file(str(tokenizer_path)), max_length=max_length, model_name=model_name)
+
+    def predict(self, pairs: list[list[str]] | list[tuple[str, str]]) -> np.ndarray:
+        """Score (query, document) pairs; higher is more relevant."""
+        if not pairs:
+            return np.zeros(0, dtype=np.float32)
+
+        encodings = self.tokenizer.encode_batch([(query, document) for query, document in pairs])
+        inputs = {
+            "input_ids": np.array([encoding.ids for encoding in encodings], dtype=np.int64),
+            "attention_mask": np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64),
+            "token_type_ids": np.array([encoding.type_ids for encoding in encodings], dtype=np.int64),
+        }
+        logits = self.session.run(None, {name: value for name, value in inputs.items() if name in self.input_names})[0]
+        # (batch, 1) for relevance models; multi-label models score with their first label
+        return np.asarray(logits, dtype=np.float32).reshape(len(pairs), -1)[:, 0]
+
+
+def _resolve_file(model_name: str, filename: str) -> Path:
+    """Find a file in a local model directory or download it from the Hub."""
+    local = Path(model_name) / filename
+    if local.exists():
+        return local
+    if Path(model_name).is_dir():
+        raise FileNotFoundError(f"{filename} not found in {model_name}")
+
+    from huggingface_hub import hf_hub_download
+
+    return Path(hf_hub_download(model_name, filename))
+
+
+def _resolve_model_file(model_name: str, onnx_file: str) -> Path:
+    """Find the ONNX model, quantizing the full-precision export if only that exists."""
+    try:
+        return _resolve_file(model_name, onnx_file)
+    except Exception as e:
+        if onnx_file == FULL_PRECISION_ONNX_FILE:
+            raise
+        logger.info(f"{onnx_file} not available for {model_name} ({e}); quantizing {FULL_PRECISION_ONNX_FILE}")
+
+    full_precision = _resolve_file(model_name, FULL_PRECISION_ONNX_FILE)
+    quantized = full_precision.with_name("model_qint8_dynamic.onnx")
+    if not quantized.exists():
+        quantize_to_int8(full_precision, quantized)
+    return quantized
+
+
+def quantize_to_int8(source: str | os.PathLike, target: str | os.PathLike) -> Path:
+    """Dynamically quantize an ONNX model's weights to int8."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    target = Path(target)
+    partial = target.with_suffix(".partial.onnx")
+    quantize_dynamic(str(source), str(partial), weight_type=QuantType.QInt8)
+    partial.replace(target)
+    logger.info(f"Quantized {source} to int8 at {target}")
+    return target
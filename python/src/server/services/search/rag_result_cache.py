@@ -0,0 +1,183 @@
+"""
+RAG Result Cache
+
+In-process cache of RAG query responses, stamped with index generations.
+
+A RAG query costs a query embedding, a database RPC and possibly a rerank, yet the
+knowledge base only changes when a crawl, upload or delete writes to it. Responses are
+cached by everything that shapes them (query, source and metadata filters, match count,
+hybrid/rerank settings, embedding model) and stamped with the current "index
+generation" of the source they searched. Every write to a source's documents or code
+examples bumps that source's generation, along with the generation used for queries
+across all sources, so an entry written before a change is never served after it.
+
+Generations are per process: writes made by another worker are picked up when entries
+expire (RAG_RESULT_CACHE_TTL_SECONDS).
+"""
+
+import copy
+import json
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Any
+
+from ..embeddings.embedding_cache import normalize_text
+from ..stats_cache import KNOWLEDGE_SCOPE, bump_stats_epoch
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 300.0
+
+# (epoch, source or all-sources counter)
+Generation = tuple[int, int]
+
+
+def rag_result_key(kind: str, query: str, match_count: int, filters: dict[str, Any] | None, **settings: Any) -> tuple:
+    """
+    Build the cache key for a RAG query.
+
+    Args:
+        kind: Which search produced the response ("documents" or "code_examples")
+        query: The search query (whitespace-normalized)
+        match_count: Requested number of results
+        filters: Source/metadata filters
+        **settings: Anything else that changes the results (hybrid, reranker, embedding model)
+    """
+    return (
+        kind,
+        normalize_text(query),
+        match_count,
+        json.dumps(filters or {}, sort_keys=True, default=str),
+        tuple(sorted(settings.items())),
+    )
+
+
+class RAGResultCache:
+    """LRU + TTL cache of RAG responses validated against per-source index generations."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Responses kept before the least recently used are evicted (0 disables caching)
+            ttl_seconds: Seconds a response stays valid
+        """
+        self.max_entries = max(0, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple, tuple[Any, Generation, float]] = OrderedDict()
+        self._epoch = 0
+        self._all_sources = 0
+        self._sources: dict[str, int] = {}
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+        self._evictions = 0
+        self._bumps = 0
+
+    def generation(self, source_id: str | None = None) -> Generation:
+        """Current index generation of a source, or of all sources when none is given."""
+        if source_id:
+            return self._epoch, self._sources.get(source_id, 0)
+        return self._epoch, self._all_sources
+
+    def bump(self, source_ids: Iterable[str] | None = None) -> None:
+        """
+        Record a write to the index.
+
+        Args:
+            source_ids: Sources whose documents or code examples changed. None when the
+                affected sources are unknown, which outdates every entry.
+        """
+        self._bumps += 1
+        if source_ids is None:
+            self._epoch += 1
+            return
+        for source_id in set(source_ids):
+            if source_id:
+                self._sources[source_id] = self._sources.get(source_id, 0) + 1
+        self._all_sources += 1
+
+    def get(self, key: tuple, source_id: str | None = None) -> Any | None:
+        """Return a copy of the cached response if it is unexpired and its source is unchanged."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        value, generation, expires_at = entry
+        if generation != self.generation(source_id) or expires_at <= time.monotonic():
+            del self._entries[key]
+            self._stale += 1
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return copy.deepcopy(value)
+
+    def put(self, key: tuple, value: Any, generation: Generation, source_id: str | None = None) -> None:
+        """
+        Store a response computed from the index at ``generation``.
+
+        ``generation`` must be read before the search ran; if the source changed since,
+        the response may already be outdated and is not stored.
+        """
+        if not self.max_entries or generation != self.generation(source_id):
+            return
+        self._entries[key] = (copy.deepcopy(value), generation, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def get_stats(self) -> dict[str, Any]:
+        """Hit/miss counters since startup."""
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self._hits,
+            "misses": self._misses,
+            "stale": self._stale,
+            "evictions": self._evictions,
+            "index_writes": self._bumps,
+            "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Global cache instance
+_rag_result_cache: RAGResultCache | None = None
+
+
+def get_rag_result_cache() -> RAGResultCache:
+    """
+    Get the global RAG result cache (size and TTL from RAG_RESULT_CACHE_MAX_ENTRIES /
+    RAG_RESULT_CACHE_TTL_SECONDS).
+    """
+    global _rag_result_cache
+
+    if _rag_result_cache is None:
+        try:
+            max_entries = int(os.getenv("RAG_RESULT_CACHE_MAX_ENTRIES", str(DEFAULT_MAX_ENTRIES)))
+        except ValueError:
+            max_entries = DEFAULT_MAX_ENTRIES
+        try:
+            ttl_seconds = float(os.getenv("RAG_RESULT_CACHE_TTL_SECONDS", str(DEFAULT_TTL_SECONDS)))
+        except ValueError:
+            ttl_seconds = DEFAULT_TTL_SECONDS
+        _rag_result_cache = RAGResultCache(max_entries, ttl_seconds)
+    return _rag_result_cache
+
+
+def bump_index_generation(source_ids: Iterable[str] | None = None) -> None:
+    """Outdate cached RAG results (and knowledge statistics) after documents or code examples changed."""
+    get_rag_result_cache().bump(source_ids)
+    bump_stats_epoch(KNOWLEDGE_SCOPE)
+
+
+def reset_rag_result_cache() -> None:
+    """Discard the global cache so the next use starts empty."""
+    global _rag_result_cache
+
+    _rag_result_cache = None
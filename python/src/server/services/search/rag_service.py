@@ -12,22 +12,126 @@ It combines multiple RAG strategies in a pipeline fashion:
 Multiple strategies can be enabled simultaneously and work together.
 """
 
+import asyncio
 import os
-from typing import Any
+import time
+from typing import Any, NamedTuple
 
 from ...config.logfire_config import get_logger, safe_span
 from ...utils import get_supabase_client
-from ..embeddings.embedding_service import create_embedding
+from ..async_db_client import execute_rpc
+from ..embeddings.embedding_service import create_query_embedding, create_query_embeddings
 from .agentic_rag_strategy import AgenticRAGStrategy
 
 # Import all strategies
-from .base_search_strategy import BaseSearchStrategy
-from .hybrid_search_strategy import HybridSearchStrategy
-from .reranking_strategy import RerankingStrategy
+from .base_search_strategy import BaseSearchStrategy, SearchProjection
+from .hybrid_search_strategy import DEFAULT_RRF_K, HybridSearchStrategy
+from .rag_result_cache import get_rag_result_cache, rag_result_key
+from .reranking_strategy import DEFAULT_RERANKING_BACKEND, DEFAULT_RERANKING_MODEL, RerankingStrategy
 
 logger = get_logger(__name__)
 
 
+# Database searches a batch query runs at once
+DEFAULT_BATCH_CONCURRENCY = 8
+
+# Characters of content a document result carries (and the reranker scores)
+RESULT_CONTENT_LENGTH = 1000
+
+# Slim results: snippet length and the metadata keys kept by default
+DEFAULT_SNIPPET_LENGTH = 300
+DEFAULT_SLIM_METADATA_KEYS = ("url", "title", "source_id", "chunk_index")
+
+# Most chunks get_chunks_by_ids fetches at once
+MAX_CHUNK_IDS = 100
+
+# Marker for "load the reranker according to USE_RERANKING"
+_FROM_SETTINGS = object()
+
+
+def _get_setting(key: str, default: str = "false") -> str:
+    """Get a setting from the credential service or fall back to environment variable."""
+    try:
+        from ..credential_service import credential_service
+
+        if hasattr(credential_service, "_cache") and credential_service._cache_initialized:
+            cached_value = credential_service._cache.get(key)
+            if isinstance(cached_value, dict) and cached_value.get("is_encrypted"):
+                encrypted_value = cached_value.get("encrypted_value")
+                if encrypted_value:
+                    try:
+                        return credential_service._decrypt_value(encrypted_value)
+                    except Exception:
+                        pass
+            elif cached_value:
+                return str(cached_value)
+        # Fallback to environment variable
+        return os.getenv(key, default)
+    except Exception:
+        return os.getenv(key, default)
+
+
+def _snippet_projection(
+    slim: bool, snippet_length: int = DEFAULT_SNIPPET_LENGTH, metadata_keys: list[str] | None = None
+) -> SearchProjection | None:
+    """The projection of a slim search (None for full results)."""
+    if not slim:
+        return None
+    keys = tuple(metadata_keys) if metadata_keys is not None else DEFAULT_SLIM_METADATA_KEYS
+    return SearchProjection(max(1, snippet_length), keys)
+
+
+def _to_snippets(results: list[dict[str, Any]], snippet_length: int) -> list[dict[str, Any]]:
+    """Cut result content to its snippet, recording the full length and whether it was cut."""
+    snippets = []
+    for result in results:
+        content = result.get("content", "")
+        content_length = result.get("content_length", len(content))
+        snippets.append({
+            **result,
+            "content": content[:snippet_length],
+            "content_length": content_length,
+            "truncated": content_length > snippet_length,
+        })
+    return snippets
+
+
+def _filter_source(filter_metadata: dict[str, Any] | None) -> str | None:
+    """The single source a filter restricts a search to, if any."""
+    source = filter_metadata.get("source") if filter_metadata else None
+    return source if isinstance(source, str) else None
+
+
+class HybridSettings(NamedTuple):
+    """How hybrid search fuses its vector and full-text results."""
+
+    mode: str  # "union" (SQL function) or "rrf" (client-side reciprocal rank fusion)
+    rrf_k: int
+    vector_weight: float
+    text_weight: float
+
+
+class RerankerSettings(NamedTuple):
+    """The settings that decide which reranker a RAGService needs."""
+
+    enabled: bool
+    model_name: str
+    backend: str
+    max_length: int | None
+
+
+def _reranking_config() -> RerankerSettings:
+    """Read the current reranker settings."""
+    use_reranking = _get_setting("USE_RERANKING", "false").lower() in ("true", "1", "yes", "on")
+    model_name = _get_setting("RERANKING_MODEL", DEFAULT_RERANKING_MODEL) or DEFAULT_RERANKING_MODEL
+    backend = (_get_setting("RERANKING_BACKEND", DEFAULT_RERANKING_BACKEND) or DEFAULT_RERANKING_BACKEND).lower()
+    try:
+        max_length = int(_get_setting("RERANKING_MAX_LENGTH", "0")) or None
+    except ValueError:
+        max_length = None
+    return RerankerSettings(use_reranking, model_name, backend, max_length)
+
+
 class RAGService:
     """
     Coordinator service that orchestrates multiple RAG strategies.
@@ -36,8 +140,15 @@ class RAGService:
     based on configuration settings.
     """
 
-    def __init__(self, supabase_client=None):
-        """Initialize RAG service as a coordinator for search strategies"""
+    def __init__(self, supabase_client=None, reranking_strategy: Any = _FROM_SETTINGS):
+        """
+        Initialize RAG service as a coordinator for search strategies.
+
+        Args:
+            supabase_client: Supabase client (defaults to a new client)
+            reranking_strategy: Reranker to use, or None to disable reranking. By default
+                a reranker is loaded when USE_RERANKING is enabled.
+        """
         self.supabase_client = supabase_client or get_supabase_client()
 
         # Initialize base strategy (always needed)
@@ -47,6 +158,13 @@ class RAGService:
         self.hybrid_strategy = HybridSearchStrategy(self.supabase_client, self.base_strategy)
         self.agentic_strategy = AgenticRAGStrategy(self.supabase_client, self.base_strategy)
 
+        # Reranking settings this service was built for (see get_rag_service)
+        self.reranking_config = _reranking_config()
+
+        if reranking_strategy is not _FROM_SETTINGS:
+            self.reranking_strategy = reranking_strategy
+            return
+
         # Initialize reranking strategy based on settings
         self.reranking_strategy = None
         use_reranking = self.get_bool_setting("USE_RERANKING", False)
@@ -60,30 +178,54 @@ class RAGService:
 
     def get_setting(self, key: str, default: str = "false") -> str:
         """Get a setting from the credential service or fall back to environment variable."""
-        try:
-            from ..credential_service import credential_service
-
-            if hasattr(credential_service, "_cache") and credential_service._cache_initialized:
-                cached_value = credential_service._cache.get(key)
-                if isinstance(cached_value, dict) and cached_value.get("is_encrypted"):
-                    encrypted_value = cached_value.get("encrypted_value")
-                    if encrypted_value:
-                        try:
-                            return credential_service._decrypt_value(encrypted_value)
-                        except Exception:
-                            pass
-                elif cached_value:
-                    return str(cached_value)
-            # Fallback to environment variable
-            return os.getenv(key, default)
-        except Exception:
-            return os.getenv(key, default)
+        return _get_setting(key, default)
 
     def get_bool_setting(self, key: str, default: bool = False) -> bool:
         """Get a boolean setting from credential service."""
         value = self.get_setting(key, "false" if not default else "true")
         return value.lower() in ("true", "1", "yes", "on")
 
+    def get_hybrid_settings(self) -> HybridSettings:
+        """Read the hybrid search fusion settings (HYBRID_SEARCH_MODE, HYBRID_RRF_K, HYBRID_*_WEIGHT)."""
+        mode = (self.get_setting("HYBRID_SEARCH_MODE", "union") or "union").lower()
+        if mode not in ("union", "rrf"):
+            logger.warning(f"Unknown HYBRID_SEARCH_MODE '{mode}', using union")
+            mode = "union"
+        try:
+            rrf_k = max(1, int(self.get_setting("HYBRID_RRF_K", str(DEFAULT_RRF_K))))
+        except ValueError:
+            rrf_k = DEFAULT_RRF_K
+        weights = []
+        for key in ("HYBRID_VECTOR_WEIGHT", "HYBRID_TEXT_WEIGHT"):
+            try:
+                weights.append(max(0.0, float(self.get_setting(key, "1.0"))))
+            except ValueError:
+                weights.append(1.0)
+        return HybridSettings(mode, rrf_k, *weights)
+
+    def _result_cache_key(
+        self,
+        kind: str,
+        query: str,
+        match_count: int,
+        filters: dict[str, Any] | None,
+        use_hybrid_search: bool,
+        snippets: SearchProjection | None = None,
+    ) -> tuple:
+        """Key a response by everything that shapes it (see rag_result_cache)."""
+        reranker = self.reranking_strategy
+        return rag_result_key(
+            kind,
+            query,
+            match_count,
+            filters,
+            hybrid=tuple(self.get_hybrid_settings()) if use_hybrid_search else False,
+            snippets=tuple(snippets) if snippets else None,
+            reranker=f"{getattr(reranker, 'backend', '')}:{getattr(reranker, 'model_name', '')}" if reranker else "",
+            embedding_provider=self.get_setting("EMBEDDING_PROVIDER", "") or self.get_setting("LLM_PROVIDER", ""),
+            embedding_model=self.get_setting("EMBEDDING_MODEL", ""),
+        )
+
     async def search_documents(
         self,
         query: str,
@@ -91,6 +233,9 @@ class RAGService:
         filter_metadata: dict | None = None,
         use_hybrid_search: bool = False,
         cached_api_key: str | None = None,
+        query_embedding: list[float] | None = None,
+        search_timings: dict[str, float] | None = None,
+        projection: SearchProjection | None = None,
     ) -> list[dict[str, Any]]:
         """
         Document search with hybrid search capability.
@@ -101,6 +246,9 @@ class RAGService:
             filter_metadata: Optional metadata filter dict
             use_hybrid_search: Whether to use hybrid search
             cached_api_key: Deprecated parameter for compatibility
+            query_embedding: Pre-computed query embedding (created from the query if not given)
+            search_timings: Optional dict that receives per-leg latency in ms (RRF hybrid search)
+            projection: Return only content snippets and selected metadata keys
 
         Returns:
             List of matching documents
@@ -112,20 +260,37 @@ class RAGService:
             hybrid_enabled=use_hybrid_search,
         ) as span:
             try:
-                # Create embedding for the query
-                query_embedding = await create_embedding(query)
+                # Create embedding for the query unless the caller already has it
+                if not query_embedding:
+                    query_embedding = await create_query_embedding(query)
 
                 if not query_embedding:
                     logger.error("Failed to create embedding for query")
                     return []
 
-                if use_hybrid_search:
+                hybrid = self.get_hybrid_settings() if use_hybrid_search else None
+                if hybrid and hybrid.mode == "rrf":
+                    # Concurrent vector + full-text searches fused client-side
+                    results = await self.hybrid_strategy.search_documents_rrf(
+                        query=query,
+                        query_embedding=query_embedding,
+                        match_count=match_count,
+                        filter_metadata=filter_metadata,
+                        k=hybrid.rrf_k,
+                        vector_weight=hybrid.vector_weight,
+                        text_weight=hybrid.text_weight,
+                        timings=search_timings,
+                        projection=projection,
+                    )
+                    span.set_attribute("search_mode", "hybrid_rrf")
+                elif hybrid:
                     # Use hybrid strategy
                     results = await self.hybrid_strategy.search_documents_hybrid(
                         query=query,
                         query_embedding=query_embedding,
                         match_count=match_count,
                         filter_metadata=filter_metadata,
+                        projection=projection,
                     )
                     span.set_attribute("search_mode", "hybrid")
                 else:
@@ -134,6 +299,7 @@ class RAGService:
                         query_embedding=query_embedding,
                         match_count=match_count,
                         filter_metadata=filter_metadata,
+                        projection=projection,
                     )
                     span.set_attribute("search_mode", "vector")
 
@@ -172,8 +338,108 @@ class RAGService:
             use_enhancement=True,
         )
 
+    async def _document_candidates(
+        self,
+        query: str,
+        match_count: int,
+        final_filter: dict[str, Any] | None,
+        use_hybrid_search: bool,
+        use_reranking: bool,
+        query_embedding: list[float] | None = None,
+        search_timings: dict[str, float] | None = None,
+        snippets: SearchProjection | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Search documents and format them for reranking and the response.
+
+        With ``snippets`` the database returns only what the reranker and the snippets
+        need (see _snippet_projection) instead of whole chunks with all their metadata.
+        """
+        # If reranking is enabled, fetch more candidates for the reranker to evaluate
+        # This allows the reranker to see a broader set of results
+        search_match_count = match_count
+        if use_reranking and self.reranking_strategy:
+            # Fetch 5x the requested amount when reranking is enabled
+            # The reranker will select the best from this larger pool
+            search_match_count = match_count * 5
+            logger.debug(f"Reranking enabled - fetching {search_match_count} candidates for {match_count} final results")
+
+        projection = None
+        if snippets:
+            content_length = snippets.content_length
+            if use_reranking and self.reranking_strategy:
+                content_length = max(content_length, RESULT_CONTENT_LENGTH)
+            projection = snippets._replace(content_length=content_length)
+
+        results = await self.search_documents(
+            query=query,
+            match_count=search_match_count,
+            filter_metadata=final_filter,
+            use_hybrid_search=use_hybrid_search,
+            query_embedding=query_embedding,
+            search_timings=search_timings,
+            projection=projection,
+        )
+
+        # Format results for processing
+        formatted_results = []
+        for i, result in enumerate(results):
+            try:
+                formatted_result = {
+                    "id": result.get("id", f"result_{i}"),
+                    "content": result.get("content", "")[:RESULT_CONTENT_LENGTH],  # Limit content
+                    "metadata": result.get("metadata", {}),
+                    "similarity_score": result.get("similarity", 0.0),
+                }
+                # How hybrid search matched the result, and the full length of slim results
+                for field in ("match_type", "rrf_score", "content_length"):
+                    if field in result:
+                        formatted_result[field] = result[field]
+                formatted_results.append(formatted_result)
+            except Exception as format_error:
+                logger.warning(f"Failed to format result {i}: {format_error}")
+                continue
+        return formatted_results
+
+    @staticmethod
+    def _document_response(
+        query: str,
+        source: str | None,
+        match_count: int,
+        results: list[dict[str, Any]],
+        use_hybrid_search: bool,
+        reranking_applied: bool,
+        search_timings: dict[str, float] | None = None,
+        snippets: SearchProjection | None = None,
+    ) -> dict[str, Any]:
+        """Build the perform_rag_query response."""
+        if snippets:
+            results = _to_snippets(results, snippets.content_length)
+        response = {
+            "results": results,
+            "query": query,
+            "source": source,
+            "match_count": match_count,
+            "total_found": len(results),
+            "execution_path": "rag_service_pipeline",
+            "search_mode": "hybrid" if use_hybrid_search else "vector",
+            "reranking_applied": reranking_applied,
+        }
+        if search_timings:
+            # Latency of each hybrid search leg, for tuning (RRF mode only)
+            response["search_timings_ms"] = search_timings
+        return response
+
     async def perform_rag_query(
-        self, query: str, source: str = None, match_count: int = 5, filter_metadata: dict[str, Any] | None = None
+        self,
+        query: str,
+        source: str = None,
+        match_count: int = 5,
+        filter_metadata: dict[str, Any] | None = None,
+        query_embedding: list[float] | None = None,
+        slim: bool = False,
+        snippet_length: int = DEFAULT_SNIPPET_LENGTH,
+        metadata_keys: list[str] | None = None,
     ) -> tuple[bool, dict[str, Any]]:
         """
         Perform a comprehensive RAG query that combines all enabled strategies.
@@ -183,11 +449,22 @@ class RAGService:
         2. Apply hybrid search if enabled
         3. Apply reranking if enabled
 
+        Responses are cached until the searched source is written to (see rag_result_cache).
+
+        Slim queries return, per result, its id, scores, the first ``snippet_length``
+        characters of its content and the ``metadata_keys`` of its metadata; the content is
+        cut in the database, so whole chunks never leave it. Open a result in full with
+        get_chunks_by_ids.
+
         Args:
             query: The search query
             source: Optional source domain to filter results
             match_count: Maximum number of results to return
             filter_metadata: Optional metadata filter dict (e.g., {"tags": ["python"]})
+            query_embedding: Pre-computed query embedding (created from the query if not given)
+            slim: Return snippets instead of up to 1000 characters of content with all metadata
+            snippet_length: Characters of content per slim result
+            metadata_keys: Metadata keys kept in slim results (default DEFAULT_SLIM_METADATA_KEYS)
 
         Returns:
             Tuple of (success, result_dict)
@@ -211,70 +488,69 @@ class RAGService:
                 # Check which strategies are enabled
                 use_hybrid_search = self.get_bool_setting("USE_HYBRID_SEARCH", False)
                 use_reranking = self.get_bool_setting("USE_RERANKING", False)
+                snippets = _snippet_projection(slim, snippet_length, metadata_keys)
 
-                # If reranking is enabled, fetch more candidates for the reranker to evaluate
-                # This allows the reranker to see a broader set of results
-                search_match_count = match_count
-                if use_reranking and self.reranking_strategy:
-                    # Fetch 5x the requested amount when reranking is enabled
-                    # The reranker will select the best from this larger pool
-                    search_match_count = match_count * 5
-                    logger.debug(f"Reranking enabled - fetching {search_match_count} candidates for {match_count} final results")
-
-                # Step 1 & 2: Get results (with hybrid search if enabled)
-                results = await self.search_documents(
-                    query=query,
-                    match_count=search_match_count,
-                    filter_metadata=final_filter,
-                    use_hybrid_search=use_hybrid_search,
+                # Serve from the result cache while the searched source is unchanged
+                result_cache = get_rag_result_cache()
+                cache_source = _filter_source(final_filter)
+                cache_key = self._result_cache_key(
+                    "documents", query, match_count, final_filter, use_hybrid_search, snippets
                 )
+                cached = result_cache.get(cache_key, cache_source)
+                span.set_attribute("cache_hit", cached is not None)
+                if cached is not None:
+                    logger.info(f"RAG query served from cache - {cached['total_found']} results")
+                    return True, cached
+                # Read before searching so a write during the search outdates this response
+                generation = result_cache.generation(cache_source)
 
-                span.set_attribute("raw_results_count", len(results))
-                span.set_attribute("hybrid_search_enabled", use_hybrid_search)
+                # Step 1 & 2: Get candidates (with hybrid search if enabled)
+                search_timings: dict[str, float] = {}
+                formatted_results = await self._document_candidates(
+                    query,
+                    match_count,
+                    final_filter,
+                    use_hybrid_search,
+                    use_reranking,
+                    query_embedding,
+                    search_timings,
+                    snippets,
+                )
 
-                # Format results for processing
-                formatted_results = []
-                for i, result in enumerate(results):
-                    try:
-                        formatted_result = {
-                            "id": result.get("id", f"result_{i}"),
-                            "content": result.get("content", "")[:1000],  # Limit content
-                            "metadata": result.get("metadata", {}),
-                            "similarity_score": result.get("similarity", 0.0),
-                        }
-                        formatted_results.append(formatted_result)
-                    except Exception as format_error:
-                        logger.warning(f"Failed to format result {i}: {format_error}")
-                        continue
+                span.set_attribute("raw_results_count", len(formatted_results))
+                span.set_attribute("hybrid_search_enabled", use_hybrid_search)
 
                 # Step 3: Apply reranking if we have a strategy or if enabled
                 reranking_applied = False
                 if self.reranking_strategy and formatted_results:
                     try:
                         # Pass top_k to limit results to the originally requested count
+                        candidate_count = len(formatted_results)
                         formatted_results = await self.reranking_strategy.rerank_results(
                             query, formatted_results, content_key="content", top_k=match_count
                         )
                         reranking_applied = True
-                        logger.debug(f"Reranking applied: {search_match_count} candidates -> {len(formatted_results)} final results")
+                        logger.debug(f"Reranking applied: {candidate_count} candidates -> {len(formatted_results)} final results")
                     except Exception as e:
                         logger.warning(f"Reranking failed: {e}")
                         reranking_applied = False
                         # If reranking fails but we fetched extra results, trim to requested count
-                        if len(formatted_results) > match_count:
-                            formatted_results = formatted_results[:match_count]
+                        formatted_results = formatted_results[:match_count]
 
-                # Build response
-                response_data = {
-                    "results": formatted_results,
-                    "query": query,
-                    "source": source,
-                    "match_count": match_count,
-                    "total_found": len(formatted_results),
-                    "execution_path": "rag_service_pipeline",
-                    "search_mode": "hybrid" if use_hybrid_search else "vector",
-                    "reranking_applied": reranking_applied,
-                }
+                response_data = self._document_response(
+                    query,
+                    source,
+                    match_count,
+                    formatted_results,
+                    use_hybrid_search,
+                    reranking_applied,
+                    search_timings,
+                    snippets,
+                )
+
+                # A response missing its rerank is served this once but not cached
+                if reranking_applied or not (self.reranking_strategy and formatted_results):
+                    result_cache.put(cache_key, response_data, generation, cache_source)
 
                 span.set_attribute("final_results_count", len(formatted_results))
                 span.set_attribute("reranking_applied", reranking_applied)
@@ -296,8 +572,219 @@ class RAGService:
                     "execution_path": "rag_service_pipeline",
                 }
 
+    async def perform_rag_query_batch(
+        self,
+        queries: list[str],
+        source: str | None = None,
+        match_count: int = 5,
+        filter_metadata: dict[str, Any] | None = None,
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        slim: bool = False,
+        snippet_length: int = DEFAULT_SNIPPET_LENGTH,
+        metadata_keys: list[str] | None = None,
+    ) -> tuple[bool, dict[str, Any]]:
+        """
+        Run several RAG queries that share a source and filters as one batch.
+
+        Instead of one full pipeline per query, the batch:
+        1. answers what it can from the result cache (repeated queries are searched once),
+        2. embeds all remaining queries with one embeddings request,
+        3. runs their vector/hybrid searches with at most ``max_concurrency`` in flight,
+        4. reranks the candidates of every query in one model forward pass,
+        so a batch of queries costs about as much as a single one.
+
+        Args:
+            queries: The search queries
+            source: Optional source ID to filter results
+            match_count: Maximum number of results per query
+            filter_metadata: Optional metadata filter dict (e.g., {"tags": ["python"]})
+            max_concurrency: Maximum database searches running at once
+            slim: Return snippets instead of full results (see perform_rag_query)
+            snippet_length: Characters of content per slim result
+            metadata_keys: Metadata keys kept in slim results
+
+        Returns:
+            Tuple of (success, result_dict) where "results" holds a perform_rag_query response
+            for each query, in order and each with its own "success", and "timings_ms" the
+            time spent per stage.
+        """
+        with safe_span(
+            "rag_query_batch", query_count=len(queries), source=source, match_count=match_count
+        ) as span:
+            try:
+                start = time.perf_counter()
+                timings: dict[str, float] = {}
+
+                filters = dict(filter_metadata or {})
+                if source:
+                    filters["source"] = source
+                final_filter = filters or None
+
+                use_hybrid_search = self.get_bool_setting("USE_HYBRID_SEARCH", False)
+                use_reranking = self.get_bool_setting("USE_RERANKING", False)
+                snippets = _snippet_projection(slim, snippet_length, metadata_keys)
+
+                result_cache = get_rag_result_cache()
+                cache_source = _filter_source(final_filter)
+                # Read before searching so a write during the batch outdates its responses
+                generation = result_cache.generation(cache_source)
+
+                responses: list[dict[str, Any] | None] = [None] * len(queries)
+                pending: dict[tuple, list[int]] = {}  # cache key -> positions of the queries sharing it
+                for i, query in enumerate(queries):
+                    key = self._result_cache_key(
+                        "documents", query, match_count, final_filter, use_hybrid_search, snippets
+                    )
+                    if key in pending:
+                        pending[key].append(i)
+                        continue
+                    cached = result_cache.get(key, cache_source)
+                    if cached is not None:
+                        responses[i] = {**cached, "query": query, "success": True}
+                    else:
+                        pending[key] = [i]
+
+                keys = list(pending)
+                work = [queries[pending[key][0]] for key in keys]
+                span.set_attribute("cache_hits", len(queries) - sum(len(positions) for positions in pending.values()))
+                span.set_attribute("queries_searched", len(work))
+
+                if work:
+                    # One embeddings request for every query not served from cache
+                    stage_start = time.perf_counter()
+                    embeddings = await create_query_embeddings(work)
+                    timings["embedding"] = round(1000 * (time.perf_counter() - stage_start), 1)
+
+                    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+                    search_timings: list[dict[str, float]] = [{} for _ in work]
+
+                    async def search(j: int) -> list[dict[str, Any]]:
+                        async with semaphore:
+                            return await self._document_candidates(
+                                work[j],
+                                match_count,
+                                final_filter,
+                                use_hybrid_search,
+                                use_reranking,
+                                embeddings[j],
+                                search_timings[j],
+                                snippets,
+                            )
+
+                    stage_start = time.perf_counter()
+                    searchable = [j for j, embedding in enumerate(embeddings) if embedding]
+                    found = await asyncio.gather(*(search(j) for j in searchable))
+                    candidates = dict(zip(searchable, found, strict=True))
+                    timings["search"] = round(1000 * (time.perf_counter() - stage_start), 1)
+
+                    rerank_ok = False
+                    if self.reranking_strategy and any(candidates.values()):
+                        stage_start = time.perf_counter()
+                        try:
+                            reranked = await self.reranking_strategy.rerank_many(
+                                [(work[j], candidates[j]) for j in searchable], content_key="content", top_k=match_count
+                            )
+                            candidates = dict(zip(searchable, reranked, strict=True))
+                            rerank_ok = True
+                        except Exception as e:
+                            logger.warning(f"Batch reranking failed: {e}")
+                            candidates = {j: results[:match_count] for j, results in candidates.items()}
+                        timings["rerank"] = round(1000 * (time.perf_counter() - stage_start), 1)
+
+                    for j, key in enumerate(keys):
+                        if j not in candidates:
+                            response = {
+                                "success": False,
+                                "error": "Failed to create embedding for query",
+                                "source": source,
+                                "execution_path": "rag_service_pipeline",
+                            }
+                        else:
+                            results = candidates[j]
+                            reranking_applied = rerank_ok and bool(results)
+                            response = self._document_response(
+                                work[j],
+                                source,
+                                match_count,
+                                results,
+                                use_hybrid_search,
+                                reranking_applied,
+                                search_timings[j],
+                                snippets,
+                            )
+                            # A response missing its rerank is served this once but not cached
+                            if reranking_applied or not (self.reranking_strategy and results):
+                                result_cache.put(key, response, generation, cache_source)
+                            response["success"] = True
+                        for i in pending[key]:
+                            responses[i] = {**response, "query": queries[i]}
+
+                timings["total"] = round(1000 * (time.perf_counter() - start), 1)
+                span.set_attribute("total_ms", timings["total"])
+                span.set_attribute("success", True)
+                logger.info(
+                    f"RAG batch completed - {len(queries)} queries, {len(work)} searched, {timings['total']}ms"
+                )
+
+                return True, {
+                    "results": responses,
+                    "count": len(responses),
+                    "source": source,
+                    "match_count": match_count,
+                    "timings_ms": timings,
+                }
+
+            except Exception as e:
+                logger.error(f"RAG batch query failed: {e}")
+                span.set_attribute("error", str(e))
+                span.set_attribute("success", False)
+
+                return False, {
+                    "error": str(e),
+                    "error_type": type(e).__name__,
+                    "source": source,
+                    "execution_path": "rag_service_pipeline",
+                }
+
+    async def get_chunks_by_ids(self, chunk_ids: list[int]) -> tuple[bool, dict[str, Any]]:
+        """
+        Get whole document chunks by id, the follow-up to a slim search.
+
+        Args:
+            chunk_ids: Ids of the chunks to fetch (at most MAX_CHUNK_IDS; duplicates are fetched once)
+
+        Returns:
+            Tuple of (success, result_dict) with "chunks" in the requested order and
+            "missing" listing the ids that were not found
+        """
+        ids = list(dict.fromkeys(chunk_ids))
+        with safe_span("rag_get_chunks", chunk_count=len(ids)) as span:
+            if len(ids) > MAX_CHUNK_IDS:
+                return False, {"error": f"At most {MAX_CHUNK_IDS} chunks can be fetched at once"}
+            if not ids:
+                return True, {"chunks": [], "count": 0, "missing": []}
+
+            try:
+                rows = await execute_rpc(self.supabase_client, "get_archon_crawled_pages_by_ids", {"chunk_ids": ids})
+            except Exception as e:
+                logger.error(f"Fetching chunks by id failed: {e}")
+                span.set_attribute("error", str(e))
+                return False, {"error": str(e)}
+
+            by_id = {row["id"]: row for row in rows or []}
+            chunks = [by_id[chunk_id] for chunk_id in ids if chunk_id in by_id]
+            missing = [chunk_id for chunk_id in ids if chunk_id not in by_id]
+
+            span.set_attribute("chunks_found", len(chunks))
+            return True, {"chunks": chunks, "count": len(chunks), "missing": missing}
+
     async def search_code_examples_service(
-        self, query: str, source_id: str | None = None, match_count: int = 5
+        self,
+        query: str,
+        source_id: str | None = None,
+        match_count: int = 5,
+        query_embedding: list[float] | None = None,
     ) -> tuple[bool, dict[str, Any]]:
         """
         Search for code examples using agentic strategy with hybrid search and reranking.
@@ -312,6 +799,7 @@ class RAGService:
             query: The search query
             source_id: Optional source ID to filter results
             match_count: Maximum number of results to return
+            query_embedding: Pre-computed query embedding (created from the query if not given)
 
         Returns:
             Tuple of (success, result_dict)
@@ -343,6 +831,18 @@ class RAGService:
                 # Prepare filter
                 filter_metadata = {"source": source_id} if source_id and source_id.strip() else None
 
+                # Serve from the result cache while the searched source is unchanged
+                result_cache = get_rag_result_cache()
+                cache_source = source_id if filter_metadata else None
+                cache_key = self._result_cache_key(
+                    "code_examples", query, match_count, filter_metadata, use_hybrid_search
+                )
+                cached = result_cache.get(cache_key, cache_source)
+                span.set_attribute("cache_hit", cached is not None)
+                if cached is not None:
+                    return True, cached
+                generation = result_cache.generation(cache_source)
+
                 if use_hybrid_search:
                     # Use hybrid search for code examples
                     results = await self.hybrid_strategy.search_code_examples_hybrid(
@@ -350,6 +850,7 @@ class RAGService:
                         match_count=search_match_count,
                         filter_metadata=filter_metadata,
                         source_id=source_id,
+                        query_embedding=query_embedding,
                     )
                 else:
                     # Use standard agentic search
@@ -358,20 +859,22 @@ class RAGService:
                         match_count=search_match_count,
                         filter_metadata=filter_metadata,
                         source_id=source_id,
+                        query_embedding=query_embedding,
                     )
 
                 # Apply reranking if we have a strategy
+                reranking_applied = False
                 if self.reranking_strategy and results:
                     try:
                         results = await self.reranking_strategy.rerank_results(
                             query, results, content_key="content", top_k=match_count
                         )
+                        reranking_applied = True
                         logger.debug(f"Code reranking applied: {search_match_count} candidates -> {len(results)} final results")
                     except Exception as e:
                         logger.warning(f"Code reranking failed: {e}")
                         # If reranking fails but we fetched extra results, trim to requested count
-                        if len(results) > match_count:
-                            results = results[:match_count]
+                        results = results[:match_count]
 
                 # Format results
                 formatted_results = []
@@ -393,10 +896,13 @@ class RAGService:
                     "query": query,
                     "source_filter": source_id,
                     "search_mode": "hybrid" if use_hybrid_search else "vector",
-                    "reranking_applied": self.reranking_strategy is not None,
+                    "reranking_applied": reranking_applied,
                     "results": formatted_results,
                     "count": len(formatted_results),
                 }
+                # A response missing its rerank is served this once but not cached
+                if reranking_applied or not (self.reranking_strategy and results):
+                    result_cache.put(cache_key, response_data, generation, cache_source)
 
                 span.set_attribute("results_found", len(formatted_results))
                 span.set_attribute("hybrid_used", use_hybrid_search)
@@ -408,3 +914,238 @@ class RAGService:
                 logger.error(f"Code example search failed: {e}")
                 span.set_attribute("error", str(e))
                 return False, {"query": query, "error": str(e)}
+
+    async def search_documents_and_code(
+        self,
+        query: str,
+        source: str | None = None,
+        match_count: int = 5,
+        code_match_count: int | None = None,
+        filter_metadata: dict[str, Any] | None = None,
+        slim: bool = False,
+        snippet_length: int = DEFAULT_SNIPPET_LENGTH,
+        metadata_keys: list[str] | None = None,
+    ) -> tuple[bool, dict[str, Any]]:
+        """
+        Search documents and code examples for the same query in one call.
+
+        The query is embedded once and the document and code example pipelines (each
+        with its hybrid search, reranking and result cache) run concurrently, so the
+        call costs one embedding and the slower of the two searches instead of their sum.
+
+        Args:
+            query: The search query
+            source: Optional source ID to filter both searches
+            match_count: Maximum number of documents to return
+            code_match_count: Maximum number of code examples (defaults to match_count)
+            filter_metadata: Optional metadata filter for documents (e.g., {"tags": ["python"]})
+            slim: Return document snippets instead of full results (see perform_rag_query)
+            snippet_length: Characters of content per slim document
+            metadata_keys: Metadata keys kept in slim documents
+
+        Returns:
+            Tuple of (success, result_dict) with "documents" and "code_examples" sections, each
+            the response of its own pipeline, and per-stage "timings_ms". Succeeds when either
+            search succeeds; a failed section carries its error.
+        """
+
+        async def timed(stage: str, search) -> tuple[bool, dict[str, Any]]:
+            stage_start = time.perf_counter()
+            try:
+                return await search
+            finally:
+                timings[stage] = round(1000 * (time.perf_counter() - stage_start), 1)
+
+        with safe_span(
+            "rag_documents_and_code", query_length=len(query), source=source, match_count=match_count
+        ) as span:
+            timings: dict[str, float] = {}
+            start = time.perf_counter()
+
+            query_embedding = await create_query_embedding(query)
+            timings["embedding"] = round(1000 * (time.perf_counter() - start), 1)
+            if not query_embedding:
+                logger.error("Failed to create embedding for query")
+                span.set_attribute("success", False)
+                return False, {
+                    "error": "Failed to create embedding for query",
+                    "query": query,
+                    "source": source,
+                    "timings_ms": timings,
+                }
+
+            (docs_ok, documents), (code_ok, code_examples) = await asyncio.gather(
+                timed(
+                    "documents",
+                    self.perform_rag_query(
+                        query,
+                        source=source,
+                        match_count=match_count,
+                        filter_metadata=dict(filter_metadata) if filter_metadata else None,
+                        query_embedding=query_embedding,
+                        slim=slim,
+                        snippet_length=snippet_length,
+                        metadata_keys=metadata_keys,
+                    ),
+                ),
+                timed(
+                    "code_examples",
+                    self.search_code_examples_service(
+                        query,
+                        source_id=source,
+                        match_count=code_match_count or match_count,
+                        query_embedding=query_embedding,
+                    ),
+                ),
+            )
+            timings["total"] = round(1000 * (time.perf_counter() - start), 1)
+
+            documents["success"] = docs_ok
+            code_examples["success"] = code_ok
+            span.set_attribute("documents_found", len(documents.get("results", [])))
+            span.set_attribute("code_examples_found", len(code_examples.get("results", [])))
+            span.set_attribute("total_ms", timings["total"])
+            span.set_attribute("success", docs_ok or code_ok)
+
+            response_data = {
+                "query": query,
+                "source": source,
+                "documents": documents,
+                "code_examples": code_examples,
+                "timings_ms": timings,
+            }
+            if not (docs_ok or code_ok):
+                response_data["error"] = documents.get("error") or code_examples.get("error")
+            return docs_ok or code_ok, response_data
+
+
+# Process-wide RAGService shared by all requests, so the search strategies and the
+# reranker model are built once instead of per request
+_rag_service: RAGService | None = None
+_refresh_task: asyncio.Task | None = None
+_refresh_config: RerankerSettings | None = None
+
+
+def _load_reranker(config: RerankerSettings) -> RerankingStrategy | None:
+    """Load and warm up a reranker (blocking, runs in a worker thread)."""
+    reranker = RerankingStrategy(config.model_name, backend=config.backend, max_length=config.max_length)
+    if not reranker.warm_up():
+        return None
+    return reranker
+
+
+def _reranker_matches(reranker: RerankingStrategy | None, config: RerankerSettings) -> bool:
+    return (
+        reranker is not None
+        and reranker.model_name == config.model_name
+        and reranker.backend == config.backend
+        and reranker.max_length == config.max_length
+    )
+
+
+async def _build_rag_service(config: RerankerSettings) -> RAGService:
+    """Build a RAGService for the given reranking settings and make it the shared one."""
+    global _rag_service
+
+    current = _rag_service
+    reranker = None
+    if config.enabled:
+        previous = current.reranking_strategy if current is not None else None
+        if _reranker_matches(previous, config):
+            reranker = previous
+        else:
+            model_name = config.model_name
+            with safe_span("rag_service_load_reranker", model_name=model_name, backend=config.backend):
+                reranker = await asyncio.to_thread(_load_reranker, config)
+            if reranker is None:
+                logger.warning(f"Reranking model {model_name} unavailable - searching without reranking")
+            else:
+                logger.info(f"Reranking model {model_name} ({config.backend}) loaded and warmed up")
+
+    supabase_client = current.supabase_client if current is not None else None
+    service = RAGService(supabase_client, reranking_strategy=reranker)
+    service.reranking_config = config
+    _rag_service = service
+    return service
+
+
+def _schedule_refresh(config: RerankerSettings) -> asyncio.Task:
+    """Start (or join) the rebuild of the shared service for ``config``."""
+    global _refresh_task, _refresh_config
+
+    if _refresh_task is None or _refresh_task.done() or _refresh_config != config:
+        _refresh_task = asyncio.create_task(_build_rag_service(config))
+        _refresh_config = config
+    return _refresh_task
+
+
+async def get_rag_service() -> RAGService:
+    """
+    Get the shared RAGService, built on first use.
+
+    When the reranking settings change, the service is rebuilt in the background and
+    the current one keeps serving requests until the new reranker has been loaded and
+    warmed up.
+    """
+    config = _reranking_config()
+    service = _rag_service
+    if service is not None and service.reranking_config == config:
+        return service
+
+    task = _schedule_refresh(config)
+    if service is None:
+        return await asyncio.shield(task)
+    return service
+
+
+def refresh_rag_service() -> None:
+    """Rebuild the shared RAGService in the background if its settings changed."""
+    service = _rag_service
+    if service is None or service.reranking_config == _reranking_config():
+        return
+    try:
+        _schedule_refresh(_reranking_config())
+    except RuntimeError:
+        # No running event loop; get_rag_service() rebuilds on next use
+        pass
+
+
+async def warm_up_rag_service() -> RAGService:
+    """Build the shared RAGService and warm up its reranker (called at startup)."""
+    return await get_rag_service()
+
+
+def get_reranker_stats() -> dict[str, Any]:
+    """Reranking settings of the shared service and its inference worker metrics."""
+    service = _rag_service
+    if service is None:
+        return {"initialized": False}
+    config = service.reranking_config
+    reranker = service.reranking_strategy
+    return {
+        "initialized": True,
+        "enabled": config.enabled,
+        "model_name": config.model_name,
+        "backend": config.backend,
+        "max_length": config.max_length,
+        "available": reranker is not None,
+        "refreshing": _refresh_task is not None and not _refresh_task.done(),
+        "worker": reranker.get_worker_stats() if reranker is not None else None,
+    }
+
+
+async def close_rag_service() -> None:
+    """Drop the shared RAGService, cancel a pending rebuild and stop the reranker worker."""
+    global _rag_service, _refresh_task, _refresh_config
+
+    if _refresh_task is not None and not _refresh_task.done():
+        _refresh_task.cancel()
+        try:
+            await _refresh_task
+        except (asyncio.CancelledError, Exception):
+            pass
+    if _rag_service is not None and _rag_service.reranking_strategy is not None:
+        _rag_service.reranking_strategy.close()
+    _rag_service = None
+    _refresh_task = None
+    _refresh_config = None
@@ -6,32 +6,46 @@ The reranking process re-scores search results based on query-document relevance
 a trained neural model, typically improving precision over initial retrieval scores.
 
 Uses the cross-encoder/ms-marco-MiniLM-L-6-v2 model for reranking by default.
+
+Two backends are available (``RERANKING_BACKEND``):
+
+- ``torch`` (default): the full-precision sentence-transformers CrossEncoder
+- ``onnx``: an int8-quantized ONNX export run with ONNX Runtime, for CPU-only hosts
+  (see onnx_reranker.py); doesn't import torch at all
+
+sentence-transformers is only imported when the torch backend loads a model.
 """
 
+import importlib.util
 import os
 from typing import Any
 
-try:
-    from sentence_transformers import CrossEncoder
-
-    CROSSENCODER_AVAILABLE = True
-except ImportError:
-    CrossEncoder = None
-    CROSSENCODER_AVAILABLE = False
-
 from ...config.logfire_config import get_logger, safe_span
+from .onnx_reranker import DEFAULT_MAX_LENGTH as DEFAULT_ONNX_MAX_LENGTH
+from .onnx_reranker import DEFAULT_ONNX_FILE, OnnxCrossEncoder, onnx_runtime_available
+from .reranking_worker import RerankingWorker
+
+CROSSENCODER_AVAILABLE = importlib.util.find_spec("sentence_transformers") is not None
 
 logger = get_logger(__name__)
 
 # Default reranking model
 DEFAULT_RERANKING_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
 
+RERANKING_BACKENDS = ("torch", "onnx")
+DEFAULT_RERANKING_BACKEND = "torch"
+
 
 class RerankingStrategy:
     """Strategy class implementing result reranking using CrossEncoder models"""
 
     def __init__(
-        self, model_name: str = DEFAULT_RERANKING_MODEL, model_instance: Any | None = None
+        self,
+        model_name: str = DEFAULT_RERANKING_MODEL,
+        model_instance: Any | None = None,
+        backend: str = DEFAULT_RERANKING_BACKEND,
+        max_length: int | None = None,
+        onnx_file: str = DEFAULT_ONNX_FILE,
     ):
         """
         Initialize reranking strategy.
@@ -39,9 +53,17 @@ class RerankingStrategy:
         Args:
             model_name: Name/path of the CrossEncoder model to use
             model_instance: Pre-loaded CrossEncoder instance or any object with a predict method (optional)
+            backend: "torch" (sentence-transformers) or "onnx" (ONNX Runtime, int8 by default)
+            max_length: Maximum tokens per query-document pair; documents are truncated
+                first (defaults to the model's own limit for torch, 512 for onnx)
+            onnx_file: ONNX file inside the model repository, for the onnx backend
         """
         self.model_name = model_name
+        self.backend = backend
+        self.max_length = max_length
+        self.onnx_file = onnx_file
         self.model = model_instance or self._load_model()
+        self._worker: RerankingWorker | None = None
 
     @classmethod
     def from_model(cls, model: Any, model_name: str = "custom_model") -> "RerankingStrategy":
@@ -59,23 +81,80 @@ class RerankingStrategy:
         """
         return cls(model_name=model_name, model_instance=model)
 
-    def _load_model(self) -> CrossEncoder:
-        """Load the CrossEncoder model for reranking."""
+    def _load_model(self) -> Any:
+        """Load the reranking model with the configured backend."""
+        if self.backend == "onnx":
+            return self._load_onnx_model()
+        if self.backend != "torch":
+            logger.warning(f"Unknown reranking backend {self.backend!r}, using torch")
+
         if not CROSSENCODER_AVAILABLE:
             logger.warning("sentence-transformers not available - reranking disabled")
             return None
 
         try:
+            from sentence_transformers import CrossEncoder
+
             logger.info(f"Loading reranking model: {self.model_name}")
-            return CrossEncoder(self.model_name)
+            return CrossEncoder(self.model_name, max_length=self.max_length)
         except Exception as e:
             logger.error(f"Failed to load reranking model {self.model_name}: {e}")
             return None
 
+    def _load_onnx_model(self) -> OnnxCrossEncoder | None:
+        """Load the ONNX Runtime cross-encoder for reranking."""
+        if not onnx_runtime_available():
+            logger.warning("onnxruntime/tokenizers not available - reranking disabled")
+            return None
+
+        try:
+            logger.info(f"Loading ONNX reranking model: {self.model_name} ({self.onnx_file})")
+            return OnnxCrossEncoder.load(
+                self.model_name, self.onnx_file, max_length=self.max_length or DEFAULT_ONNX_MAX_LENGTH
+            )
+        except Exception as e:
+            logger.error(f"Failed to load ONNX reranking model {self.model_name}: {e}")
+            return None
+
     def is_available(self) -> bool:
         """Check if reranking is available (model loaded successfully)."""
         return self.model is not None
 
+    @property
+    def worker(self) -> RerankingWorker:
+        """Batched off-loop inference for the current model (rebuilt if the model is replaced)."""
+        if self._worker is None or self._worker.model is not self.model:
+            if self._worker is not None:
+                self._worker.close()
+            self._worker = RerankingWorker(self.model, self.model_name)
+        return self._worker
+
+    def get_worker_stats(self) -> dict[str, Any] | None:
+        """Queue depth and batch-size metrics of the inference worker, if it has run."""
+        return self._worker.get_stats() if self._worker is not None else None
+
+    def close(self) -> None:
+        """Stop the inference worker thread."""
+        if self._worker is not None:
+            self._worker.close()
+            self._worker = None
+
+    def warm_up(self) -> bool:
+        """
+        Run one dummy prediction so the first real query doesn't pay for lazy initialization.
+
+        Returns:
+            True if the model answered, False if it is unavailable or failed
+        """
+        if not self.model:
+            return False
+        try:
+            self.model.predict([["warm up query", "warm up document"]])
+            return True
+        except Exception as e:
+            logger.warning(f"Reranking model warm-up failed for {self.model_name}: {e}")
+            return False
+
     def build_query_document_pairs(
         self, query: str, results: list[dict[str, Any]], content_key: str = "content"
     ) -> tuple[list[list[str]], list[int]]:
@@ -154,6 +233,9 @@ class RerankingStrategy:
 
         Returns:
             Reranked list of results ordered by rerank_score (highest first)
+
+        Raises:
+            Exception: If the model fails, so callers can tell unranked results apart
         """
         if not self.model or not results:
             logger.debug("Reranking skipped - no model or no results")
@@ -172,9 +254,10 @@ class RerankingStrategy:
                     logger.warning("No valid texts found for reranking")
                     return results
 
-                # Get reranking scores from the model
+                # Get reranking scores from the model, off the event loop and batched
+                # with concurrent reranks
                 with safe_span("crossencoder_predict"):
-                    scores = self.model.predict(query_doc_pairs)
+                    scores = await self.worker.predict(query_doc_pairs)
 
                 # Apply scores and sort results
                 reranked_results = self.apply_rerank_scores(results, scores, valid_indices, top_k)
@@ -191,15 +274,61 @@ class RerankingStrategy:
             except Exception as e:
                 logger.error(f"Error during reranking: {e}")
                 span.set_attribute("error", str(e))
-                return results
+                raise
+
+    async def rerank_many(
+        self,
+        requests: list[tuple[str, list[dict[str, Any]]]],
+        content_key: str = "content",
+        top_k: int | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Rerank the results of several queries with one model forward pass.
+
+        Args:
+            requests: (query, results) for each query
+            content_key: The key in each result dict containing text content for reranking
+            top_k: Optional limit on number of results to return per query
+
+        Returns:
+            Reranked results for each request, in request order
+
+        Raises:
+            Exception: If the model fails
+        """
+        if not self.model:
+            return [results for _, results in requests]
+
+        pairs: list[list[str]] = []
+        slices = []
+        for query, results in requests:
+            query_doc_pairs, valid_indices = self.build_query_document_pairs(query, results, content_key)
+            slices.append((len(pairs), len(query_doc_pairs), valid_indices))
+            pairs.extend(query_doc_pairs)
+
+        with safe_span(
+            "rerank_many", query_count=len(requests), pair_count=len(pairs), model_name=self.model_name
+        ):
+            scores = await self.worker.predict(pairs)
+
+        return [
+            self.apply_rerank_scores(results, scores[offset:offset + count], valid_indices, top_k)
+            if count
+            else results[:top_k] if top_k else results
+            for (_, results), (offset, count, valid_indices) in zip(requests, slices, strict=True)
+        ]
 
     def get_model_info(self) -> dict[str, Any]:
         """Get information about the loaded reranking model."""
         return {
             "model_name": self.model_name,
+            "backend": self.backend,
+            "max_length": self.max_length,
             "available": self.is_available(),
             "crossencoder_available": CROSSENCODER_AVAILABLE,
+            "onnx_runtime_available": onnx_runtime_available(),
             "model_loaded": self.model is not None,
+            "worker": self.get_worker_stats(),
         }
 
 
@@ -213,15 +342,25 @@ class RerankingConfig:
             use_reranking = credential_service.get_bool_setting("USE_RERANKING", False)
             model_name = credential_service.get_setting("RERANKING_MODEL", DEFAULT_RERANKING_MODEL)
             top_k = int(credential_service.get_setting("RERANKING_TOP_K", "0"))
+            backend = credential_service.get_setting("RERANKING_BACKEND", DEFAULT_RERANKING_BACKEND)
+            max_length = int(credential_service.get_setting("RERANKING_MAX_LENGTH", "0"))
 
             return {
                 "enabled": use_reranking,
                 "model_name": model_name,
                 "top_k": top_k if top_k > 0 else None,
+                "backend": backend,
+                "max_length": max_length if max_length > 0 else None,
             }
         except Exception as e:
             logger.error(f"Error loading reranking config: {e}")
-            return {"enabled": False, "model_name": DEFAULT_RERANKING_MODEL, "top_k": None}
+            return {
+                "enabled": False,
+                "model_name": DEFAULT_RERANKING_MODEL,
+                "top_k": None,
+                "backend": DEFAULT_RERANKING_BACKEND,
+                "max_length": None,
+            }
 
     @staticmethod
     def from_env() -> dict[str, Any]:
@@ -230,4 +369,6 @@ class RerankingConfig:
             "enabled": os.getenv("USE_RERANKING", "false").lower() in ("true", "1", "yes", "on"),
             "model_name": os.getenv("RERANKING_MODEL", DEFAULT_RERANKING_MODEL),
             "top_k": int(os.getenv("RERANKING_TOP_K", "0")) or None,
+            "backend": os.getenv("RERANKING_BACKEND", DEFAULT_RERANKING_BACKEND),
+            "max_length": int(os.getenv("RERANKING_MAX_LENGTH", "0")) or None,
         }
@@ -0,0 +1,174 @@
+"""
+Reranking Worker
+
+Runs CrossEncoder inference off the event loop and batches concurrent requests.
+
+``model.predict`` is CPU/GPU bound and takes hundreds of milliseconds for a few dozen
+candidates, so calling it from a coroutine stalls every other request. The worker
+runs predictions in its own thread (PyTorch releases the GIL during the forward
+pass) and coalesces requests arriving within a short window into one batched
+``predict`` call, so N concurrent reranks cost a few forward passes instead of N
+serialized ones.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from ...config.logfire_config import get_logger, safe_span
+
+logger = get_logger(__name__)
+
+# How long the first request of a batch waits for others to join it
+DEFAULT_BATCH_WINDOW_SECONDS = 0.005
+# Upper bound on query-document pairs scored in one forward pass
+DEFAULT_MAX_BATCH_PAIRS = 512
+
+
+@dataclass
+class _RerankRequest:
+    pairs: list[list[str]]
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class RerankingWorker:
+    """Batched, off-loop ``predict`` for one reranking model."""
+
+    def __init__(
+        self,
+        model: Any,
+        model_name: str = "reranker",
+        batch_window: float = DEFAULT_BATCH_WINDOW_SECONDS,
+        max_batch_pairs: int = DEFAULT_MAX_BATCH_PAIRS,
+    ):
+        self.model = model
+        self.model_name = model_name
+        self.batch_window = batch_window
+        self.max_batch_pairs = max_batch_pairs
+
+        # One dedicated thread: the model is not shared between concurrent forward passes
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reranker")
+        self._pending: list[_RerankRequest] = []
+        self._drain_task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+        self._requests = 0
+        self._pairs = 0
+        self._batches = 0
+        self._batched_requests = 0
+        self._failed_batches = 0
+        self._max_batch_requests = 0
+        self._max_batch_pairs_seen = 0
+        self._last_batch_requests = 0
+        self._max_queue_depth = 0
+        self._inference_seconds = 0.0
+        self._wait_seconds = 0.0
+
+    async def predict(self, pairs: list[list[str]]) -> list[float]:
+        """Score query-document pairs, batched with other concurrent calls."""
+        if not pairs:
+            return []
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Pending work belongs to a loop that is gone (e.g. between test loops)
+            self._loop = loop
+            self._pending = []
+            self._drain_task = None
+
+        request = _RerankRequest(pairs, loop.create_future())
+        self._pending.append(request)
+        self._requests += 1
+        self._max_queue_depth = max(self._max_queue_depth, len(self._pending))
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = loop.create_task(self._drain())
+        return await request.future
+
+    def _take_batch(self) -> list[_RerankRequest]:
+        """Pop the next batch of pending requests, always at least one."""
+        batch = []
+        pair_count = 0
+        while self._pending:
+            request = self._pending[0]
+            if batch and pair_count + len(request.pairs) > self.max_batch_pairs:
+                break
+            batch.append(self._pending.pop(0))
+            pair_count += len(request.pairs)
+        return batch
+
+    def _predict_sync(self, pairs: list[list[str]]) -> tuple[list[float], float]:
+        start = time.perf_counter()
+        scores = self.model.predict(pairs)
+        return [float(score) for score in scores], time.perf_counter() - start
+
+    async def _drain(self) -> None:
+        if self.batch_window > 0:
+            await asyncio.sleep(self.batch_window)
+
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            # Requests that arrive during a forward pass join the next batch
+            batch = [request for request in self._take_batch() if not request.future.done()]
+            if not batch:
+                continue
+
+            pairs = [pair for request in batch for pair in request.pairs]
+            wait_seconds = sum(time.perf_counter() - request.enqueued_at for request in batch)
+
+            with safe_span(
+                "reranker_batch", model_name=self.model_name, batch_requests=len(batch), batch_pairs=len(pairs)
+            ):
+                try:
+                    scores, elapsed = await loop.run_in_executor(self._executor, self._predict_sync, pairs)
+                except Exception as e:
+                    self._failed_batches += 1
+                    logger.error(f"Reranking batch of {len(pairs)} pairs failed: {e}")
+                    for request in batch:
+                        if not request.future.done():
+                            request.future.set_exception(e)
+                    continue
+
+            self._batches += 1
+            self._batched_requests += len(batch)
+            self._pairs += len(pairs)
+            self._wait_seconds += wait_seconds
+            self._inference_seconds += elapsed
+            self._last_batch_requests = len(batch)
+            self._max_batch_requests = max(self._max_batch_requests, len(batch))
+            self._max_batch_pairs_seen = max(self._max_batch_pairs_seen, len(pairs))
+
+            offset = 0
+            for request in batch:
+                count = len(request.pairs)
+                if not request.future.done():
+                    request.future.set_result(scores[offset:offset + count])
+                offset += count
+
+    def get_stats(self) -> dict[str, Any]:
+        """Queue depth, batch sizes and inference time."""
+        return {
+            "model_name": self.model_name,
+            "queue_depth": len(self._pending),
+            "max_queue_depth": self._max_queue_depth,
+            "requests": self._requests,
+            "pairs_scored": self._pairs,
+            "batches": self._batches,
+            "failed_batches": self._failed_batches,
+            "last_batch_requests": self._last_batch_requests,
+            "max_batch_requests": self._max_batch_requests,
+            "max_batch_pairs": self._max_batch_pairs_seen,
+            "avg_batch_requests": round(self._batched_requests / self._batches, 2) if self._batches else 0.0,
+            "avg_batch_pairs": round(self._pairs / self._batches, 2) if self._batches else 0.0,
+            "inference_seconds": round(self._inference_seconds, 4),
+            "avg_queue_wait_ms": round(1000 * self._wait_seconds / self._batched_requests, 2)
+            if self._batched_requests
+            else 0.0,
+            "batch_window_ms": self.batch_window * 1000,
+        }
+
+    def close(self) -> None:
+        """Stop the inference thread once queued predictions are done."""
+        self._executor.shutdown(wait=False)
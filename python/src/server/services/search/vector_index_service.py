@@ -0,0 +1,454 @@
+"""
+Vector Index Service
+
+Inspects and (re)builds the pgvector ANN indexes on the embedding_* columns, and
+derives the per-query search effort (hnsw.ef_search / ivfflat.probes).
+
+complete_setup.sql creates ivfflat indexes with a fixed ``lists = 100`` on empty
+tables. ivfflat clusters are computed when the index is built, so such indexes never
+fit the data that arrives later; on large tables recall and latency both suffer. This
+service counts the rows of every embedding column, recommends an index for it (HNSW
+for large or high-dimensional columns via EmbeddingRouter.get_optimal_index_type,
+otherwise ivfflat with lists sized to the row count) and rebuilds indexes with
+CREATE INDEX CONCURRENTLY, so searches and writes keep working during the build.
+
+Index management needs the direct Postgres connection (SUPABASE_DB_URL or
+DATABASE_URL): DDL and catalog queries are not available through the REST API.
+"""
+
+import asyncio
+import math
+import re
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from ...config.logfire_config import get_logger, safe_span
+from ..async_db_client import get_async_db_client, quote_identifier
+
+logger = get_logger(__name__)
+
+VECTOR_TABLES = ("archon_crawled_pages", "archon_code_examples")
+
+# Column the search functions query (they default to 1536 dimensions)
+SEARCH_COLUMN = "embedding_1536"
+
+# pgvector cannot build ivfflat/hnsw indexes on vector columns wider than this
+MAX_INDEXED_DIMENSIONS = 2000
+
+# What complete_setup.sql creates, assumed until the indexes were inspected
+DEFAULT_IVFFLAT_LISTS = 100
+
+# pgvector's HNSW build defaults
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 64
+
+# ivfflat lists outside [ideal / 2, ideal * 2] are worth a rebuild
+LISTS_TOLERANCE = 2.0
+
+# VECTOR_SEARCH_RECALL -> (hnsw.ef_search, ivfflat.probes as a multiple of sqrt(lists))
+RECALL_PROFILES = {
+    "fast": (40, 0.5),
+    "balanced": (100, 1.0),
+    "accurate": (200, 2.0),
+}
+
+_INDEX_PATTERN = re.compile(r"USING (ivfflat|hnsw) \((\w+)", re.IGNORECASE)
+_OPTION_PATTERN = re.compile(r"(lists|m|ef_construction)\s*=\s*'?(\d+)'?", re.IGNORECASE)
+
+
+class DirectDatabaseRequiredError(RuntimeError):
+    """Raised when index management is used without a direct Postgres connection."""
+
+
+@dataclass
+class IndexSpec:
+    """An ANN index method and its build parameters."""
+
+    method: str  # "ivfflat" or "hnsw"
+    lists: int | None = None
+    m: int | None = None
+    ef_construction: int | None = None
+
+    def options_sql(self) -> str:
+        """The WITH (...) clause for CREATE INDEX."""
+        if self.method == "hnsw":
+            return f"WITH (m = {int(self.m or HNSW_M)}, ef_construction = {int(self.ef_construction or HNSW_EF_CONSTRUCTION)})"
+        return f"WITH (lists = {int(self.lists or DEFAULT_IVFFLAT_LISTS)})"
+
+
+@dataclass
+class VectorIndexStatus:
+    """An embedding column, its current index and the recommended one."""
+
+    table: str
+    column: str
+    dimensions: int
+    rows: int
+    index_name: str | None = None
+    current: IndexSpec | None = None
+    valid: bool = True
+    size_bytes: int | None = None
+    recommended: IndexSpec | None = None
+    action: str = "keep"  # keep, create, rebuild or none
+    reason: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def ivfflat_lists(rows: int) -> int:
+    """ivfflat list count for a column (pgvector guidance: rows / 1000 up to 1M rows, sqrt(rows) above)."""
+    if rows <= 1_000_000:
+        return max(10, rows // 1000)
+    return int(math.sqrt(rows))
+
+
+def parse_index_definition(indexdef: str) -> tuple[str, IndexSpec] | None:
+    """
+    Parse a pg_indexes.indexdef of an ivfflat/hnsw index.
+
+    Returns:
+        (indexed column, index spec), or None for other indexes
+    """
+    match = _INDEX_PATTERN.search(indexdef)
+    if not match:
+        return None
+    options = {name.lower(): int(value) for name, value in _OPTION_PATTERN.findall(indexdef)}
+    method = match.group(1).lower()
+    if method == "hnsw":
+        spec = IndexSpec(
+            "hnsw", m=options.get("m", HNSW_M), ef_construction=options.get("ef_construction", HNSW_EF_CONSTRUCTION)
+        )
+    else:
+        spec = IndexSpec("ivfflat", lists=options.get("lists", DEFAULT_IVFFLAT_LISTS))
+    return match.group(2), spec
+
+
+def recommend_index(dimensions: int, rows: int, index_type: str = "auto") -> tuple[IndexSpec | None, str]:
+    """
+    Recommend an index for an embedding column.
+
+    Args:
+        dimensions: Vector dimensions of the column
+        rows: Rows with an embedding in the column
+        index_type: "auto" (EmbeddingRouter's choice), "hnsw" or "ivfflat"
+
+    Returns:
+        (recommended index or None when the column should not be indexed, reason)
+    """
+    if dimensions > MAX_INDEXED_DIMENSIONS:
+        return None, f"pgvector cannot index vectors over {MAX_INDEXED_DIMENSIONS} dimensions"
+    if rows == 0:
+        return None, "no embeddings yet; ivfflat clusters built on an empty column are useless"
+
+    if index_type == "auto":
+        from ..ollama.embedding_router import embedding_router
+
+        index_type = embedding_router.get_optimal_index_type(dimensions, rows)
+
+    if index_type == "hnsw":
+        return IndexSpec("hnsw", m=HNSW_M, ef_construction=HNSW_EF_CONSTRUCTION), f"hnsw for {rows} rows"
+    lists = ivfflat_lists(rows)
+    return IndexSpec("ivfflat", lists=lists), f"ivfflat with {lists} lists for {rows} rows"
+
+
+def plan_action(current: IndexSpec | None, valid: bool, recommended: IndexSpec | None) -> str:
+    """What to do with a column's index: keep, create, rebuild or none (leave unindexed/as is)."""
+    if recommended is None:
+        return "none"
+    if current is None:
+        return "create"
+    if not valid or current.method != recommended.method:
+        return "rebuild"
+    if current.method == "ivfflat" and current.lists and recommended.lists:
+        ratio = current.lists / recommended.lists
+        if ratio > LISTS_TOLERANCE or ratio < 1 / LISTS_TOLERANCE:
+            return "rebuild"
+    return "keep"
+
+
+def index_name(table: str, column: str) -> str:
+    """Name of the index on a column, as complete_setup.sql names them."""
+    return f"idx_{table}_{column}"
+
+
+def build_statements(status: VectorIndexStatus, spec: IndexSpec) -> list[str]:
+    """
+    SQL that (re)builds a column's index without blocking reads or writes.
+
+    A new index is built next to the old one, which is only dropped once the new one
+    is ready. Each statement must run outside a transaction (CONCURRENTLY).
+    """
+    table = quote_identifier(status.table)
+    column = quote_identifier(status.column)
+    name = status.index_name or index_name(status.table, status.column)
+    create = (
+        f"CREATE INDEX CONCURRENTLY {{name}} ON {table} USING {spec.method} "
+        f"({column} vector_cosine_ops) {spec.options_sql()}"
+    )
+    if status.current is None:
+        return [create.format(name=quote_identifier(name))]
+
+    new_name = f"{name[:59]}_new"
+    return [
+        # Left behind by a failed earlier build
+        f"DROP INDEX CONCURRENTLY IF EXISTS {quote_identifier(new_name)}",
+        create.format(name=quote_identifier(new_name)),
+        f"DROP INDEX CONCURRENTLY IF EXISTS {quote_identifier(name)}",
+        f"ALTER INDEX {quote_identifier(new_name)} RENAME TO {quote_identifier(name)}",
+    ]
+
+
+def vector_search_params(recall: str, lists: int | None, match_count: int) -> dict[str, int]:
+    """
+    Per-query ANN search effort for the search functions.
+
+    Args:
+        recall: VECTOR_SEARCH_RECALL profile (fast, balanced or accurate); anything
+            else keeps the database defaults
+        lists: ivfflat lists of the searched index
+        match_count: Results the query asks for (HNSW returns at most ef_search)
+
+    Returns:
+        {"ef_search": ..., "probes": ...}, or {} to keep the database defaults
+    """
+    profile = RECALL_PROFILES.get((recall or "").strip().lower())
+    if profile is None:
+        return {}
+    ef_search, probes_factor = profile
+    probes = max(1, round(probes_factor * math.sqrt(lists or DEFAULT_IVFFLAT_LISTS)))
+    return {"ef_search": max(ef_search, match_count), "probes": probes}
+
+
+class VectorIndexService:
+    """Inspects, recommends and rebuilds the vector indexes."""
+
+    def __init__(self, db_client=None):
+        self._db_client = db_client
+        # ivfflat lists of the searched column's index per table, from the last inspection
+        self.search_lists: dict[str, int] = {}
+        self.build: dict[str, Any] = {"status": "idle"}
+        self._build_task: asyncio.Task | None = None
+
+    def _db(self):
+        db_client = self._db_client or get_async_db_client()
+        if db_client is None:
+            raise DirectDatabaseRequiredError(
+                "Vector index management needs a direct database connection (set SUPABASE_DB_URL)"
+            )
+        return db_client
+
+    async def _row_counts(self, table: str, columns: list[str], exact: bool) -> dict[str, int]:
+        """Rows with an embedding per column, estimated from planner statistics unless ``exact``."""
+        db = self._db()
+        if not exact:
+            table_rows = await db.fetchval("SELECT reltuples::bigint FROM pg_class WHERE oid = $1::regclass", table)
+            # reltuples is -1 (or 0) until the table has been analyzed
+            if table_rows and table_rows > 0:
+                stats = await db.fetch(
+                    "SELECT attname, null_frac FROM pg_stats WHERE schemaname = 'public' AND tablename = $1",
+                    table,
+                )
+                null_frac = {row["attname"]: row["null_frac"] for row in stats}
+                if all(column in null_frac for column in columns):
+                    return {column: int(table_rows * (1 - null_frac[column])) for column in columns}
+
+        counts = ", ".join(f"count({quote_identifier(column)}) AS {quote_identifier(column)}" for column in columns)
+        row = await db.fetchrow(f"SELECT {counts} FROM {quote_identifier(table)}")
+        return {column: int(row[column]) for column in columns}
+
+    async def inspect(self, exact: bool = False, index_type: str = "auto") -> list[VectorIndexStatus]:
+        """
+        Inspect every embedding column and recommend an index for it.
+
+        Args:
+            exact: Count rows instead of estimating them from planner statistics
+                (a full scan on large tables)
+            index_type: "auto", "hnsw" or "ivfflat" for the recommendations
+
+        Returns:
+            One status per embedding column
+        """
+        with safe_span("vector_index_inspect", exact=exact) as span:
+            db = self._db()
+            statuses = []
+            for table in VECTOR_TABLES:
+                columns = [
+                    row["column_name"]
+                    for row in await db.fetch(
+                        "SELECT column_name FROM information_schema.columns "
+                        "WHERE table_schema = 'public' AND table_name = $1 AND udt_name = 'vector' "
+                        "AND column_name ~ '^embedding_[0-9]+$' ORDER BY ordinal_position",
+                        table,
+                    )
+                ]
+                if not columns:
+                    continue
+                rows = await self._row_counts(table, columns, exact)
+
+                indexes: dict[str, dict[str, Any]] = {}
+                for row in await db.fetch(
+                    "SELECT i.indexname, i.indexdef, x.indisvalid AS valid, pg_relation_size(c.oid) AS size_bytes "
+                    "FROM pg_indexes i "
+                    "JOIN pg_class c ON c.relname = i.indexname "
+                    "JOIN pg_index x ON x.indexrelid = c.oid "
+                    "WHERE i.schemaname = 'public' AND i.tablename = $1",
+                    table,
+                ):
+                    parsed = parse_index_definition(row["indexdef"])
+                    # Skip the leftover of a failed concurrent rebuild
+                    if parsed and not row["indexname"].endswith("_new"):
+                        indexes[parsed[0]] = {**row, "spec": parsed[1]}
+
+                for column in columns:
+                    dimensions = int(column.rsplit("_", 1)[1])
+                    index = indexes.get(column)
+                    status = VectorIndexStatus(
+                        table=table,
+                        column=column,
+                        dimensions=dimensions,
+                        rows=rows[column],
+                        index_name=index["indexname"] if index else None,
+                        current=index["spec"] if index else None,
+                        valid=bool(index["valid"]) if index else True,
+                        size_bytes=index["size_bytes"] if index else None,
+                    )
+                    status.recommended, status.reason = recommend_index(dimensions, status.rows, index_type)
+                    status.action = plan_action(status.current, status.valid, status.recommended)
+                    statuses.append(status)
+
+                    if column == SEARCH_COLUMN:
+                        if status.current and status.current.method == "ivfflat":
+                            self.search_lists[table] = status.current.lists or DEFAULT_IVFFLAT_LISTS
+                        else:
+                            self.search_lists.pop(table, None)
+
+            span.set_attribute("columns", len(statuses))
+            span.set_attribute("actions", sum(status.action in ("create", "rebuild") for status in statuses))
+            return statuses
+
+    async def build_progress(self) -> list[dict[str, Any]]:
+        """Progress of index builds running in the database (pg_stat_progress_create_index)."""
+        return await self._db().fetch(
+            "SELECT c.relname AS index_name, p.phase, p.blocks_done, p.blocks_total, "
+            "p.tuples_done, p.tuples_total "
+            "FROM pg_stat_progress_create_index p LEFT JOIN pg_class c ON c.oid = p.index_relid"
+        )
+
+    def plan(
+        self,
+        statuses: list[VectorIndexStatus],
+        table: str | None = None,
+        column: str | None = None,
+        force: bool = False,
+    ) -> list[tuple[VectorIndexStatus, list[str]]]:
+        """
+        Statements for the columns whose index should be created or rebuilt.
+
+        Args:
+            statuses: Output of inspect()
+            table: Only this table
+            column: Only this column
+            force: Also rebuild indexes that already match the recommendation
+        """
+        plan = []
+        for status in statuses:
+            if (table and status.table != table) or (column and status.column != column):
+                continue
+            if status.action in ("create", "rebuild") or (force and status.recommended):
+                plan.append((status, build_statements(status, status.recommended)))
+        return plan
+
+    @property
+    def is_building(self) -> bool:
+        return self._build_task is not None and not self._build_task.done()
+
+    def start_build(self, plan: list[tuple[VectorIndexStatus, list[str]]], maintenance_work_mem: str | None = None):
+        """
+        Run a build plan in the background, one index at a time.
+
+        Raises:
+            RuntimeError: If a build is already running
+        """
+        if self.is_building:
+            raise RuntimeError("A vector index build is already running")
+        self._db()
+        self.build = {
+            "status": "running",
+            "started_at": time.time(),
+            "indexes": [f"{status.table}.{status.column}" for status, _ in plan],
+            "completed": [],
+            "current": None,
+            "error": None,
+        }
+        self._build_task = asyncio.create_task(self._run_build(plan, maintenance_work_mem))
+        return self.build
+
+    async def _run_build(self, plan, maintenance_work_mem: str | None) -> None:
+        db = self._db()
+        pool = await db.connect()
+        try:
+            for status, statements in plan:
+                target = f"{status.table}.{status.column}"
+                self.build["current"] = target
+                with safe_span("vector_index_build", index=target, method=status.recommended.method):
+                    start = time.perf_counter()
+                    # Session settings must stay on one connection, outside a transaction
+                    async with pool.acquire() as conn:
+                        if maintenance_work_mem:
+                            await conn.execute("SELECT set_config('maintenance_work_mem', $1, false)", maintenance_work_mem)
+                        try:
+                            for statement in statements:
+                                await conn.execute(statement)
+                        finally:
+                            if maintenance_work_mem:
+                                await conn.execute("RESET maintenance_work_mem")
+                    elapsed = round(time.perf_counter() - start, 1)
+                logger.info(f"Built {status.recommended.method} index on {target} in {elapsed}s")
+                self.build["completed"].append({"index": target, "seconds": elapsed})
+                if status.column == SEARCH_COLUMN:
+                    if status.recommended.method == "ivfflat":
+                        self.search_lists[status.table] = status.recommended.lists
+                    else:
+                        self.search_lists.pop(status.table, None)
+            self.build["status"] = "completed"
+        except Exception as e:
+            logger.error(f"Vector index build failed on {self.build['current']}: {e}", exc_info=True)
+            self.build["status"] = "failed"
+            self.build["error"] = str(e)
+        finally:
+            self.build["current"] = None
+            self.build["finished_at"] = time.time()
+
+    @staticmethod
+    def search_recall() -> str:
+        """The VECTOR_SEARCH_RECALL setting ("" keeps the database defaults)."""
+        # Deferred: rag_service imports the search strategies, which import this module
+        from .rag_service import _get_setting
+
+        return _get_setting("VECTOR_SEARCH_RECALL", "")
+
+    def search_params(self, table: str, match_count: int) -> dict[str, int]:
+        """Per-query ef_search/probes for searching ``table`` (see VECTOR_SEARCH_RECALL)."""
+        return vector_search_params(self.search_recall(), self.search_lists.get(table), match_count)
+
+
+# Global service instance
+_vector_index_service: VectorIndexService | None = None
+
+
+def get_vector_index_service() -> VectorIndexService:
+    """Get the global vector index service."""
+    global _vector_index_service
+
+    if _vector_index_service is None:
+        _vector_index_service = VectorIndexService()
+    return _vector_index_service
+
+
+def reset_vector_index_service() -> None:
+    """Discard the global service so the next use starts fresh."""
+    global _vector_index_service
+
+    _vector_index_service = None
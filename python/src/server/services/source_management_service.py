@@ -5,6 +5,7 @@ Handles source metadata, summaries, and management.
 Consolidates both utility functions and class-based service.
 """
 
+import asyncio
 from typing import Any
 
 from supabase import Client
@@ -12,6 +13,7 @@ from supabase import Client
 from ..config.logfire_config import get_logger, search_logger
 from .client_manager import get_supabase_client
 from .llm_provider_service import extract_message_text, get_llm_client
+from .stats_cache import KNOWLEDGE_SCOPE, bump_stats_epoch
 
 logger = get_logger(__name__)
 
@@ -241,8 +243,8 @@ async def update_source_info(
     search_logger.info(f"Updating source {source_id} with knowledge_type={knowledge_type}")
     try:
         # First, check if source already exists to preserve title
-        existing_source = (
-            client.table("archon_sources").select("title").eq("source_id", source_id).execute()
+        existing_source = await asyncio.to_thread(
+            client.table("archon_sources").select("title").eq("source_id", source_id).execute
         )
 
         if existing_source.data:
@@ -287,11 +289,11 @@ async def update_source_info(
             if source_display_name:
                 update_data["source_display_name"] = source_display_name
 
-            result = (
+            result = await asyncio.to_thread(
                 client.table("archon_sources")
                 .update(update_data)
                 .eq("source_id", source_id)
-                .execute()
+                .execute
             )
 
             search_logger.info(
@@ -355,9 +357,12 @@ async def update_source_info(
             if source_display_name:
                 upsert_data["source_display_name"] = source_display_name
 
-            client.table("archon_sources").upsert(upsert_data).execute()
+            await asyncio.to_thread(client.table("archon_sources").upsert(upsert_data).execute)
             search_logger.info(f"Created/updated source {source_id} with title: {title}")
 
+        # Source rows feed the dashboard's source counts per knowledge type
+        bump_stats_epoch(KNOWLEDGE_SCOPE)
+
     except Exception as e:
         search_logger.error(f"Error updating source {source_id}: {e}")
         raise  # Re-raise the exception so the caller knows it failed
@@ -408,6 +413,9 @@ class SourceManagementService:
         Returns:
             Tuple of (success, result_dict)
         """
+        # Imported here: the search package imports utils, which imports this module
+        from .search.rag_result_cache import bump_index_generation
+
         try:
             logger.info(f"Starting delete_source for source_id: {source_id}")
 
@@ -420,6 +428,7 @@ class SourceManagementService:
                     .eq("source_id", source_id)
                     .execute()
                 )
+                bump_index_generation([source_id])
                 pages_deleted = len(pages_response.data) if pages_response.data else 0
                 logger.info(f"Deleted {pages_deleted} pages from crawled_pages")
             except Exception as pages_error:
@@ -435,6 +444,7 @@ class SourceManagementService:
                     .eq("source_id", source_id)
                     .execute()
                 )
+                bump_index_generation([source_id])
                 code_deleted = len(code_response.data) if code_response.data else 0
                 logger.info(f"Deleted {code_deleted} code examples")
             except Exception as code_error:
@@ -450,6 +460,7 @@ class SourceManagementService:
                     .eq("source_id", source_id)
                     .execute()
                 )
+                bump_stats_epoch(KNOWLEDGE_SCOPE)
                 source_deleted = len(source_response.data) if source_response.data else 0
                 logger.info(f"Deleted {source_deleted} source records")
             except Exception as source_error:
@@ -531,6 +542,7 @@ class SourceManagementService:
             )
 
             if response.data:
+                bump_stats_epoch(KNOWLEDGE_SCOPE)
                 return True, {"source_id": source_id, "updated_fields": list(update_data.keys())}
             else:
                 return False, {"error": f"Source with ID {source_id} not found"}
@@ -0,0 +1,165 @@
+"""
+Stats Cache
+
+In-process cache of aggregate counts (dashboard statistics, task counts per project),
+stamped with invalidation epochs.
+
+The aggregates are computed in Postgres, but dashboards and the project sidebar poll
+them every few seconds while the underlying tables rarely change. Each entry records
+the epoch of every data scope it was computed from ("tasks" for projects and tasks,
+"knowledge" for sources, documents and code examples); writes to a scope bump its
+epoch, so an entry computed before a write is never served after it.
+
+Every entry also carries a version number that only changes when a recomputation
+returns different data, so pollers get an ETag without hashing the payload, and a
+client holding a current ETag gets 304 responses without the aggregates being
+recomputed at all.
+
+Epochs are per process: writes made by another worker are picked up when entries
+expire (STATS_CACHE_TTL_SECONDS).
+"""
+
+import copy
+import os
+import secrets
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any
+
+DEFAULT_TTL_SECONDS = 30.0
+
+# Data scopes the cached aggregates depend on
+TASKS_SCOPE = "tasks"
+KNOWLEDGE_SCOPE = "knowledge"
+
+
+class StatsCache:
+    """Aggregate results validated against per-scope write epochs, with change versions."""
+
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds: Seconds an entry stays valid without a local write (0 disables caching)
+        """
+        self.ttl_seconds = max(0.0, ttl_seconds)
+        # Distinguishes this process's versions from those of a restarted or other worker
+        self._instance = secrets.token_hex(4)
+        self._epochs: dict[str, int] = {}
+        # Writes run in worker threads too; a lost increment could leave a stale entry valid
+        self._bump_lock = threading.Lock()
+        self._entries: dict[Any, tuple[Any, tuple[int, ...], float, int]] = {}
+        self._versions: dict[Any, tuple[Any, int]] = {}
+        self._next_version = 0
+        self._hits = 0
+        self._misses = 0
+
+    def epochs(self, scopes: Iterable[str]) -> tuple[int, ...]:
+        """Current write epochs of the given scopes."""
+        return tuple(self._epochs.get(scope, 0) for scope in scopes)
+
+    def bump(self, *scopes: str) -> None:
+        """Record a write to the given scopes, outdating every entry computed from them."""
+        with self._bump_lock:
+            for scope in scopes:
+                self._epochs[scope] = self._epochs.get(scope, 0) + 1
+
+    def etag(self, version: int) -> str:
+        """ETag for a version returned by get_or_compute."""
+        return f'"{self._instance}-{version}"'
+
+    def get_or_compute(self, key: Any, scopes: tuple[str, ...], compute: Callable[[], Any]) -> tuple[Any, int]:
+        """
+        Return (value, version) for ``key``, calling ``compute`` only if the cached value is
+        missing, expired, or older than a write to one of ``scopes``.
+
+        ``compute`` may raise; nothing is cached then.
+        """
+        cached = self._lookup(key, scopes)
+        if cached is not None:
+            return cached
+
+        # Read before computing so a write during the computation outdates the result
+        epochs = self.epochs(scopes)
+        return self._store(key, scopes, epochs, compute())
+
+    async def get_or_compute_async(
+        self, key: Any, scopes: tuple[str, ...], compute: Callable[[], Awaitable[Any]]
+    ) -> tuple[Any, int]:
+        """get_or_compute for a coroutine function ``compute``."""
+        cached = self._lookup(key, scopes)
+        if cached is not None:
+            return cached
+
+        epochs = self.epochs(scopes)
+        return self._store(key, scopes, epochs, await compute())
+
+    def _lookup(self, key: Any, scopes: tuple[str, ...]) -> tuple[Any, int] | None:
+        """Cached (value, version) if still valid."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, epochs, expires_at, version = entry
+            if epochs == self.epochs(scopes) and expires_at > time.monotonic():
+                self._hits += 1
+                return copy.deepcopy(value), version
+        self._misses += 1
+        return None
+
+    def _store(self, key: Any, scopes: tuple[str, ...], epochs: tuple[int, ...], value: Any) -> tuple[Any, int]:
+        """Version a computed value and cache it unless a write happened since ``epochs``."""
+        version = self._version_of(key, value)
+        if self.ttl_seconds and epochs == self.epochs(scopes):
+            self._entries[key] = (copy.deepcopy(value), epochs, time.monotonic() + self.ttl_seconds, version)
+        return value, version
+
+    def _version_of(self, key: Any, value: Any) -> int:
+        """Keep the version of an unchanged value, otherwise assign a new one."""
+        previous = self._versions.get(key)
+        if previous is not None and previous[0] == value:
+            return previous[1]
+        self._next_version += 1
+        self._versions[key] = (copy.deepcopy(value), self._next_version)
+        return self._next_version
+
+    def get_stats(self) -> dict[str, Any]:
+        """Hit/miss counters since startup."""
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "ttl_seconds": self.ttl_seconds,
+            "epochs": dict(self._epochs),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Global cache instance
+_stats_cache: StatsCache | None = None
+
+
+def get_stats_cache() -> StatsCache:
+    """Get the global stats cache (TTL from STATS_CACHE_TTL_SECONDS)."""
+    global _stats_cache
+
+    if _stats_cache is None:
+        try:
+            ttl_seconds = float(os.getenv("STATS_CACHE_TTL_SECONDS", str(DEFAULT_TTL_SECONDS)))
+        except ValueError:
+            ttl_seconds = DEFAULT_TTL_SECONDS
+        _stats_cache = StatsCache(ttl_seconds)
+    return _stats_cache
+
+
+def bump_stats_epoch(*scopes: str) -> None:
+    """Outdate cached aggregates after a write to projects/tasks or to the knowledge base."""
+    get_stats_cache().bump(*scopes)
+
+
+def reset_stats_cache() -> None:
+    """Discard the global cache so the next use starts empty."""
+    global _stats_cache
+
+    _stats_cache = None
@@ -8,6 +8,7 @@ Provides common functionality for all document storage operations including:
 - Progress reporting
 """
 
+import asyncio
 import re
 from abc import ABC, abstractmethod
 from collections.abc import Callable
@@ -18,6 +19,83 @@ from ...config.logfire_config import get_logger, safe_span
 
 logger = get_logger(__name__)
 
+# Texts at least this large are chunked in a worker process instead of on the event loop
+PROCESS_POOL_CHUNK_THRESHOLD = 50_000
+# Characters of text handed to one worker process task when chunking a document group
+PROCESS_POOL_GROUP_CHARS = 2_000_000
+
+
+def chunk_text(text: str, chunk_size: int = 5000) -> list[str]:
+    """
+    Split text into chunks intelligently, preserving context.
+
+    This function implements a context-aware chunking strategy that:
+    1. Preserves code blocks (```) as complete units when possible
+    2. Prefers to break at paragraph boundaries (\\n\\n)
+    3. Falls back to sentence boundaries (. ) if needed
+    4. Only splits mid-content when absolutely necessary
+
+    Args:
+        text: Text to chunk
+        chunk_size: Maximum chunk size (default: 5000)
+
+    Returns:
+        List of text chunks
+    """
+    if not text or not isinstance(text, str):
+        logger.warning("Invalid text provided for chunking")
+        return []
+
+    chunks = []
+    start = 0
+    text_length = len(text)
+
+    while start < text_length:
+        # Determine the end of this chunk
+        end = start + chunk_size
+
+        # If we're at the end of the text, take what's left
+        if end >= text_length:
+            chunk = text[start:].strip()
+            if chunk:
+                chunks.append(chunk)
+            break
+
+        # Try to find a good break point
+        chunk = text[start:end]
+
+        # First, try to break at a code block boundary
+        code_block_pos = chunk.rfind("```")
+        if code_block_pos != -1 and code_block_pos > chunk_size * 0.3:
+            end = start + code_block_pos
+
+        # If no code block, try paragraph break
+        elif "\n\n" in chunk:
+            last_break = chunk.rfind("\n\n")
+            if last_break > chunk_size * 0.3:
+                end = start + last_break
+
+        # If no paragraph break, try sentence break
+        elif ". " in chunk:
+            last_period = chunk.rfind(". ")
+            if last_period > chunk_size * 0.3:
+                end = start + last_period + 1
+
+        # Extract chunk and clean it up
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+
+        # Move start position for next chunk
+        start = end
+
+    return chunks
+
+
+def chunk_texts(texts: list[str], chunk_size: int = 5000) -> list[list[str]]:
+    """Chunk a group of texts (one process pool task per document group)."""
+    return [chunk_text(text, chunk_size) for text in texts]
+
 
 class BaseStorageService(ABC):
     """Base class for all storage services with common functionality."""
@@ -40,11 +118,7 @@ class BaseStorageService(ABC):
         """
         Split text into chunks intelligently, preserving context.
 
-        This function implements a context-aware chunking strategy that:
-        1. Preserves code blocks (```) as complete units when possible
-        2. Prefers to break at paragraph boundaries (\\n\\n)
-        3. Falls back to sentence boundaries (. ) if needed
-        4. Only splits mid-content when absolutely necessary
+        See chunk_text() for the strategy.
 
         Args:
             text: Text to chunk
@@ -53,54 +127,7 @@ class BaseStorageService(ABC):
         Returns:
             List of text chunks
         """
-        if not text or not isinstance(text, str):
-            logger.warning("Invalid text provided for chunking")
-            return []
-
-        chunks = []
-        start = 0
-        text_length = len(text)
-
-        while start < text_length:
-            # Determine the end of this chunk
-            end = start + chunk_size
-
-            # If we're at the end of the text, take what's left
-            if end >= text_length:
-                chunk = text[start:].strip()
-                if chunk:
-                    chunks.append(chunk)
-                break
-
-            # Try to find a good break point
-            chunk = text[start:end]
-
-            # First, try to break at a code block boundary
-            code_block_pos = chunk.rfind("```")
-            if code_block_pos != -1 and code_block_pos > chunk_size * 0.3:
-                end = start + code_block_pos
-
-            # If no code block, try paragraph break
-            elif "\n\n" in chunk:
-                last_break = chunk.rfind("\n\n")
-                if last_break > chunk_size * 0.3:
-                    end = start + last_break
-
-            # If no paragraph break, try sentence break
-            elif ". " in chunk:
-                last_period = chunk.rfind(". ")
-                if last_period > chunk_size * 0.3:
-                    end = start + last_period + 1
-
-            # Extract chunk and clean it up
-            chunk = text[start:end].strip()
-            if chunk:
-                chunks.append(chunk)
-
-            # Move start position for next chunk
-            start = end
-
-        return chunks
+        return chunk_text(text, chunk_size)
 
     async def smart_chunk_text_async(
         self, text: str, chunk_size: int = 5000, progress_callback: Callable | None = None
@@ -120,11 +147,9 @@ class BaseStorageService(ABC):
             "smart_chunk_text_async", text_length=len(text), chunk_size=chunk_size
         ) as span:
             try:
-                # For large texts, run chunking in thread pool
-                if len(text) > 50000:  # 50KB threshold
-                    chunks = await self.threading_service.run_cpu_intensive(
-                        self.smart_chunk_text, text, chunk_size
-                    )
+                # Large texts are chunked in a worker process so they don't hold the GIL
+                if len(text) > PROCESS_POOL_CHUNK_THRESHOLD:
+                    chunks = await self.threading_service.run_in_process_pool(chunk_text, text, chunk_size)
                 else:
                     chunks = self.smart_chunk_text(text, chunk_size)
 
@@ -146,6 +171,43 @@ class BaseStorageService(ABC):
                 logger.error(f"Error chunking text: {e}")
                 raise
 
+    async def smart_chunk_texts_async(self, texts: list[str], chunk_size: int = 5000) -> list[list[str]]:
+        """
+        Chunk a group of documents, returning one chunk list per text.
+
+        Large groups are split into sub-groups of about PROCESS_POOL_GROUP_CHARS characters,
+        each chunked by one worker process, so the pickling cost is paid per group rather
+        than per document and the groups run on all pool workers in parallel.
+
+        Args:
+            texts: Texts to chunk
+            chunk_size: Maximum chunk size
+
+        Returns:
+            List of chunk lists, in the same order as texts
+        """
+        total_chars = sum(len(text) for text in texts)
+        with safe_span("smart_chunk_texts_async", documents=len(texts), total_chars=total_chars) as span:
+            if total_chars <= PROCESS_POOL_CHUNK_THRESHOLD:
+                span.set_attribute("process_pool", False)
+                return [self.smart_chunk_text(text, chunk_size) for text in texts]
+
+            groups: list[list[str]] = [[]]
+            group_chars = 0
+            for text in texts:
+                if groups[-1] and group_chars + len(text) > PROCESS_POOL_GROUP_CHARS:
+                    groups.append([])
+                    group_chars = 0
+                groups[-1].append(text)
+                group_chars += len(text)
+
+            results = await asyncio.gather(*(
+                self.threading_service.run_in_process_pool(chunk_texts, group, chunk_size) for group in groups
+            ))
+            span.set_attribute("process_pool", True)
+            span.set_attribute("groups", len(groups))
+            return [chunks for group_result in results for chunks in group_result]
+
     def extract_metadata(
         self, chunk: str, base_metadata: dict[str, Any] | None = None
     ) -> dict[str, Any]:
@@ -0,0 +1,162 @@
+"""
+Code Block Deduplication
+
+Groups near-duplicate code blocks without comparing every pair.
+
+Each block is normalized once and sketched with a one-permutation MinHash over token
+shingles. Locality-sensitive hashing (banded signatures) buckets blocks that are
+likely similar, and the exact SequenceMatcher check only runs on those candidate
+pairs. Small inputs skip the sketching and compare all pairs, so results there are
+identical to the exhaustive comparison.
+"""
+
+import operator
+import re
+import zlib
+from collections import defaultdict
+from collections.abc import Callable
+from difflib import SequenceMatcher
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.85
+
+# Inputs up to this size are compared exhaustively (exact, and cheap enough)
+EXACT_COMPARISON_MAX_BLOCKS = 100
+
+# MinHash / LSH parameters: 16 bands x 4 rows puts the candidate threshold near
+# Jaccard 0.5, below the shingle overlap of blocks that are >= 85% similar.
+NUM_PERMUTATIONS = 64
+NUM_BANDS = 16
+SHINGLE_SIZE = 5
+
+# Candidate pairs whose signatures agree on fewer slots than this (estimated Jaccard)
+# are too dissimilar to reach the similarity threshold and skip the exact check
+MIN_ESTIMATED_JACCARD = 0.4
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+_UINT32 = 1 << 32
+
+
+def _shingle_hashes(normalized: str, shingle_size: int = SHINGLE_SIZE) -> set[int]:
+    """Hash the token shingles of a normalized code string."""
+    tokens = _TOKEN_PATTERN.findall(normalized)
+    if len(tokens) <= shingle_size:
+        return {zlib.crc32(" ".join(tokens).encode("utf-8"))}
+    return {
+        zlib.crc32(" ".join(tokens[i : i + shingle_size]).encode("utf-8"))
+        for i in range(len(tokens) - shingle_size + 1)
+    }
+
+
+def minhash_signature(shingle_hashes: set[int], num_permutations: int = NUM_PERMUTATIONS) -> tuple[int, ...]:
+    """
+    One-permutation MinHash: a single pass assigns each shingle hash to a bin and keeps
+    the minimum per bin. Empty bins are filled from the next non-empty bin (rotation
+    densification) so signatures of short blocks stay comparable.
+    """
+    bins: list[int | None] = [None] * num_permutations
+    for value in shingle_hashes:
+        index = value % num_permutations
+        rank = value // num_permutations
+        current = bins[index]
+        if current is None or rank < current:
+            bins[index] = rank
+
+    if all(b is None for b in bins):
+        return tuple([0] * num_permutations)
+
+    # Walk twice around the ring backwards so every bin sees its next non-empty bin
+    signature = [0] * num_permutations
+    next_value = next_position = 0
+    for position in range(2 * num_permutations - 1, -1, -1):
+        index = position % num_permutations
+        if bins[index] is not None:
+            next_value, next_position = bins[index], position
+        if position < num_permutations:
+            signature[index] = next_value + (next_position - position) * _UINT32
+    return tuple(signature)
+
+
+def estimated_jaccard(signature1: tuple[int, ...], signature2: tuple[int, ...]) -> float:
+    """Estimate shingle-set Jaccard similarity from two MinHash signatures."""
+    return sum(map(operator.eq, signature1, signature2)) / len(signature1)
+
+
+def _is_similar(head: str, candidate: str, threshold: float) -> bool:
+    """Exact similarity check, with cheap upper bounds tried first."""
+    if head == candidate:
+        return True
+    total = len(head) + len(candidate)
+    # ratio() can never exceed 2 * min(len) / total
+    if 2 * min(len(head), len(candidate)) / total < threshold:
+        return False
+    matcher = SequenceMatcher(None, head, candidate)
+    return matcher.real_quick_ratio() >= threshold and matcher.quick_ratio() >= threshold and (
+        matcher.ratio() >= threshold
+    )
+
+
+def group_similar_code(
+    codes: list[str],
+    normalize: Callable[[str], str],
+    similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+    exact_max_blocks: int = EXACT_COMPARISON_MAX_BLOCKS,
+) -> list[list[int]]:
+    """
+    Group indices of near-duplicate code strings.
+
+    Grouping is greedy in input order, like the original pairwise pass: the first
+    ungrouped block starts a group and absorbs every later ungrouped block whose
+    normalized similarity to it is at or above the threshold.
+
+    Args:
+        codes: Code strings to group
+        normalize: Normalization applied once per block before comparison
+        similarity_threshold: SequenceMatcher ratio needed to treat blocks as duplicates
+        exact_max_blocks: Up to this many blocks, compare all pairs instead of using LSH
+
+    Returns:
+        Groups of indices into ``codes``, ordered by their first member
+    """
+    normalized = [normalize(code) for code in codes]
+    count = len(normalized)
+
+    buckets: dict[tuple, list[int]] | None = None
+    band_keys: list[list[tuple]] = []
+    signatures: list[tuple[int, ...]] = []
+    if count > exact_max_blocks:
+        signatures = [minhash_signature(_shingle_hashes(text)) for text in normalized]
+        rows = NUM_PERMUTATIONS // NUM_BANDS
+        band_keys = [
+            [(band, signature[band * rows : (band + 1) * rows]) for band in range(NUM_BANDS)]
+            for signature in signatures
+        ]
+        buckets = defaultdict(list)
+        for index, keys in enumerate(band_keys):
+            for key in keys:
+                buckets[key].append(index)
+
+    groups: list[list[int]] = []
+    grouped = [False] * count
+    for i in range(count):
+        if grouped[i]:
+            continue
+        group = [i]
+        grouped[i] = True
+
+        if buckets is None:
+            later = range(i + 1, count)
+        else:
+            # Candidates are resolved lazily so blocks already grouped are never revisited
+            later = sorted(
+                j
+                for j in {j for key in band_keys[i] for j in buckets[key] if j > i and not grouped[j]}
+                if estimated_jaccard(signatures[i], signatures[j]) >= MIN_ESTIMATED_JACCARD
+            )
+
+        for j in later:
+            if not grouped[j] and _is_similar(normalized[i], normalized[j], similarity_threshold):
+                group.append(j)
+                grouped[j] = True
+        groups.append(group)
+
+    return groups
@@ -11,13 +11,13 @@ import re
 import time
 from collections import defaultdict, deque
 from collections.abc import Callable
-from difflib import SequenceMatcher
+from contextlib import asynccontextmanager
 from typing import Any
 from urllib.parse import urlparse
 
 from supabase import Client
 
-from ...config.logfire_config import search_logger
+from ...config.logfire_config import safe_span, search_logger
 from ..credential_service import credential_service
 from ..embeddings.contextual_embedding_service import generate_contextual_embeddings_batch
 from ..embeddings.embedding_service import create_embeddings_batch
@@ -28,6 +28,9 @@ from ..llm_provider_service import (
     prepare_chat_completion_params,
     synthesize_json_from_reasoning,
 )
+from ..search.rag_result_cache import bump_index_generation
+from ..threading_service import get_threading_service
+from .code_deduplication import group_similar_code
 
 
 def _extract_json_payload(raw_response: str, context_code: str = "", language: str = "") -> str:
@@ -156,27 +159,6 @@ def _normalize_code_for_comparison(code: str) -> str:
     return normalized
 
 
-def _calculate_code_similarity(code1: str, code2: str) -> float:
-    """
-    Calculate similarity between two code strings using normalized comparison.
-
-    Args:
-        code1: First code string
-        code2: Second code string
-
-    Returns:
-        Similarity ratio between 0.0 and 1.0
-    """
-    # Normalize both code strings for comparison
-    norm1 = _normalize_code_for_comparison(code1)
-    norm2 = _normalize_code_for_comparison(code2)
-
-    # Use difflib's SequenceMatcher for similarity calculation
-    similarity = SequenceMatcher(None, norm1, norm2).ratio()
-
-    return similarity
-
-
 def _select_best_code_variant(similar_blocks: list[dict[str, Any]]) -> dict[str, Any]:
     """
     Select the best variant from a list of similar code blocks.
@@ -236,13 +218,17 @@ def _select_best_code_variant(similar_blocks: list[dict[str, Any]]) -> dict[str,
 
 
 
-def extract_code_blocks(markdown_content: str, min_length: int = None) -> list[dict[str, Any]]:
+def extract_code_blocks(
+    markdown_content: str, min_length: int = None, settings: dict[str, Any] | None = None
+) -> list[dict[str, Any]]:
     """
     Extract code blocks from markdown content along with context.
 
     Args:
         markdown_content: The markdown content to extract code blocks from
         min_length: Minimum length of code blocks to extract (default: from settings or 250)
+        settings: Optional settings snapshot that takes precedence over the credential
+            cache (worker processes have no credential cache)
 
     Returns:
         List of dictionaries containing code blocks and their context
@@ -250,6 +236,8 @@ def extract_code_blocks(markdown_content: str, min_length: int = None) -> list[d
     # Load all code extraction settings with direct fallback
     try:
         def _get_setting_fallback(key: str, default: str) -> str:
+            if settings and key in settings:
+                return str(settings[key])
             if credential_service._cache_initialized and key in credential_service._cache:
                 return credential_service._cache[key]
             return os.getenv(key, default)
@@ -531,34 +519,16 @@ def extract_code_blocks(markdown_content: str, min_length: int = None) -> list[d
 
     search_logger.debug(f"Starting deduplication process for {len(code_blocks)} code blocks")
 
-    # Group similar code blocks together
-    similarity_threshold = 0.85  # 85% similarity threshold
-    grouped_blocks = []
-    processed_indices = set()
-
-    for i, block1 in enumerate(code_blocks):
-        if i in processed_indices:
-            continue
-
-        # Start a new group with this block
-        similar_group = [block1]
-        processed_indices.add(i)
-
-        # Find all similar blocks
-        for j, block2 in enumerate(code_blocks):
-            if j <= i or j in processed_indices:
-                continue
-
-            similarity = _calculate_code_similarity(block1["code"], block2["code"])
-
-            if similarity >= similarity_threshold:
-                similar_group.append(block2)
-                processed_indices.add(j)
-                search_logger.debug(f"Found similar code blocks with {similarity:.2f} similarity")
+    # Group similar code blocks together (each block is normalized once; large inputs use
+    # MinHash/LSH candidate buckets instead of comparing every pair)
+    groups = group_similar_code(
+        [block["code"] for block in code_blocks],
+        normalize=_normalize_code_for_comparison,
+        similarity_threshold=0.85,  # 85% similarity threshold
+    )
 
-        # Select the best variant from the similar group
-        best_variant = _select_best_code_variant(similar_group)
-        grouped_blocks.append(best_variant)
+    # Select the best variant from each similar group
+    grouped_blocks = [_select_best_code_variant([code_blocks[i] for i in group]) for group in groups]
 
     deduplicated_count = len(code_blocks) - len(grouped_blocks)
     if deduplicated_count > 0:
@@ -591,15 +561,32 @@ def generate_code_example_summary(
     return asyncio.run(_generate_code_example_summary_async(code, context_before, context_after, language, provider))
 
 
+@asynccontextmanager
+async def _shared_client(client: Any):
+    """Yield an already-open LLM client without taking ownership of it."""
+    yield client
+
+
 async def _generate_code_example_summary_async(
-    code: str, context_before: str, context_after: str, language: str = "", provider: str = None
+    code: str,
+    context_before: str,
+    context_after: str,
+    language: str = "",
+    provider: str = None,
+    client: Any = None,
+    model_choice: str | None = None,
 ) -> dict[str, str]:
     """
     Async version of generate_code_example_summary using unified LLM provider service.
+
+    Args:
+        client: Optional open LLM client to reuse (batch callers share one client)
+        model_choice: Optional pre-resolved model name
     """
 
     # Get model choice from credential service (RAG setting)
-    model_choice = await _get_model_choice()
+    if model_choice is None:
+        model_choice = await _get_model_choice()
 
     # If provider is not specified, get it from credential service
     if provider is None:
@@ -648,8 +635,9 @@ Format your response as JSON:
     )
 
     try:
-        # Use unified LLM provider service
-        async with get_llm_client(provider=provider) as client:
+        # Use unified LLM provider service (or the caller's shared client)
+        client_context = _shared_client(client) if client is not None else get_llm_client(provider=provider)
+        async with client_context as client:
             search_logger.info(
                 f"Generating summary for {hash(code) & 0xffffff:06x} using model: {model_choice}"
             )
@@ -967,12 +955,131 @@ Format your response as JSON:
         }
 
 
+def _fallback_summary(language: str = "") -> dict[str, str]:
+    return {
+        "example_name": f"Code Example{f' ({language})' if language else ''}",
+        "summary": "Code example for demonstration purposes.",
+    }
+
+
+def _get_code_summary_setting(key: str, default: int) -> int:
+    """Read an integer code summary setting from the credential cache or environment."""
+    try:
+        if credential_service._cache_initialized and key in credential_service._cache:
+            return int(credential_service._cache[key])
+        return int(os.getenv(key, str(default)))
+    except (TypeError, ValueError):
+        return default
+
+
+def _estimate_summary_tokens(blocks: list[dict[str, Any]]) -> int:
+    """Rough token estimate for the rate limiter (prompt is truncated to ~2,500 chars per block)."""
+    prompt_chars = sum(
+        min(len(block.get("code", "")), 1500)
+        + min(len(block.get("context_before", "")), 500)
+        + min(len(block.get("context_after", "")), 500)
+        for block in blocks
+    )
+    return prompt_chars // 4 + 300 * len(blocks)
+
+
+async def _generate_code_summaries_multi(
+    blocks: list[dict[str, Any]], client: Any, model_choice: str, provider: str
+) -> list[dict[str, str] | None]:
+    """
+    Summarize several code blocks with a single chat completion.
+
+    Returns:
+        One summary per block, or None for blocks the response did not cover
+        (callers fall back to single-block requests for those).
+    """
+    sections = []
+    for index, block in enumerate(blocks):
+        context_before = block.get("context_before", "")
+        context_after = block.get("context_after", "")
+        code = block.get("code", "")
+        sections.append(
+            f"""<example index="{index}">
+<context_before>
+{context_before[-500:]}
+</context_before>
+<code_example language="{block.get("language", "")}">
+{code[:1500]}
+</code_example>
+<context_after>
+{context_after[:500]}
+</context_after>
+</example>"""
+        )
+
+    prompt = (
+        "\n\n".join(sections)
+        + f"""
+
+For EACH of the {len(blocks)} code examples above, based on the code and its surrounding context, provide:
+1. A concise, action-oriented name (1-4 words) that describes what the code DOES (e.g. "Parse JSON Response", "Connect PostgreSQL")
+2. A summary (2-3 sentences) that describes what the code example demonstrates and its purpose
+
+Respond with JSON only, in exactly this format:
+{{
+  "summaries": [
+    {{"index": 0, "example_name": "Action-oriented name", "summary": "2-3 sentence description"}}
+  ]
+}}
+"""
+    )
+
+    request_params = {
+        "model": model_choice,
+        "messages": [
+            {
+                "role": "system",
+                "content": "You are a helpful assistant that analyzes code examples and provides JSON responses with example names and summaries.",
+            },
+            {"role": "user", "content": prompt},
+        ],
+        "max_tokens": 400 * len(blocks) + 200,
+        "temperature": 0.3,
+    }
+    if provider.lower() in {"openai", "google", "anthropic"}:
+        request_params["response_format"] = {"type": "json_object"}
+
+    response = await client.chat.completions.create(
+        **prepare_chat_completion_params(model_choice, request_params)
+    )
+    choice = response.choices[0] if response.choices else None
+    content = extract_message_text(choice)[0] if choice else ""
+
+    results: list[dict[str, str] | None] = [None] * len(blocks)
+    try:
+        payload = json.loads(_extract_json_payload(content or ""))
+    except json.JSONDecodeError:
+        search_logger.warning("Multi-block summary response was not valid JSON; falling back per block")
+        return results
+
+    entries = payload.get("summaries", []) if isinstance(payload, dict) else []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            index = int(entry.get("index"))
+        except (TypeError, ValueError):
+            continue
+        if 0 <= index < len(blocks) and entry.get("example_name") and entry.get("summary"):
+            results[index] = {"example_name": entry["example_name"], "summary": entry["summary"]}
+    return results
+
+
 async def generate_code_summaries_batch(
     code_blocks: list[dict[str, Any]], max_workers: int = None, progress_callback=None, provider: str = None
 ) -> list[dict[str, str]]:
     """
     Generate summaries for multiple code blocks with rate limiting and proper worker management.
 
+    All requests share one LLM client on the current event loop and are paced by the
+    ThreadingService rate limiter. When CODE_SUMMARY_BLOCKS_PER_REQUEST > 1, several
+    blocks are packed into one prompt.
+
     Args:
         code_blocks: List of code block dictionaries
         max_workers: Maximum number of concurrent API requests
@@ -987,98 +1094,124 @@ async def generate_code_summaries_batch(
 
     # Get max_workers from settings if not provided
     if max_workers is None:
-        try:
-            if (
-                credential_service._cache_initialized
-                and "CODE_SUMMARY_MAX_WORKERS" in credential_service._cache
-            ):
-                max_workers = int(credential_service._cache["CODE_SUMMARY_MAX_WORKERS"])
-            else:
-                max_workers = int(os.getenv("CODE_SUMMARY_MAX_WORKERS", "3"))
-        except:
-            max_workers = 3  # Default fallback
+        max_workers = _get_code_summary_setting("CODE_SUMMARY_MAX_WORKERS", 3)
+    max_workers = max(1, max_workers)
+    blocks_per_request = max(1, _get_code_summary_setting("CODE_SUMMARY_BLOCKS_PER_REQUEST", 1))
 
     search_logger.info(
-        f"Generating summaries for {len(code_blocks)} code blocks with max_workers={max_workers}"
+        f"Generating summaries for {len(code_blocks)} code blocks with max_workers={max_workers}, "
+        f"blocks_per_request={blocks_per_request}"
     )
 
-    # Semaphore to limit concurrent requests
-    semaphore = asyncio.Semaphore(max_workers)
+    total = len(code_blocks)
+    summaries: list[dict[str, str] | None] = [None] * total
     completed_count = 0
     lock = asyncio.Lock()
+    semaphore = asyncio.Semaphore(max_workers)
+    threading_service = get_threading_service()
+    start_time = time.perf_counter()
+
+    def blocks_per_second() -> float:
+        elapsed = time.perf_counter() - start_time
+        return round(completed_count / elapsed, 2) if elapsed > 0 else 0.0
+
+    with safe_span(
+        "generate_code_summaries_batch",
+        total_blocks=total,
+        max_workers=max_workers,
+        blocks_per_request=blocks_per_request,
+    ) as span:
+        try:
+            if provider is None:
+                try:
+                    provider_config = await credential_service.get_active_provider("llm")
+                    provider = provider_config.get("provider", "openai")
+                except Exception as e:
+                    search_logger.warning(f"Failed to get provider from credential service: {e}, defaulting to openai")
+                    provider = "openai"
+            model_choice = await _get_model_choice()
+
+            async with get_llm_client(provider=provider) as client:
+
+                async def summarize_group(indices: list[int]) -> None:
+                    nonlocal completed_count
+                    group = [code_blocks[i] for i in indices]
+                    async with semaphore:
+                        results: list[dict[str, str] | None] = [None] * len(group)
+                        if len(group) > 1:
+                            # Only a packed request takes a slot for the whole group
+                            async with threading_service.rate_limited_operation(_estimate_summary_tokens(group)):
+                                try:
+                                    results = await _generate_code_summaries_multi(
+                                        group, client, model_choice, provider
+                                    )
+                                except Exception as e:
+                                    search_logger.warning(f"Multi-block summary request failed: {e}")
+
+                        # Single blocks, and blocks the packed response did not cover, get individual requests
+                        for offset, result in enumerate(results):
+                            if result is None:
+                                block = group[offset]
+                                async with threading_service.rate_limited_operation(
+                                    _estimate_summary_tokens([block])
+                                ):
+                                    result = await _generate_code_example_summary_async(
+                                        block["code"],
+                                        block["context_before"],
+                                        block["context_after"],
+                                        block.get("language", ""),
+                                        provider,
+                                        client=client,
+                                        model_choice=model_choice,
+                                    )
+                            summaries[indices[offset]] = result
+
+                    # Update progress
+                    async with lock:
+                        completed_count += len(group)
+                        if progress_callback:
+                            # Simple progress based on summaries completed
+                            progress_percentage = int((completed_count / total) * 100)
+                            await progress_callback({
+                                "status": "code_extraction",
+                                "percentage": progress_percentage,
+                                "log": f"Generated {completed_count}/{total} code summaries",
+                                "completed_summaries": completed_count,
+                                "total_summaries": total,
+                                "blocks_per_second": blocks_per_second(),
+                            })
+
+                groups = [
+                    list(range(i, min(i + blocks_per_request, total)))
+                    for i in range(0, total, blocks_per_request)
+                ]
+                outcomes = await asyncio.gather(
+                    *[summarize_group(group) for group in groups], return_exceptions=True
+                )
+                for group, outcome in zip(groups, outcomes, strict=True):
+                    if isinstance(outcome, Exception):
+                        search_logger.error(f"Error generating summaries for code blocks {group}: {outcome}")
 
-    async def generate_single_summary_with_limit(block: dict[str, Any]) -> dict[str, str]:
-        nonlocal completed_count
-        async with semaphore:
-            # Add delay between requests to avoid rate limiting
-            await asyncio.sleep(0.5)  # 500ms delay between requests
-
-            # Run the synchronous function in a thread
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                generate_code_example_summary,
-                block["code"],
-                block["context_before"],
-                block["context_after"],
-                block.get("language", ""),
-                provider,
-            )
-
-            # Update progress
-            async with lock:
-                completed_count += 1
-                if progress_callback:
-                    # Simple progress based on summaries completed
-                    progress_percentage = int((completed_count / len(code_blocks)) * 100)
-                    await progress_callback({
-                        "status": "code_extraction",
-                        "percentage": progress_percentage,
-                        "log": f"Generated {completed_count}/{len(code_blocks)} code summaries",
-                        "completed_summaries": completed_count,
-                        "total_summaries": len(code_blocks),
-                    })
-
-            return result
-
-    # Process all blocks concurrently but with rate limiting
-    try:
-        summaries = await asyncio.gather(
-            *[generate_single_summary_with_limit(block) for block in code_blocks],
-            return_exceptions=True,
+        except Exception as e:
+            search_logger.error(f"Error in batch summary generation: {e}")
+            span.set_attribute("error", str(e))
+
+        # Any block without a summary (errors, cancelled groups) gets a fallback
+        final_summaries = [
+            summary if summary is not None else _fallback_summary(code_blocks[i].get("language", ""))
+            for i, summary in enumerate(summaries)
+        ]
+
+        elapsed = time.perf_counter() - start_time
+        throughput = round(total / elapsed, 2) if elapsed > 0 else 0.0
+        span.set_attribute("elapsed_seconds", round(elapsed, 3))
+        span.set_attribute("blocks_per_second", throughput)
+        search_logger.info(
+            f"Successfully generated {len(final_summaries)} code summaries in {elapsed:.1f}s "
+            f"({throughput} blocks/sec)"
         )
-
-        # Handle any exceptions in the results
-        final_summaries = []
-        for i, summary in enumerate(summaries):
-            if isinstance(summary, Exception):
-                search_logger.error(f"Error generating summary for code block {i}: {summary}")
-                # Use fallback summary
-                language = code_blocks[i].get("language", "")
-                fallback = {
-                    "example_name": f"Code Example{f' ({language})' if language else ''}",
-                    "summary": "Code example for demonstration purposes.",
-                }
-                final_summaries.append(fallback)
-            else:
-                final_summaries.append(summary)
-
-        search_logger.info(f"Successfully generated {len(final_summaries)} code summaries")
         return final_summaries
 
-    except Exception as e:
-        search_logger.error(f"Error in batch summary generation: {e}")
-        # Return fallback summaries for all blocks
-        fallback_summaries = []
-        for block in code_blocks:
-            language = block.get("language", "")
-            fallback = {
-                "example_name": f"Code Example{f' ({language})' if language else ''}",
-                "summary": "Code example for demonstration purposes.",
-            }
-            fallback_summaries.append(fallback)
-        return fallback_summaries
-
 
 async def add_code_examples_to_supabase(
     client: Client,
@@ -1109,11 +1242,18 @@ async def add_code_examples_to_supabase(
     if not urls:
         return
 
+    # Every write outdates cached RAG results for these sources
+    source_ids = {
+        (metadata or {}).get("source_id") or urlparse(url).netloc or urlparse(url).path
+        for url, metadata in zip(urls, metadatas, strict=False)
+    }
+
     # Delete existing records for these URLs
     unique_urls = list(set(urls))
     for url in unique_urls:
         try:
-            client.table("archon_code_examples").delete().eq("url", url).execute()
+            await asyncio.to_thread(client.table("archon_code_examples").delete().eq("url", url).execute)
+            bump_index_generation(source_ids)
         except Exception as e:
             search_logger.error(f"Error deleting existing code examples for {url}: {e}")
 
@@ -1294,7 +1434,8 @@ async def add_code_examples_to_supabase(
 
         for retry in range(max_retries):
             try:
-                client.table("archon_code_examples").insert(batch_data).execute()
+                await asyncio.to_thread(client.table("archon_code_examples").insert(batch_data).execute)
+                bump_index_generation({record["source_id"] for record in batch_data})
                 # Success - break out of retry loop
                 break
             except Exception as e:
@@ -1313,7 +1454,8 @@ async def add_code_examples_to_supabase(
                     successful_inserts = 0
                     for record in batch_data:
                         try:
-                            client.table("archon_code_examples").insert(record).execute()
+                            await asyncio.to_thread(client.table("archon_code_examples").insert(record).execute)
+                            bump_index_generation([record["source_id"]])
                             successful_inserts += 1
                         except Exception as individual_error:
                             search_logger.error(
@@ -11,6 +11,7 @@ from typing import Any
 from ...config.logfire_config import safe_span, search_logger
 from ..embeddings.contextual_embedding_service import generate_contextual_embeddings_batch
 from ..embeddings.embedding_service import create_embeddings_batch
+from ..search.rag_result_cache import bump_index_generation
 
 
 async def add_documents_to_supabase(
@@ -25,6 +26,7 @@ async def add_documents_to_supabase(
     enable_parallel_batches: bool = True,
     provider: str | None = None,
     cancellation_check: Any | None = None,
+    replace_existing: bool = True,
 ) -> dict[str, int]:
     """
     Add documents to Supabase with threading optimizations.
@@ -41,6 +43,8 @@ async def add_documents_to_supabase(
         batch_size: Size of each batch for insertion
         progress_callback: Optional async callback function for progress reporting
         provider: Optional provider override for embeddings
+        replace_existing: Delete all existing rows for these URLs first. Incremental
+            refreshes pass False after deleting only the chunks they replace.
     """
     with safe_span(
         "add_documents_to_supabase", total_documents=len(contents), batch_size=batch_size
@@ -77,7 +81,9 @@ async def add_documents_to_supabase(
             # enable_parallel = True
 
         # Get unique URLs to delete existing records
-        unique_urls = list(set(urls))
+        unique_urls = list(set(urls)) if replace_existing else []
+        # Every write outdates cached RAG results for these sources
+        source_ids = {metadata.get("source_id") for metadata in metadatas if metadata and metadata.get("source_id")}
 
         # Delete existing records for these URLs in batches
         try:
@@ -100,7 +106,10 @@ async def add_documents_to_supabase(
                             raise
 
                     batch_urls = unique_urls[i : i + delete_batch_size]
-                    client.table("archon_crawled_pages").delete().in_("url", batch_urls).execute()
+                    await asyncio.to_thread(
+                        client.table("archon_crawled_pages").delete().in_("url", batch_urls).execute
+                    )
+                    bump_index_generation(source_ids)
                     # Yield control to allow other async operations
                     if i + delete_batch_size < len(unique_urls):
                         await asyncio.sleep(0.05)  # Reduced pause between delete batches
@@ -130,7 +139,10 @@ async def add_documents_to_supabase(
 
                 batch_urls = unique_urls[i : i + fallback_batch_size]
                 try:
-                    client.table("archon_crawled_pages").delete().in_("url", batch_urls).execute()
+                    await asyncio.to_thread(
+                        client.table("archon_crawled_pages").delete().in_("url", batch_urls).execute
+                    )
+                    bump_index_generation(source_ids)
                     await asyncio.sleep(0.05)  # Rate limit to prevent overwhelming
                 except Exception as inner_e:
                     search_logger.error(
@@ -157,6 +169,16 @@ async def add_documents_to_supabase(
         completed_batches = 0
         total_batches = (len(contents) + batch_size - 1) // batch_size
         total_chunks_stored = 0
+        embedding_cache_hits = 0
+        embedding_cache_misses = 0
+
+        def embedding_cache_stats() -> dict[str, Any]:
+            lookups = embedding_cache_hits + embedding_cache_misses
+            return {
+                "embedding_cache_hits": embedding_cache_hits,
+                "embedding_cache_misses": embedding_cache_misses,
+                "embedding_cache_hit_rate": round(embedding_cache_hits / lookups, 4) if lookups else 0.0,
+            }
 
         # Process in batches to avoid memory issues
         for batch_num, i in enumerate(range(0, len(contents), batch_size), 1):
@@ -317,6 +339,9 @@ async def add_documents_to_supabase(
                 progress_callback=wrapper_func if progress_callback else None
             )
 
+            embedding_cache_hits += result.cache_hits
+            embedding_cache_misses += result.cache_misses
+
             # Log any failures
             if result.has_failures:
                 search_logger.error(
@@ -434,7 +459,10 @@ async def add_documents_to_supabase(
                         raise
 
                 try:
-                    client.table("archon_crawled_pages").insert(batch_data).execute()
+                    await asyncio.to_thread(
+                        client.table("archon_crawled_pages").insert(batch_data).execute
+                    )
+                    bump_index_generation(source_ids)
                     total_chunks_stored += len(batch_data)
 
                     # Increment completed batches and report simple progress
@@ -458,6 +486,7 @@ async def add_documents_to_supabase(
                         "current_batch": batch_num,
                         "chunks_processed": len(batch_data),
                         "active_workers": max_workers if use_contextual_embeddings else 1,
+                        **embedding_cache_stats(),
                     }
                     await report_progress(complete_msg, new_progress, batch_info)
                     break
@@ -492,7 +521,10 @@ async def add_documents_to_supabase(
                                     raise
 
                             try:
-                                client.table("archon_crawled_pages").insert(record).execute()
+                                await asyncio.to_thread(
+                                    client.table("archon_crawled_pages").insert(record).execute
+                                )
+                                bump_index_generation(source_ids)
                                 successful_inserts += 1
                                 total_chunks_stored += 1
                             except Exception as individual_error:
@@ -524,6 +556,7 @@ async def add_documents_to_supabase(
                     total_batches=total_batches,
                     current_batch=total_batches,
                     chunks_processed=len(contents),
+                    **embedding_cache_stats(),
                     # DON'T send 'status': 'completed' - that's for the orchestration service only!
                 )
                 search_logger.info("DEBUG document_storage final 100% sent successfully")
@@ -533,5 +566,8 @@ async def add_documents_to_supabase(
         span.set_attribute("success", True)
         span.set_attribute("total_processed", len(contents))
         span.set_attribute("total_stored", total_chunks_stored)
+        cache_stats = embedding_cache_stats()
+        span.set_attribute("embedding_cache_hits", cache_stats["embedding_cache_hits"])
+        span.set_attribute("embedding_cache_hit_rate", cache_stats["embedding_cache_hit_rate"])
 
-        return {"chunks_stored": total_chunks_stored}
+        return {"chunks_stored": total_chunks_stored, **cache_stats}
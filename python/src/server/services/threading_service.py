@@ -9,11 +9,14 @@ Based on proven patterns from crawl4ai_mcp.py architecture.
 
 import asyncio
 import gc
+import multiprocessing
+import os
 import threading
 import time
 from collections import deque
 from collections.abc import Callable
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 
@@ -70,6 +73,8 @@ class ThreadingConfig:
     batch_size: int = 15
     yield_interval: float = 0.1  # How often to yield control to event loop
     health_check_interval: float = 30  # System health check frequency
+    # Worker processes for pure-CPU stages (chunking, code extraction); 0 runs them in threads
+    process_workers: int = field(default_factory=lambda: min(4, os.cpu_count() or 1))
 
 
 class RateLimiter:
@@ -422,6 +427,9 @@ class ThreadingService:
         self.io_executor = ThreadPoolExecutor(
             max_workers=self.config.max_workers * 2, thread_name_prefix="archon-io"
         )
+        # Created on first use so importing the service never forks
+        self.process_executor: ProcessPoolExecutor | None = None
+        self._process_lock = threading.Lock()
 
         self._running = False
         self._health_check_task = None
@@ -452,6 +460,7 @@ class ThreadingService:
         # Shutdown thread pools
         self.cpu_executor.shutdown(wait=True)
         self.io_executor.shutdown(wait=True)
+        self.shutdown_process_pool()
 
         logfire_logger.info("Threading service stopped")
 
@@ -483,6 +492,65 @@ class ThreadingService:
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(self.cpu_executor, func, *args, **kwargs)
 
+    def configure_process_pool(self, workers: int) -> None:
+        """
+        Set the number of worker processes for CPU-bound stages.
+
+        An existing pool with a different size is shut down and recreated on next use.
+        0 disables the process pool; work then runs in the CPU thread pool.
+        """
+        workers = max(0, workers)
+        if workers == self.config.process_workers:
+            return
+        self.config.process_workers = workers
+        self.shutdown_process_pool(wait=False)
+        logfire_logger.info("Process pool configured", extra={"process_workers": workers})
+
+    def _get_process_executor(self) -> ProcessPoolExecutor | None:
+        """Get the process pool, creating it on first use."""
+        if self.config.process_workers <= 0:
+            return None
+        with self._process_lock:
+            if self.process_executor is None:
+                # spawn: forking a process that runs the event loop, the crawler and DB
+                # connection threads can deadlock the child on inherited locks
+                self.process_executor = ProcessPoolExecutor(
+                    max_workers=self.config.process_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                logfire_logger.info(
+                    "Process pool started", extra={"process_workers": self.config.process_workers}
+                )
+            return self.process_executor
+
+    def shutdown_process_pool(self, wait: bool = True) -> None:
+        """Shut down the process pool (recreated on next use)."""
+        with self._process_lock:
+            executor, self.process_executor = self.process_executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    async def run_in_process_pool(self, func: Callable, *args) -> Any:
+        """
+        Run a pure-CPU function in a worker process.
+
+        The function and its arguments must be picklable (module-level function, plain
+        data). Falls back to the CPU thread pool when the process pool is disabled or
+        a worker process died.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_process_executor()
+        if executor is not None:
+            try:
+                return await loop.run_in_executor(executor, func, *args)
+            except BrokenProcessPool:
+                logfire_logger.warning("Process pool broken, recreating it and retrying in a thread")
+                with self._process_lock:
+                    if self.process_executor is executor:
+                        self.process_executor = None
+                executor.shutdown(wait=False, cancel_futures=True)
+        return await loop.run_in_executor(self.cpu_executor, func, *args)
+
     async def run_io_bound(self, func: Callable, *args, **kwargs) -> Any:
         """Run I/O-bound function in thread pool"""
         loop = asyncio.get_event_loop()
@@ -577,6 +645,28 @@ async def start_threading_service() -> ThreadingService:
     return service
 
 
+async def configure_process_pool_from_settings() -> int:
+    """
+    Size the global process pool from the CPU_PROCESS_POOL_SIZE rag_strategy setting.
+
+    Returns:
+        The configured number of worker processes (0 = CPU stages run in threads)
+    """
+    service = get_threading_service()
+    try:
+        from .credential_service import credential_service
+
+        settings = await credential_service.get_credentials_by_category("rag_strategy")
+        raw_value = settings.get("CPU_PROCESS_POOL_SIZE")
+        if raw_value not in (None, ""):
+            service.configure_process_pool(int(raw_value))
+    except (TypeError, ValueError) as e:
+        logfire_logger.warning(f"Invalid CPU_PROCESS_POOL_SIZE, keeping {service.config.process_workers}: {e}")
+    except Exception as e:
+        logfire_logger.warning(f"Failed to load process pool settings: {e}")
+    return service.config.process_workers
+
+
 async def stop_threading_service():
     """Stop the global threading service"""
     global _threading_service
@@ -0,0 +1,66 @@
+"""Encode large JSON lists once and stream them, with an ETag of the encoding."""
+
+import hashlib
+import json
+from collections.abc import AsyncIterator, Iterable
+from typing import Any
+
+from fastapi.responses import StreamingResponse
+
+# Bytes of encoded items sent per body chunk
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class EncodedJSONList:
+    """A list whose items were each serialized exactly once."""
+
+    def __init__(self, items: Iterable[Any]):
+        """
+        Encode the items and hash the encoding.
+
+        Args:
+            items: JSON-serializable items (non-JSON values are encoded with str())
+        """
+        digest = hashlib.md5()
+        self.chunks: list[bytes] = []
+        for item in items:
+            chunk = json.dumps(item, sort_keys=True, default=str).encode("utf-8")
+            digest.update(chunk)
+            digest.update(b"\n")
+            self.chunks.append(chunk)
+        self.etag = f'"{digest.hexdigest()}"'
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    @property
+    def size_bytes(self) -> int:
+        """Encoded size of the items."""
+        return sum(len(chunk) for chunk in self.chunks) + max(len(self.chunks) - 1, 0)
+
+    def response(self, key: str, extra: dict[str, Any] | None = None, headers: dict[str, str] | None = None):
+        """
+        Stream ``{key: [items...], **extra}`` without re-encoding the items.
+
+        Args:
+            key: Field holding the list
+            extra: Further (small) top-level fields
+            headers: Response headers
+        """
+        chunks = self.chunks
+        tail = json.dumps(extra or {}, default=str).encode("utf-8")[1:]
+
+        async def body() -> AsyncIterator[bytes]:
+            buffer = bytearray(json.dumps(key).encode("utf-8").join([b"{", b":["]))
+            for index, chunk in enumerate(chunks):
+                if index:
+                    buffer += b","
+                buffer += chunk
+                if len(buffer) >= STREAM_CHUNK_SIZE:
+                    yield bytes(buffer)
+                    buffer.clear()
+            buffer += b"]"
+            buffer += tail if tail == b"}" else b"," + tail
+            yield bytes(buffer)
+
+        return StreamingResponse(body(), media_type="application/json", headers=headers)
@@ -3,6 +3,20 @@ Progress Tracking Utilities
 
 Provides utilities for tracking and broadcasting progress updates.
 """
+from .progress_store import (
+    MemoryProgressStore,
+    PostgresProgressStore,
+    ProgressStore,
+    SQLiteProgressStore,
+    create_progress_store,
+)
 from .progress_tracker import ProgressTracker
 
-__all__ = ['ProgressTracker']
+__all__ = [
+    "ProgressTracker",
+    "ProgressStore",
+    "MemoryProgressStore",
+    "SQLiteProgressStore",
+    "PostgresProgressStore",
+    "create_progress_store",
+]
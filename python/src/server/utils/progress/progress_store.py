@@ -0,0 +1,310 @@
+"""
+Progress Store
+
+Backends that make progress state visible to every uvicorn worker.
+
+ProgressTracker always keeps states in a process-local dict, which is all a single
+worker needs. With several workers the state of an operation lives in the worker that
+runs it, so it is also written to a shared store selected by ``PROGRESS_BACKEND``:
+
+- ``memory`` (default): process-local only
+- ``sqlite``: a SQLite file shared by the workers on one host (``PROGRESS_SQLITE_PATH``)
+- ``postgres``: the ``archon_progress`` table over the direct asyncpg connection
+  (``SUPABASE_DB_URL`` / ``DATABASE_URL``)
+
+Every write gets a new, increasing version. Each worker runs one ProgressSync task
+that pulls the changes past the last version it saw into its local dict, so the
+polling and streaming endpoints answer from memory whichever worker serves them.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from ...config.logfire_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_SQLITE_PATH = Path.home() / ".cache" / "archon" / "progress.sqlite3"
+DEFAULT_SYNC_INTERVAL = 0.25
+
+# Deleted states are kept this long so every worker sees the deletion
+TOMBSTONE_TTL_SECONDS = 600
+# States not written for this long belong to workers that died mid-operation
+STALE_STATE_TTL_SECONDS = 24 * 3600
+
+# A change as seen by other workers: (progress_id, state or None once deleted, version)
+ProgressChange = tuple[str, dict[str, Any] | None, int]
+
+
+def _to_json_state(state: dict[str, Any]) -> dict[str, Any]:
+    """Copy a state into plain JSON types (progress kwargs can hold arbitrary values)."""
+    return json.loads(json.dumps(state, default=str))
+
+
+class ProgressStore(ABC):
+    """Shared storage for progress states."""
+
+    # Whether other processes can see what this store holds
+    shared = True
+
+    @abstractmethod
+    async def save(self, progress_id: str, state: dict[str, Any]) -> int:
+        """Write a state and return its new version."""
+
+    @abstractmethod
+    async def delete(self, progress_id: str) -> None:
+        """Delete a state (other workers drop it on their next sync)."""
+
+    @abstractmethod
+    async def changes_since(self, version: int) -> list[ProgressChange]:
+        """Return changes with a version greater than ``version``, oldest first."""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Release connections held by the store."""
+
+
+class MemoryProgressStore(ProgressStore):
+    """Process-local store: ProgressTracker's own dict is the only copy."""
+
+    shared = False
+
+    def __init__(self):
+        self._version = 0
+
+    async def save(self, progress_id: str, state: dict[str, Any]) -> int:
+        self._version += 1
+        return self._version
+
+    async def delete(self, progress_id: str) -> None:
+        return None
+
+    async def changes_since(self, version: int) -> list[ProgressChange]:
+        return []
+
+    async def close(self) -> None:
+        return None
+
+
+class SQLiteProgressStore(ProgressStore):
+    """Progress states in a SQLite file shared by the workers on one host."""
+
+    def __init__(self, path: str | Path = DEFAULT_SQLITE_PATH):
+        self.path = str(path)
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            # Autocommit mode; writes use explicit BEGIN IMMEDIATE so versions are
+            # assigned in commit order across processes
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS progress_states (
+                    progress_id TEXT PRIMARY KEY,
+                    state TEXT,
+                    version INTEGER NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_progress_states_version ON progress_states (version)")
+            self._conn = conn
+        return self._conn
+
+    def _write_sync(self, progress_id: str, state_json: str | None) -> int:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                version = conn.execute("SELECT COALESCE(MAX(version), 0) + 1 FROM progress_states").fetchone()[0]
+                conn.execute(
+                    "INSERT OR REPLACE INTO progress_states (progress_id, state, version, updated_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (progress_id, state_json, version, now),
+                )
+                if state_json is None:
+                    conn.execute(
+                        "DELETE FROM progress_states WHERE (state IS NULL AND updated_at < ?) OR updated_at < ?",
+                        (now - TOMBSTONE_TTL_SECONDS, now - STALE_STATE_TTL_SECONDS),
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return version
+
+    def _changes_since_sync(self, version: int) -> list[ProgressChange]:
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT progress_id, state, version FROM progress_states WHERE version > ? ORDER BY version",
+                (version,),
+            ).fetchall()
+        return [(row[0], json.loads(row[1]) if row[1] is not None else None, row[2]) for row in rows]
+
+    async def save(self, progress_id: str, state: dict[str, Any]) -> int:
+        return await asyncio.to_thread(self._write_sync, progress_id, json.dumps(state, default=str))
+
+    async def delete(self, progress_id: str) -> None:
+        await asyncio.to_thread(self._write_sync, progress_id, None)
+
+    async def changes_since(self, version: int) -> list[ProgressChange]:
+        return await asyncio.to_thread(self._changes_since_sync, version)
+
+    async def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class PostgresProgressStore(ProgressStore):
+    """Progress states in the ``archon_progress`` table (migration 010)."""
+
+    # Versions come from a sequence, so a lower version can commit after a higher one
+    # was read; changes this recent are re-read on every sync to close that gap
+    RECHECK_SECONDS = 5.0
+
+    def __init__(self, client):
+        self.client = client
+
+    async def save(self, progress_id: str, state: dict[str, Any]) -> int:
+        return await self.client.fetchval(
+            """
+            INSERT INTO archon_progress (progress_id, state)
+            VALUES ($1, $2)
+            ON CONFLICT (progress_id) DO UPDATE
+            SET state = EXCLUDED.state,
+                version = nextval('archon_progress_version_seq'),
+                updated_at = NOW()
+            RETURNING version
+            """,
+            progress_id,
+            _to_json_state(state),
+        )
+
+    async def delete(self, progress_id: str) -> None:
+        await self.client.execute(
+            """
+            UPDATE archon_progress
+            SET state = NULL, version = nextval('archon_progress_version_seq'), updated_at = NOW()
+            WHERE progress_id = $1
+            """,
+            progress_id,
+        )
+        await self.client.execute(
+            """
+            DELETE FROM archon_progress
+            WHERE (state IS NULL AND updated_at < NOW() - make_interval(secs => $1))
+               OR updated_at < NOW() - make_interval(secs => $2)
+            """,
+            float(TOMBSTONE_TTL_SECONDS),
+            float(STALE_STATE_TTL_SECONDS),
+        )
+
+    async def changes_since(self, version: int) -> list[ProgressChange]:
+        rows = await self.client.fetch(
+            """
+            SELECT progress_id, state, version FROM archon_progress
+            WHERE version > $1 OR updated_at > NOW() - make_interval(secs => $2)
+            ORDER BY version
+            """,
+            version,
+            self.RECHECK_SECONDS,
+        )
+        return [(row["progress_id"], row["state"], row["version"]) for row in rows]
+
+    async def close(self) -> None:
+        # The pool is shared with other services and closed on shutdown
+        return None
+
+
+def create_progress_store(backend: str | None = None) -> ProgressStore:
+    """
+    Create the store selected by ``PROGRESS_BACKEND``.
+
+    Falls back to the in-memory store (with a warning) when the postgres backend is
+    selected without a direct database connection.
+    """
+    backend = (backend or os.getenv("PROGRESS_BACKEND", "memory")).strip().lower()
+    if backend == "sqlite":
+        return SQLiteProgressStore(os.getenv("PROGRESS_SQLITE_PATH") or DEFAULT_SQLITE_PATH)
+    if backend == "postgres":
+        from ...services.async_db_client import get_async_db_client
+
+        client = get_async_db_client()
+        if client is not None:
+            return PostgresProgressStore(client)
+        logger.warning(
+            "PROGRESS_BACKEND=postgres needs SUPABASE_DB_URL or DATABASE_URL; progress stays in this worker"
+        )
+    elif backend != "memory":
+        logger.warning(f"Unknown PROGRESS_BACKEND {backend!r}; progress stays in this worker")
+    return MemoryProgressStore()
+
+
+class ProgressSync:
+    """Background task pulling other workers' progress changes into this worker."""
+
+    def __init__(
+        self,
+        store: ProgressStore,
+        apply_change: Callable[[str, dict[str, Any] | None, int], None],
+        interval: float = DEFAULT_SYNC_INTERVAL,
+    ):
+        self.store = store
+        self.apply_change = apply_change
+        self.interval = interval
+        self.version = 0
+        self._task: asyncio.Task | None = None
+        self._failing = False
+
+    async def sync_once(self) -> int:
+        """Apply pending changes and return how many were seen."""
+        changes = await self.store.changes_since(self.version)
+        for progress_id, state, version in changes:
+            self.apply_change(progress_id, state, version)
+            self.version = max(self.version, version)
+        return len(changes)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sync_once()
+                if self._failing:
+                    logger.info("Progress sync recovered")
+                self._failing = False
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if not self._failing:
+                    logger.warning(f"Progress sync failed, retrying: {e}")
+                self._failing = True
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
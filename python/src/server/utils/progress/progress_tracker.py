@@ -1,14 +1,28 @@
 """
 Progress Tracker Utility
 
-Tracks operation progress in memory for HTTP polling access.
+Tracks operation progress in memory for HTTP polling and streaming access.
+
+States written here are also published to the configured ProgressStore, and states
+published by other workers are synced back in, so any worker can serve any operation.
 """
 
 import asyncio
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Any
 
-from ...config.logfire_config import safe_logfire_error, safe_logfire_info
+from ...config.logfire_config import get_logger, safe_logfire_error, safe_logfire_info
+from .progress_store import (
+    DEFAULT_SYNC_INTERVAL,
+    MemoryProgressStore,
+    ProgressStore,
+    ProgressSync,
+    create_progress_store,
+)
+
+logger = get_logger(__name__)
 
 
 class ProgressTracker:
@@ -20,6 +34,20 @@ class ProgressTracker:
     # Class-level storage for all progress states
     _progress_states: dict[str, dict[str, Any]] = {}
 
+    # Local change counter per state, bumped on every local update or synced change
+    _versions: dict[str, int] = {}
+    _version_counter = 0
+    # Store versions of states synced from other workers, so older copies are ignored
+    _store_versions: dict[str, int] = {}
+    # States written by trackers in this worker; syncing never overwrites them
+    _owned: set[str] = set()
+    # Stream subscribers waiting for changes, per progress ID
+    _subscribers: dict[str, set[asyncio.Queue]] = {}
+
+    _store: ProgressStore = MemoryProgressStore()
+    _sync: ProgressSync | None = None
+    _store_failing = False
+
     def __init__(self, progress_id: str, operation_type: str = "crawl"):
         """
         Initialize the progress tracker.
@@ -38,8 +66,11 @@ class ProgressTracker:
             "progress": 0,
             "logs": [],
         }
+        self._publish_pending = False
+        self._publish_task: asyncio.Task | None = None
         # Store in class-level dictionary
         ProgressTracker._progress_states[progress_id] = self.state
+        ProgressTracker._owned.add(progress_id)
 
     @classmethod
     def get_progress(cls, progress_id: str) -> dict[str, Any] | None:
@@ -48,9 +79,108 @@ class ProgressTracker:
 
     @classmethod
     def clear_progress(cls, progress_id: str) -> None:
-        """Remove progress state from memory."""
+        """Remove progress state from memory and the shared store."""
         if progress_id in cls._progress_states:
             del cls._progress_states[progress_id]
+        cls._forget(progress_id)
+        if cls._store.shared:
+            try:
+                asyncio.get_running_loop().create_task(cls._delete_from_store(progress_id))
+            except RuntimeError:
+                pass
+
+    @classmethod
+    def get_version(cls, progress_id: str) -> int | None:
+        """Local version of a state; changes whenever the state does."""
+        return cls._versions.get(progress_id)
+
+    @classmethod
+    @contextmanager
+    def subscribe(cls, progress_id: str) -> Iterator[asyncio.Queue]:
+        """
+        Subscribe to changes of one progress state.
+
+        The yielded queue receives an item whenever the state changed since it was last
+        drained (bursts are coalesced); read the current state with get_progress().
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        cls._subscribers.setdefault(progress_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = cls._subscribers.get(progress_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del cls._subscribers[progress_id]
+
+    @classmethod
+    def _bump(cls, progress_id: str) -> None:
+        """Record a change and wake stream subscribers."""
+        cls._version_counter += 1
+        cls._versions[progress_id] = cls._version_counter
+        for queue in cls._subscribers.get(progress_id, ()):
+            if queue.empty():
+                queue.put_nowait(None)
+
+    @classmethod
+    def _forget(cls, progress_id: str) -> None:
+        cls._owned.discard(progress_id)
+        cls._store_versions.pop(progress_id, None)
+        cls._bump(progress_id)
+        cls._versions.pop(progress_id, None)
+
+    @classmethod
+    def _apply_synced_change(cls, progress_id: str, state: dict[str, Any] | None, version: int) -> None:
+        """Apply a change published by another worker."""
+        if progress_id in cls._owned or version <= cls._store_versions.get(progress_id, 0):
+            return
+        if state is None:
+            if progress_id in cls._progress_states:
+                del cls._progress_states[progress_id]
+                cls._forget(progress_id)
+            return
+        cls._progress_states[progress_id] = state
+        cls._store_versions[progress_id] = version
+        cls._bump(progress_id)
+
+    @classmethod
+    def _store_error(cls, error: Exception) -> None:
+        if not cls._store_failing:
+            logger.warning(f"Failed to publish progress to the shared store: {error}")
+        cls._store_failing = True
+
+    @classmethod
+    async def _delete_from_store(cls, progress_id: str) -> None:
+        try:
+            await cls._store.delete(progress_id)
+        except Exception as e:
+            cls._store_error(e)
+
+    @classmethod
+    async def start_sync(
+        cls, store: ProgressStore | None = None, interval: float = DEFAULT_SYNC_INTERVAL
+    ) -> ProgressStore:
+        """
+        Select the progress store (PROGRESS_BACKEND by default) and, for shared
+        stores, start syncing other workers' progress into this worker.
+        """
+        await cls.stop_sync()
+        cls._store = store or create_progress_store()
+        if cls._store.shared:
+            cls._sync = ProgressSync(cls._store, cls._apply_synced_change, interval)
+            cls._sync.start()
+        safe_logfire_info(f"Progress store ready | backend={type(cls._store).__name__}")
+        return cls._store
+
+    @classmethod
+    async def stop_sync(cls) -> None:
+        """Stop syncing and close the store (progress stays local afterwards)."""
+        if cls._sync is not None:
+            await cls._sync.stop()
+            cls._sync = None
+        store, cls._store = cls._store, MemoryProgressStore()
+        await store.close()
 
     @classmethod
     def list_active(cls) -> dict[str, dict[str, Any]]:
@@ -70,6 +200,9 @@ class ProgressTracker:
             # Only clean up if still in terminal state (prevent cleanup of reused IDs)
             if status in ["completed", "failed", "error", "cancelled"]:
                 del cls._progress_states[progress_id]
+                cls._forget(progress_id)
+                if cls._store.shared:
+                    await cls._delete_from_store(progress_id)
                 safe_logfire_info(f"Progress state cleaned up after delay | progress_id={progress_id} | status={status}")
 
     async def start(self, initial_data: dict[str, Any] | None = None):
@@ -343,15 +476,39 @@ class ProgressTracker:
         )
 
     def _update_state(self):
-        """Update progress state in memory storage."""
+        """Update progress state in memory storage and publish it."""
         # Update the class-level dictionary
         ProgressTracker._progress_states[self.progress_id] = self.state
+        ProgressTracker._owned.add(self.progress_id)
+        ProgressTracker._bump(self.progress_id)
+        self._schedule_publish()
 
         safe_logfire_info(
             f"📊 [PROGRESS] Updated {self.operation_type} | ID: {self.progress_id} | "
             f"Status: {self.state.get('status')} | Progress: {self.state.get('progress')}%"
         )
 
+    def _schedule_publish(self) -> None:
+        """Write the state to a shared store in the background, coalescing bursts."""
+        if not ProgressTracker._store.shared:
+            return
+        self._publish_pending = True
+        if self._publish_task is None or self._publish_task.done():
+            try:
+                self._publish_task = asyncio.get_running_loop().create_task(self._publish())
+            except RuntimeError:
+                self._publish_pending = False
+
+    async def _publish(self) -> None:
+        store = ProgressTracker._store
+        while self._publish_pending:
+            self._publish_pending = False
+            try:
+                await store.save(self.progress_id, self.state)
+                ProgressTracker._store_failing = False
+            except Exception as e:
+                ProgressTracker._store_error(e)
+
     def _format_duration(self, seconds: float) -> str:
         """Format duration in seconds to human-readable string."""
         if seconds < 60:
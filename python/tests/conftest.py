@@ -56,6 +56,39 @@ def ensure_test_environment():
     yield
     
 
+@pytest.fixture(autouse=True)
+def isolated_embedding_cache(monkeypatch):
+    """Give every test empty in-memory embedding caches instead of the on-disk one."""
+    from src.server.services.embeddings import embedding_cache, query_embedding_cache
+
+    monkeypatch.setenv("EMBEDDING_CACHE_PATH", ":memory:")
+    embedding_cache.close_embedding_cache()
+    query_embedding_cache.reset_query_embedding_cache()
+    yield
+    embedding_cache.close_embedding_cache()
+    query_embedding_cache.reset_query_embedding_cache()
+
+
+@pytest.fixture(autouse=True)
+def isolated_rag_result_cache():
+    """Give every test an empty RAG result cache."""
+    from src.server.services.search import rag_result_cache
+
+    rag_result_cache.reset_rag_result_cache()
+    yield
+    rag_result_cache.reset_rag_result_cache()
+
+
+@pytest.fixture(autouse=True)
+def isolated_stats_cache():
+    """Give every test an empty stats cache."""
+    from src.server.services import stats_cache
+
+    stats_cache.reset_stats_cache()
+    yield
+    stats_cache.reset_stats_cache()
+
+
 @pytest.fixture(autouse=True)
 def prevent_real_db_calls():
     """Automatically prevent any real database calls in all tests."""
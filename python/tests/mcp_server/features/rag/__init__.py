@@ -0,0 +1 @@
+"""RAG tools tests."""
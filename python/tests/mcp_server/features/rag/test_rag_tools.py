@@ -0,0 +1,176 @@
+"""Unit tests for RAG tools."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from mcp.server.fastmcp import Context
+
+from src.mcp_server.features.rag.rag_tools import register_rag_tools
+
+
+@pytest.fixture
+def mock_mcp():
+    """Create a mock MCP server for testing."""
+    mock = MagicMock()
+    mock._tools = {}
+
+    def tool_decorator():
+        def decorator(func):
+            mock._tools[func.__name__] = func
+            return func
+
+        return decorator
+
+    mock.tool = tool_decorator
+    return mock
+
+
+@pytest.fixture
+def mock_context():
+    """Create a mock context for testing."""
+    return MagicMock(spec=Context)
+
+
+@pytest.mark.asyncio
+async def test_search_knowledge_and_code_makes_one_request(mock_mcp, mock_context):
+    """Documents and code examples come back from a single combined API call."""
+    register_rag_tools(mock_mcp)
+    search = mock_mcp._tools["rag_search_knowledge_and_code"]
+
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "success": True,
+        "documents": {"success": True, "results": [{"content": "docs"}], "reranking_applied": True},
+        "code_examples": {"success": False, "results": [], "error": "Code example extraction is disabled"},
+        "timings_ms": {"embedding": 120.0, "documents": 40.0, "code_examples": 35.0, "total": 161.0},
+    }
+
+    with patch("src.mcp_server.features.rag.rag_tools.httpx.AsyncClient") as mock_client:
+        mock_async_client = AsyncMock()
+        mock_async_client.post.return_value = mock_response
+        mock_client.return_value.__aenter__.return_value = mock_async_client
+
+        result = json.loads(
+            await search(mock_context, query="vector search", source_id="src_1", tags=["py"], code_match_count=3)
+        )
+
+    assert mock_async_client.post.await_count == 1
+    url, = mock_async_client.post.call_args.args
+    assert url.endswith("/api/rag/query/combined")
+    assert mock_async_client.post.call_args.kwargs["json"] == {
+        "query": "vector search",
+        "match_count": 5,
+        "code_match_count": 3,
+        "source": "src_1",
+        "filter_metadata": {"tags": ["py"]},
+    }
+
+    assert result["success"] is True
+    assert result["documents"] == {"success": True, "results": [{"content": "docs"}], "reranked": True, "error": None}
+    assert result["code_examples"]["success"] is False
+    assert result["code_examples"]["error"] == "Code example extraction is disabled"
+    assert result["timings_ms"]["total"] == 161.0
+
+
+@pytest.mark.asyncio
+async def test_search_knowledge_base_batch_makes_one_request(mock_mcp, mock_context):
+    """All sub-queries go out in one batch API call and come back in order."""
+    register_rag_tools(mock_mcp)
+    search = mock_mcp._tools["rag_search_knowledge_base_batch"]
+
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "success": True,
+        "results": [
+            {"query": "jwt refresh", "success": True, "results": [{"content": "docs"}], "reranking_applied": True},
+            {"query": "pgvector index", "success": False, "results": [], "error": "Failed to create embedding"},
+        ],
+        "timings_ms": {"embedding": 150.0, "search": 60.0, "rerank": 90.0, "total": 301.0},
+    }
+
+    with patch("src.mcp_server.features.rag.rag_tools.httpx.AsyncClient") as mock_client:
+        mock_async_client = AsyncMock()
+        mock_async_client.post.return_value = mock_response
+        mock_client.return_value.__aenter__.return_value = mock_async_client
+
+        result = json.loads(await search(mock_context, queries=["jwt refresh", "pgvector index"], source_id="src_1"))
+
+    assert mock_async_client.post.await_count == 1
+    url, = mock_async_client.post.call_args.args
+    assert url.endswith("/api/rag/query/batch")
+    assert mock_async_client.post.call_args.kwargs["json"] == {
+        "queries": ["jwt refresh", "pgvector index"],
+        "match_count": 5,
+        "source": "src_1",
+    }
+
+    assert result["success"] is True
+    assert [item["query"] for item in result["results"]] == ["jwt refresh", "pgvector index"]
+    assert result["results"][0]["reranked"] is True
+    assert result["results"][1] == {
+        "query": "pgvector index",
+        "success": False,
+        "results": [],
+        "reranked": False,
+        "error": "Failed to create embedding",
+    }
+    assert result["timings_ms"]["total"] == 301.0
+
+
+@pytest.mark.asyncio
+async def test_search_knowledge_base_asks_for_snippets(mock_mcp, mock_context):
+    """Searches return snippets unless full content is requested."""
+    register_rag_tools(mock_mcp)
+    search = mock_mcp._tools["rag_search_knowledge_base"]
+
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"results": [{"id": 7, "content": "snip", "truncated": True}]}
+
+    with patch("src.mcp_server.features.rag.rag_tools.httpx.AsyncClient") as mock_client:
+        mock_async_client = AsyncMock()
+        mock_async_client.post.return_value = mock_response
+        mock_client.return_value.__aenter__.return_value = mock_async_client
+
+        result = json.loads(await search(mock_context, query="vector search"))
+        assert mock_async_client.post.call_args.kwargs["json"] == {
+            "query": "vector search",
+            "match_count": 5,
+            "slim": True,
+        }
+
+        await search(mock_context, query="vector search", full_content=True)
+        assert mock_async_client.post.call_args.kwargs["json"]["slim"] is False
+
+    assert result["results"][0]["id"] == 7
+
+
+@pytest.mark.asyncio
+async def test_get_chunks_fetches_by_id(mock_mcp, mock_context):
+    """Opening search results is one request for all of them."""
+    register_rag_tools(mock_mcp)
+    get_chunks = mock_mcp._tools["rag_get_chunks"]
+
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "success": True,
+        "chunks": [{"id": 7, "content": "full chunk"}],
+        "count": 1,
+        "missing": [9],
+    }
+
+    with patch("src.mcp_server.features.rag.rag_tools.httpx.AsyncClient") as mock_client:
+        mock_async_client = AsyncMock()
+        mock_async_client.post.return_value = mock_response
+        mock_client.return_value.__aenter__.return_value = mock_async_client
+
+        result = json.loads(await get_chunks(mock_context, ids=[7, 9]))
+
+    url, = mock_async_client.post.call_args.args
+    assert url.endswith("/api/rag/chunks")
+    assert mock_async_client.post.call_args.kwargs["json"] == {"ids": [7, 9]}
+    assert result == {"success": True, "chunks": [{"id": 7, "content": "full chunk"}], "missing": [9], "error": None}
@@ -78,7 +78,7 @@ async def test_create_task_with_sources(mock_mcp, mock_context):
 
 @pytest.mark.asyncio
 async def test_find_tasks_with_project_filter(mock_mcp, mock_context):
-    """Test listing tasks with project-specific endpoint."""
+    """Test listing tasks of one project."""
     register_task_tools(mock_mcp)
 
     # Get the find_tasks function
@@ -107,9 +107,10 @@ async def test_find_tasks_with_project_filter(mock_mcp, mock_context):
         assert result_data["success"] is True
         assert len(result_data["tasks"]) == 2
 
-        # Verify project-specific endpoint was used
+        # Verify the generic endpoint pages the project's tasks
         call_args = mock_async_client.get.call_args
-        assert "/api/projects/project-123/tasks" in call_args[0][0]
+        assert call_args[0][0].endswith("/api/tasks")
+        assert call_args[1]["params"]["project_id"] == "project-123"
 
 
 @pytest.mark.asyncio
@@ -233,3 +234,74 @@ async def test_delete_task_already_archived(mock_mcp, mock_context):
         )
         assert result_data["error"]["type"] == "http_error"
         assert "http 400" in result_data["error"]["message"].lower()
+
+
+@pytest.mark.asyncio
+async def test_find_tasks_follows_cursor(mock_mcp, mock_context):
+    """The next page is requested with the cursor of the previous one."""
+    register_task_tools(mock_mcp)
+
+    find_tasks = mock_mcp._tools.get("find_tasks")
+
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "tasks": [{"id": "task-11", "title": "Task 11", "status": "todo"}],
+        "pagination": {"total": 25, "page": 1, "per_page": 10, "has_more": True, "next_cursor": "c2"},
+    }
+
+    with patch("src.mcp_server.features.tasks.task_tools.httpx.AsyncClient") as mock_client:
+        mock_async_client = AsyncMock()
+        mock_async_client.get.return_value = mock_response
+        mock_client.return_value.__aenter__.return_value = mock_async_client
+
+        result = json.loads(await find_tasks(mock_context, cursor="c1"))
+
+        assert mock_async_client.get.call_args[1]["params"]["cursor"] == "c1"
+
+    assert result["next_cursor"] == "c2"
+    assert result["total_count"] == 25
+
+
+@pytest.mark.asyncio
+async def test_manage_tasks_bulk_sends_one_request(mock_mcp, mock_context):
+    """A whole plan is written with one POST and the returned tasks are slimmed."""
+    register_task_tools(mock_mcp)
+
+    manage_tasks_bulk = mock_mcp._tools.get("manage_tasks_bulk")
+
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {
+        "message": "Tasks written successfully",
+        "created": [{"id": "task-1", "title": "Plan", "sources": [{"url": "a"}], "code_examples": []}],
+        "updated": [],
+        "missing": ["task-9"],
+    }
+
+    with patch("src.mcp_server.features.tasks.task_tools.httpx.AsyncClient") as mock_client:
+        mock_async_client = AsyncMock()
+        mock_async_client.post.return_value = mock_response
+        mock_client.return_value.__aenter__.return_value = mock_async_client
+
+        result = json.loads(
+            await manage_tasks_bulk(
+                mock_context, project_id="project-1", create=[{"title": "Plan"}], reorder=["task-9"]
+            )
+        )
+
+        assert mock_async_client.post.call_count == 1
+        assert mock_async_client.post.call_args[0][0].endswith("/api/tasks/bulk")
+        assert mock_async_client.post.call_args[1]["json"] == {
+            "project_id": "project-1",
+            "create": [{"title": "Plan"}],
+            "update": [],
+            "reorder": ["task-9"],
+        }
+
+    assert result["success"] is True
+    assert result["created"][0]["sources_count"] == 1
+    assert result["missing"] == ["task-9"]
+
+    result = json.loads(await manage_tasks_bulk(mock_context, project_id="project-1"))
+    assert result["success"] is False
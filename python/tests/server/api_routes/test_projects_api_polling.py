@@ -1,5 +1,6 @@
 """Unit tests for projects API polling endpoints with ETag support."""
 
+import json
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -8,6 +9,11 @@ from fastapi import HTTPException, Response
 from fastapi.testclient import TestClient
 
 
+async def _json_body(streamed):
+    """Read a streamed JSON response."""
+    return json.loads(b"".join([chunk async for chunk in streamed.body_iterator]))
+
+
 @pytest.fixture
 def test_client():
     """Create a test client for the projects router."""
@@ -44,9 +50,12 @@ class TestProjectsListPolling:
             mock_source_service.format_projects_with_sources.return_value = mock_projects
             
             response = Response()
-            result = await list_projects(response=response, if_none_match=None)
+            streamed = await list_projects(response=response, if_none_match=None)
             
-            assert result is not None
+            # Full content is streamed
+            assert streamed is not None
+            assert streamed.headers["ETag"] == response.headers["ETag"]
+            result = await _json_body(streamed)
             assert len(result["projects"]) == 2
             assert result["count"] == 2
             assert "timestamp" in result
@@ -286,7 +295,7 @@ class TestPollingEdgeCases:
             mock_source_service.format_projects_with_sources.return_value = []
             
             response = Response()
-            result = await list_projects(response=response)
+            result = await _json_body(await list_projects(response=response))
             
             assert result["projects"] == []
             assert result["count"] == 0
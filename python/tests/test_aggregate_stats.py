@@ -0,0 +1,244 @@
+"""
+Tests for database-aggregated statistics and their epoch-versioned cache.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import Response
+from starlette.requests import Request
+
+from src.server.api_routes import dashboard_api
+from src.server.services.projects.task_service import TaskService
+from src.server.services.stats_cache import (
+    KNOWLEDGE_SCOPE,
+    TASKS_SCOPE,
+    StatsCache,
+    bump_stats_epoch,
+    get_stats_cache,
+)
+
+COUNT_ROWS = [
+    {"project_id": "project-1", "status": "todo", "task_count": 2},
+    {"project_id": "project-1", "status": "review", "task_count": 1},
+    {"project_id": "project-2", "status": "done", "task_count": 4},
+]
+
+
+def _request(etag: str | None = None) -> Request:
+    headers = [(b"if-none-match", etag.encode())] if etag else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers, "query_string": b""})
+
+
+def test_cache_follows_write_epochs_and_keeps_versions_of_unchanged_values():
+    cache = StatsCache(ttl_seconds=60)
+    values = iter([{"n": 1}, {"n": 1}, {"n": 2}])
+    compute = MagicMock(side_effect=lambda: next(values))
+
+    first, version = cache.get_or_compute("key", (TASKS_SCOPE,), compute)
+    assert cache.get_or_compute("key", (TASKS_SCOPE,), compute) == (first, version)
+    assert compute.call_count == 1
+
+    # Writes elsewhere do not outdate the entry
+    cache.bump(KNOWLEDGE_SCOPE)
+    cache.get_or_compute("key", (TASKS_SCOPE,), compute)
+    assert compute.call_count == 1
+
+    # Recomputed after a write, but the same counts keep the same version
+    cache.bump(TASKS_SCOPE)
+    assert cache.get_or_compute("key", (TASKS_SCOPE,), compute) == ({"n": 1}, version)
+    cache.bump(TASKS_SCOPE)
+    value, new_version = cache.get_or_compute("key", (TASKS_SCOPE,), compute)
+    assert value == {"n": 2} and new_version != version
+    assert cache.etag(new_version) != cache.etag(version)
+
+
+def test_result_computed_across_a_write_is_not_cached():
+    cache = StatsCache(ttl_seconds=60)
+
+    def compute():
+        cache.bump(TASKS_SCOPE)
+        return {"n": 1}
+
+    cache.get_or_compute("key", (TASKS_SCOPE,), compute)
+    assert cache.get_stats()["entries"] == 0
+
+    uncached = StatsCache(ttl_seconds=0)
+    uncached.get_or_compute("key", (TASKS_SCOPE,), lambda: {"n": 1})
+    assert uncached.get_stats()["entries"] == 0
+
+
+def test_task_counts_are_grouped_in_the_database(monkeypatch):
+    monkeypatch.setattr(TaskService, "_count_function_missing", False)
+    client = MagicMock()
+    client.rpc.return_value.execute.return_value.data = COUNT_ROWS
+
+    success, counts = TaskService(client).get_all_project_task_counts()
+
+    assert success
+    client.rpc.assert_called_once_with("get_task_counts_by_project", {})
+    client.table.assert_not_called()
+    assert counts == {
+        "project-1": {"todo": 2, "doing": 0, "review": 1, "done": 0},
+        "project-2": {"todo": 0, "doing": 0, "review": 0, "done": 4},
+    }
+
+
+def test_task_counts_without_migration_count_rows(monkeypatch):
+    monkeypatch.setattr(TaskService, "_count_function_missing", False)
+    client = MagicMock()
+    client.rpc.return_value.execute.side_effect = Exception("function get_task_counts_by_project() does not exist")
+    client.table.return_value.select.return_value.or_.return_value.execute.return_value.data = [
+        {"project_id": "project-1", "status": "todo"},
+        {"project_id": "project-1", "status": "todo"},
+        {"project_id": "project-1", "status": "review"},
+    ]
+
+    success, counts = TaskService(client).get_all_project_task_counts()
+    assert success
+    assert counts == {"project-1": {"todo": 2, "doing": 0, "review": 1, "done": 0}}
+
+    # The missing function is not retried on every poll
+    client.rpc.reset_mock()
+    TaskService(client).get_all_project_task_counts()
+    client.rpc.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_task_counts_endpoint_etag_is_the_cached_version(monkeypatch):
+    from src.server.api_routes.projects_api import get_all_task_counts
+
+    monkeypatch.setattr(TaskService, "_count_function_missing", False)
+    client = MagicMock()
+    client.rpc.return_value.execute.return_value.data = COUNT_ROWS
+
+    with patch("src.server.api_routes.projects_api.get_supabase_client", return_value=client):
+        response = Response()
+        counts = await get_all_task_counts(_request(), response)
+        etag = response.headers["ETag"]
+        assert counts["project-2"]["done"] == 4
+
+        # Unchanged: 304 without querying again
+        response = Response()
+        assert await get_all_task_counts(_request(etag), response) is None
+        assert response.status_code == 304
+        assert client.rpc.call_count == 1
+
+        # A task write forces a recount; the same counts keep the ETag
+        bump_stats_epoch(TASKS_SCOPE)
+        response = Response()
+        assert await get_all_task_counts(_request(etag), response) is None
+        assert client.rpc.call_count == 2
+
+        client.rpc.return_value.execute.return_value.data = COUNT_ROWS[:1]
+        bump_stats_epoch(TASKS_SCOPE)
+        response = Response()
+        assert await get_all_task_counts(_request(etag), response) == {
+            "project-1": {"todo": 2, "doing": 0, "review": 0, "done": 0}
+        }
+        assert response.headers["ETag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_dashboard_stats_from_aggregate_functions(monkeypatch):
+    monkeypatch.setattr(dashboard_api, "_missing_stats_functions", set())
+    calls = []
+
+    async def execute_rpc(client, name, params):
+        calls.append((name, params))
+        if name == "get_project_task_stats":
+            return [
+                {"bucket": "projects", "item_count": 3},
+                {"bucket": "todo", "item_count": 5},
+                {"bucket": "done", "item_count": 2},
+                {"bucket": "archived", "item_count": 1},
+            ]
+        return [
+            {"knowledge_type": "technical", "sources": 2, "documents": 300, "code_examples": 40},
+            {"knowledge_type": "business", "sources": 1, "documents": 20, "code_examples": 0},
+        ]
+
+    client = MagicMock()
+    with (
+        patch("src.server.api_routes.dashboard_api.execute_rpc", side_effect=execute_rpc),
+        patch("src.server.api_routes.dashboard_api.get_supabase_client", return_value=client),
+    ):
+        response = Response()
+        stats = await dashboard_api.get_dashboard_stats(_request(), response, project_id="project-1")
+
+        assert calls[0] == ("get_project_task_stats", {"project_filter": "project-1"})
+        client.table.assert_not_called()
+        assert stats["projects"] == {"total": 3, "active": 3}
+        assert stats["tasks"] == {"todo": 5, "doing": 0, "review": 0, "done": 2, "archived": 1, "total": 8}
+        assert (stats["knowledge"]["sources"], stats["knowledge"]["documents"]) == (3, 320)
+        assert stats["knowledge"]["by_knowledge_type"]["business"]["documents"] == 20
+
+        # Polls with the current ETag cost nothing until the knowledge base changes
+        etag = response.headers["ETag"]
+        response = Response()
+        assert await dashboard_api.get_dashboard_stats(_request(etag), response, project_id="project-1") is None
+        assert response.status_code == 304
+        assert len(calls) == 2
+
+        bump_stats_epoch(KNOWLEDGE_SCOPE)
+        await dashboard_api.get_dashboard_stats(_request(etag), Response(), project_id="project-1")
+        assert len(calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_dashboard_stats_without_migration_and_on_errors(monkeypatch):
+    monkeypatch.setattr(dashboard_api, "_missing_stats_functions", set())
+
+    async def execute_rpc(client, name, params):
+        raise Exception(f"Could not find the function public.{name}")
+
+    client = MagicMock()
+    client.table.return_value.select.return_value.execute.return_value.count = 7
+    client.table.return_value.select.return_value.execute.return_value.data = [
+        {"status": "doing", "archived": False},
+        {"status": None, "archived": False},
+        {"status": "done", "archived": True},
+    ]
+    with (
+        patch("src.server.api_routes.dashboard_api.execute_rpc", side_effect=execute_rpc),
+        patch("src.server.api_routes.dashboard_api.get_supabase_client", return_value=client),
+    ):
+        stats = await dashboard_api.get_dashboard_stats(_request(), Response())
+
+        assert stats["projects"]["total"] == 7
+        assert stats["tasks"] == {"todo": 1, "doing": 1, "review": 0, "done": 0, "archived": 1, "total": 3}
+        assert stats["knowledge"]["documents"] == 7
+        assert dashboard_api._missing_stats_functions == {"get_project_task_stats", "get_knowledge_stats"}
+
+        # A failed section is returned as zeros but not cached
+        bump_stats_epoch(TASKS_SCOPE)
+        client.table.side_effect = RuntimeError("connection reset")
+        response = Response()
+        stats = await dashboard_api.get_dashboard_stats(_request(), response)
+        assert stats["knowledge"]["sources"] == 0
+        assert "ETag" not in response.headers
+        assert get_stats_cache().get_stats()["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_source_writes_outdate_cached_knowledge_stats():
+    from src.server.services.knowledge.knowledge_item_service import KnowledgeItemService
+    from src.server.services.source_management_service import update_source_info
+
+    cache = get_stats_cache()
+    compute = MagicMock(return_value={"technical": 1})
+    cache.get_or_compute("knowledge", (KNOWLEDGE_SCOPE,), compute)
+
+    client = MagicMock()
+    client.table.return_value.select.return_value.eq.return_value.execute.return_value.data = [{"metadata": {}}]
+    client.table.return_value.update.return_value.eq.return_value.execute.return_value.data = [{"source_id": "s1"}]
+    success, _ = await KnowledgeItemService(client).update_item("s1", {"knowledge_type": "business"})
+    assert success
+    cache.get_or_compute("knowledge", (KNOWLEDGE_SCOPE,), compute)
+    assert compute.call_count == 2
+
+    # A new source row changes the source counts too
+    client.table.return_value.select.return_value.eq.return_value.execute.return_value.data = []
+    await update_source_info(client, "s2", "summary", 10, source_display_name="Docs", source_url="https://docs.example")
+    cache.get_or_compute("knowledge", (KNOWLEDGE_SCOPE,), compute)
+    assert compute.call_count == 3
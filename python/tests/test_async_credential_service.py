@@ -336,3 +336,62 @@ class TestAsyncCredentialService:
         result2 = await get_credential("PERSISTENT_KEY", "default")
         assert result2 == "persistent_value"
         assert result1 == result2
+
+    @pytest.mark.asyncio
+    async def test_encryption_key_derived_once(self):
+        """PBKDF2 key derivation runs once, not on every encrypt/decrypt"""
+        from src.server.services import credential_service as cred_module
+
+        cred_module._derive_encryption_key.cache_clear()
+        encrypted = credential_service._encrypt_value("secret")
+        for _ in range(5):
+            credential_service._decrypted_cache.clear()
+            assert credential_service._decrypt_value(encrypted) == "secret"
+
+        info = cred_module._derive_encryption_key.cache_info()
+        assert info.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_decrypted_value_invalidated_on_set_and_delete(self, mock_supabase_client):
+        """Cached plaintexts are dropped when the credential changes"""
+        mock_client, _ = mock_supabase_client
+        credential_service._cache_initialized = True
+
+        with patch.object(credential_service, "_get_supabase_client", return_value=mock_client):
+            await credential_service.set_credential("API_KEY", "first", is_encrypted=True)
+            assert await credential_service.get_credential("API_KEY") == "first"
+            first_ciphertext = credential_service._cache["API_KEY"]["encrypted_value"]
+            assert first_ciphertext in credential_service._decrypted_cache
+
+            await credential_service.set_credential("API_KEY", "second", is_encrypted=True)
+            assert first_ciphertext not in credential_service._decrypted_cache
+            assert await credential_service.get_credential("API_KEY") == "second"
+
+            second_ciphertext = credential_service._cache["API_KEY"]["encrypted_value"]
+            await credential_service.delete_credential("API_KEY")
+            assert second_ciphertext not in credential_service._decrypted_cache
+            assert await credential_service.get_credential("API_KEY", "gone") == "gone"
+
+    @pytest.mark.slow
+    @pytest.mark.asyncio
+    async def test_encrypted_lookup_microbenchmark(self):
+        """Encrypted credential lookups cost microseconds once the key is derived"""
+        import time
+
+        credential_service._cache = {
+            "OPENAI_API_KEY": {
+                "encrypted_value": credential_service._encrypt_value("sk-test"),
+                "is_encrypted": True,
+            }
+        }
+        credential_service._cache_initialized = True
+        assert await get_credential("OPENAI_API_KEY") == "sk-test"
+
+        iterations = 2000
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await credential_service.get_credential("OPENAI_API_KEY")
+        per_lookup_us = (time.perf_counter() - start) / iterations * 1_000_000
+
+        # A single PBKDF2 derivation alone takes tens of milliseconds
+        assert per_lookup_us < 5000
@@ -42,11 +42,14 @@ class TestAsyncLLMProviderService:
     @pytest.fixture(autouse=True)
     def clear_cache(self):
         """Clear cache before each test"""
+        import src.server.services.llm_client_registry as registry_module
         import src.server.services.llm_provider_service as llm_module
 
         llm_module._settings_cache.clear()
+        registry_module._client_registry = None
         yield
         llm_module._settings_cache.clear()
+        registry_module._client_registry = None
 
     @pytest.fixture
     def mock_credential_service(self):
@@ -480,6 +483,12 @@ class TestAsyncLLMProviderService:
 
                 # After context manager exits, should still have reference to client
                 assert client_ref == mock_client
+                # Pooled clients stay open for reuse and are closed with the registry
+                mock_client.aclose.assert_not_awaited()
+
+                from src.server.services.llm_client_registry import close_client_registry
+
+                await close_client_registry()
                 mock_client.aclose.assert_awaited_once()
 
     @pytest.mark.asyncio
@@ -0,0 +1,194 @@
+"""
+Tests for creating, updating and reordering many tasks in one request.
+"""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from src.server.services.projects.task_service import TASK_ORDER_GAP, TaskService
+from src.server.services.stats_cache import get_stats_cache
+
+
+def _row(task_id: str, **fields) -> dict:
+    return {"id": task_id, "project_id": "project-1", "title": task_id, "status": "todo", **fields}
+
+
+@pytest.fixture(autouse=True)
+def bulk_function_installed(monkeypatch):
+    monkeypatch.setattr(TaskService, "_bulk_function_missing", False)
+
+
+def _columns(client: MagicMock, *tasks: tuple[str, str]) -> None:
+    """Active tasks of the project as (id, status), as read for a reorder."""
+    query = client.table.return_value.select.return_value.eq.return_value.or_.return_value
+    query.execute.return_value.data = [{"id": task_id, "status": status} for task_id, status in tasks]
+
+
+@pytest.mark.asyncio
+async def test_bulk_write_is_one_call():
+    client = MagicMock()
+    _columns(client, ("task-1", "todo"), ("task-2", "todo"), ("task-3", "doing"))
+    threads = []
+
+    def execute():
+        threads.append(threading.current_thread())
+        return MagicMock(data=[
+            _row("task-1", task_order=1000),
+            _row("task-2", task_order=1000),
+            _row("task-3", task_order=2000),
+            _row("new-1", task_order=5000),
+            _row("new-2", task_order=6000),
+        ])
+
+    client.rpc.return_value.execute.side_effect = execute
+    epochs = get_stats_cache().epochs(["tasks"])
+
+    success, result = await TaskService(client).bulk_write_tasks(
+        "project-1",
+        creates=[{"title": "Plan"}, {"title": "Build", "status": "todo"}],
+        updates=[{"id": "task-2", "status": "doing"}, {"id": "task-7", "title": "Gone"}],
+        reorder=["task-2", "task-3", "task-1"],
+    )
+
+    assert success
+    client.rpc.assert_called_once()
+    client.table.return_value.insert.assert_not_called()
+    client.table.return_value.update.assert_not_called()
+    # The write runs in a worker thread, not on the event loop
+    assert threads and threads[0] is not threading.main_thread()
+    name, params = client.rpc.call_args[0]
+    assert name == "bulk_write_archon_tasks"
+    assert params["target_project_id"] == "project-1"
+    assert params["creates"] == [{"title": "Plan"}, {"title": "Build", "status": "todo"}]
+    # Each reordered column is renumbered, in its new status, merged into the updates
+    assert params["updates"] == [
+        {"id": "task-2", "status": "doing", "task_order": TASK_ORDER_GAP},
+        {"id": "task-7", "title": "Gone"},
+        {"id": "task-3", "task_order": 2 * TASK_ORDER_GAP},
+        {"id": "task-1", "task_order": TASK_ORDER_GAP},
+    ]
+    assert [task["id"] for task in result["created"]] == ["new-1", "new-2"]
+    assert [task["id"] for task in result["updated"]] == ["task-1", "task-2", "task-3"]
+    assert result["missing"] == ["task-7"]
+    assert get_stats_cache().epochs(["tasks"]) != epochs
+
+
+@pytest.mark.asyncio
+async def test_partial_reorder_is_rejected():
+    client = MagicMock()
+    _columns(client, ("task-1", "todo"), ("task-2", "todo"), ("task-3", "todo"))
+
+    # Renumbering only some of a column would tie or interleave with the others
+    success, result = await TaskService(client).bulk_write_tasks("project-1", reorder=["task-3", "task-1"])
+    assert not success
+    assert "every task of the 'todo' column; missing: task-2" in result["error"]
+
+    success, result = await TaskService(client).bulk_write_tasks("project-1", reorder=["task-9"])
+    assert not success
+    assert "not found in the project (or archived): task-9" in result["error"]
+    client.rpc.assert_not_called()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "kwargs, error",
+    [
+        ({"creates": [{"title": " "}]}, "creates[0]: Task title is required"),
+        ({"creates": [{"title": "A", "status": "blocked"}]}, "creates[0]: Invalid status"),
+        ({"updates": [{"id": "t-1"}]}, "updates[0]: no fields to update"),
+        ({"updates": [{"id": "t-1", "sources": [], "owner": "x"}]}, "unknown fields owner"),
+        ({"creates": [{"title": "A", "task_order": True}]}, "task_order must be a non-negative integer"),
+        ({"reorder": ["t-1", "t-1"]}, "more than once"),
+        ({"creates": [{"title": "A"}] * 101}, "At most 100"),
+        ({}, "Nothing to create"),
+    ],
+)
+async def test_bulk_write_validates_before_writing(kwargs, error):
+    client = MagicMock()
+
+    success, result = await TaskService(client).bulk_write_tasks("project-1", **kwargs)
+
+    assert not success
+    assert error in result["error"]
+    client.rpc.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_bulk_write_without_migration_inserts_all_creates_at_once():
+    client = MagicMock()
+    client.rpc.return_value.execute.side_effect = Exception("function bulk_write_archon_tasks does not exist")
+    tasks = client.table.return_value
+    tasks.select.return_value.eq.return_value.or_.return_value.execute.return_value.data = [
+        {"status": "todo", "task_order": 3000},
+        {"status": "doing", "task_order": 500},
+    ]
+    tasks.insert.return_value.execute.return_value.data = [_row("new-1"), _row("new-2")]
+
+    success, result = await TaskService(client).bulk_write_tasks(
+        "project-1", creates=[{"title": "Plan"}, {"title": "Build", "status": "doing"}, {"title": "Ship", "task_order": 7}]
+    )
+
+    assert success
+    assert TaskService._bulk_function_missing
+    (inserted,), _ = tasks.insert.call_args
+    assert [(task["title"], task["status"], task["task_order"]) for task in inserted] == [
+        ("Plan", "todo", 3000 + TASK_ORDER_GAP),
+        ("Build", "doing", 500 + TASK_ORDER_GAP),
+        ("Ship", "todo", 7),
+    ]
+    assert tasks.insert.call_count == 1
+    assert len(result["created"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_write_without_migration_appends_above_explicit_orders():
+    client = MagicMock()
+    client.rpc.return_value.execute.side_effect = Exception("function bulk_write_archon_tasks does not exist")
+    tasks = client.table.return_value
+    tasks.select.return_value.eq.return_value.or_.return_value.execute.return_value.data = [
+        {"status": "todo", "task_order": 3000},
+    ]
+    tasks.insert.return_value.execute.return_value.data = [_row("new-1"), _row("new-2"), _row("new-3")]
+
+    success, _ = await TaskService(client).bulk_write_tasks(
+        "project-1",
+        creates=[{"title": "Plan"}, {"title": "Ship", "task_order": 9000}, {"title": "Wrap"}],
+    )
+
+    assert success
+    (inserted,), _ = tasks.insert.call_args
+    assert [task["task_order"] for task in inserted] == [9000 + TASK_ORDER_GAP, 9000, 9000 + 2 * TASK_ORDER_GAP]
+
+
+@pytest.mark.asyncio
+async def test_bulk_endpoint():
+    from src.server.api_routes.projects_api import BulkTasksRequest, bulk_write_tasks
+
+    service = MagicMock()
+
+    async def bulk(*args, **kwargs):
+        service.calls = (args, kwargs)
+        return True, {"created": [_row("new-1")], "updated": [], "missing": []}
+
+    service.bulk_write_tasks = bulk
+    with patch("src.server.api_routes.projects_api.TaskService", return_value=service):
+        request = BulkTasksRequest(project_id="project-1", create=[{"title": "Plan"}], reorder=["t-1"])
+        response = await bulk_write_tasks(request)
+
+    assert response["created"][0]["id"] == "new-1"
+    assert service.calls == (
+        ("project-1",),
+        {"creates": [{"title": "Plan"}], "updates": [], "reorder": ["t-1"]},
+    )
+
+    async def invalid(*args, **kwargs):
+        return False, {"error": "creates[0]: Task title is required and must be a non-empty string"}
+
+    service.bulk_write_tasks = invalid
+    with patch("src.server.api_routes.projects_api.TaskService", return_value=service):
+        with pytest.raises(HTTPException) as exc_info:
+            await bulk_write_tasks(BulkTasksRequest(project_id="project-1", create=[{"title": ""}]))
+    assert exc_info.value.status_code == 400
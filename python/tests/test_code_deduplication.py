@@ -0,0 +1,107 @@
+"""
+Tests and benchmark for MinHash/LSH code block deduplication.
+"""
+
+import random
+import time
+from difflib import SequenceMatcher
+
+import pytest
+
+from src.server.services.storage.code_deduplication import (
+    estimated_jaccard,
+    group_similar_code,
+    minhash_signature,
+)
+from src.server.services.storage.code_storage_service import (
+    _normalize_code_for_comparison,
+    extract_code_blocks,
+)
+
+
+def _make_blocks(count: int, seed: int = 0) -> list[str]:
+    """Synthetic API-reference style blocks: families of near-duplicate variants."""
+    rng = random.Random(seed)
+    families = max(1, count // 4)
+    blocks = []
+    for i in range(count):
+        family = i % families
+        family_rng = random.Random(family)
+        lines = [f"async def endpoint_{family}(request, item_id: int):"]
+        for k in range(family_rng.randint(6, 12)):
+            lines.append(f"    value_{k} = service_{family_rng.randint(0, 999)}.fetch(item_id, {family_rng.randint(0, 99)})")
+        variant = rng.random()
+        if variant < 0.3:
+            lines.insert(1, f"    # variant {rng.randint(0, 5)}")
+        elif variant < 0.5:
+            lines[0] = lines[0].replace("item_id: int", "item_id: Annotated[int, Path()]")
+        lines.append("    return value_0")
+        blocks.append("\n".join(lines))
+    rng.shuffle(blocks)
+    return blocks
+
+
+def _reference_groups(codes: list[str]) -> list[list[int]]:
+    """The original O(n^2) pairwise grouping."""
+    normalized = [_normalize_code_for_comparison(code) for code in codes]
+    groups = []
+    processed = set()
+    for i, code in enumerate(normalized):
+        if i in processed:
+            continue
+        group = [i]
+        processed.add(i)
+        for j in range(i + 1, len(codes)):
+            if j not in processed and SequenceMatcher(None, code, normalized[j]).ratio() >= 0.85:
+                group.append(j)
+                processed.add(j)
+        groups.append(group)
+    return groups
+
+
+def test_small_inputs_match_pairwise_reference():
+    codes = _make_blocks(60, seed=1)
+    assert group_similar_code(codes, _normalize_code_for_comparison) == _reference_groups(codes)
+
+
+def test_lsh_grouping_matches_pairwise_reference():
+    codes = _make_blocks(200, seed=2)
+    lsh_groups = group_similar_code(codes, _normalize_code_for_comparison, exact_max_blocks=0)
+    assert lsh_groups == _reference_groups(codes)
+
+
+def test_signatures_estimate_jaccard():
+    identical = minhash_signature({1, 2, 3, 4, 5})
+    assert estimated_jaccard(identical, minhash_signature({1, 2, 3, 4, 5})) == 1.0
+    disjoint = minhash_signature(set(range(1000, 2000)))
+    assert estimated_jaccard(minhash_signature(set(range(1000))), disjoint) < 0.1
+
+
+def test_extract_code_blocks_keeps_best_variant_semantics():
+    code = "\n".join(f"result_{i} = client.query('select {i}')" for i in range(12))
+    markdown = (
+        "Plain variant:\n\n```\n" + code + "\n```\n\n"
+        "Typed variant with more context around it:\n\n```python\n" + code + "\n```\n"
+    )
+
+    blocks = extract_code_blocks(markdown, min_length=50)
+
+    assert len(blocks) == 1
+    assert blocks[0]["language"] == "python"
+    assert blocks[0]["consolidated_variants"] == 2
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("block_count", [1_000, 5_000, 10_000])
+def test_deduplication_benchmark(block_count):
+    codes = _make_blocks(block_count)
+
+    start = time.perf_counter()
+    groups = group_similar_code(codes, _normalize_code_for_comparison)
+    elapsed = time.perf_counter() - start
+
+    print(f"dedup {block_count} blocks -> {len(groups)} groups in {elapsed:.2f}s "
+          f"({block_count / elapsed:.0f} blocks/sec)")
+    assert sum(len(g) for g in groups) == block_count
+    # Each family has four members; near-duplicates must collapse
+    assert len(groups) <= block_count // 2
@@ -0,0 +1,148 @@
+"""
+Tests for the native-async code summary batch pipeline.
+"""
+
+import json
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.server.services.storage import code_storage_service
+from src.server.services.storage.code_storage_service import generate_code_summaries_batch
+from src.server.services.threading_service import get_threading_service
+
+MODULE = "src.server.services.storage.code_storage_service"
+
+
+def _response(payload: dict) -> SimpleNamespace:
+    message = SimpleNamespace(content=json.dumps(payload), role="assistant")
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _blocks(count: int) -> list[dict]:
+    return [
+        {
+            "code": f"def func_{i}():\n    return {i}\n" * 5,
+            "context_before": "Example usage",
+            "context_after": "",
+            "language": "python",
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def llm_client():
+    """Fake LLM client plus a counter of how many times a client was acquired."""
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock()
+    acquisitions = []
+
+    @asynccontextmanager
+    async def fake_get_llm_client(provider=None, **kwargs):
+        acquisitions.append(provider)
+        yield client
+
+    with patch(f"{MODULE}.get_llm_client", fake_get_llm_client), patch(
+        f"{MODULE}._get_model_choice", AsyncMock(return_value="gpt-4o-mini")
+    ), patch.object(code_storage_service.credential_service, "_cache_initialized", False):
+        yield client, acquisitions
+
+
+@pytest.mark.asyncio
+async def test_batch_shares_one_client_without_threads(llm_client, monkeypatch):
+    client, acquisitions = llm_client
+    client.chat.completions.create.return_value = _response(
+        {"example_name": "Return Value", "summary": "Returns a constant value from a function."}
+    )
+    progress = []
+
+    async def progress_callback(data):
+        progress.append(data)
+
+    summaries = await generate_code_summaries_batch(
+        _blocks(6), max_workers=2, progress_callback=progress_callback, provider="openai"
+    )
+
+    assert len(summaries) == 6
+    assert all(s["example_name"] == "Return Value" for s in summaries)
+    assert acquisitions == ["openai"]
+    assert client.chat.completions.create.await_count == 6
+    assert progress[-1]["completed_summaries"] == 6
+    assert "blocks_per_second" in progress[-1]
+
+
+@pytest.mark.asyncio
+async def test_multiple_blocks_packed_into_one_prompt(llm_client, monkeypatch):
+    client, _ = llm_client
+    monkeypatch.setenv("CODE_SUMMARY_BLOCKS_PER_REQUEST", "3")
+    client.chat.completions.create.return_value = _response(
+        {
+            "summaries": [
+                {"index": i, "example_name": f"Example {i}", "summary": f"Summary {i}."}
+                for i in range(3)
+            ]
+        }
+    )
+
+    summaries = await generate_code_summaries_batch(_blocks(6), max_workers=2, provider="openai")
+
+    assert [s["example_name"] for s in summaries] == [f"Example {i % 3}" for i in range(6)]
+    assert client.chat.completions.create.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_blocks_missing_from_packed_response_fall_back_to_single_requests(llm_client, monkeypatch):
+    client, _ = llm_client
+    monkeypatch.setenv("CODE_SUMMARY_BLOCKS_PER_REQUEST", "2")
+    client.chat.completions.create.side_effect = [
+        _response({"summaries": [{"index": 0, "example_name": "First", "summary": "First block."}]}),
+        _response({"example_name": "Second", "summary": "Second block summarized on its own."}),
+    ]
+
+    summaries = await generate_code_summaries_batch(_blocks(2), max_workers=1, provider="openai")
+
+    assert summaries[0]["example_name"] == "First"
+    assert summaries[1]["example_name"] == "Second"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("blocks_per_request, block_count, responses", [
+    ("1", 5, [_response({"example_name": "Single", "summary": "One block."})] * 5),
+    ("2", 2, [
+        _response({"summaries": [{"index": 0, "example_name": "First", "summary": "First block."}]}),
+        _response({"example_name": "Second", "summary": "Second block summarized on its own."}),
+    ]),
+])
+async def test_each_llm_request_takes_one_rate_limit_slot(
+    llm_client, monkeypatch, blocks_per_request, block_count, responses
+):
+    client, _ = llm_client
+    monkeypatch.setenv("CODE_SUMMARY_BLOCKS_PER_REQUEST", blocks_per_request)
+    client.chat.completions.create.side_effect = responses
+    rate_limiter = get_threading_service().rate_limiter
+
+    with patch.object(rate_limiter, "acquire", AsyncMock(return_value=True)) as acquire:
+        await generate_code_summaries_batch(_blocks(block_count), provider="openai")
+
+    assert client.chat.completions.create.await_count == len(responses)
+    assert acquire.await_count == len(responses)
+
+
+@pytest.mark.asyncio
+async def test_client_failure_returns_fallback_summaries(monkeypatch):
+    @asynccontextmanager
+    async def failing_client(provider=None, **kwargs):
+        raise ValueError("OpenAI API key not found")
+        yield
+
+    with patch(f"{MODULE}.get_llm_client", failing_client), patch(
+        f"{MODULE}._get_model_choice", AsyncMock(return_value="gpt-4o-mini")
+    ):
+        summaries = await generate_code_summaries_batch(_blocks(2), provider="openai")
+
+    assert summaries == [
+        {"example_name": "Code Example (python)", "summary": "Code example for demonstration purposes."}
+    ] * 2
@@ -0,0 +1,123 @@
+"""
+Tests for the content-hash embedding cache.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.server.services.embeddings.embedding_cache import EmbeddingCache, content_hash
+from src.server.services.embeddings.embedding_service import create_embeddings_batch
+
+SERVICE_MODULE = "src.server.services.embeddings.embedding_service"
+
+
+class AsyncContextManager:
+    def __init__(self, return_value):
+        self.return_value = return_value
+
+    async def __aenter__(self):
+        return self.return_value
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+def _vector(text: str) -> list[float]:
+    return [float(len(text)), 0.5, 0.25]
+
+
+@pytest.fixture
+def provider():
+    """Fake embedding client returning a deterministic vector per input text."""
+    client = MagicMock()
+
+    async def create(model, input, dimensions):
+        return SimpleNamespace(data=[SimpleNamespace(embedding=_vector(text)) for text in input])
+
+    client.embeddings.create = AsyncMock(side_effect=create)
+    threading_service = MagicMock()
+    threading_service.rate_limited_operation.return_value = AsyncContextManager(None)
+
+    with (
+        patch(f"{SERVICE_MODULE}.get_llm_client", return_value=AsyncContextManager(client)),
+        patch(f"{SERVICE_MODULE}.get_embedding_model", AsyncMock(return_value="text-embedding-3-small")),
+        patch(f"{SERVICE_MODULE}.get_threading_service", return_value=threading_service),
+        patch(f"{SERVICE_MODULE}.credential_service") as cred,
+    ):
+        cred.get_credentials_by_category = AsyncMock(
+            return_value={"EMBEDDING_BATCH_SIZE": "10", "EMBEDDING_DIMENSIONS": "3"}
+        )
+        yield client
+
+
+def test_content_hash_ignores_whitespace_only_changes():
+    assert content_hash("def foo():\n    return 1\n") == content_hash("def foo():  \n return 1")
+    assert content_hash("def foo(): return 1") != content_hash("def foo(): return 2")
+
+
+@pytest.mark.asyncio
+async def test_cache_round_trip_is_keyed_by_model_and_dimensions(tmp_path):
+    cache = EmbeddingCache(tmp_path / "cache.sqlite3")
+    await cache.put_many("model-a", 3, ["alpha", "beta"], [[0.5, 1.0, 2.0], [1.5, 2.5, 3.5]])
+
+    assert await cache.get_many("model-a", 3, ["beta", "gamma", "alpha"]) == {
+        0: [1.5, 2.5, 3.5],
+        2: [0.5, 1.0, 2.0],
+    }
+    assert await cache.get_many("model-b", 3, ["alpha"]) == {}
+    assert await cache.get_many("model-a", 1536, ["alpha"]) == {}
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 3
+    cache.close()
+
+    # Entries persist across instances
+    reopened = EmbeddingCache(tmp_path / "cache.sqlite3")
+    assert await reopened.get_many("model-a", 3, ["alpha"]) == {0: [0.5, 1.0, 2.0]}
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_cache_prunes_least_recently_used_entries():
+    cache = EmbeddingCache(":memory:", max_entries=2)
+    await cache.put_many("m", 1, ["one"], [[1.0]])
+    await cache.put_many("m", 1, ["two"], [[2.0]])
+    await cache.get_many("m", 1, ["one"])  # refresh "one"
+    await cache.put_many("m", 1, ["three"], [[3.0]])
+
+    assert sorted(await cache.get_many("m", 1, ["one", "two", "three"])) == [0, 2]
+
+
+@pytest.mark.asyncio
+async def test_create_embeddings_batch_only_sends_cache_misses(provider):
+    first = await create_embeddings_batch(["page one", "page two"])
+    assert first.cache_hits == 0
+    assert first.cache_misses == 2
+    assert provider.embeddings.create.await_args.kwargs["input"] == ["page one", "page two"]
+
+    second = await create_embeddings_batch(["page one", "page three!", "page  two"])
+
+    # Only the new chunk reaches the provider
+    assert provider.embeddings.create.await_count == 2
+    assert provider.embeddings.create.await_args.kwargs["input"] == ["page three!"]
+    assert second.cache_hits == 2
+    assert second.cache_misses == 1
+    assert second.cache_hit_rate == pytest.approx(2 / 3)
+    # Results keep input order and map back to the caller's texts
+    assert second.texts_processed == ["page one", "page three!", "page  two"]
+    assert second.embeddings == [_vector("page one"), _vector("page three!"), _vector("page two")]
+
+
+@pytest.mark.asyncio
+async def test_create_embeddings_batch_all_hits_skips_provider(provider):
+    await create_embeddings_batch(["cached chunk"])
+    provider.embeddings.create.reset_mock()
+
+    result = await create_embeddings_batch(["cached chunk"])
+
+    provider.embeddings.create.assert_not_awaited()
+    assert result.success_count == 1
+    assert result.cache_hit_rate == 1.0
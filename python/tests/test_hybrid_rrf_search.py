@@ -0,0 +1,150 @@
+"""
+Tests for hybrid search with client-side reciprocal rank fusion.
+"""
+
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.server.services.search.base_search_strategy import BaseSearchStrategy
+from src.server.services.search.hybrid_search_strategy import HybridSearchStrategy, reciprocal_rank_fusion
+from src.server.services.search.rag_service import RAGService
+
+EMBEDDING = [0.1, 0.2, 0.3]
+
+
+def _row(chunk_id: int, **fields):
+    return {
+        "id": chunk_id,
+        "url": f"https://docs.example.com/{chunk_id}",
+        "chunk_number": 0,
+        "content": f"chunk {chunk_id}",
+        "metadata": {},
+        "source_id": "docs.example.com",
+        **fields,
+    }
+
+
+@pytest.fixture
+def database():
+    """Vector and full-text RPCs that each take 100ms, recording their calls."""
+    calls = []
+    failing = set()
+
+    async def execute_rpc(client, name, params):
+        calls.append((name, params))
+        await asyncio.sleep(0.1)
+        if name in failing:
+            raise RuntimeError(f"{name} timed out")
+        if name == "search_archon_crawled_pages_text":
+            return [_row(3, text_score=0.9), _row(1, text_score=0.5), _row(4, text_score=0.2)]
+        if name == "hybrid_search_archon_crawled_pages":
+            return [_row(1, similarity=0.9, match_type="hybrid")]
+        return [_row(1, similarity=0.92), _row(2, similarity=0.81), _row(3, similarity=0.4)]
+
+    with (
+        patch("src.server.services.search.base_search_strategy.execute_rpc", side_effect=execute_rpc),
+        patch("src.server.services.search.hybrid_search_strategy.execute_rpc", side_effect=execute_rpc),
+    ):
+        yield calls, failing
+
+
+def test_reciprocal_rank_fusion_weights_and_dedupes():
+    vector = [{"id": "a"}, {"id": "b"}, {"id": "c"}]
+    text = [{"id": "c"}, {"id": "d"}, {"id": "c"}]
+
+    fused = reciprocal_rank_fusion([(vector, 1.0), (text, 1.0)], k=60)
+
+    # Found by both lists beats a single first place
+    assert [entry["id"] for entry in fused] == ["c", "a", "b", "d"]
+    assert fused[0]["ranks"] == [3, 1]
+    assert fused[0]["rrf_score"] == pytest.approx(1 / 63 + 1 / 61)
+
+    # A heavier text weight lets its top result win
+    fused = reciprocal_rank_fusion([(vector, 1.0), (text, 3.0)], k=60)
+    assert fused[0]["id"] == "c"
+    assert fused[1]["id"] == "d"
+
+
+@pytest.mark.asyncio
+async def test_rrf_runs_both_legs_concurrently(database):
+    calls, _ = database
+    strategy = HybridSearchStrategy(MagicMock(), BaseSearchStrategy(MagicMock()))
+    timings = {}
+
+    start = time.perf_counter()
+    results = await strategy.search_documents_rrf(
+        "asyncio task", EMBEDDING, match_count=3, filter_metadata={"source": "docs.example.com"}, timings=timings
+    )
+    elapsed = time.perf_counter() - start
+
+    # Both 100ms legs overlap
+    assert elapsed < 0.18
+    assert sorted(name for name, _ in calls) == ["match_archon_crawled_pages", "search_archon_crawled_pages_text"]
+    text_params = dict(calls)["search_archon_crawled_pages_text"]
+    assert text_params == {
+        "query_text": "asyncio task",
+        "match_count": 3,
+        "filter": {},
+        "source_filter": "docs.example.com",
+    }
+
+    assert [r["id"] for r in results] == [1, 3, 2]
+    assert [r["match_type"] for r in results] == ["hybrid", "hybrid", "vector"]
+    assert (results[1]["vector_rank"], results[1]["text_rank"]) == (3, 1)
+    assert results[0]["similarity"] == 0.92
+
+    assert set(timings) == {"vector", "text", "fusion", "total"}
+    assert timings["vector"] >= 100 and timings["text"] >= 100
+    assert timings["total"] < timings["vector"] + timings["text"]
+
+
+@pytest.mark.asyncio
+async def test_failed_leg_falls_back_to_the_other(database):
+    _, failing = database
+    strategy = HybridSearchStrategy(MagicMock(), BaseSearchStrategy(MagicMock()))
+
+    failing.add("match_archon_crawled_pages")
+    results = await strategy.search_documents_rrf("asyncio task", EMBEDDING, match_count=5)
+
+    assert [r["id"] for r in results] == [3, 1, 4]
+    assert all(r["match_type"] == "keyword" for r in results)
+    assert results[0]["similarity"] == 0.9
+
+    failing.clear()
+    failing.add("search_archon_crawled_pages_text")
+    timings = {}
+    results = await strategy.search_documents_rrf("asyncio task", EMBEDDING, match_count=5, timings=timings)
+
+    assert [r["id"] for r in results] == [1, 2, 3]
+    assert all(r["match_type"] == "vector" for r in results)
+    assert timings["text"] is None
+
+
+@pytest.mark.asyncio
+async def test_rag_query_reports_leg_latency_in_rrf_mode(database):
+    calls, _ = database
+    settings = {"USE_HYBRID_SEARCH": "true", "USE_RERANKING": "false", "HYBRID_SEARCH_MODE": "rrf"}
+
+    with (
+        patch.object(RAGService, "get_setting", side_effect=lambda key, default="false": settings.get(key, default)),
+        patch("src.server.services.search.rag_service.create_query_embedding") as embed,
+    ):
+        embed.return_value = EMBEDDING
+        rag = RAGService(supabase_client=MagicMock(), reranking_strategy=None)
+
+        success, response = await rag.perform_rag_query("asyncio task", match_count=2)
+        assert success
+        assert [r["id"] for r in response["results"]] == [1, 3]
+        assert response["results"][0]["match_type"] == "hybrid"
+        assert {"vector", "text", "fusion", "total"} <= set(response["search_timings_ms"])
+
+        # Union mode keeps using the SQL function and is cached separately
+        calls.clear()
+        settings["HYBRID_SEARCH_MODE"] = "union"
+        success, response = await rag.perform_rag_query("asyncio task", match_count=2)
+        assert success
+        assert [name for name, _ in calls] == ["hybrid_search_archon_crawled_pages"]
+        assert "search_timings_ms" not in response
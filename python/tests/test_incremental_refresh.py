@@ -0,0 +1,192 @@
+"""
+Tests for incremental knowledge refreshes driven by page fingerprints.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from src.server.services.crawling.document_storage_operations import DocumentStorageOperations
+from src.server.services.crawling.page_fingerprints import (
+    PageFingerprint,
+    PageFingerprintTracker,
+    hash_text,
+)
+from src.server.services.crawling.strategies.recursive import RecursiveCrawlStrategy
+from src.server.services.crawling.streaming_pipeline import StreamingIngestionPipeline
+
+PIPELINE_MODULE = "src.server.services.crawling.streaming_pipeline"
+FINGERPRINTS_MODULE = "src.server.services.crawling.page_fingerprints"
+
+
+def _fingerprint(url: str, chunks: list[str], **kwargs) -> PageFingerprint:
+    return PageFingerprint(
+        url=url,
+        content_hash=hash_text("\n\n".join(chunks)),
+        chunk_hashes=[hash_text(chunk) for chunk in chunks],
+        **kwargs,
+    )
+
+
+def _tracker(previous: list[PageFingerprint], client=None) -> PageFingerprintTracker:
+    tracker = PageFingerprintTracker(client or MagicMock(), "src-1", incremental=True)
+    tracker.previous = {fingerprint.url: fingerprint for fingerprint in previous}
+    return tracker
+
+
+def test_diff_reports_changed_and_removed_chunks():
+    tracker = _tracker([_fingerprint("https://example.com/a", ["one", "two", "three"])])
+
+    unchanged = tracker.diff("https://example.com/a", hash_text("one\n\ntwo\n\nthree"), [])
+    assert unchanged.unchanged
+
+    changed = tracker.diff(
+        "https://example.com/a", hash_text("one\n\nTWO"), [hash_text("one"), hash_text("TWO")]
+    )
+    assert not changed.unchanged
+    assert changed.changed_indices == [1]
+    assert changed.removed_indices == [2]
+
+    new = tracker.diff("https://example.com/new", "hash", [hash_text("x"), hash_text("y")])
+    assert new.changed_indices == [0, 1]
+    assert new.previous_chunk_count is None
+
+    assert tracker.stats["pages_unchanged"] == 1
+    assert tracker.stats["pages_changed"] == 1
+    assert tracker.stats["pages_new"] == 1
+    assert tracker.stats["chunks_deleted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_pipeline_only_embeds_changed_chunks():
+    supabase = MagicMock()
+    ops = DocumentStorageOperations(supabase)
+    ops.doc_storage_service.smart_chunk_text_async = AsyncMock(
+        side_effect=lambda text, chunk_size: text.split("\n\n")
+    )
+    ops._create_source_records = AsyncMock()
+    tracker = _tracker(
+        [
+            _fingerprint("https://example.com/same", ["alpha", "beta"]),
+            _fingerprint("https://example.com/edited", ["gamma", "delta", "epsilon"]),
+        ],
+        client=supabase,
+    )
+    pipeline = StreamingIngestionPipeline(
+        ops, {"knowledge_type": "documentation"}, "src-1", crawl_type="sitemap",
+        extract_code_examples=False, flush_seconds=0.01, fingerprints=tracker,
+    )
+    add_documents = AsyncMock(side_effect=lambda **kwargs: {"chunks_stored": len(kwargs["contents"])})
+
+    with patch(f"{PIPELINE_MODULE}.add_documents_to_supabase", add_documents):
+        pipeline.start()
+        await pipeline.submit({"url": "https://example.com/same", "markdown": "alpha\n\nbeta"})
+        await pipeline.submit({"url": "https://example.com/edited", "markdown": "gamma\n\nDELTA"})
+        await pipeline.submit({"url": "https://example.com/new", "markdown": "zeta"})
+        results = await pipeline.finish()
+
+    stored = [
+        (url, number, content)
+        for call in add_documents.await_args_list
+        for url, number, content in zip(
+            call.kwargs["urls"], call.kwargs["chunk_numbers"], call.kwargs["contents"], strict=True
+        )
+    ]
+    assert sorted(stored) == [
+        ("https://example.com/edited", 1, "DELTA"),
+        ("https://example.com/new", 0, "zeta"),
+    ]
+    assert all(call.kwargs["replace_existing"] is False for call in add_documents.await_args_list)
+
+    # Only the replaced and removed chunks of the edited page are deleted; the new page is replaced
+    delete = supabase.table.return_value.delete.return_value
+    delete.eq.assert_any_call("url", "https://example.com/edited")
+    delete.eq.return_value.in_.assert_called_once_with("chunk_number", [1, 2])
+    delete.eq.assert_any_call("url", "https://example.com/new")
+
+    # The source already exists, so its summary is not regenerated from a partial crawl
+    ops._create_source_records.assert_not_awaited()
+
+    assert results["pages_unchanged"] == 1
+    assert results["chunks_skipped"] == 3
+    assert results["chunks_embedded"] == 2
+    assert results["chunks_deleted"] == 1
+    assert results["chunk_count"] == results["chunks_stored"] == 2
+
+    # Fingerprints for every crawled page are saved for the next refresh
+    upserted = supabase.table.return_value.upsert.call_args_list
+    saved_urls = {row["url"] for call in upserted for row in call.args[0]}
+    assert saved_urls == {"https://example.com/same", "https://example.com/edited", "https://example.com/new"}
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_skips_not_modified_pages():
+    tracker = _tracker([
+        _fingerprint("https://example.com/a", ["a"], etag='"v1"', internal_links=["https://example.com/b"]),
+        _fingerprint("https://example.com/c", ["c"], last_modified="Mon, 01 Jan 2024 00:00:00 GMT"),
+        _fingerprint("https://example.com/no-validators", ["d"]),
+    ])
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, text="changed")
+
+    real_client = httpx.AsyncClient
+    with patch(
+        f"{FINGERPRINTS_MODULE}.httpx.AsyncClient",
+        side_effect=lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+    ):
+        not_modified = await tracker.filter_not_modified(
+            ["https://example.com/a", "https://example.com/c", "https://example.com/no-validators"]
+        )
+
+    assert not_modified == {"https://example.com/a": ["https://example.com/b"]}
+    # Pages without stored validators are not probed
+    assert sorted(str(request.url) for request in requests) == ["https://example.com/a", "https://example.com/c"]
+    assert tracker.stats["pages_not_modified"] == 1
+
+
+@pytest.mark.asyncio
+async def test_recursive_crawl_follows_links_of_not_modified_pages():
+    crawled = []
+
+    async def arun_many(urls, config, dispatcher):
+        crawled.extend(urls)
+
+        async def results():
+            for url in urls:
+                yield SimpleNamespace(
+                    url=url,
+                    success=True,
+                    markdown=SimpleNamespace(fit_markdown=f"content of {url}"),
+                    html="",
+                    links={"internal": []},
+                    response_headers={"ETag": '"v2"'},
+                )
+
+        return results()
+
+    crawler = MagicMock()
+    crawler.arun_many = AsyncMock(side_effect=arun_many)
+    strategy = RecursiveCrawlStrategy(crawler, MagicMock())
+
+    async def filter_unchanged(urls):
+        return {"https://example.com/": ["https://example.com/child"]} if "https://example.com/" in urls else {}
+
+    with patch(
+        "src.server.services.crawling.strategies.recursive.credential_service.get_credentials_by_category",
+        AsyncMock(return_value={}),
+    ):
+        results = await strategy.crawl_recursive_with_progress(
+            ["https://example.com/"], lambda url: url, lambda url: False,
+            max_depth=2, filter_unchanged=filter_unchanged,
+        )
+
+    assert crawled == ["https://example.com/child"]
+    assert results[0]["url"] == "https://example.com/child"
+    assert results[0]["etag"] == '"v2"'
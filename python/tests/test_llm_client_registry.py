@@ -0,0 +1,80 @@
+"""
+Tests for the pooled LLM client registry.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.server.services.llm_client_registry import LLMClientRegistry
+
+
+def _make_client():
+    client = MagicMock()
+    client.aclose = AsyncMock()
+    return client
+
+
+@pytest.mark.asyncio
+async def test_reuses_client_per_provider_base_url_and_key():
+    registry = LLMClientRegistry()
+    factory = MagicMock(side_effect=_make_client)
+
+    first, pooled = registry.acquire("openai", None, "sk-one", factory)
+    second, _ = registry.acquire("openai", None, "sk-one", factory)
+    other_key, _ = registry.acquire("openai", None, "sk-two", factory)
+    other_url, _ = registry.acquire("ollama", "http://localhost:11434/v1", "ollama", factory)
+
+    assert pooled is True
+    assert first is second
+    assert other_key is not first
+    assert other_url is not first
+    assert factory.call_count == 3
+
+    stats = registry.get_stats()
+    assert stats["pooled_clients"] == 3
+    assert stats["reuse_hits"] == 1
+    # Raw API keys never appear in metrics
+    assert "sk-one" not in str(stats)
+
+
+@pytest.mark.asyncio
+async def test_invalidate_retires_and_close_all_closes():
+    registry = LLMClientRegistry()
+    openai_client, _ = registry.acquire("openai", None, "sk", _make_client)
+    google_client, _ = registry.acquire("google", "https://g", "gk", _make_client)
+
+    assert registry.invalidate("openai") == 1
+    # Retired clients are not closed immediately (requests may be in flight)
+    openai_client.aclose.assert_not_awaited()
+
+    replacement, _ = registry.acquire("openai", None, "sk", _make_client)
+    assert replacement is not openai_client
+
+    await registry.close_all()
+    openai_client.aclose.assert_awaited_once()
+    google_client.aclose.assert_awaited_once()
+    replacement.aclose.assert_awaited_once()
+    assert registry.get_stats()["pooled_clients"] == 0
+
+
+def test_clients_are_not_pooled_across_event_loops():
+    registry = LLMClientRegistry()
+
+    async def acquire():
+        return registry.acquire("openai", None, "sk", _make_client)
+
+    async def acquire_in_thread():
+        return await asyncio.to_thread(lambda: asyncio.run(acquire()))
+
+    async def main():
+        bound, pooled = await acquire()
+        foreign, foreign_pooled = await acquire_in_thread()
+        return bound, pooled, foreign, foreign_pooled
+
+    bound, pooled, foreign, foreign_pooled = asyncio.run(main())
+
+    assert pooled is True
+    assert foreign_pooled is False
+    assert foreign is not bound
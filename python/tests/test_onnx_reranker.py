@@ -0,0 +1,286 @@
+"""
+Tests for the ONNX Runtime reranker backend and its comparison with the torch CrossEncoder.
+"""
+
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from tokenizers import Tokenizer, models, pre_tokenizers, processors
+
+from src.server.services.search import rag_service
+from src.server.services.search.onnx_reranker import OnnxCrossEncoder
+from src.server.services.search.reranking_strategy import DEFAULT_RERANKING_MODEL, RerankingStrategy
+
+STRATEGY_MODULE = "src.server.services.search.reranking_strategy"
+
+# Fixed query set: (query, candidate documents, index of the relevant document)
+QUERY_SET = [
+    (
+        "how do I create a virtual environment in python",
+        [
+            "The venv module creates lightweight virtual environments: python -m venv .venv",
+            "Rust uses cargo to manage dependencies and build projects.",
+            "Docker images are built from a Dockerfile with docker build.",
+            "pip install installs packages from the Python Package Index.",
+        ],
+        0,
+    ),
+    (
+        "what is the default port of postgres",
+        [
+            "Redis listens on port 6379 by default.",
+            "PostgreSQL accepts connections on TCP port 5432 unless configured otherwise.",
+            "HTTP servers usually listen on port 80.",
+            "MySQL's default port is 3306.",
+        ],
+        1,
+    ),
+    (
+        "react hook for side effects",
+        [
+            "useState returns a stateful value and a function to update it.",
+            "CSS grid lays out elements in rows and columns.",
+            "useEffect lets you synchronize a component with an external system after rendering.",
+            "Vue components declare reactive data in the data option.",
+        ],
+        2,
+    ),
+    (
+        "cancel an asyncio task",
+        [
+            "Threads in Python share memory and are limited by the GIL.",
+            "asyncio.gather runs awaitables concurrently and collects their results.",
+            "The json module serializes Python objects to JSON strings.",
+            "Call task.cancel() to request cancellation; the task receives CancelledError at its next await.",
+        ],
+        3,
+    ),
+    (
+        "create an index on a jsonb column",
+        [
+            "A GIN index on a jsonb column speeds up containment queries: CREATE INDEX ON t USING gin (doc);",
+            "VACUUM reclaims storage occupied by dead tuples.",
+            "Foreign keys enforce referential integrity between tables.",
+            "SELECT DISTINCT removes duplicate rows from a result.",
+        ],
+        0,
+    ),
+    (
+        "git undo last commit but keep changes",
+        [
+            "git log shows the commit history.",
+            "git reset --soft HEAD~1 removes the last commit and keeps its changes staged.",
+            "git clone copies a repository into a new directory.",
+            "git stash saves uncommitted changes for later.",
+        ],
+        1,
+    ),
+]
+
+
+class LengthModel:
+    """Scores a pair by how many query words appear in the document."""
+
+    def __init__(self, delay: float = 0.0, noise: float = 0.0):
+        self.delay = delay
+        self.rng = np.random.default_rng(0)
+        self.noise = noise
+
+    def predict(self, pairs):
+        time.sleep(self.delay)
+        scores = []
+        for query, document in pairs:
+            words = set(document.lower().replace(".", " ").split())
+            scores.append(sum(word in words for word in query.lower().split()))
+        return np.asarray(scores, dtype=np.float32) + self.rng.normal(0, self.noise, len(pairs))
+
+
+def compare_rerankers(reference, candidate, query_set=QUERY_SET, repeats: int = 3) -> dict:
+    """
+    Compare two rerank models on a fixed query set.
+
+    Quality: MRR of the relevant document for each model, how often both put the same
+    document first, and the mean Spearman correlation of their rankings. Latency: median
+    and p95 of one predict call per query.
+    """
+
+    def evaluate(model):
+        rankings, reciprocal_ranks, latencies = [], [], []
+        for query, documents, relevant in query_set:
+            pairs = [[query, document] for document in documents]
+            for _ in range(repeats):
+                start = time.perf_counter()
+                scores = np.asarray(model.predict(pairs), dtype=np.float64)
+                latencies.append(time.perf_counter() - start)
+            order = [int(i) for i in np.argsort(-scores, kind="stable")]
+            rankings.append(order)
+            reciprocal_ranks.append(1.0 / (order.index(relevant) + 1))
+        latencies.sort()
+        return {
+            "mrr": statistics.mean(reciprocal_ranks),
+            "p50_ms": 1000 * statistics.median(latencies),
+            "p95_ms": 1000 * latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+        }, rankings
+
+    reference_stats, reference_rankings = evaluate(reference)
+    candidate_stats, candidate_rankings = evaluate(candidate)
+
+    def spearman(a, b):
+        n = len(a)
+        rank_a = {doc: i for i, doc in enumerate(a)}
+        rank_b = {doc: i for i, doc in enumerate(b)}
+        return 1 - 6 * sum((rank_a[d] - rank_b[d]) ** 2 for d in rank_a) / (n * (n * n - 1))
+
+    return {
+        "reference": reference_stats,
+        "candidate": candidate_stats,
+        "top1_agreement": statistics.mean(
+            a[0] == b[0] for a, b in zip(reference_rankings, candidate_rankings, strict=True)
+        ),
+        "spearman": statistics.mean(
+            spearman(a, b) for a, b in zip(reference_rankings, candidate_rankings, strict=True)
+        ),
+    }
+
+
+def _word_tokenizer() -> Tokenizer:
+    words = sorted({word for query, docs, _ in QUERY_SET for text in [query, *docs] for word in text.lower().split()})
+    vocab = {"[PAD]": 0, "[UNK]": 1, "[CLS]": 2, "[SEP]": 3, **{word: i + 4 for i, word in enumerate(words)}}
+    tokenizer = Tokenizer(models.WordLevel(vocab, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = pre_tokenizers.WhitespaceSplit()
+    tokenizer.post_processor = processors.TemplateProcessing(
+        single="[CLS] $A [SEP]",
+        pair="[CLS] $A [SEP] $B:1 [SEP]:1",
+        special_tokens=[("[CLS]", 2), ("[SEP]", 3)],
+    )
+    return tokenizer
+
+
+class FakeSession:
+    """onnxruntime.InferenceSession stand-in scoring by the number of attended tokens."""
+
+    def __init__(self, input_names=("input_ids", "attention_mask")):
+        self.input_names = input_names
+        self.feeds = []
+
+    def get_inputs(self):
+        return [SimpleNamespace(name=name) for name in self.input_names]
+
+    def run(self, output_names, feed):
+        self.feeds.append(feed)
+        return [feed["attention_mask"].sum(axis=1, keepdims=True).astype(np.float32)]
+
+
+def test_onnx_cross_encoder_truncates_documents_not_queries():
+    session = FakeSession()
+    tokenizer = _word_tokenizer()
+    model = OnnxCrossEncoder(session, tokenizer, max_length=10)
+    query = "cancel an asyncio task"
+    long_document = QUERY_SET[3][1][3]
+
+    scores = model.predict([[query, long_document], [query, "git log"]])
+
+    assert scores.shape == (2,)
+    # [CLS] + 4 query tokens + [SEP] + document tokens + [SEP], capped at 10
+    assert list(scores) == [10.0, 9.0]
+    feed = session.feeds[0]
+    # Only the inputs the model declares are fed, padded to the longest pair
+    assert set(feed) == {"input_ids", "attention_mask"}
+    assert feed["input_ids"].shape == (2, 10)
+    assert feed["input_ids"].dtype == np.int64
+    # The whole query survives; the document is what gets cut
+    query_ids = tokenizer.encode(query).ids
+    assert feed["input_ids"][0][: len(query_ids)].tolist() == query_ids
+
+
+@pytest.mark.asyncio
+async def test_onnx_backend_keeps_rerank_contract_without_torch():
+    model = OnnxCrossEncoder(FakeSession(("input_ids", "attention_mask", "token_type_ids")), _word_tokenizer())
+    with (
+        patch(f"{STRATEGY_MODULE}.onnx_runtime_available", return_value=True),
+        patch(f"{STRATEGY_MODULE}.OnnxCrossEncoder.load", return_value=model) as load,
+        patch.dict(sys.modules, {"sentence_transformers": None}),
+    ):
+        reranker = RerankingStrategy("cross-encoder/ms-marco-MiniLM-L-6-v2", backend="onnx", max_length=64)
+        assert reranker.warm_up()
+        results = [{"id": i, "content": document} for i, document in enumerate(QUERY_SET[0][1])]
+        reranked = await reranker.rerank_results(QUERY_SET[0][0], results, top_k=2)
+        reranker.close()
+
+    load.assert_called_once_with("cross-encoder/ms-marco-MiniLM-L-6-v2", "onnx/model_quint8_avx2.onnx", max_length=64)
+    assert len(reranked) == 2
+    assert all(isinstance(result["rerank_score"], float) for result in reranked)
+    assert reranked[0]["rerank_score"] >= reranked[1]["rerank_score"]
+    assert reranker.get_model_info()["backend"] == "onnx"
+
+
+def test_onnx_backend_unavailable_disables_reranking():
+    with patch(f"{STRATEGY_MODULE}.onnx_runtime_available", return_value=False):
+        reranker = RerankingStrategy(backend="onnx")
+
+    assert not reranker.is_available()
+
+
+@pytest.mark.asyncio
+async def test_backend_setting_change_reloads_shared_reranker():
+    settings = {"USE_RERANKING": "true", "RERANKING_BACKEND": "torch"}
+    loaded = []
+
+    def load(model_name, backend, max_length):
+        loaded.append(backend)
+        strategy = RerankingStrategy.from_model(LengthModel(), model_name)
+        strategy.backend, strategy.max_length = backend, max_length
+        return strategy
+
+    try:
+        with (
+            patch.object(rag_service, "_get_setting", side_effect=lambda key, default="false": settings.get(key, default)),
+            patch.object(rag_service, "RerankingStrategy", side_effect=load),
+            patch.object(rag_service, "get_supabase_client", return_value=MagicMock()),
+        ):
+            first = await rag_service.get_rag_service()
+            settings["RERANKING_BACKEND"] = "onnx"
+            rag_service.refresh_rag_service()
+            await rag_service._refresh_task
+            second = await rag_service.get_rag_service()
+    finally:
+        await rag_service.close_rag_service()
+
+    assert loaded == ["torch", "onnx"]
+    assert first.reranking_strategy.model_name == second.reranking_strategy.model_name == DEFAULT_RERANKING_MODEL
+    assert second.reranking_config.backend == "onnx"
+
+
+def test_comparison_harness_reports_quality_and_latency():
+    report = compare_rerankers(LengthModel(), LengthModel(noise=0.01), repeats=2)
+
+    assert report["reference"]["mrr"] > 0.5
+    assert 0.0 <= report["top1_agreement"] <= 1.0
+    assert -1.0 <= report["spearman"] <= 1.0
+    assert report["candidate"]["p95_ms"] >= report["candidate"]["p50_ms"]
+
+
+@pytest.mark.slow
+def test_benchmark_onnx_int8_against_torch_crossencoder():
+    """Latency and quality of the int8 ONNX reranker against the full-precision CrossEncoder."""
+    torch_reranker = RerankingStrategy(DEFAULT_RERANKING_MODEL, backend="torch")
+    onnx_reranker = RerankingStrategy(DEFAULT_RERANKING_MODEL, backend="onnx")
+    if not (torch_reranker.is_available() and onnx_reranker.is_available()):
+        pytest.skip("needs sentence-transformers, onnxruntime and access to the model files")
+
+    report = compare_rerankers(torch_reranker.model, onnx_reranker.model)
+    print(
+        f"torch: MRR {report['reference']['mrr']:.3f}, p50 {report['reference']['p50_ms']:.1f}ms, "
+        f"p95 {report['reference']['p95_ms']:.1f}ms | "
+        f"onnx int8: MRR {report['candidate']['mrr']:.3f}, p50 {report['candidate']['p50_ms']:.1f}ms, "
+        f"p95 {report['candidate']['p95_ms']:.1f}ms | "
+        f"top-1 agreement {report['top1_agreement']:.2f}, spearman {report['spearman']:.3f}"
+    )
+    # Quantization may reorder near-ties but must keep the relevant document on top
+    assert report["candidate"]["mrr"] >= report["reference"]["mrr"] - 0.1
+    assert report["top1_agreement"] >= 0.8
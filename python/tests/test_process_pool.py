@@ -0,0 +1,215 @@
+"""
+Tests for running chunking and code extraction in the managed process pool.
+"""
+
+import asyncio
+import html
+import os
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.server.services.crawling.code_extraction_service import (
+    CodeExtractionService,
+    extract_code_blocks_for_documents,
+)
+from src.server.services.storage.base_storage_service import chunk_text, chunk_texts
+from src.server.services.storage.storage_services import DocumentStorageService
+from src.server.services.threading_service import ThreadingConfig, ThreadingService
+
+EXTRACTION_MODULE = "src.server.services.crawling.code_extraction_service"
+
+CODE_SAMPLE = '''def load_settings(path):
+    """Load settings from a JSON file."""
+    import json
+
+    with open(path) as handle:
+        settings = json.load(handle)
+    for key, value in settings.items():
+        if isinstance(value, str) and value.isdigit():
+            settings[key] = int(value)
+    return settings
+
+
+class SettingsCache:
+    def __init__(self, path):
+        self.path = path
+        self._settings = None
+
+    def get(self, key, default=None):
+        if self._settings is None:
+            self._settings = load_settings(self.path)
+        return self._settings.get(key, default)
+'''
+
+
+def _document(index: int, paragraphs: int = 40) -> dict:
+    prose = "\n\n".join(
+        f"Section {index}.{p}: the crawler stores pages as chunks. Each chunk keeps its source URL."
+        for p in range(paragraphs)
+    )
+    markdown = f"# Page {index}\n\n{prose}\n\n```python\n{CODE_SAMPLE}```\n\n{prose}"
+    return {"url": f"https://example.com/docs/{index}", "markdown": markdown, "html": ""}
+
+
+def _html_document(index: int, paragraphs: int = 40) -> dict:
+    doc = _document(index, paragraphs)
+    prose = "".join(f"<p>Section {index}.{p}: pages are stored as chunks.</p>" for p in range(paragraphs))
+    code = html.escape(CODE_SAMPLE)
+    doc["html"] = (
+        f"<html><body>{prose}<pre><code class=\"language-python\">{code}</code></pre>{prose}</body></html>"
+    )
+    return doc
+
+
+@pytest.fixture
+def service():
+    threading_service = ThreadingService(ThreadingConfig(process_workers=2))
+    yield threading_service
+    threading_service.shutdown_process_pool()
+
+
+@pytest.mark.asyncio
+async def test_process_pool_chunking_matches_in_process(service):
+    texts = [_document(i, paragraphs=400)["markdown"] for i in range(6)]
+
+    results = await service.run_in_process_pool(chunk_texts, texts, 2000)
+
+    assert service.process_executor is not None
+    assert results == [chunk_text(text, 2000) for text in texts]
+
+
+@pytest.mark.asyncio
+async def test_smart_chunk_texts_async_groups_large_batches(service):
+    storage = DocumentStorageService(None)
+    storage.threading_service = service
+    texts = [_document(i, paragraphs=400)["markdown"] for i in range(5)] + ["", "short text"]
+
+    with patch("src.server.services.storage.base_storage_service.PROCESS_POOL_GROUP_CHARS", 100_000):
+        results = await storage.smart_chunk_texts_async(texts, chunk_size=5000)
+
+    assert results == [chunk_text(text, 5000) for text in texts]
+
+
+@pytest.mark.asyncio
+async def test_process_pool_disabled_runs_in_threads():
+    threading_service = ThreadingService(ThreadingConfig(process_workers=0))
+
+    assert await threading_service.run_in_process_pool(chunk_text, "one. two. three", 5) == chunk_text(
+        "one. two. three", 5
+    )
+    assert threading_service.process_executor is None
+
+
+@pytest.mark.asyncio
+async def test_code_extraction_worker_matches_in_process_extraction(service):
+    docs = [_document(i) for i in range(4)]
+    extraction = CodeExtractionService(None)
+    with patch(
+        f"{EXTRACTION_MODULE}.credential_service.get_credential",
+        AsyncMock(side_effect=lambda key, default: default),
+    ):
+        settings = await extraction._load_extraction_settings()
+        expected = [await extraction._extract_code_blocks_from_document(doc) for doc in docs]
+
+    results = await service.run_in_process_pool(extract_code_blocks_for_documents, docs, settings)
+
+    assert results == expected
+    assert all(len(blocks) == 1 and blocks[0]["language"] == "python" for blocks in results)
+
+
+@pytest.mark.asyncio
+async def test_extraction_uses_process_pool_for_large_crawls(service):
+    docs = [_document(i) for i in range(12)]
+    extraction = CodeExtractionService(None)
+    progress = []
+
+    async def record_progress(data):
+        progress.append(data["completed_documents"])
+
+    with (
+        patch(f"{EXTRACTION_MODULE}.get_threading_service", return_value=service),
+        patch(f"{EXTRACTION_MODULE}.PROCESS_POOL_EXTRACTION_THRESHOLD", 1000),
+        patch(f"{EXTRACTION_MODULE}.PROCESS_POOL_GROUP_MAX_DOCUMENTS", 5),
+        patch(
+            f"{EXTRACTION_MODULE}.credential_service.get_credential",
+            AsyncMock(side_effect=lambda key, default: default),
+        ),
+    ):
+        blocks = await extraction._extract_code_blocks_from_documents(docs, "src-1", record_progress)
+
+    assert service.process_executor is not None
+    assert [block["source_url"] for block in blocks] == [doc["url"] for doc in docs]
+    assert all(block["source_id"] == "src-1" for block in blocks)
+    # Progress is reported per document group, in order
+    assert progress == [5, 10, 12]
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_benchmark_process_pool_scaling():
+    """Chunk and extract a synthetic crawl with 1, 2 and 4 worker processes."""
+    docs = [_html_document(i, paragraphs=200) for i in range(96)]
+    texts = [doc["markdown"] for doc in docs]
+    groups = [docs[i:i + 6] for i in range(0, len(docs), 6)]
+    extraction = CodeExtractionService(None)
+    with patch(
+        f"{EXTRACTION_MODULE}.credential_service.get_credential",
+        AsyncMock(side_effect=lambda key, default: default),
+    ):
+        settings = await extraction._load_extraction_settings()
+
+    async def run_workload(threading_service):
+        return await asyncio.gather(
+            asyncio.gather(*(
+                threading_service.run_in_process_pool(chunk_texts, texts[i:i + 6], 1000)
+                for i in range(0, len(texts), 6)
+            )),
+            asyncio.gather(*(
+                threading_service.run_in_process_pool(extract_code_blocks_for_documents, group, settings)
+                for group in groups
+            )),
+        )
+
+    available_cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    baseline = None
+    single_worker_elapsed = None
+    for workers in (1, 2, 4):
+        threading_service = ThreadingService(ThreadingConfig(process_workers=workers))
+        try:
+            # Start every worker, then run the workload once untimed so workers have
+            # imported the extraction modules before anything is measured
+            pids = set()
+            deadline = time.monotonic() + 120
+            while len(pids) < workers and time.monotonic() < deadline:
+                pids.update(await asyncio.gather(*(
+                    threading_service.run_in_process_pool(os.getpid) for _ in range(workers)
+                )))
+            await run_workload(threading_service)
+
+            timings = []
+            for _ in range(3):
+                start = time.perf_counter()
+                chunked, extracted = await run_workload(threading_service)
+                timings.append(time.perf_counter() - start)
+        finally:
+            threading_service.shutdown_process_pool()
+
+        elapsed = min(timings)
+        print(f"process_workers={workers}: {len(docs) / elapsed:.1f} docs/s ({elapsed:.3f}s, best of 3)")
+        if baseline is None:
+            assert all(blocks for group in extracted for blocks in group)
+            baseline = (chunked, extracted)
+            single_worker_elapsed = elapsed
+        # Results never depend on the pool size
+        assert (chunked, extracted) == baseline
+
+        # Work spreads across cores: each usable core beyond the first must add
+        # at least 30% of single-worker throughput (pickling and scheduling eat the rest)
+        usable = min(workers, available_cores)
+        if usable > 1:
+            speedup = single_worker_elapsed / elapsed
+            assert speedup >= 1 + 0.3 * (usable - 1), (
+                f"{workers} workers on {available_cores} cores: only {speedup:.2f}x faster"
+            )
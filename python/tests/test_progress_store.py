@@ -0,0 +1,156 @@
+"""
+Tests for shared progress stores, cross-worker sync and the progress stream.
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.server.api_routes import progress_api
+from src.server.utils.progress import ProgressTracker, SQLiteProgressStore
+
+
+@pytest.fixture(autouse=True)
+async def reset_progress_tracker():
+    ProgressTracker._progress_states.clear()
+    yield
+    await ProgressTracker.stop_sync()
+    ProgressTracker._progress_states.clear()
+    ProgressTracker._owned.clear()
+    ProgressTracker._versions.clear()
+    ProgressTracker._store_versions.clear()
+    progress_api._response_cache.clear()
+
+
+async def _flush_publish(tracker: ProgressTracker) -> None:
+    if tracker._publish_task is not None:
+        await tracker._publish_task
+
+
+def _parse_events(chunks: list[str]) -> list[tuple[str, dict]]:
+    events = []
+    for chunk in chunks:
+        if chunk.startswith(":"):
+            continue
+        fields = dict(line.split(": ", 1) for line in chunk.strip().split("\n"))
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_sqlite_store_shares_progress_between_workers(tmp_path):
+    path = tmp_path / "progress.sqlite3"
+    await ProgressTracker.start_sync(SQLiteProgressStore(path), interval=60)
+    other_worker = SQLiteProgressStore(path)
+
+    # A state published by another worker shows up here after a sync
+    await other_worker.save("remote-op", {"progress_id": "remote-op", "type": "crawl", "status": "crawling", "progress": 40})
+    await ProgressTracker._sync.sync_once()
+    assert ProgressTracker.get_progress("remote-op")["progress"] == 40
+
+    # An older copy never overwrites a newer one
+    ProgressTracker._apply_synced_change("remote-op", {"status": "starting", "progress": 0}, version=1)
+    assert ProgressTracker.get_progress("remote-op")["progress"] == 40
+
+    # States tracked here are published for the other workers
+    tracker = ProgressTracker("local-op", operation_type="upload")
+    await tracker.start({"filename": "notes.md"})
+    await tracker.update("processing", 55, "Chunking")
+    await _flush_publish(tracker)
+    published = {progress_id: state for progress_id, state, _ in await other_worker.changes_since(0)}
+    assert published["local-op"]["progress"] == 55
+    assert published["local-op"]["filename"] == "notes.md"
+
+    # ...and syncing them back doesn't replace the live local state
+    await ProgressTracker._sync.sync_once()
+    assert ProgressTracker.get_progress("local-op") is tracker.state
+
+    # Deletions propagate as well
+    await other_worker.delete("remote-op")
+    await ProgressTracker._sync.sync_once()
+    assert ProgressTracker.get_progress("remote-op") is None
+    await other_worker.close()
+
+
+@pytest.mark.asyncio
+async def test_memory_store_keeps_progress_local():
+    store = await ProgressTracker.start_sync()
+    assert not store.shared
+    assert ProgressTracker._sync is None
+
+    tracker = ProgressTracker("op-1")
+    await tracker.update("crawling", 10, "Crawling")
+    assert tracker._publish_task is None
+    assert ProgressTracker.get_progress("op-1")["progress"] == 10
+
+
+@pytest.mark.asyncio
+async def test_stream_sends_snapshot_then_deltas():
+    tracker = ProgressTracker("stream-op")
+    await tracker.start({"url": "https://example.com"})
+    await tracker.update("crawling", 10, "Crawling page 1")
+
+    request = MagicMock()
+    request.is_disconnected = AsyncMock(return_value=False)
+    chunks = []
+
+    async def consume():
+        async for chunk in progress_api._progress_events("stream-op", request):
+            chunks.append(chunk)
+
+    consumer = asyncio.create_task(consume())
+    await asyncio.sleep(0.01)
+    await tracker.update("crawling", 50, "Crawling page 2")
+    await asyncio.sleep(0.01)
+    await tracker.complete({"chunks_stored": 12})
+    await asyncio.wait_for(consumer, timeout=5)
+
+    events = _parse_events(chunks)
+    assert [event for event, _ in events] == ["snapshot", "delta", "delta", "end"]
+
+    snapshot = events[0][1]
+    assert snapshot["status"] == "crawling"
+    assert snapshot["logs"] == ["Crawling page 1"]
+
+    # Deltas only carry what changed; new log lines are appended rather than resent
+    first_delta = events[1][1]
+    assert first_delta["changed"]["progress"] == 50
+    assert first_delta["appended"] == {"logs": ["Crawling page 2"]}
+    assert "url" not in first_delta.get("changed", {})
+
+    assert events[2][1]["changed"]["status"] == "completed"
+    assert events[3][1] == {"progressId": "stream-op", "status": "completed"}
+
+
+def test_progress_delta_handles_trimmed_log_window():
+    previous = {"progress": 10, "logs": ["a", "b", "c"], "currentUrl": "https://example.com/1"}
+    current = {"progress": 20, "logs": ["b", "c", "d"]}
+
+    assert progress_api._progress_delta(previous, current) == {
+        "changed": {"progress": 20},
+        "appended": {"logs": ["d"]},
+        "trimmed": {"logs": 1},
+        "removed": ["currentUrl"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_progress_response_and_etag_are_cached_per_version(client):
+    tracker = ProgressTracker("etag-op")
+    await tracker.update("crawling", 30, "Crawling")
+
+    with patch.object(
+        progress_api, "create_progress_response", wraps=progress_api.create_progress_response
+    ) as build:
+        first = client.get("/api/progress/etag-op")
+        second = client.get("/api/progress/etag-op", headers={"If-None-Match": first.headers["ETag"]})
+        assert build.call_count == 1
+        assert second.status_code == 304
+
+        await tracker.update("crawling", 60, "Crawling more")
+        third = client.get("/api/progress/etag-op", headers={"If-None-Match": first.headers["ETag"]})
+        assert build.call_count == 2
+        assert third.status_code == 200
+        assert third.json()["progress"] == 60
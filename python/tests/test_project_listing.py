@@ -0,0 +1,84 @@
+"""
+Tests for lightweight project lists and streamed full-content lists.
+"""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.server.services.projects.project_service import ProjectService
+from src.server.utils import json_streaming
+from src.server.utils.json_streaming import EncodedJSONList
+
+
+def _project(n: int, **fields) -> dict:
+    return {
+        "id": f"proj-{n}",
+        "title": f"Project {n}",
+        "description": "",
+        "github_repo": None,
+        "pinned": False,
+        "created_at": "2025-01-01T00:00:00+00:00",
+        "updated_at": "2025-01-01T00:00:00+00:00",
+        **fields,
+    }
+
+
+@pytest.fixture(autouse=True)
+def count_columns_installed(monkeypatch):
+    monkeypatch.setattr(ProjectService, "_count_columns_missing", False)
+
+
+def test_lightweight_list_selects_sizes_not_content():
+    client = MagicMock()
+    query = client.table.return_value.select.return_value.order.return_value
+    query.execute.return_value.data = [_project(1, docs_count=4, features_count=0, has_data=True)]
+
+    success, result = ProjectService(client).list_projects(include_content=False)
+
+    assert success
+    (columns,), _ = client.table.return_value.select.call_args
+    assert "docs_count" in columns and "docs," not in columns and "data" not in columns.replace("has_data", "")
+    assert result["projects"][0]["stats"] == {"docs_count": 4, "features_count": 0, "has_data": True}
+
+
+def test_lightweight_list_without_migration_counts_fetched_fields():
+    client = MagicMock()
+    query = client.table.return_value.select.return_value.order.return_value
+    query.execute.side_effect = [
+        Exception("column archon_projects.docs_count does not exist"),
+        MagicMock(data=[_project(1, docs=[{}, {}], features=[{}], data={})]),
+    ]
+
+    success, result = ProjectService(client).list_projects(include_content=False)
+
+    assert success
+    assert ProjectService._count_columns_missing
+    (columns,), _ = client.table.return_value.select.call_args
+    assert "docs, features, data" in columns
+    assert result["projects"][0]["stats"] == {"docs_count": 2, "features_count": 1, "has_data": False}
+
+
+@pytest.mark.asyncio
+async def test_encoded_list_streams_each_item_encoded_once(monkeypatch):
+    monkeypatch.setattr(json_streaming, "STREAM_CHUNK_SIZE", 100)
+    projects = [_project(n, docs=[{"content": "x" * 50}]) for n in range(5)]
+
+    encoded = EncodedJSONList(projects)
+    response = encoded.response("projects", {"count": 5}, {"ETag": encoded.etag})
+    chunks = [chunk async for chunk in response.body_iterator]
+
+    assert len(chunks) > 1
+    body = b"".join(chunks)
+    assert json.loads(body) == {"projects": projects, "count": 5}
+    assert encoded.size_bytes == len(body) - len(b'{"projects":[],"count": 5}')
+    assert response.headers["ETag"] == encoded.etag
+
+    # Same items, same ETag; any change, a new one
+    assert EncodedJSONList([dict(p) for p in projects]).etag == encoded.etag
+    projects[3]["title"] = "Renamed"
+    assert EncodedJSONList(projects).etag != encoded.etag
+
+    empty = EncodedJSONList([]).response("projects")
+    assert json.loads(b"".join([chunk async for chunk in empty.body_iterator])) == {"projects": []}
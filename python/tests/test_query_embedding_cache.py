@@ -0,0 +1,176 @@
+"""
+Tests for the in-process query embedding cache.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.server.services.embeddings import embedding_service, query_embedding_cache
+from src.server.services.embeddings.embedding_exceptions import EmbeddingRateLimitError
+from src.server.services.embeddings.query_embedding_cache import QueryEmbeddingCache
+
+SERVICE_MODULE = "src.server.services.embeddings.embedding_service"
+CACHE_MODULE = "src.server.services.embeddings.query_embedding_cache"
+
+
+@pytest.fixture
+def provider():
+    """Stub embedding provider: a slow create_embedding plus model/dimension settings."""
+    state = {"model": "text-embedding-3-small"}
+
+    async def create(text, provider=None):
+        await asyncio.sleep(0.02)
+        return [float(len(text)), float(len(state["model"]))]
+
+    create_embedding = AsyncMock(side_effect=create)
+    with (
+        patch(f"{SERVICE_MODULE}.create_embedding", create_embedding),
+        patch(f"{SERVICE_MODULE}.get_embedding_model", AsyncMock(side_effect=lambda provider=None: state["model"])),
+        patch.object(
+            embedding_service.credential_service,
+            "get_credentials_by_category",
+            AsyncMock(return_value={"EMBEDDING_DIMENSIONS": "1536"}),
+        ),
+    ):
+        yield create_embedding, state
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_queries_share_one_call(provider):
+    create_embedding, _ = provider
+
+    results = await asyncio.gather(*(
+        embedding_service.create_query_embedding("how to cancel an asyncio task") for _ in range(10)
+    ))
+
+    assert create_embedding.await_count == 1
+    assert all(result == results[0] for result in results)
+
+    # Whitespace-only differences hit the cache
+    again = await embedding_service.create_query_embedding("  how to cancel\nan asyncio   task ")
+    assert again == results[0]
+    assert create_embedding.await_count == 1
+
+    stats = query_embedding_cache.get_query_embedding_cache().get_stats()
+    assert stats["misses"] == 1
+    assert stats["shared_inflight"] == 9
+    assert stats["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_model_is_part_of_the_key(provider):
+    create_embedding, state = provider
+
+    first = await embedding_service.create_query_embedding("vector search")
+    state["model"] = "nomic-embed-text"
+    second = await embedding_service.create_query_embedding("vector search")
+
+    assert create_embedding.await_count == 2
+    assert first != second
+
+
+@pytest.mark.asyncio
+async def test_embedding_setting_change_invalidates_cache(provider):
+    create_embedding, _ = provider
+    from src.server.services.credential_service import credential_service
+
+    await embedding_service.create_query_embedding("vector search")
+    with (
+        patch.object(credential_service, "_get_supabase_client", return_value=MagicMock()),
+        patch.object(credential_service, "_cache", {}),
+    ):
+        await credential_service.set_credential("EMBEDDING_MODEL", "text-embedding-3-large", category="rag_strategy")
+    await embedding_service.create_query_embedding("vector search")
+
+    assert create_embedding.await_count == 2
+    assert query_embedding_cache.get_query_embedding_cache().get_stats()["invalidations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_results_started_before_invalidation_are_not_cached():
+    cache = QueryEmbeddingCache()
+    release = asyncio.Event()
+
+    async def create():
+        await release.wait()
+        return [1.0]
+
+    key = ("", "model", 2, "query")
+    pending = asyncio.create_task(cache.get_or_create(key, create))
+    await asyncio.sleep(0)
+    cache.invalidate()
+    release.set()
+
+    assert await pending == [1.0]
+    assert cache.get(key) is None
+
+
+@pytest.mark.asyncio
+async def test_failures_reach_every_waiter_and_are_not_cached():
+    cache = QueryEmbeddingCache()
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise EmbeddingRateLimitError("Rate limit hit")
+
+    key = ("", "model", 2, "query")
+    results = await asyncio.gather(*(cache.get_or_create(key, failing) for _ in range(3)), return_exceptions=True)
+
+    assert calls == 1
+    assert all(isinstance(result, EmbeddingRateLimitError) for result in results)
+    assert cache.get(key) is None
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_shared_call():
+    cache = QueryEmbeddingCache()
+
+    async def create():
+        await asyncio.sleep(0.02)
+        return [3.0]
+
+    key = ("", "model", 2, "query")
+    first = asyncio.create_task(cache.get_or_create(key, create))
+    second = asyncio.create_task(cache.get_or_create(key, create))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == [3.0]
+    assert cache.get(key) == [3.0]
+
+
+def test_lru_eviction_and_ttl_expiry():
+    cache = QueryEmbeddingCache(max_entries=2, ttl_seconds=60)
+    now = [1000.0]
+
+    with patch(f"{CACHE_MODULE}.time.monotonic", side_effect=lambda: now[0]):
+        cache.put(("", "m", 2, "a"), [1.0])
+        cache.put(("", "m", 2, "b"), [2.0])
+        assert cache.get(("", "m", 2, "a")) == [1.0]
+        cache.put(("", "m", 2, "c"), [3.0])
+
+        # "b" was least recently used
+        assert cache.get(("", "m", 2, "b")) is None
+        assert cache.get(("", "m", 2, "a")) == [1.0]
+
+        now[0] += 61
+        assert cache.get(("", "m", 2, "c")) is None
+
+    assert cache.get_stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_always_calls_provider(provider, monkeypatch):
+    create_embedding, _ = provider
+    monkeypatch.setenv("QUERY_EMBEDDING_CACHE_MAX_ENTRIES", "0")
+    query_embedding_cache.reset_query_embedding_cache()
+
+    await embedding_service.create_query_embedding("vector search")
+    await embedding_service.create_query_embedding("vector search")
+
+    assert create_embedding.await_count == 2
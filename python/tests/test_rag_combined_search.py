@@ -0,0 +1,88 @@
+"""
+Tests for combined document + code example retrieval.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.server.services.search.rag_service import RAGService
+
+SETTINGS = {"USE_HYBRID_SEARCH": "false", "USE_RERANKING": "false"}
+EMBEDDING = [0.1, 0.2, 0.3]
+
+
+@pytest.fixture
+def service():
+    """RAGService with agentic RAG on and both tables answering after 100ms."""
+    rpc_calls = []
+
+    async def execute_rpc(client, name, params):
+        rpc_calls.append((name, params))
+        await asyncio.sleep(0.1)
+        if name == "match_archon_code_examples":
+            return [{"url": "u", "content": "print()", "summary": "s", "source_id": "src", "similarity": 0.8}]
+        return [{"id": "1", "content": "docs", "metadata": {}, "similarity": 0.9}]
+
+    with (
+        patch.object(RAGService, "get_setting", side_effect=lambda key, default="false": SETTINGS.get(key, default)),
+        patch("src.server.services.search.base_search_strategy.execute_rpc", side_effect=execute_rpc),
+        patch("src.server.services.search.agentic_rag_strategy.AgenticRAGStrategy.is_enabled", return_value=True),
+        patch(
+            "src.server.services.search.rag_service.create_query_embedding", AsyncMock(return_value=EMBEDDING)
+        ) as embed,
+        patch(
+            "src.server.services.search.agentic_rag_strategy.create_query_embedding", AsyncMock(return_value=EMBEDDING)
+        ) as code_embed,
+    ):
+        yield RAGService(supabase_client=MagicMock(), reranking_strategy=None), rpc_calls, embed, code_embed
+
+
+@pytest.mark.asyncio
+async def test_embeds_once_and_searches_both_tables_concurrently(service):
+    rag, rpc_calls, embed, code_embed = service
+
+    success, result = await rag.search_documents_and_code("asyncio task", source="src", code_match_count=3)
+
+    assert success
+    assert embed.await_count == 1
+    assert code_embed.await_count == 0
+    assert sorted(name for name, _ in rpc_calls) == ["match_archon_code_examples", "match_archon_crawled_pages"]
+    assert all(params["query_embedding"] == EMBEDDING for _, params in rpc_calls)
+    assert all(params["source_filter"] == "src" for _, params in rpc_calls)
+    assert dict(rpc_calls)["match_archon_code_examples"]["match_count"] == 3
+
+    assert result["documents"]["success"] and result["documents"]["results"][0]["content"] == "docs"
+    assert result["code_examples"]["success"] and result["code_examples"]["results"][0]["code"] == "print()"
+
+    timings = result["timings_ms"]
+    assert set(timings) == {"embedding", "documents", "code_examples", "total"}
+    # The slower search, not the sum of both
+    assert timings["total"] < timings["documents"] + timings["code_examples"]
+
+
+@pytest.mark.asyncio
+async def test_failed_code_search_still_returns_documents(service):
+    rag, _, _, _ = service
+
+    with patch("src.server.services.search.agentic_rag_strategy.AgenticRAGStrategy.is_enabled", return_value=False):
+        success, result = await rag.search_documents_and_code("asyncio task")
+
+    assert success
+    assert result["documents"]["success"]
+    assert result["code_examples"]["success"] is False
+    assert "USE_AGENTIC_RAG" in result["code_examples"]["error"]
+
+
+@pytest.mark.asyncio
+async def test_combined_endpoint(service):
+    from src.server.api_routes.knowledge_api import RagCombinedQueryRequest, perform_combined_rag_query
+
+    rag, _, _, _ = service
+    with patch("src.server.api_routes.knowledge_api.get_rag_service", AsyncMock(return_value=rag)):
+        response = await perform_combined_rag_query(RagCombinedQueryRequest(query="asyncio task"))
+
+    assert response["success"] is True
+    assert len(response["documents"]["results"]) == 1
+    assert len(response["code_examples"]["results"]) == 1
@@ -0,0 +1,209 @@
+"""
+Tests for batched RAG queries.
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from src.server.services.embeddings import embedding_service
+from src.server.services.embeddings.embedding_service import EmbeddingBatchResult
+from src.server.services.search.rag_service import RAGService
+from src.server.services.search.reranking_strategy import RerankingStrategy
+
+SERVICE_MODULE = "src.server.services.embeddings.embedding_service"
+SETTINGS = {"USE_HYBRID_SEARCH": "false", "USE_RERANKING": "true"}
+
+
+class CountingModel:
+    """CrossEncoder stand-in with a fixed cost per predict call; scores by content length."""
+
+    def __init__(self, call_seconds: float = 0.0):
+        self.call_seconds = call_seconds
+        self.batches: list[int] = []
+
+    def predict(self, pairs):
+        self.batches.append(len(pairs))
+        time.sleep(self.call_seconds)
+        return [float(len(document)) for _, document in pairs]
+
+
+@pytest.fixture
+def backend():
+    """Fake embedding provider and database with fixed latencies, recording every call."""
+    calls = {"embeddings": [], "rpc": [], "in_flight": 0, "max_in_flight": 0, "fail": set()}
+    latency = {"embedding": 0.0, "rpc": 0.0}
+
+    async def create_embeddings_batch(texts, progress_callback=None, provider=None):
+        calls["embeddings"].append(list(texts))
+        await asyncio.sleep(latency["embedding"])
+        result = EmbeddingBatchResult()
+        for text in texts:
+            if text in calls["fail"]:
+                result.add_failure(text, RuntimeError("provider rejected input"))
+            else:
+                result.add_success([float(len(text)), 1.0], text)
+        return result
+
+    async def execute_rpc(client, name, params):
+        calls["rpc"].append(params["query_embedding"])
+        calls["in_flight"] += 1
+        calls["max_in_flight"] = max(calls["max_in_flight"], calls["in_flight"])
+        await asyncio.sleep(latency["rpc"])
+        calls["in_flight"] -= 1
+        length = int(params["query_embedding"][0])
+        return [
+            {"id": f"{length}-{i}", "content": "x" * (i + 1), "metadata": {}, "similarity": 0.5}
+            for i in range(params["match_count"])
+        ]
+
+    with (
+        patch(f"{SERVICE_MODULE}.create_embeddings_batch", side_effect=create_embeddings_batch),
+        patch(f"{SERVICE_MODULE}.get_embedding_model", AsyncMock(return_value="text-embedding-3-small")),
+        patch.object(
+            embedding_service.credential_service,
+            "get_credentials_by_category",
+            AsyncMock(return_value={"EMBEDDING_DIMENSIONS": "1536"}),
+        ),
+        patch("src.server.services.search.base_search_strategy.execute_rpc", side_effect=execute_rpc),
+        patch.object(RAGService, "get_setting", side_effect=lambda key, default="false": SETTINGS.get(key, default)),
+    ):
+        yield calls, latency
+
+
+def _service(model: CountingModel) -> RAGService:
+    return RAGService(supabase_client=MagicMock(), reranking_strategy=RerankingStrategy.from_model(model))
+
+
+@pytest.mark.asyncio
+async def test_batch_embeds_once_and_reranks_in_one_pass(backend):
+    calls, _ = backend
+    model = CountingModel()
+    service = _service(model)
+
+    # Answered from the result cache, so not embedded or searched again
+    await service.perform_rag_query("cached query", match_count=2)
+    calls["embeddings"].clear()
+    calls["rpc"].clear()
+    model.batches.clear()
+
+    queries = ["jwt refresh", "fastapi deps", "cached query", "pgvector index", "  jwt   refresh "]
+    success, result = await service.perform_rag_query_batch(queries, match_count=2)
+
+    assert success
+    assert calls["embeddings"] == [["jwt refresh", "fastapi deps", "pgvector index"]]
+    assert len(calls["rpc"]) == 3
+    # 3 searched queries x 10 candidates, scored in one forward pass
+    assert model.batches == [30]
+
+    items = result["results"]
+    assert [item["query"] for item in items] == queries
+    assert all(item["success"] and item["reranking_applied"] for item in items)
+    assert all([r["content"] for r in item["results"]] == ["x" * 10, "x" * 9] for item in items)
+    assert items[0]["results"] == items[4]["results"]
+    assert set(result["timings_ms"]) == {"embedding", "search", "rerank", "total"}
+
+    # Batch results are cached for single queries too
+    calls["rpc"].clear()
+    await service.perform_rag_query("pgvector index", match_count=2)
+    assert calls["rpc"] == []
+
+
+@pytest.mark.asyncio
+async def test_batch_bounds_concurrent_searches(backend):
+    calls, latency = backend
+    latency["rpc"] = 0.01
+
+    success, result = await _service(CountingModel()).perform_rag_query_batch(
+        [f"query {i}" for i in range(12)], max_concurrency=3
+    )
+
+    assert success
+    assert len(calls["rpc"]) == 12
+    assert calls["max_in_flight"] == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_embedding_fails_only_that_query(backend):
+    calls, _ = backend
+    calls["fail"].add("bad query")
+
+    success, result = await _service(CountingModel()).perform_rag_query_batch(["good query", "bad query"])
+
+    assert success
+    good, bad = result["results"]
+    assert good["success"] and len(good["results"]) == 5
+    assert bad["success"] is False
+    assert bad["query"] == "bad query"
+    assert "embedding" in bad["error"]
+
+
+@pytest.mark.asyncio
+async def test_batch_shares_query_embeddings_in_flight(backend):
+    calls, latency = backend
+    latency["embedding"] = 0.02
+
+    single, batch = await asyncio.gather(
+        embedding_service.create_query_embedding("jwt refresh"),
+        embedding_service.create_query_embeddings(["jwt refresh", "fastapi deps"]),
+    )
+
+    assert batch == [single, [12.0, 1.0]]
+    assert calls["embeddings"] == [["jwt refresh"], ["fastapi deps"]]
+
+
+@pytest.mark.asyncio
+async def test_batch_endpoint_validates_queries():
+    from src.server.api_routes.knowledge_api import (
+        MAX_BATCH_QUERIES,
+        RagBatchQueryRequest,
+        perform_rag_query_batch,
+    )
+
+    for queries in ([], ["ok", " "], ["q"] * (MAX_BATCH_QUERIES + 1)):
+        with pytest.raises(HTTPException) as exc_info:
+            await perform_rag_query_batch(RagBatchQueryRequest(queries=queries))
+        assert exc_info.value.status_code == 422
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_benchmark_batch_vs_separate_queries(backend):
+    """16 sub-queries: one perform_rag_query each (concurrently) vs one batch."""
+    _, latency = backend
+    latency.update(embedding=0.05, rpc=0.03)
+    # Distinct queries per run so neither path is answered from the caches
+    separate_queries = [f"separate sub question {i}" for i in range(16)]
+    batch_queries = [f"batched sub question {i}" for i in range(16)]
+
+    async def timed(coro) -> float:
+        start = time.perf_counter()
+        await coro
+        return time.perf_counter() - start
+
+    # Same search concurrency (8) for both paths
+    separate_model = CountingModel(call_seconds=0.02)
+    separate_service = _service(separate_model)
+    semaphore = asyncio.Semaphore(8)
+
+    async def one(query):
+        async with semaphore:
+            return await separate_service.perform_rag_query(query)
+
+    single = await timed(_service(CountingModel(call_seconds=0.02)).perform_rag_query("warm single query"))
+    separate = await timed(asyncio.gather(*(one(query) for query in separate_queries)))
+
+    batch_model = CountingModel(call_seconds=0.02)
+    batch = await timed(_service(batch_model).perform_rag_query_batch(batch_queries))
+
+    print(
+        f"single: {single * 1000:.0f}ms | 16 separate: {separate * 1000:.0f}ms "
+        f"({len(separate_model.batches)} rerank passes) | batch: {batch * 1000:.0f}ms "
+        f"({len(batch_model.batches)} rerank pass)"
+    )
+    assert len(batch_model.batches) == 1
+    assert batch < separate
+    assert batch < 2 * single
@@ -0,0 +1,172 @@
+"""
+Tests for the versioned RAG result cache.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.server.services.embeddings.embedding_service import EmbeddingBatchResult
+from src.server.services.search import rag_result_cache
+from src.server.services.search.rag_result_cache import RAGResultCache, bump_index_generation
+from src.server.services.search.rag_service import RAGService
+from src.server.services.search.reranking_strategy import RerankingStrategy
+from src.server.services.source_management_service import SourceManagementService
+from src.server.services.storage.document_storage_service import add_documents_to_supabase
+
+SETTINGS = {"USE_HYBRID_SEARCH": "false", "USE_RERANKING": "false", "EMBEDDING_MODEL": "text-embedding-3-small"}
+
+
+@pytest.fixture
+def service():
+    """RAGService whose document search is a mock returning one result."""
+    with patch.object(
+        RAGService, "get_setting", side_effect=lambda key, default="false": SETTINGS.get(key, default)
+    ):
+        rag = RAGService(supabase_client=MagicMock(), reranking_strategy=None)
+        rag.search_documents = AsyncMock(
+            side_effect=lambda **kwargs: [{"id": "1", "content": "asyncio docs", "metadata": {}, "similarity": 0.9}]
+        )
+        yield rag
+
+
+@pytest.mark.asyncio
+async def test_repeated_query_is_served_from_cache(service):
+    first = await service.perform_rag_query("asyncio task", source="docs.python.org")
+    second = await service.perform_rag_query("  asyncio   task", source="docs.python.org")
+
+    assert second == first
+    assert service.search_documents.await_count == 1
+
+    # Anything that changes the results is part of the key
+    await service.perform_rag_query("asyncio task", source="docs.python.org", match_count=10)
+    await service.perform_rag_query("asyncio task", source="react.dev")
+    await service.perform_rag_query("asyncio task", source="docs.python.org", filter_metadata={"tags": ["py"]})
+    assert service.search_documents.await_count == 4
+
+    # Callers may mutate what they get back without touching the cache
+    second[1]["results"].clear()
+    _, third = await service.perform_rag_query("asyncio task", source="docs.python.org")
+    assert len(third["results"]) == 1
+
+    stats = rag_result_cache.get_rag_result_cache().get_stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 4
+
+
+@pytest.mark.asyncio
+async def test_source_write_outdates_only_that_source(service):
+    await service.perform_rag_query("asyncio task", source="docs.python.org")
+    await service.perform_rag_query("asyncio task", source="react.dev")
+    await service.perform_rag_query("asyncio task")
+
+    with (
+        patch("src.server.services.storage.document_storage_service.create_embeddings_batch") as embed,
+        patch("src.server.services.credential_service.credential_service") as credentials,
+    ):
+        credentials.get_credentials_by_category = AsyncMock(return_value={})
+        batch = EmbeddingBatchResult()
+        batch.add_success([0.1] * 1536, "new chunk")
+        embed.return_value = batch
+        await add_documents_to_supabase(
+            client=MagicMock(),
+            urls=["https://docs.python.org/3/library/asyncio-task.html"],
+            chunk_numbers=[0],
+            contents=["new chunk"],
+            metadatas=[{"source_id": "docs.python.org"}],
+            url_to_full_document={},
+        )
+
+    service.search_documents.reset_mock()
+    await service.perform_rag_query("asyncio task", source="react.dev")
+    assert service.search_documents.await_count == 0
+
+    await service.perform_rag_query("asyncio task", source="docs.python.org")
+    await service.perform_rag_query("asyncio task")
+    assert service.search_documents.await_count == 2
+    assert rag_result_cache.get_rag_result_cache().get_stats()["stale"] == 2
+
+
+@pytest.mark.asyncio
+async def test_delete_source_outdates_its_results(service):
+    await service.perform_rag_query("asyncio task", source="docs.python.org")
+
+    success, _ = SourceManagementService(MagicMock()).delete_source("docs.python.org")
+    await service.perform_rag_query("asyncio task", source="docs.python.org")
+
+    assert success
+    assert service.search_documents.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_write_during_search_is_not_cached(service):
+    async def search_while_crawl_writes(**kwargs):
+        bump_index_generation(["docs.python.org"])
+        return [{"id": "1", "content": "old", "metadata": {}, "similarity": 0.9}]
+
+    service.search_documents.side_effect = search_while_crawl_writes
+    await service.perform_rag_query("asyncio task", source="docs.python.org")
+    await service.perform_rag_query("asyncio task", source="docs.python.org")
+
+    assert service.search_documents.await_count == 2
+
+
+class FailingModel:
+    """CrossEncoder stand-in whose forward pass always fails."""
+
+    def predict(self, pairs):
+        raise RuntimeError("CUDA out of memory")
+
+
+@pytest.mark.asyncio
+async def test_failed_rerank_is_not_cached(service):
+    service.reranking_strategy = RerankingStrategy.from_model(FailingModel())
+    candidates = [{"id": str(i), "content": f"chunk {i}", "metadata": {}, "similarity": 0.9} for i in range(25)]
+    service.search_documents.side_effect = lambda **kwargs: list(candidates)
+    service.agentic_strategy.is_enabled = MagicMock(return_value=True)
+    service.agentic_strategy.search_code_examples = AsyncMock(side_effect=lambda **kwargs: list(candidates))
+
+    for _ in range(2):
+        success, documents = await service.perform_rag_query("asyncio task", match_count=5)
+        assert success and documents["reranking_applied"] is False
+        assert [result["id"] for result in documents["results"]] == ["0", "1", "2", "3", "4"]
+
+        success, code = await service.search_code_examples_service("asyncio task", match_count=5)
+        assert success and code["reranking_applied"] is False
+        assert code["count"] == 5
+
+    # Unranked responses are served but never cached
+    assert service.search_documents.await_count == 2
+    assert service.agentic_strategy.search_code_examples.await_count == 2
+    assert rag_result_cache.get_rag_result_cache().get_stats()["entries"] == 0
+
+
+def test_ttl_and_unknown_source_writes():
+    cache = RAGResultCache(ttl_seconds=60)
+    now = [1000.0]
+
+    with patch("src.server.services.search.rag_result_cache.time.monotonic", side_effect=lambda: now[0]):
+        cache.put(("a",), {"results": []}, cache.generation("s1"), "s1")
+        assert cache.get(("a",), "s1") == {"results": []}
+        now[0] += 61
+        assert cache.get(("a",), "s1") is None
+
+        cache.put(("a",), {"results": []}, cache.generation("s1"), "s1")
+        # A write whose sources are unknown outdates everything
+        cache.bump()
+        assert cache.get(("a",), "s1") is None
+
+
+@pytest.mark.asyncio
+async def test_health_reports_cache_counters(service):
+    from src.server.api_routes.knowledge_api import knowledge_health
+
+    await service.perform_rag_query("asyncio task")
+    await service.perform_rag_query("asyncio task")
+
+    with patch("src.server.main._check_database_schema", AsyncMock(return_value={"valid": True})):
+        health = await knowledge_health()
+
+    assert health["rag_result_cache"]["hits"] == 1
+    assert health["rag_result_cache"]["misses"] == 1
+    assert health["rag_result_cache"]["hit_rate"] == 0.5
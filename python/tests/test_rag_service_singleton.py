@@ -0,0 +1,151 @@
+"""
+Tests for the process-wide RAGService and its shared, warmed-up reranker.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.server.services.search import rag_service
+from src.server.services.search.reranking_strategy import RerankingStrategy
+
+MODULE = "src.server.services.search.rag_service"
+
+
+class CountingModel:
+    """CrossEncoder stand-in that scores by content length and counts predictions."""
+
+    def __init__(self):
+        self.predict_calls = 0
+
+    def predict(self, pairs):
+        self.predict_calls += 1
+        return [float(len(document)) for _, document in pairs]
+
+
+@pytest.fixture
+def reranker_settings():
+    settings = {"USE_RERANKING": "true", "RERANKING_MODEL": "model-a"}
+    loaded: list[tuple[str, CountingModel]] = []
+
+    def load(model_name, **kwargs):
+        model = CountingModel()
+        loaded.append((model_name, model))
+        return RerankingStrategy.from_model(model, model_name)
+
+    with (
+        patch(f"{MODULE}._get_setting", side_effect=lambda key, default="false": settings.get(key, default)),
+        patch(f"{MODULE}.RerankingStrategy", side_effect=load),
+        patch(f"{MODULE}.get_supabase_client", return_value=MagicMock()),
+    ):
+        yield settings, loaded
+
+
+@pytest.fixture(autouse=True)
+async def reset_rag_service():
+    await rag_service.close_rag_service()
+    yield
+    await rag_service.close_rag_service()
+
+
+@pytest.mark.asyncio
+async def test_reranked_queries_share_one_warm_model(reranker_settings):
+    _, loaded = reranker_settings
+
+    services = await asyncio.gather(*(rag_service.get_rag_service() for _ in range(5)))
+
+    assert all(service is services[0] for service in services)
+    assert len(loaded) == 1
+    model_name, model = loaded[0]
+    assert model_name == "model-a"
+    # Warmed up with one dummy prediction before serving queries
+    assert model.predict_calls == 1
+
+    candidates = [
+        {"id": str(i), "content": "x" * (i + 1), "metadata": {}, "similarity": 0.5} for i in range(10)
+    ]
+    service = services[0]
+    with patch.object(service, "search_documents", AsyncMock(side_effect=lambda **kwargs: list(candidates))):
+        # Distinct queries, so none is answered from the result cache
+        for i in range(3):
+            success, result = await (await rag_service.get_rag_service()).perform_rag_query(f"query {i}", match_count=2)
+            assert success
+            assert result["reranking_applied"] is True
+            assert [r["id"] for r in result["results"]] == ["9", "8"]
+
+    # Each reranked query costs one inference and no model load
+    assert len(loaded) == 1
+    assert model.predict_calls == 4
+
+
+@pytest.mark.asyncio
+async def test_setting_change_swaps_reranker_in_background(reranker_settings):
+    settings, loaded = reranker_settings
+    first = await rag_service.get_rag_service()
+
+    settings["RERANKING_MODEL"] = "model-b"
+    # The current service keeps answering while the new model loads
+    assert await rag_service.get_rag_service() is first
+    await rag_service._refresh_task
+
+    second = await rag_service.get_rag_service()
+    assert second is not first
+    assert second.reranking_strategy.model_name == "model-b"
+    assert second.supabase_client is first.supabase_client
+    assert [name for name, _ in loaded] == ["model-a", "model-b"]
+
+    # Disabling reranking drops the reranker without loading anything
+    settings["USE_RERANKING"] = "false"
+    rag_service.refresh_rag_service()
+    await rag_service._refresh_task
+    third = await rag_service.get_rag_service()
+    assert third.reranking_strategy is None
+
+    # The disabled service no longer holds the model, so re-enabling loads it again
+    settings["USE_RERANKING"] = "true"
+    rag_service.refresh_rag_service()
+    await rag_service._refresh_task
+    assert (await rag_service.get_rag_service()).reranking_strategy.model_name == "model-b"
+    assert len(loaded) == 3
+
+
+@pytest.mark.asyncio
+async def test_unchanged_settings_reuse_loaded_model(reranker_settings):
+    _, loaded = reranker_settings
+    first = await rag_service.get_rag_service()
+
+    rag_service.refresh_rag_service()
+
+    assert rag_service._refresh_task.done()
+    assert await rag_service.get_rag_service() is first
+    assert len(loaded) == 1
+
+
+@pytest.mark.asyncio
+async def test_unavailable_model_disables_reranking(reranker_settings):
+    broken = MagicMock()
+    broken.predict.side_effect = RuntimeError("model files missing")
+
+    with patch(f"{MODULE}.RerankingStrategy", side_effect=lambda name, **kwargs: RerankingStrategy.from_model(broken, name)):
+        service = await rag_service.get_rag_service()
+
+    assert service.reranking_strategy is None
+    # The failed load is not retried on every query
+    assert await rag_service.get_rag_service() is service
+
+
+@pytest.mark.asyncio
+async def test_reranking_setting_update_refreshes_shared_service():
+    from src.server.services.credential_service import credential_service
+
+    with (
+        patch.object(credential_service, "_get_supabase_client", return_value=MagicMock()),
+        patch.object(credential_service, "_cache", {}),
+        patch(f"{MODULE}.refresh_rag_service") as refresh,
+    ):
+        await credential_service.set_credential("RERANKING_MODEL", "model-b", category="rag_strategy")
+        assert refresh.call_count == 1
+
+        await credential_service.set_credential("MATCH_COUNT", "5", category="rag_strategy")
+        assert refresh.call_count == 1
@@ -101,7 +101,7 @@ class TestRAGServiceSearch:
         """Test document search with mocked embedding"""
         # Patch at the module level where it's called from RAGService
         with (
-            patch("src.server.services.search.rag_service.create_embedding") as mock_embed,
+            patch("src.server.services.search.rag_service.create_query_embedding") as mock_embed,
             patch.object(rag_service.base_strategy, "vector_search") as mock_search,
         ):
             # Setup mocks
@@ -337,7 +337,7 @@ class TestRAGIntegrationSimple:
     async def test_hybrid_search_integration(self, rag_service):
         """Test RAG with hybrid search enabled"""
         with (
-            patch("src.server.services.search.rag_service.create_embedding") as mock_embed,
+            patch("src.server.services.search.rag_service.create_query_embedding") as mock_embed,
             patch.object(rag_service.hybrid_strategy, "search_documents_hybrid") as mock_hybrid,
             patch.object(rag_service, "get_bool_setting") as mock_settings,
         ):
@@ -0,0 +1,178 @@
+"""
+Tests for slim (snippet) search results and fetching whole chunks by id.
+"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from src.server.services.search import base_search_strategy
+from src.server.services.search.base_search_strategy import SearchProjection
+from src.server.services.search.rag_service import RAGService
+from src.server.services.search.reranking_strategy import RerankingStrategy
+
+EMBEDDING = [0.1, 0.2, 0.3]
+
+METADATA = {
+    "url": "https://docs.example.com/page",
+    "title": "Page",
+    "description": "A long page description " * 20,
+    "source_id": "docs.example.com",
+    "knowledge_type": "technical",
+    "crawl_type": "recursive",
+    "word_count": 900,
+    "char_count": 5000,
+    "chunk_index": 0,
+    "tags": ["python"],
+}
+
+
+def _chunk(chunk_id: int) -> dict:
+    return {
+        "id": chunk_id,
+        "url": "https://docs.example.com/page",
+        "chunk_number": chunk_id,
+        "content": f"chunk {chunk_id} " + "x" * 4990,
+        "metadata": METADATA,
+        "source_id": "docs.example.com",
+    }
+
+
+class LengthModel:
+    """CrossEncoder stand-in that records what it scored."""
+
+    def __init__(self):
+        self.documents: list[str] = []
+
+    def predict(self, pairs):
+        self.documents.extend(document for _, document in pairs)
+        return [float(-i) for i in range(len(pairs))]
+
+
+@pytest.fixture
+def database(monkeypatch):
+    """Search RPCs over 5000-char chunks; the slim ones project like the SQL functions do."""
+    calls = []
+    state = {"slim_installed": True}
+    monkeypatch.setattr(base_search_strategy, "_missing_slim_rpcs", set())
+
+    async def execute_rpc(client, name, params):
+        calls.append((name, params))
+        if name == "get_archon_crawled_pages_by_ids":
+            return [_chunk(chunk_id) for chunk_id in sorted(params["chunk_ids"]) if chunk_id < 100]
+        rows = [{**_chunk(i), "similarity": 0.9 - i / 100} for i in range(params["match_count"])]
+        if name.endswith("_slim"):
+            if not state["slim_installed"]:
+                raise RuntimeError(f"function {name}(...) does not exist")
+            projection = SearchProjection(params["snippet_length"], tuple(params["metadata_keys"]))
+            return [projection.apply(row) for row in rows]
+        return rows
+
+    settings = {"USE_HYBRID_SEARCH": "false", "USE_RERANKING": "false"}
+    with (
+        patch("src.server.services.search.base_search_strategy.execute_rpc", side_effect=execute_rpc),
+        patch("src.server.services.search.rag_service.execute_rpc", side_effect=execute_rpc),
+        patch.object(RAGService, "get_setting", side_effect=lambda key, default="false": settings.get(key, default)),
+    ):
+        yield calls, state, settings
+
+
+@pytest.mark.asyncio
+async def test_slim_query_returns_snippets_cut_in_the_database(database):
+    calls, _, _ = database
+    rag = RAGService(supabase_client=MagicMock(), reranking_strategy=None)
+
+    success, full = await rag.perform_rag_query("asyncio", match_count=3, query_embedding=EMBEDDING)
+    assert success
+    assert calls[-1][0] == "match_archon_crawled_pages"
+
+    success, slim = await rag.perform_rag_query("asyncio", match_count=3, query_embedding=EMBEDDING, slim=True)
+    assert success
+    name, params = calls[-1]
+    assert name == "match_archon_crawled_pages_slim"
+    assert params["snippet_length"] == 300
+    assert params["metadata_keys"] == ["url", "title", "source_id", "chunk_index"]
+
+    result = slim["results"][0]
+    assert result["id"] == 0
+    assert result["content"] == "chunk 0 " + "x" * 292
+    assert (result["content_length"], result["truncated"]) == (4998, True)
+    assert set(result["metadata"]) == {"url", "title", "source_id", "chunk_index"}
+    assert len(json.dumps(slim)) * 3 < len(json.dumps(full))
+
+    # Full and slim responses are cached separately
+    assert "content_length" not in full["results"][0]
+    success, again = await rag.perform_rag_query(
+        "asyncio", match_count=3, query_embedding=EMBEDDING, slim=True, snippet_length=50, metadata_keys=[]
+    )
+    assert calls[-1][1]["snippet_length"] == 50
+    assert again["results"][0]["metadata"] == {}
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_slim_query_reranks_on_longer_content_than_it_returns(database):
+    calls, _, settings = database
+    settings["USE_RERANKING"] = "true"
+    model = LengthModel()
+    rag = RAGService(supabase_client=MagicMock(), reranking_strategy=RerankingStrategy.from_model(model))
+
+    success, response = await rag.perform_rag_query("asyncio", match_count=2, query_embedding=EMBEDDING, slim=True)
+
+    assert success and response["reranking_applied"]
+    name, params = calls[-1]
+    assert (name, params["match_count"], params["snippet_length"]) == ("match_archon_crawled_pages_slim", 10, 1000)
+    assert {len(document) for document in model.documents} == {1000}
+    assert [len(r["content"]) for r in response["results"]] == [300, 300]
+    assert all(r["truncated"] for r in response["results"])
+
+
+@pytest.mark.asyncio
+async def test_slim_query_without_migration_projects_client_side(database):
+    calls, state, _ = database
+    state["slim_installed"] = False
+    rag = RAGService(supabase_client=MagicMock(), reranking_strategy=None)
+
+    success, response = await rag.perform_rag_query("asyncio", match_count=2, query_embedding=EMBEDDING, slim=True)
+    assert success
+    assert [name for name, _ in calls] == ["match_archon_crawled_pages_slim", "match_archon_crawled_pages"]
+    assert len(response["results"][0]["content"]) == 300
+    assert response["results"][0]["content_length"] == 4998
+
+    # The missing function is not retried on every search
+    calls.clear()
+    await rag.perform_rag_query("threads", match_count=2, query_embedding=EMBEDDING, slim=True)
+    assert [name for name, _ in calls] == ["match_archon_crawled_pages"]
+
+
+@pytest.mark.asyncio
+async def test_get_chunks_by_ids(database):
+    calls, _, _ = database
+    rag = RAGService(supabase_client=MagicMock(), reranking_strategy=None)
+
+    success, result = await rag.get_chunks_by_ids([7, 3, 500, 7])
+
+    assert success
+    assert calls == [("get_archon_crawled_pages_by_ids", {"chunk_ids": [7, 3, 500]})]
+    assert [chunk["id"] for chunk in result["chunks"]] == [7, 3]
+    assert len(result["chunks"][0]["content"]) == 4998
+    assert result["missing"] == [500]
+
+    success, result = await rag.get_chunks_by_ids(list(range(101)))
+    assert not success
+
+
+@pytest.mark.asyncio
+async def test_chunks_endpoint_validation():
+    from src.server.api_routes.knowledge_api import RagChunksRequest, RagQueryRequest, get_rag_chunks, perform_rag_query
+
+    for ids in ([], list(range(101))):
+        with pytest.raises(HTTPException) as exc_info:
+            await get_rag_chunks(RagChunksRequest(ids=ids))
+        assert exc_info.value.status_code == 422
+
+    with pytest.raises(HTTPException) as exc_info:
+        await perform_rag_query(RagQueryRequest(query="asyncio", slim=True, snippet_length=0))
+    assert exc_info.value.status_code == 422
@@ -0,0 +1,140 @@
+"""
+Tests for batched, off-loop reranker inference.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.server.services.search.reranking_strategy import RerankingStrategy
+from src.server.services.search.reranking_worker import RerankingWorker
+
+
+class SlowModel:
+    """CrossEncoder stand-in with a fixed per-call cost plus a per-pair cost."""
+
+    def __init__(self, call_seconds: float = 0.0, pair_seconds: float = 0.0, fail: bool = False):
+        self.call_seconds = call_seconds
+        self.pair_seconds = pair_seconds
+        self.fail = fail
+        self.batches: list[int] = []
+        self.threads: set[str] = set()
+
+    def predict(self, pairs):
+        self.threads.add(threading.current_thread().name)
+        self.batches.append(len(pairs))
+        time.sleep(self.call_seconds + self.pair_seconds * len(pairs))
+        if self.fail:
+            raise RuntimeError("CUDA out of memory")
+        return [float(len(document)) for _, document in pairs]
+
+
+def _results(count: int, prefix: str = "doc") -> list[dict]:
+    return [{"id": f"{prefix}-{i}", "content": "x" * (i + 1)} for i in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reranks_share_a_forward_pass():
+    model = SlowModel(call_seconds=0.01)
+    reranker = RerankingStrategy.from_model(model)
+
+    reranked = await asyncio.gather(*(
+        reranker.rerank_results(f"query {q}", _results(5 + q, prefix=f"q{q}"), top_k=2) for q in range(8)
+    ))
+
+    # Each caller gets its own scores back, from one batched predict
+    for q, results in enumerate(reranked):
+        assert [r["id"] for r in results] == [f"q{q}-{4 + q}", f"q{q}-{3 + q}"]
+    assert model.batches == [sum(5 + q for q in range(8))]
+    assert all(name.startswith("reranker") for name in model.threads)
+
+    stats = reranker.get_worker_stats()
+    assert stats["requests"] == 8
+    assert stats["batches"] == 1
+    assert stats["max_batch_requests"] == 8
+    assert stats["queue_depth"] == 0
+    assert stats["max_queue_depth"] == 8
+
+
+@pytest.mark.asyncio
+async def test_inference_does_not_block_event_loop():
+    reranker = RerankingStrategy.from_model(SlowModel(call_seconds=0.2))
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    try:
+        await reranker.rerank_results("query", _results(20))
+    finally:
+        task.cancel()
+
+    assert ticks >= 10
+
+
+@pytest.mark.asyncio
+async def test_requests_arriving_during_inference_form_next_batch():
+    model = SlowModel(call_seconds=0.05)
+    worker = RerankingWorker(model, batch_window=0, max_batch_pairs=6)
+
+    first = asyncio.create_task(worker.predict([["q", "a"]] * 4))
+    await asyncio.sleep(0.01)
+    # Queued while the first batch runs; capped at 6 pairs per forward pass
+    later = [asyncio.create_task(worker.predict([["q", "bb"]] * 3)) for _ in range(3)]
+    results = await asyncio.gather(first, *later)
+
+    assert results[0] == [1.0] * 4
+    assert all(scores == [2.0] * 3 for scores in results[1:])
+    assert model.batches == [4, 6, 3]
+    assert worker.get_stats()["max_batch_pairs"] == 6
+    worker.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_fails_every_caller_in_it():
+    reranker = RerankingStrategy.from_model(SlowModel(fail=True))
+    results = _results(3)
+
+    reranked = await asyncio.gather(
+        *(reranker.rerank_results("query", list(results)) for _ in range(2)), return_exceptions=True
+    )
+
+    assert all(isinstance(outcome, RuntimeError) for outcome in reranked)
+    assert reranker.get_worker_stats()["failed_batches"] == 1
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_benchmark_batched_vs_serialized_reranking():
+    """Rerank 16 concurrent 50-candidate queries with and without batching."""
+    concurrency, candidates = 16, 50
+
+    async def run(batched: bool) -> tuple[float, int]:
+        model = SlowModel(call_seconds=0.02, pair_seconds=0.0002)
+        reranker = RerankingStrategy.from_model(model)
+        start = time.perf_counter()
+        if batched:
+            await asyncio.gather(*(
+                reranker.rerank_results(f"query {q}", _results(candidates)) for q in range(concurrency)
+            ))
+        else:
+            for q in range(concurrency):
+                pairs, _ = reranker.build_query_document_pairs(f"query {q}", _results(candidates))
+                model.predict(pairs)
+        reranker.close()
+        return time.perf_counter() - start, len(model.batches)
+
+    serialized, serialized_calls = await run(batched=False)
+    batched, batched_calls = await run(batched=True)
+    print(
+        f"serialized: {serialized:.3f}s in {serialized_calls} predicts, "
+        f"batched: {batched:.3f}s in {batched_calls} predicts"
+    )
+    assert batched_calls < serialized_calls
+    assert batched < serialized
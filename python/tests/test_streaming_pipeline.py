@@ -0,0 +1,156 @@
+"""
+Tests for the streaming crawl -> chunk -> embed -> store pipeline.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.server.services.crawling.document_storage_operations import DocumentStorageOperations
+from src.server.services.crawling.strategies.batch import BatchCrawlStrategy
+from src.server.services.crawling.streaming_pipeline import StreamingIngestionPipeline
+
+PIPELINE_MODULE = "src.server.services.crawling.streaming_pipeline"
+
+
+def _page(i: int) -> dict:
+    return {
+        "url": f"https://example.com/page{i}",
+        "markdown": f"# Page {i}\n\n" + "Some documentation text. " * 20,
+        "html": f"<h1>Page {i}</h1>",
+    }
+
+
+@pytest.fixture
+def doc_storage_ops():
+    ops = DocumentStorageOperations(MagicMock())
+    ops._create_source_records = AsyncMock()
+    ops.extract_and_store_code_examples = AsyncMock(return_value=1)
+    return ops
+
+
+def _make_pipeline(doc_storage_ops, **kwargs) -> StreamingIngestionPipeline:
+    options = {"crawl_type": "sitemap", "queue_size": 2, "flush_chunks": 3, "flush_seconds": 0.05}
+    options.update(kwargs)
+    return StreamingIngestionPipeline(
+        doc_storage_ops, {"knowledge_type": "documentation", "tags": ["t"]}, "src-1", **options
+    )
+
+
+@pytest.mark.asyncio
+async def test_chunks_are_stored_while_pages_are_still_arriving(doc_storage_ops):
+    stored_batches = []
+
+    async def fake_add_documents(**kwargs):
+        stored_batches.append(kwargs["urls"])
+        return {"chunks_stored": len(kwargs["contents"])}
+
+    pipeline = _make_pipeline(doc_storage_ops)
+    with patch(f"{PIPELINE_MODULE}.add_documents_to_supabase", side_effect=fake_add_documents):
+        pipeline.start()
+        for i in range(3):
+            await pipeline.submit(_page(i))
+        # Let the worker flush before the crawl has finished
+        await asyncio.sleep(0.2)
+        assert stored_batches, "first chunks should be stored before the crawl ends"
+
+        for i in range(3, 8):
+            await pipeline.submit(_page(i))
+        results = await pipeline.finish()
+
+    assert results["pages_processed"] == 8
+    assert results["chunks_stored"] == results["chunk_count"] == 8
+    assert results["time_to_first_chunk_seconds"] is not None
+    assert results["source_id"] == "src-1"
+    assert sorted(url for batch in stored_batches for url in batch) == sorted(
+        f"https://example.com/page{i}" for i in range(8)
+    )
+    # Source record is created once, before the first chunks are stored
+    doc_storage_ops._create_source_records.assert_awaited_once()
+    # Code extraction runs per stored batch
+    assert doc_storage_ops.extract_and_store_code_examples.await_count == results["flushes"]
+    assert results["code_examples_stored"] == results["flushes"]
+
+
+@pytest.mark.asyncio
+async def test_slow_storage_applies_backpressure(doc_storage_ops):
+    async def slow_add_documents(**kwargs):
+        await asyncio.sleep(0.05)
+        return {"chunks_stored": len(kwargs["contents"])}
+
+    pipeline = _make_pipeline(doc_storage_ops, queue_size=2, flush_chunks=1, extract_code_examples=False)
+    with patch(f"{PIPELINE_MODULE}.add_documents_to_supabase", side_effect=slow_add_documents):
+        pipeline.start()
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for i in range(10):
+            await pipeline.submit(_page(i))
+        submit_time = loop.time() - started
+        results = await pipeline.finish()
+
+    assert results["peak_queue_depth"] <= 2
+    # The producer had to wait for storage instead of buffering all ten pages
+    assert submit_time >= 0.2
+    assert results["chunks_stored"] == 10
+    doc_storage_ops.extract_and_store_code_examples.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_storage_failure_stops_the_crawl(doc_storage_ops):
+    pipeline = _make_pipeline(doc_storage_ops, flush_chunks=1)
+    with patch(f"{PIPELINE_MODULE}.add_documents_to_supabase", AsyncMock(side_effect=RuntimeError("db down"))):
+        pipeline.start()
+        with pytest.raises(RuntimeError, match="db down"):
+            for i in range(20):
+                await pipeline.submit(_page(i))
+                await asyncio.sleep(0.01)
+        await pipeline.aclose()
+
+
+@pytest.mark.asyncio
+async def test_empty_pages_are_skipped(doc_storage_ops):
+    pipeline = _make_pipeline(doc_storage_ops)
+    with patch(f"{PIPELINE_MODULE}.add_documents_to_supabase", AsyncMock(return_value={"chunks_stored": 1})):
+        pipeline.start()
+        await pipeline.submit({"url": "https://example.com/empty", "markdown": "   "})
+        await pipeline.submit(_page(1))
+        results = await pipeline.finish()
+
+    assert results["pages_skipped"] == 1
+    assert results["pages_processed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_strategy_streams_pages_to_sink():
+    async def results_stream():
+        for i in range(3):
+            yield SimpleNamespace(
+                url=f"https://example.com/page{i}",
+                success=True,
+                markdown=SimpleNamespace(fit_markdown=f"content {i}"),
+                html="<p></p>",
+            )
+
+    crawler = MagicMock()
+    crawler.arun_many = AsyncMock(return_value=results_stream())
+    strategy = BatchCrawlStrategy(crawler, MagicMock())
+    received = []
+
+    async def sink(page):
+        received.append(page["url"])
+
+    with patch(
+        "src.server.services.crawling.strategies.batch.credential_service.get_credentials_by_category",
+        AsyncMock(return_value={}),
+    ):
+        results = await strategy.crawl_batch_with_progress(
+            [f"https://example.com/page{i}" for i in range(3)],
+            lambda url: url,
+            lambda url: False,
+            on_page=sink,
+        )
+
+    assert results == []
+    assert received == [f"https://example.com/page{i}" for i in range(3)]
@@ -0,0 +1,165 @@
+"""
+Tests for database-side task pagination and keyset cursors.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+from src.server.services.projects.task_service import (
+    TaskService,
+    decode_task_cursor,
+    encode_task_cursor,
+)
+
+
+def _task(n: int, task_order: int | None = 0) -> dict:
+    return {
+        "id": f"00000000-0000-0000-0000-{n:012d}",
+        "project_id": "proj-1",
+        "title": f"Task {n}",
+        "description": "",
+        "status": "todo",
+        "assignee": "User",
+        "task_order": task_order,
+        "created_at": f"2025-01-01T00:00:{n:02d}.5+00:00",
+        "updated_at": "2025-01-01T00:00:00+00:00",
+        "sources_count": 2,
+        "code_examples_count": 1,
+    }
+
+
+class FakeQuery:
+    """Records the PostgREST query list_tasks builds and returns canned rows."""
+
+    def __init__(self, rows: list[dict], count: int | None = None, fail_first_with: str | None = None):
+        self.rows = rows
+        self.count = count
+        self.fail_first_with = fail_first_with
+        self.calls: list[tuple] = []
+
+    def table(self, name):
+        return self
+
+    def __getattr__(self, name):
+        def record(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+
+        return record
+
+    def execute(self):
+        if self.fail_first_with:
+            message, self.fail_first_with = self.fail_first_with, None
+            raise RuntimeError(message)
+
+        class Response:
+            pass
+
+        response = Response()
+        start, end = next((args for name, args, _ in self.calls[::-1] if name == "range"), (0, None))
+        response.data = self.rows[start : end + 1 if end is not None else None]
+        response.count = self.count
+        return response
+
+    def called(self, name):
+        return [(args, kwargs) for call, args, kwargs in self.calls if call == name]
+
+
+def test_page_is_cut_in_the_database():
+    database = FakeQuery([_task(n) for n in range(25)], count=25)
+
+    success, result = TaskService(database).list_tasks(
+        exclude_large_fields=True, limit=10, offset=10, count="exact"
+    )
+
+    assert success
+    (columns,), select_options = database.called("select")[0]
+    assert "sources_count, code_examples_count" in columns
+    assert "sources," not in columns
+    assert select_options == {"count": "exact"}
+    assert database.called("range") == [((10, 20), {})]
+    assert [args[0] for args, _ in database.called("order")] == ["task_order", "created_at", "id"]
+
+    assert [t["title"] for t in result["tasks"]] == [f"Task {n}" for n in range(10, 20)]
+    assert result["tasks"][0]["stats"] == {"sources_count": 2, "code_examples_count": 1}
+    assert result["total_count"] == 25
+    assert result["has_more"]
+    assert decode_task_cursor(result["next_cursor"])[2] == _task(19)["id"]
+
+
+def test_cursor_continues_after_the_last_task():
+    cursor = encode_task_cursor(_task(9, task_order=3))
+    database = FakeQuery([_task(n) for n in range(10, 15)])
+
+    success, result = TaskService(database).list_tasks(limit=10, offset=50, cursor=cursor)
+
+    assert success
+    # Offset is ignored with a cursor; the last page has no next cursor
+    assert database.called("range") == [((0, 10), {})]
+    keyset = database.called("or_")[-1][0][0]
+    assert keyset == (
+        'task_order.gt.3,task_order.is.null,'
+        'and(task_order.eq.3,created_at.gt."2025-01-01T00:00:09.5+00:00"),'
+        'and(task_order.eq.3,created_at.eq."2025-01-01T00:00:09.5+00:00",'
+        'id.gt."00000000-0000-0000-0000-000000000009")'
+    )
+    assert len(result["tasks"]) == 5
+    assert (result["has_more"], result["next_cursor"]) == (False, None)
+
+    # Tasks without a task_order sort last
+    TaskService(database).list_tasks(limit=10, cursor=encode_task_cursor(_task(9, task_order=None)))
+    assert database.called("or_")[-1][0][0].startswith("and(task_order.is.null,created_at.gt.")
+
+    assert TaskService(database).list_tasks(cursor="not-a-cursor") == (False, {"error": "Invalid cursor"})
+
+
+def test_unpaginated_listing_is_unchanged():
+    database = FakeQuery([_task(n) for n in range(3)])
+
+    success, result = TaskService(database).list_tasks(include_closed=True)
+
+    assert success
+    assert database.called("range") == []
+    assert database.called("select")[0] == (("*",), {})
+    assert result["total_count"] == 3
+    assert "next_cursor" not in result
+
+
+def test_missing_count_columns_fall_back_to_counting_arrays(monkeypatch):
+    monkeypatch.setattr(TaskService, "_count_columns_missing", False)
+    rows = [{**_task(0), "sources": [1, 2, 3], "code_examples": []}]
+    for row in rows:
+        del row["sources_count"], row["code_examples_count"]
+    database = FakeQuery(rows, fail_first_with="column archon_tasks.sources_count does not exist")
+
+    success, result = TaskService(database).list_tasks(exclude_large_fields=True, limit=10)
+
+    assert success
+    assert "sources, code_examples" in database.called("select")[-1][0][0]
+    assert result["tasks"][0]["stats"] == {"sources_count": 3, "code_examples_count": 0}
+    assert TaskService._count_columns_missing
+
+
+@pytest.mark.asyncio
+async def test_tasks_endpoint_pages_in_the_service():
+    from src.server.api_routes.projects_api import list_tasks
+
+    database = FakeQuery([_task(n) for n in range(12)], count=1000)
+    with patch("src.server.api_routes.projects_api.TaskService", return_value=TaskService(database)):
+        response = await list_tasks(project_id="proj-1", per_page=5, page=2, count="estimated")
+
+        assert [t["title"] for t in response["tasks"]] == [f"Task {n}" for n in range(5, 10)]
+        assert response["pagination"]["total"] == 1000
+        assert response["pagination"]["pages"] == 200
+        assert response["pagination"]["total_is_estimate"]
+        assert database.called("select")[-1][1] == {"count": "estimated"}
+
+        response = await list_tasks(per_page=5, cursor=response["pagination"]["next_cursor"], count="none")
+        assert response["pagination"]["total"] is None
+        assert "count" not in database.called("select")[-1][1]
+
+        with pytest.raises(HTTPException) as exc_info:
+            await list_tasks(cursor="bogus")
+        assert exc_info.value.status_code == 400
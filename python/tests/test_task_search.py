@@ -0,0 +1,107 @@
+"""
+Tests for ranked task search and its ILIKE fallback.
+"""
+
+import pytest
+
+from src.server.services.projects.task_service import TaskService, _term_filter
+
+
+def _task(n: int) -> dict:
+    return {
+        "id": f"task-{n}",
+        "project_id": "proj-1",
+        "title": f"Task {n}",
+        "description": "",
+        "status": "todo",
+        "task_order": n,
+        "created_at": "2025-01-01T00:00:00+00:00",
+        "updated_at": "2025-01-01T00:00:00+00:00",
+    }
+
+
+class RecordingClient:
+    """Records the PostgREST calls list_tasks makes and returns canned rows."""
+
+    def __init__(self, rows: list[dict], missing_function: bool = False):
+        self.rows = rows
+        self.missing_function = missing_function
+        self.calls: list[tuple] = []
+
+    def __getattr__(self, name):
+        def record(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+
+        return record
+
+    def execute(self):
+        if self.missing_function and self.called("rpc"):
+            self.missing_function = False
+            raise RuntimeError("Could not find the function public.search_archon_tasks in the schema cache")
+
+        class Response:
+            data = self.rows
+            count = None
+
+        return Response()
+
+    def called(self, name):
+        return [(args, kwargs) for call, args, kwargs in self.calls if call == name]
+
+
+@pytest.fixture(autouse=True)
+def search_function_installed(monkeypatch):
+    monkeypatch.setattr(TaskService, "_search_function_missing", False)
+
+
+def test_search_is_ranked_in_the_database():
+    database = RecordingClient([_task(7), _task(2), _task(5)])
+
+    success, result = TaskService(database).list_tasks(
+        project_id="proj-1", status="todo", search_query="OAuth token refresh", limit=2, offset=4
+    )
+
+    assert success
+    (name, params), _ = database.called("rpc")[0]
+    assert name == "search_archon_tasks"
+    assert params == {
+        "search_query": "OAuth token refresh",
+        "filter_project_id": "proj-1",
+        "filter_status": "todo",
+        "filter_assignee": None,
+        "include_closed": False,
+        "include_archived": False,
+    }
+    # Filters and ordering stay inside the function; only the page is cut here
+    assert not database.called("table") and not database.called("order") and not database.called("eq")
+    assert database.called("range") == [((4, 6), {})]
+    assert [task["id"] for task in result["tasks"]] == ["task-7", "task-2"]
+    assert result["has_more"] is True
+    assert result["next_cursor"] is None
+
+
+def test_search_without_migration_requires_every_term():
+    database = RecordingClient([_task(1)], missing_function=True)
+    service = TaskService(database)
+
+    success, _ = service.list_tasks(search_query="auth  Token", include_closed=True)
+
+    assert success
+    assert TaskService._search_function_missing
+    assert [args[0] for args, _ in database.called("or_")] == [
+        _term_filter("auth"),
+        _term_filter("token"),
+        "archived.is.null,archived.is.false",
+    ]
+
+    # The missing function is not retried on every search
+    database.calls.clear()
+    service.list_tasks(search_query="auth")
+    assert not database.called("rpc")
+
+
+def test_term_filter_quotes_filter_syntax():
+    assert _term_filter("a,b)") == (
+        'title.ilike."%a,b)%",description.ilike."%a,b)%",feature.ilike."%a,b)%"'
+    )
@@ -115,8 +115,10 @@ class TestProjectServiceOptimization:
         assert project["stats"]["features_count"] == 2
         assert project["stats"]["has_data"] is True
         
-        # Verify SELECT * was used (after N+1 fix, we fetch all data in one query)
-        mock_table.select.assert_called_with("*")
+        # Verify the large fields are not selected, only their sizes
+        (columns,), _ = mock_table.select.call_args
+        assert "docs_count, features_count, has_data" in columns
+        assert "docs," not in columns and "*" not in columns
         assert mock_client.table.call_count == 1  # Only one query now!
     
     def test_token_reduction(self):
@@ -0,0 +1,231 @@
+"""
+Tests for the vector index manager and per-query search effort.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from src.server.services.ollama.embedding_router import EmbeddingRouter
+from src.server.services.search.base_search_strategy import BaseSearchStrategy
+from src.server.services.search.vector_index_service import (
+    DirectDatabaseRequiredError,
+    VectorIndexService,
+    ivfflat_lists,
+    recommend_index,
+    vector_search_params,
+)
+
+CATALOG_INDEXES = {
+    "archon_crawled_pages": [
+        {
+            "indexname": "idx_archon_crawled_pages_embedding_1536",
+            "indexdef": "CREATE INDEX idx_archon_crawled_pages_embedding_1536 ON public.archon_crawled_pages "
+            "USING ivfflat (embedding_1536 vector_cosine_ops) WITH (lists='100')",
+            "valid": True,
+            "size_bytes": 24_000_000_000,
+        },
+        {
+            "indexname": "idx_archon_crawled_pages_embedding_768",
+            "indexdef": "CREATE INDEX idx_archon_crawled_pages_embedding_768 ON public.archon_crawled_pages "
+            "USING ivfflat (embedding_768 vector_cosine_ops) WITH (lists='100')",
+            "valid": True,
+            "size_bytes": 8192,
+        },
+        {
+            "indexname": "archon_crawled_pages_pkey",
+            "indexdef": "CREATE UNIQUE INDEX archon_crawled_pages_pkey ON public.archon_crawled_pages USING btree (id)",
+            "valid": True,
+            "size_bytes": 8192,
+        },
+    ],
+    "archon_code_examples": [],
+}
+
+
+class FakeDatabase:
+    """Catalog answers for a 3M-row crawled pages table and a 40k-row code examples table."""
+
+    def __init__(self):
+        self.executed: list[str] = []
+        self.fail_on: str | None = None
+
+    async def fetchval(self, query, table):
+        return {"archon_crawled_pages": 3_000_000, "archon_code_examples": 40_000}[table]
+
+    async def fetch(self, query, *args):
+        if "information_schema.columns" in query:
+            return [{"column_name": f"embedding_{d}"} for d in (384, 768, 1024, 1536, 3072)]
+        if "pg_stats" in query:
+            filled = {"archon_crawled_pages": "embedding_1536", "archon_code_examples": "embedding_768"}[args[0]]
+            return [
+                {"attname": f"embedding_{d}", "null_frac": 0.0 if f"embedding_{d}" == filled else 1.0}
+                for d in (384, 768, 1024, 1536, 3072)
+            ]
+        if "pg_indexes" in query:
+            return CATALOG_INDEXES[args[0]]
+        if "pg_stat_progress_create_index" in query:
+            return []
+        raise AssertionError(query)
+
+    async def connect(self):
+        database = self
+
+        class Connection:
+            async def execute(self, statement, *args):
+                database.executed.append(statement)
+                if database.fail_on and database.fail_on in statement:
+                    raise RuntimeError("could not create index")
+
+        class Pool:
+            @asynccontextmanager
+            async def acquire(self):
+                yield Connection()
+
+        return Pool()
+
+
+def _status(statuses, table, column):
+    return next(s for s in statuses if s.table == table and s.column == column)
+
+
+def test_index_recommendations():
+    # Large columns get HNSW, smaller ones right-sized ivfflat
+    assert EmbeddingRouter().get_optimal_index_type(1536, row_count=3_000_000) == "hnsw"
+    assert EmbeddingRouter().get_optimal_index_type(1536) == "ivfflat"
+    assert recommend_index(1536, 3_000_000)[0].method == "hnsw"
+    assert recommend_index(1536, 50_000)[0].lists == 50
+    assert recommend_index(1536, 3_000_000, index_type="ivfflat")[0].lists == 1732
+    assert ivfflat_lists(2_000) == 10
+
+    # Nothing to index, or too wide for pgvector indexes
+    assert recommend_index(1536, 0)[0] is None
+    assert recommend_index(3072, 1_000)[0] is None
+
+
+@pytest.mark.asyncio
+async def test_inspect_finds_undersized_and_missing_indexes():
+    service = VectorIndexService(FakeDatabase())
+
+    statuses = await service.inspect()
+
+    pages = _status(statuses, "archon_crawled_pages", "embedding_1536")
+    assert pages.rows == 3_000_000
+    assert (pages.current.method, pages.current.lists) == ("ivfflat", 100)
+    assert pages.recommended.method == "hnsw"
+    assert pages.action == "rebuild"
+
+    # Empty column keeps its index, code examples get their first one
+    assert _status(statuses, "archon_crawled_pages", "embedding_768").action == "none"
+    code = _status(statuses, "archon_code_examples", "embedding_768")
+    assert (code.action, code.recommended.lists) == ("create", 40)
+    assert _status(statuses, "archon_crawled_pages", "embedding_3072").action == "none"
+
+    # Probes follow the inspected list count
+    assert service.search_lists == {"archon_crawled_pages": 100}
+
+
+@pytest.mark.asyncio
+async def test_rebuild_builds_new_index_before_dropping_old():
+    database = FakeDatabase()
+    service = VectorIndexService(database)
+    statuses = await service.inspect()
+    plan = service.plan(statuses, table="archon_crawled_pages")
+
+    service.start_build(plan, maintenance_work_mem="2GB")
+    await service._build_task
+
+    assert service.build["status"] == "completed"
+    assert database.executed == [
+        "SELECT set_config('maintenance_work_mem', $1, false)",
+        'DROP INDEX CONCURRENTLY IF EXISTS "idx_archon_crawled_pages_embedding_1536_new"',
+        'CREATE INDEX CONCURRENTLY "idx_archon_crawled_pages_embedding_1536_new" ON "archon_crawled_pages" '
+        'USING hnsw ("embedding_1536" vector_cosine_ops) WITH (m = 16, ef_construction = 64)',
+        'DROP INDEX CONCURRENTLY IF EXISTS "idx_archon_crawled_pages_embedding_1536"',
+        'ALTER INDEX "idx_archon_crawled_pages_embedding_1536_new" RENAME TO "idx_archon_crawled_pages_embedding_1536"',
+        "RESET maintenance_work_mem",
+    ]
+    # HNSW has no lists to size probes by
+    assert "archon_crawled_pages" not in service.search_lists
+
+
+@pytest.mark.asyncio
+async def test_failed_build_is_reported_and_does_not_block_the_next():
+    database = FakeDatabase()
+    database.fail_on = "CREATE INDEX"
+    service = VectorIndexService(database)
+    plan = service.plan(await service.inspect())
+
+    service.start_build(plan)
+    with pytest.raises(RuntimeError):
+        service.start_build(plan)
+    await service._build_task
+
+    assert service.build["status"] == "failed"
+    assert "could not create index" in service.build["error"]
+    assert not service.is_building
+
+
+def test_search_params_follow_recall_setting():
+    assert vector_search_params("", 100, 10) == {}
+    assert vector_search_params("fast", 100, 10) == {"ef_search": 40, "probes": 5}
+    assert vector_search_params("balanced", 1732, 10) == {"ef_search": 100, "probes": 42}
+    # HNSW returns at most ef_search rows
+    assert vector_search_params("accurate", None, 250) == {"ef_search": 250, "probes": 20}
+
+
+@pytest.mark.asyncio
+async def test_vector_search_sends_search_params(monkeypatch):
+    calls = []
+
+    async def execute_rpc(client, name, params):
+        calls.append(params)
+        return []
+
+    strategy = BaseSearchStrategy(MagicMock())
+    with patch("src.server.services.search.base_search_strategy.execute_rpc", side_effect=execute_rpc):
+        await strategy.vector_search([0.1], match_count=5)
+        monkeypatch.setenv("VECTOR_SEARCH_RECALL", "accurate")
+        await strategy.vector_search([0.1], match_count=5)
+
+    assert "ef_search" not in calls[0]
+    assert calls[1]["ef_search"] == 200
+    assert calls[1]["probes"] == 20
+
+
+@pytest.mark.asyncio
+async def test_endpoints():
+    from src.server.api_routes.vector_index_api import (
+        VectorIndexRebuildRequest,
+        get_vector_indexes,
+        rebuild_vector_indexes,
+    )
+
+    with patch("src.server.services.search.vector_index_service.get_async_db_client", return_value=None):
+        with pytest.raises(HTTPException) as exc_info:
+            await get_vector_indexes(exact=False, index_type="auto")
+        assert exc_info.value.status_code == 503
+        with pytest.raises(DirectDatabaseRequiredError):
+            VectorIndexService().start_build([])
+
+    service = VectorIndexService(FakeDatabase())
+    with patch("src.server.api_routes.vector_index_api.get_vector_index_service", return_value=service):
+        overview = await get_vector_indexes(exact=False, index_type="auto")
+        assert len(overview["indexes"]) == 10
+        assert overview["build"]["status"] == "idle"
+
+        response = await rebuild_vector_indexes(VectorIndexRebuildRequest(dry_run=True))
+        assert response["started"] is False
+        assert [(p["table"], p["column"], p["index"]) for p in response["plan"]] == [
+            ("archon_crawled_pages", "embedding_1536", "hnsw"),
+            ("archon_code_examples", "embedding_768", "ivfflat"),
+        ]
+        assert not service.is_building
+
+        response = await rebuild_vector_indexes(VectorIndexRebuildRequest(table="archon_code_examples"))
+        assert response.status_code == 202
+        await asyncio.wait_for(service._build_task, 1)
+        assert service.build["completed"][0]["index"] == "archon_code_examples.embedding_768"